@@ -37,3 +37,11 @@ class UtilityValueUnavailableException(UnableToProduceGuidedSuggestionException)
     This later mode of failure went undetected for GlowWormSwarmOptimizer for a few months, as it continued returning random suggestions
     implicitly when no predictions were available from the surrogate model.
     """
+
+
+class OptimizerQueueFullException(MlosException):
+    """ Raised when a request can't be queued for an optimizer, because too many requests are already waiting for it. """
+
+
+class OptimizerWorkerLostException(MlosException):
+    """ Raised when the worker process hosting an optimizer died, taking the optimizer with it. """
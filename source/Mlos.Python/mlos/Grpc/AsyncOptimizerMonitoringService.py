@@ -0,0 +1,116 @@
+# pylint: disable=unused-argument
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import grpc
+
+from mlos.Exceptions import OptimizerQueueFullException, OptimizerWorkerLostException
+from mlos.global_values import serialize_to_bytes_string
+from mlos.Grpc.DataFrameEncoderDecoder import DataFrameDecoder, DataFrameFormat
+from mlos.Grpc.OptimizerMonitoringService import OptimizerMonitoringService
+from mlos.Grpc.OptimizerMonitoringService_pb2_grpc import OptimizerMonitoringServiceServicer
+from mlos.Grpc.OptimizerMonitoringService_pb2 import OptimizerConvergenceState, OptimizerList, Empty, OptimizerInfo, OptimizerHandle, \
+    SimpleBoolean, SimpleInteger, SimpleString
+from mlos.Grpc.OptimizerMonitoringServiceEncoderDecoder import OptimizerMonitoringServiceEncoder
+from mlos.Grpc.OptimizerProcessPool import OptimizerProcessPool
+from mlos.Logger import create_logger
+
+
+
+class AsyncOptimizerMonitoringService(OptimizerMonitoringServiceServicer):
+    """ Defines the Optimizer Monitoring Microservice on top of grpc's asyncio server.
+
+    Requests about an optimizer's problem, config or training status are answered from the front end's records, all
+    others are queued for the optimizer's worker process. Encoding is shared with OptimizerMonitoringService.
+
+    """
+
+    max_rows_per_chunk = OptimizerMonitoringService.max_rows_per_chunk
+
+    def __init__(self, optimizer_process_pool: OptimizerProcessPool, logger=None):
+        self._optimizer_process_pool = optimizer_process_pool
+        if logger is None:
+            logger = create_logger(self.__class__.__name__)
+        self.logger = logger
+
+    async def ListExistingOptimizers(self, request: Empty, context):
+        optimizers_info = []
+        for optimizer_id, record in self._optimizer_process_pool.list_optimizers():
+            optimizers_info.append(OptimizerInfo(
+                OptimizerHandle=OptimizerHandle(Id=optimizer_id),
+                OptimizerConfigJsonString=record.optimizer_config.to_json(),
+                OptimizationProblem=OptimizerMonitoringServiceEncoder.encode_optimization_problem(record.optimization_problem)
+            ))
+        return OptimizerList(Optimizers=optimizers_info)
+
+    async def GetOptimizerInfo(self, request: OptimizerHandle, context):
+        record = self._optimizer_process_pool.get_optimizer_record(request.Id)
+        return OptimizerInfo(
+            OptimizerHandle=OptimizerHandle(Id=request.Id),
+            OptimizerConfigJsonString=record.optimizer_config.to_json(),
+            OptimizationProblem=OptimizerMonitoringServiceEncoder.encode_optimization_problem(record.optimization_problem)
+        )
+
+    async def GetOptimizerConvergenceState(self, request, context):
+        convergence_state = await self._call_optimizer(context, request.Id, 'get_optimizer_convergence_state')
+        return OptimizerConvergenceState(
+            OptimizerHandle=OptimizerHandle(Id=request.Id),
+            SerializedOptimizerConvergenceState=serialize_to_bytes_string(convergence_state)
+        )
+
+    async def IsTrained(self, request, context):
+        record = self._optimizer_process_pool.get_optimizer_record(request.Id)
+        return SimpleBoolean(Value=record.trained)
+
+    async def ComputeGoodnessOfFitMetrics(self, request, context):
+        gof_metrics = await self._call_optimizer(context, request.Id, 'compute_surrogate_model_goodness_of_fit')
+        return SimpleString(Value=gof_metrics.to_json())
+
+    async def GetNumObservations(self, request, context):
+        record = self._optimizer_process_pool.get_optimizer_record(request.Id)
+        return SimpleInteger(Value=record.num_observations)
+
+    async def GetAllObservations(self, request, context):
+        features_df, objectives_df, context_df = await self._call_optimizer(context, request.Id, 'get_all_observations')
+        return OptimizerMonitoringService.encode_observations(features_df, objectives_df, DataFrameFormat.from_grpc_context(context), context_df=context_df)
+
+    async def GetAllObservationsStream(self, request, context):
+        features_df, objectives_df, context_df = await self._call_optimizer(context, request.OptimizerHandle.Id, 'get_all_observations')
+        max_rows_per_chunk = self.max_rows_per_chunk
+        if 0 < request.MaxRowsPerChunk < max_rows_per_chunk:
+            max_rows_per_chunk = request.MaxRowsPerChunk
+
+        for observations in OptimizerMonitoringService.encode_observations_in_chunks(
+                features_df=features_df,
+                objectives_df=objectives_df,
+                max_rows_per_chunk=max_rows_per_chunk,
+                dataframe_format=DataFrameFormat.from_grpc_context(context),
+                context_df=context_df
+        ):
+            yield observations
+
+    async def Predict(self, request, context):
+        return await self._predict(request, context, DataFrameFormat.from_grpc_context(context))
+
+    async def PredictStream(self, request_iterator, context):
+        dataframe_format = DataFrameFormat.from_grpc_context(context)
+        async for request in request_iterator:
+            yield await self._predict(request, context, dataframe_format)
+
+    async def Echo(self, request: Empty, context):
+        return Empty()
+
+    async def _predict(self, request, context, dataframe_format: DataFrameFormat):
+        features_df = DataFrameDecoder.decode_features_dataframe(request.Features, orient='list')
+        context_df = DataFrameDecoder.decode_context_dataframe(request.Context, orient='list')
+        prediction = await self._call_optimizer(context, request.OptimizerHandle.Id, 'predict', features_df, context_values_pandas_frame=context_df)
+        return OptimizerMonitoringService.encode_prediction(prediction, dataframe_format)
+
+    async def _call_optimizer(self, grpc_context, optimizer_id, method_name, *args, **kwargs):
+        try:
+            return await self._optimizer_process_pool.call(optimizer_id, method_name, *args, **kwargs)
+        except OptimizerQueueFullException as e:
+            await grpc_context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        except OptimizerWorkerLostException as e:
+            await grpc_context.abort(grpc.StatusCode.UNAVAILABLE, str(e))
@@ -0,0 +1,147 @@
+# pylint: disable=unused-argument
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import json
+
+import grpc
+
+from mlos.Exceptions import OptimizerQueueFullException, OptimizerWorkerLostException
+from mlos.Grpc.OptimizerProcessPool import OptimizerProcessPool
+from mlos.Grpc.OptimizerService import OptimizerService
+from mlos.Grpc.OptimizerService_pb2 import CreateOptimizerRequest, ConfigurationParameters, ConfigurationParametersBatch, Empty, OptimizerHandle, \
+    OptimizerInfo
+from mlos.Grpc.OptimizerService_pb2_grpc import OptimizerServiceServicer
+from mlos.Grpc.OptimizerServiceEncoderDecoder import OptimizerServiceDecoder, OptimizerServiceEncoder
+from mlos.Optimizers.BayesianOptimizer import bayesian_optimizer_config_store
+from mlos.Spaces import Point
+from mlos.Logger import create_logger
+
+
+
+class AsyncOptimizerService(OptimizerServiceServicer):
+    """ Defines the Optimizer Microservice on top of grpc's asyncio server.
+
+    Requests are decoded and encoded on the event loop, while the optimizers themselves live in the worker processes of
+    an OptimizerProcessPool. Calls to a single optimizer are queued and run one at a time, so a slow suggestion for one
+    optimizer only delays the requests for that optimizer.
+
+    """
+
+    def __init__(self, optimizer_process_pool: OptimizerProcessPool, logger=None):
+        self._optimizer_process_pool = optimizer_process_pool
+        if logger is None:
+            logger = create_logger(self.__class__.__name__)
+        self.logger = logger
+
+    async def CreateOptimizer(self, request: CreateOptimizerRequest, context):
+        self.logger.info("Creating Optimizer")
+        optimization_problem = OptimizerServiceDecoder.decode_optimization_problem(optimization_problem_pb2=request.OptimizationProblem)
+        optimizer_config_json = request.OptimizerConfig
+        if optimizer_config_json is not None and len(optimizer_config_json) > 0:
+            optimizer_config = Point.from_json(optimizer_config_json)
+        else:
+            optimizer_config = bayesian_optimizer_config_store.default
+
+        try:
+            record = await self._optimizer_process_pool.create_optimizer(optimization_problem=optimization_problem, optimizer_config=optimizer_config)
+        except OptimizerWorkerLostException as e:
+            await context.abort(grpc.StatusCode.UNAVAILABLE, str(e))
+        self.logger.info(f"Created optimizer {record.optimizer_id} with config: {optimizer_config.to_json(indent=2)}")
+        return OptimizerHandle(Id=record.optimizer_id)
+
+    async def GetOptimizerInfo(self, request: OptimizerHandle, context):
+        record = self._optimizer_process_pool.get_optimizer_record(request.Id)
+        return OptimizerInfo(
+            OptimizerHandle=OptimizerHandle(Id=request.Id),
+            OptimizerConfigJsonString=record.optimizer_config.to_json(),
+            OptimizationProblem=OptimizerServiceEncoder.encode_optimization_problem(record.optimization_problem)
+        )
+
+    async def Suggest(self, request, context):
+        self.logger.info("Suggesting")
+        suggested_params = await self._call_optimizer(
+            context,
+            request.OptimizerHandle.Id,
+            'suggest',
+            random=request.Random,
+            context=OptimizerServiceDecoder.decode_context(request.Context)
+        )
+        return ConfigurationParameters(
+            ParametersJsonString=json.dumps(suggested_params.to_dict())
+        )
+
+    async def SuggestBatch(self, request, context):
+        self.logger.info(f"Suggesting {request.NumSuggestions} configurations")
+        if request.NumSuggestions == 0:
+            raise ValueError("NumSuggestions must be positive.")
+        suggestion_context = OptimizerServiceDecoder.decode_context(request.Context)
+
+        # The calls are queued one after another rather than all at once, so that a large batch can't fill up the
+        # optimizer's queue.
+        #
+        configurations = []
+        for _ in range(request.NumSuggestions):
+            suggested_params = await self._call_optimizer(
+                context,
+                request.OptimizerHandle.Id,
+                'suggest',
+                random=request.Random,
+                context=suggestion_context
+            )
+            configurations.append(ConfigurationParameters(ParametersJsonString=json.dumps(suggested_params.to_dict())))
+        return ConfigurationParametersBatch(Configurations=configurations)
+
+    async def RegisterObservation(self, request, context):
+        features_df, objectives_df, context_df = OptimizerService.decode_observation(request.Observation)
+        await self._register(context, request.OptimizerHandle.Id, features_df, objectives_df, context_df)
+        return Empty()
+
+    async def RegisterObservations(self, request, context):
+        features_df, objectives_df, context_df = OptimizerService.decode_observations(request.Observations)
+        await self._register(context, request.OptimizerHandle.Id, features_df, objectives_df, context_df)
+        return Empty()
+
+    async def RegisterObservationsStream(self, request_iterator, context):
+        """ Registers observations streamed in chunks.
+
+        Same as OptimizerService.RegisterObservationsStream: the chunks are decoded as they arrive and registered with a
+        single call after the last one.
+        """
+        optimizer_id = None
+        decoded_chunks = []
+        async for request in request_iterator:
+            if optimizer_id is None:
+                optimizer_id = request.OptimizerHandle.Id
+            elif request.OptimizerHandle.Id != optimizer_id:
+                raise ValueError(f"All chunks must be for the same optimizer. Expected {optimizer_id}, got {request.OptimizerHandle.Id}.")
+            decoded_chunks.append(OptimizerService.decode_observations(request.Observations))
+
+        if optimizer_id is None:
+            return Empty()
+
+        features_df, objectives_df, context_df = OptimizerService.concatenate_observation_chunks(decoded_chunks)
+        await self._register(context, optimizer_id, features_df, objectives_df, context_df)
+        return Empty()
+
+    async def Echo(self, request: Empty, context):
+        return Empty()
+
+    async def _register(self, context, optimizer_id, features_df, objectives_df, context_df):
+        await self._call_optimizer(
+            context,
+            optimizer_id,
+            'register',
+            parameter_values_pandas_frame=features_df,
+            target_values_pandas_frame=objectives_df,
+            context_values_pandas_frame=context_df
+        )
+
+    async def _call_optimizer(self, grpc_context, optimizer_id, method_name, *args, **kwargs):
+        try:
+            return await self._optimizer_process_pool.call(optimizer_id, method_name, *args, **kwargs)
+        except OptimizerQueueFullException as e:
+            await grpc_context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        except OptimizerWorkerLostException as e:
+            await grpc_context.abort(grpc.StatusCode.UNAVAILABLE, str(e))
@@ -0,0 +1,136 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import asyncio
+import threading
+
+try:
+    from grpc import aio
+except ImportError:
+    # Before grpcio 1.32 the asyncio API was experimental.
+    #
+    from grpc.experimental import aio
+
+from mlos.Grpc import OptimizerService_pb2_grpc, OptimizerMonitoringService_pb2_grpc
+from mlos.Grpc.AsyncOptimizerService import AsyncOptimizerService
+from mlos.Grpc.AsyncOptimizerMonitoringService import AsyncOptimizerMonitoringService
+from mlos.Grpc.OptimizerProcessPool import OptimizerProcessPool
+from mlos.Logger import create_logger
+
+
+
+class AsyncOptimizerServicesServer:
+    """ Hosts the OptimizerMicroservice on grpc's asyncio server, with the optimizers in worker processes.
+
+    Has the same interface as OptimizerServicesServer. The server's event loop runs on a background thread, so start()
+    returns once the server is listening and the caller's thread is free, just like with the threaded server.
+
+    Parameters
+    ----------
+    port : int
+        Port to listen on.
+
+    num_workers : int, default=None
+        Number of optimizer worker processes. Defaults to the number of CPUs.
+
+    max_queued_calls_per_optimizer : int, default=100
+        How many requests can be waiting for a single optimizer before new ones are rejected with RESOURCE_EXHAUSTED.
+
+    logger : logger, default=None
+        Logger to use. By default, a new logger is created internally.
+    """
+
+    def __init__(self, port, num_workers=None, max_queued_calls_per_optimizer=100, logger=None):
+        self.port = port
+        self.started = False
+        if logger is None:
+            logger = create_logger("AsyncOptimizerMicroserviceServer init")
+        self.logger = logger
+        self._optimizer_process_pool = OptimizerProcessPool(
+            num_workers=num_workers,
+            max_queued_calls_per_optimizer=max_queued_calls_per_optimizer,
+            logger=logger
+        )
+        self._server = None
+        self._loop = None
+        self._thread = None
+        self._stopped_event = threading.Event()
+
+    def start(self):
+        assert self._thread is None, "Server already started"
+
+        # The workers must be spawned before grpc starts its threads.
+        #
+        self._optimizer_process_pool.start()
+
+        self._loop = asyncio.new_event_loop()
+        server_started = threading.Event()
+        startup_exceptions = []
+        self._thread = threading.Thread(
+            target=self._run_event_loop,
+            args=(server_started, startup_exceptions),
+            name="AsyncOptimizerServicesServer",
+            daemon=True
+        )
+        self._thread.start()
+        server_started.wait()
+        if startup_exceptions:
+            self._thread.join()
+            self._thread = None
+            self._optimizer_process_pool.shutdown()
+            raise startup_exceptions[0]
+
+        self.started = True
+        self.logger.info("AsyncOptimizerMicroserviceServer started")
+
+    def stop(self, grace=None):
+        """ Requests the server to stop and returns a threading.Event that is set once it has.
+
+        """
+        asyncio.run_coroutine_threadsafe(self._server.stop(grace), self._loop)
+        self.logger.info("AsyncOptimizerMicroserviceServer stop requested")
+        return self._stopped_event
+
+    def wait_for_termination(self, timeout=None):
+        """ Blocks until the server stops or the timeout expires. Returns True if the timeout expired.
+
+        """
+        if self._thread is None:
+            return True
+        self._thread.join(timeout=timeout)
+        return self._thread.is_alive()
+
+    def _run_event_loop(self, server_started, startup_exceptions):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve(server_started, startup_exceptions))
+        finally:
+            self._loop.close()
+            self._stopped_event.set()
+
+    async def _serve(self, server_started, startup_exceptions):
+        try:
+            self._server = aio.server()
+            OptimizerService_pb2_grpc.add_OptimizerServiceServicer_to_server(
+                AsyncOptimizerService(optimizer_process_pool=self._optimizer_process_pool, logger=self.logger),
+                self._server
+            )
+            OptimizerMonitoringService_pb2_grpc.add_OptimizerMonitoringServiceServicer_to_server(
+                AsyncOptimizerMonitoringService(optimizer_process_pool=self._optimizer_process_pool, logger=self.logger),
+                self._server
+            )
+            if self._server.add_insecure_port(f'[::]:{self.port}') == 0:
+                raise RuntimeError(f"Failed to bind to port {self.port}.")
+            await self._server.start()
+        except Exception as e:  # pylint: disable=broad-except
+            startup_exceptions.append(e)
+            return
+        finally:
+            server_started.set()
+
+        await self._server.wait_for_termination()
+
+        # The work queues' tasks belong to this loop, so the pool has to be shut down before the loop closes.
+        #
+        self._optimizer_process_pool.shutdown()
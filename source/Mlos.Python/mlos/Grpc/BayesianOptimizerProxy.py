@@ -3,15 +3,18 @@
 # Licensed under the MIT License.
 #
 import json
-from typing import Tuple
+from typing import Iterable, Iterator, List, Tuple
 
+import grpc
 import pandas as pd
 
 from mlos.global_values import deserialize_from_bytes_string
+from mlos.Grpc.DataFrameEncoderDecoder import DataFrameDecoder, DataFrameEncoder, DataFrameFormat
 from mlos.Grpc import OptimizerMonitoringService_pb2
 from mlos.Grpc.OptimizerMonitoringService_pb2_grpc import OptimizerMonitoringServiceStub
 from mlos.Grpc import OptimizerService_pb2
 from mlos.Grpc.OptimizerService_pb2_grpc import OptimizerServiceStub
+from mlos.Grpc.OptimizerServiceEncoderDecoder import OptimizerServiceEncoder
 from mlos.Logger import create_logger
 from mlos.Optimizers.OptimizerBase import OptimizerBase
 from mlos.Optimizers.RegressionModels.MultiObjectiveGoodnessOfFitMetrics import MultiObjectiveGoodnessOfFitMetrics
@@ -40,6 +43,12 @@ class BayesianOptimizerProxy(OptimizerBase):
         Unique identifying string.
     logger : logger, default=None
         Logger to use. By default, a new logger is created internally.
+    dataframe_format : DataFrameFormat, default=DataFrameFormat.COLUMNAR
+        Encoding of observations and predictions sent to and requested from the service. JSON is only needed to talk
+        to services that predate columnar dataframes.
+    max_rows_per_message : int, default=10000
+        Dataframes with more rows are split into chunks of this size and streamed, which bounds the size of every
+        message and of the buffers on both ends.
     """
 
     def __init__(
@@ -48,7 +57,9 @@ class BayesianOptimizerProxy(OptimizerBase):
             optimization_problem,
             optimizer_config,
             id,  # pylint: disable=redefined-builtin
-            logger=None
+            logger=None,
+            dataframe_format: DataFrameFormat = DataFrameFormat.COLUMNAR,
+            max_rows_per_message: int = 10000
     ):
         if logger is None:
             logger = create_logger("BayesianOptimizerClient")
@@ -62,6 +73,9 @@ class BayesianOptimizerProxy(OptimizerBase):
         self._optimizer_monitoring_stub = OptimizerMonitoringServiceStub(self._grpc_channel)
         self.optimizer_config = optimizer_config
         self.id = id
+        self.dataframe_format = dataframe_format
+        self._grpc_metadata = dataframe_format.to_metadata()
+        self.max_rows_per_message = max_rows_per_message
 
     @property
     def optimizer_handle_for_optimizer_monitoring_service(self):
@@ -89,65 +103,244 @@ class BayesianOptimizerProxy(OptimizerBase):
         return MultiObjectiveGoodnessOfFitMetrics.from_json(response.Value, objective_names=self.optimization_problem.objective_space.dimension_names)
 
     @trace()
-    def suggest(self, random=False, context=None):  # pylint: disable=unused-argument
-        if context is not None:
-            raise NotImplementedError("Context not currently supported on remote optimizers")
-
+    def suggest(self, random=False, context: Point = None):
         suggestion_request = OptimizerService_pb2.SuggestRequest(
             OptimizerHandle=self.optimizer_handle_for_optimizer_service,
             Random=random,
-            Context=context
+            Context=OptimizerServiceEncoder.encode_context(context)
         )
         suggestion_response = self._optimizer_stub.Suggest(suggestion_request)
         suggested_params_dict = json.loads(suggestion_response.ParametersJsonString)
         return Point(**suggested_params_dict)
 
+    @trace()
+    def suggest_batch(self, num_suggestions: int, random=False, context: Point = None) -> List[Point]:
+        """ Returns num_suggestions suggestions in a single round trip, e.g. to hand one out to each of several workers.
+
+        """
+        suggest_batch_request = OptimizerService_pb2.SuggestBatchRequest(
+            OptimizerHandle=self.optimizer_handle_for_optimizer_service,
+            Random=random,
+            Context=OptimizerServiceEncoder.encode_context(context),
+            NumSuggestions=num_suggestions
+        )
+        suggest_batch_response = self._optimizer_stub.SuggestBatch(suggest_batch_request)
+        return [
+            Point(**json.loads(configuration.ParametersJsonString))
+            for configuration in suggest_batch_response.Configurations
+        ]
+
     @trace()
     def register(self, parameter_values_pandas_frame, target_values_pandas_frame, context_values_pandas_frame=None):
-        if context_values_pandas_frame is not None:
-            raise NotImplementedError("Context not currently supported on remote optimizers")
+        """ Registers observations with the remote optimizer.
 
+        Observations that don't fit into a single message of max_rows_per_message rows are streamed in chunks.
+        """
         feature_values_pandas_frame = parameter_values_pandas_frame
-        register_request = OptimizerService_pb2.RegisterObservationsRequest(
-            OptimizerHandle=self.optimizer_handle_for_optimizer_service,
-            Observations=OptimizerService_pb2.Observations(
+        if len(feature_values_pandas_frame.index) <= self.max_rows_per_message:
+            register_request = self._make_register_observations_request(
+                feature_values_pandas_frame,
+                target_values_pandas_frame,
+                context_values_pandas_frame
+            )
+            self._optimizer_stub.RegisterObservations(register_request) # TODO: we should be using the optimizer_stub for this.
+            return
+
+        # The stub pulls chunks from the generator as gRPC's flow control lets them out, so only a few encoded chunks
+        # exist at any time.
+        #
+        register_requests = (
+            self._make_register_observations_request(
+                feature_values_pandas_frame=feature_values_pandas_frame.iloc[chunk_start:chunk_start + self.max_rows_per_message],
+                target_values_pandas_frame=target_values_pandas_frame.iloc[chunk_start:chunk_start + self.max_rows_per_message],
+                context_values_pandas_frame=None if context_values_pandas_frame is None else
+                context_values_pandas_frame.iloc[chunk_start:chunk_start + self.max_rows_per_message]
+            )
+            for chunk_start
+            in range(0, len(feature_values_pandas_frame.index), self.max_rows_per_message)
+        )
+        self._optimizer_stub.RegisterObservationsStream(register_requests)
+
+    def _make_register_observations_request(self, feature_values_pandas_frame, target_values_pandas_frame, context_values_pandas_frame=None):
+        context = DataFrameEncoder.encode_context_dataframe(context_values_pandas_frame, self.dataframe_format)
+        if self.dataframe_format == DataFrameFormat.COLUMNAR:
+            observations = OptimizerService_pb2.Observations(
+                Features=OptimizerService_pb2.Features(FeaturesDataFrame=DataFrameEncoder.encode_dataframe(feature_values_pandas_frame)),
+                ObjectiveValues=OptimizerService_pb2.ObjectiveValues(ObjectiveValuesDataFrame=DataFrameEncoder.encode_dataframe(target_values_pandas_frame)),
+                Context=context
+            )
+        else:
+            observations = OptimizerService_pb2.Observations(
                 Features=OptimizerService_pb2.Features(FeaturesJsonString=feature_values_pandas_frame.to_json(orient='index', double_precision=15)),
                 ObjectiveValues=OptimizerService_pb2.ObjectiveValues(
                     ObjectiveValuesJsonString=target_values_pandas_frame.to_json(orient='index', double_precision=15)
-                )
+                ),
+                Context=context
             )
+        return OptimizerService_pb2.RegisterObservationsRequest(
+            OptimizerHandle=self.optimizer_handle_for_optimizer_service,
+            Observations=observations
         )
-        self._optimizer_stub.RegisterObservations(register_request) # TODO: we should be using the optimizer_stub for this.
 
     @trace()
     def get_all_observations(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-        response = self._optimizer_monitoring_stub.GetAllObservations(self.optimizer_handle_for_optimizer_monitoring_service)
-        features_df = pd.read_json(response.Features.FeaturesJsonString, orient='index').sort_index()
-        objectives_df = pd.read_json(response.ObjectiveValues.ObjectiveValuesJsonString, orient='index').sort_index()
+        """ Returns all observations. The context dataframe is None if the optimization problem has no context space.
+
+        Observations that fit into a single message of max_rows_per_message rows are retrieved with a single unary call,
+        anything larger is paginated over GetAllObservationsStream.
+        """
+        try:
+            num_observations = self._optimizer_monitoring_stub.GetNumObservations(self.optimizer_handle_for_optimizer_monitoring_service).Value
+        except grpc.RpcError as e:
+            # Services that predate GetNumObservations don't stream observations either.
+            #
+            if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                raise
+            num_observations = 0
+
+        if num_observations <= self.max_rows_per_message:
+            # Observations registered since they were counted can make this message a little longer than max_rows_per_message.
+            #
+            response = self._optimizer_monitoring_stub.GetAllObservations(
+                self.optimizer_handle_for_optimizer_monitoring_service,
+                metadata=self._grpc_metadata
+            )
+            return (
+                DataFrameDecoder.decode_features_dataframe(response.Features),
+                DataFrameDecoder.decode_objective_values_dataframe(response.ObjectiveValues),
+                DataFrameDecoder.decode_context_dataframe(response.Context)
+            )
+
+        features_dfs = []
+        objectives_dfs = []
+        context_dfs = []
+        for features_df, objectives_df, context_df in self.stream_all_observations():
+            features_dfs.append(features_df)
+            objectives_dfs.append(objectives_df)
+            context_dfs.append(context_df)
+        features_df = pd.concat(features_dfs) if len(features_dfs) > 1 else features_dfs[0]
+        objectives_df = pd.concat(objectives_dfs) if len(objectives_dfs) > 1 else objectives_dfs[0]
         context_df = None
+        if context_dfs[0] is not None:
+            context_df = pd.concat(context_dfs) if len(context_dfs) > 1 else context_dfs[0]
         return features_df, objectives_df, context_df
 
+    def stream_all_observations(self, max_rows_per_chunk=None) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+        """ Yields (features_df, objectives_df, context_df) for consecutive chunks of all observations registered with the remote optimizer.
+
+        Chunks are received as they are consumed, so the memory used is bounded by the chunk size rather than by the
+        number of observations.
+
+        :param max_rows_per_chunk: defaults to max_rows_per_message.
+        :return:
+        """
+        request = OptimizerMonitoringService_pb2.GetAllObservationsRequest(
+            OptimizerHandle=self.optimizer_handle_for_optimizer_monitoring_service,
+            MaxRowsPerChunk=max_rows_per_chunk if max_rows_per_chunk is not None else self.max_rows_per_message
+        )
+        for response in self._optimizer_monitoring_stub.GetAllObservationsStream(request, metadata=self._grpc_metadata):
+            features_df = DataFrameDecoder.decode_features_dataframe(response.Features)
+            objectives_df = DataFrameDecoder.decode_objective_values_dataframe(response.ObjectiveValues)
+            context_df = DataFrameDecoder.decode_context_dataframe(response.Context)
+            yield features_df, objectives_df, context_df
+
     @trace()
     def predict(self, parameter_values_pandas_frame, t=None, context_values_pandas_frame=None, objective_name=None) -> Prediction:  # pylint: disable=unused-argument
-        # TODO: make this streaming and/or using arrow.
-        #
-        if context_values_pandas_frame is not None:
-            raise NotImplementedError("Context not currently supported on remote optimizers")
-        feature_values_dict = parameter_values_pandas_frame.to_dict(orient='list')
-        prediction_request = OptimizerMonitoringService_pb2.PredictRequest(
+        """ Returns predictions for all rows in parameter_values_pandas_frame.
+
+        Frames longer than max_rows_per_message rows are sent to the service in chunks over a single stream.
+        """
+        num_rows = len(parameter_values_pandas_frame.index)
+        if num_rows <= self.max_rows_per_message:
+            prediction_request = self._make_predict_request(parameter_values_pandas_frame, context_values_pandas_frame)
+            prediction_response = self._optimizer_monitoring_stub.Predict(prediction_request, metadata=self._grpc_metadata)
+            return self._decode_prediction(prediction_response)
+
+        chunk_starts = range(0, num_rows, self.max_rows_per_message)
+        predictions = self.stream_predictions(
+            parameter_values_pandas_frames=(
+                parameter_values_pandas_frame.iloc[chunk_start:chunk_start + self.max_rows_per_message]
+                for chunk_start
+                in chunk_starts
+            ),
+            context_values_pandas_frames=None if context_values_pandas_frame is None else (
+                context_values_pandas_frame.iloc[chunk_start:chunk_start + self.max_rows_per_message]
+                for chunk_start
+                in chunk_starts
+            )
+        )
+        valid_predictions_dfs = []
+        predicted_objective_name = None
+        for chunk_start, prediction in zip(chunk_starts, predictions):
+            predicted_objective_name = prediction.objective_name
+            valid_predictions_df = prediction.get_dataframe()
+            if self.dataframe_format == DataFrameFormat.JSON:
+                # JSON encoded features don't carry the index, so predictions are indexed by position within the chunk.
+                #
+                valid_predictions_df.index = valid_predictions_df.index + chunk_start
+            valid_predictions_dfs.append(valid_predictions_df)
+        return Prediction.create_prediction_from_dataframe(
+            objective_name=predicted_objective_name,
+            dataframe=pd.concat(valid_predictions_dfs)
+        )
+
+    def stream_predictions(
+            self,
+            parameter_values_pandas_frames: Iterable[pd.DataFrame],
+            context_values_pandas_frames: Iterable[pd.DataFrame] = None
+    ) -> Iterator[Prediction]:
+        """ Yields a Prediction for each of the parameter value frames.
+
+        The frames are sent over a single stream as they are produced and predictions are received as they are consumed,
+        so that predicting over an arbitrarily large grid only takes memory for a few chunks. For optimization problems
+        with a context space, context_values_pandas_frames must yield the context for each of the parameter value frames.
+        """
+        if context_values_pandas_frames is None:
+            prediction_requests = (
+                self._make_predict_request(parameter_values_pandas_frame)
+                for parameter_values_pandas_frame
+                in parameter_values_pandas_frames
+            )
+        else:
+            prediction_requests = (
+                self._make_predict_request(parameter_values_pandas_frame, context_values_pandas_frame)
+                for parameter_values_pandas_frame, context_values_pandas_frame
+                in zip(parameter_values_pandas_frames, context_values_pandas_frames)
+            )
+        for prediction_response in self._optimizer_monitoring_stub.PredictStream(prediction_requests, metadata=self._grpc_metadata):
+            yield self._decode_prediction(prediction_response)
+
+    def _make_predict_request(self, parameter_values_pandas_frame, context_values_pandas_frame=None):
+        if self.dataframe_format == DataFrameFormat.COLUMNAR:
+            features = OptimizerMonitoringService_pb2.Features(
+                FeaturesDataFrame=DataFrameEncoder.encode_dataframe(parameter_values_pandas_frame, pb2_module=OptimizerMonitoringService_pb2)
+            )
+        else:
+            features = OptimizerMonitoringService_pb2.Features(
+                FeaturesJsonString=json.dumps(parameter_values_pandas_frame.to_dict(orient='list'))
+            )
+        return OptimizerMonitoringService_pb2.PredictRequest(
             OptimizerHandle=self.optimizer_handle_for_optimizer_monitoring_service,
-            Features=OptimizerMonitoringService_pb2.Features(
-                FeaturesJsonString=json.dumps(feature_values_dict)
+            Features=features,
+            Context=DataFrameEncoder.encode_context_dataframe(
+                context_values_pandas_frame,
+                self.dataframe_format,
+                pb2_module=OptimizerMonitoringService_pb2,
+                orient='list'
             )
         )
-        prediction_response = self._optimizer_monitoring_stub.Predict(prediction_request)
 
+    @staticmethod
+    def _decode_prediction(prediction_response) -> Prediction:
         # To be compliant with the OptimizerBase, we need to recover a single Prediction object and return it.
         #
         objective_predictions_pb2 = prediction_response.ObjectivePredictions
         assert len(objective_predictions_pb2) == 1
         only_prediction_pb2 = objective_predictions_pb2[0]
         objective_name = only_prediction_pb2.ObjectiveName
-        valid_predictions_df = Prediction.dataframe_from_json(only_prediction_pb2.PredictionDataFrameJsonString)
+        if only_prediction_pb2.HasField('PredictionDataFrame'):
+            valid_predictions_df = DataFrameDecoder.decode_dataframe(only_prediction_pb2.PredictionDataFrame)
+        else:
+            valid_predictions_df = Prediction.dataframe_from_json(only_prediction_pb2.PredictionDataFrameJsonString)
         prediction = Prediction.create_prediction_from_dataframe(objective_name=objective_name, dataframe=valid_predictions_df)
         return prediction
@@ -0,0 +1,166 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+from enum import Enum
+import json
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype
+
+from mlos.Grpc import OptimizerService_pb2
+
+
+# Key in the gRPC call metadata, under which clients state the format they want dataframes in responses to be in.
+#
+DATAFRAME_FORMAT_METADATA_KEY = "mlos-dataframe-format"
+
+
+class DataFrameFormat(Enum):
+    """ Encodings of dataframes in gRPC messages.
+
+    JSON is what all clients and servers understand. COLUMNAR packs numeric columns as raw arrays, which makes bulk
+    transfers of observations and predictions about as fast as copying memory.
+    """
+    JSON = "json"
+    COLUMNAR = "columnar"
+
+    def to_metadata(self):
+        """ Returns the gRPC call metadata with which a client asks for responses in this format.
+
+        """
+        return ((DATAFRAME_FORMAT_METADATA_KEY, self.value),)
+
+    @classmethod
+    def from_grpc_context(cls, context):
+        """ Returns the format requested by the client, defaulting to JSON for clients that don't specify one.
+
+        """
+        if context is None:
+            return cls.JSON
+        for key, value in context.invocation_metadata():
+            if key == DATAFRAME_FORMAT_METADATA_KEY:
+                try:
+                    return cls(value)
+                except ValueError:
+                    return cls.JSON
+        return cls.JSON
+
+
+class DataFrameEncoder:
+    """ Encodes dataframes into DataFrame messages.
+
+    Both OptimizerService and OptimizerMonitoringService define identical DataFrame messages, so the encoder is told which
+    one to produce.
+    """
+
+    _packed_dtypes = {
+        OptimizerService_pb2.ColumnType.FLOAT64: np.dtype('<f8'),
+        OptimizerService_pb2.ColumnType.INT64: np.dtype('<i8'),
+        OptimizerService_pb2.ColumnType.BOOL: np.dtype('?')
+    }
+
+    @staticmethod
+    def encode_dataframe(dataframe: pd.DataFrame, pb2_module=OptimizerService_pb2):
+        return pb2_module.DataFrame(
+            Index=DataFrameEncoder.encode_column(name="", values=dataframe.index.to_series(), pb2_module=pb2_module),
+            Columns=[
+                DataFrameEncoder.encode_column(name=column_name, values=dataframe[column_name], pb2_module=pb2_module)
+                for column_name in dataframe.columns
+            ]
+        )
+
+    @staticmethod
+    def encode_column(name: str, values: pd.Series, pb2_module=OptimizerService_pb2):
+        if is_bool_dtype(values.dtype):
+            column_type = pb2_module.ColumnType.BOOL
+        elif is_integer_dtype(values.dtype):
+            column_type = pb2_module.ColumnType.INT64
+        elif is_float_dtype(values.dtype):
+            column_type = pb2_module.ColumnType.FLOAT64
+        else:
+            return pb2_module.Column(
+                Name=str(name),
+                Type=pb2_module.ColumnType.JSON,
+                JsonValues=values.to_json(orient='values', double_precision=15)
+            )
+
+        packed_values = np.ascontiguousarray(values.to_numpy(), dtype=DataFrameEncoder._packed_dtypes[column_type])
+        return pb2_module.Column(Name=str(name), Type=column_type, PackedValues=packed_values.tobytes())
+
+    @staticmethod
+    def encode_context_dataframe(context_df: pd.DataFrame, dataframe_format: DataFrameFormat, pb2_module=OptimizerService_pb2, orient='index'):
+        """ Encodes context columns into a Context message. Returns None if there are no context columns.
+
+        :param context_df:
+        :param dataframe_format:
+        :param pb2_module:
+        :param orient: the orientation of the JSON string, must match what the features are encoded with.
+        :return:
+        """
+        if context_df is None or len(context_df.columns) == 0:
+            return None
+        if dataframe_format == DataFrameFormat.COLUMNAR:
+            return pb2_module.Context(ContextDataFrame=DataFrameEncoder.encode_dataframe(context_df, pb2_module=pb2_module))
+        if orient == 'index':
+            return pb2_module.Context(ContextJsonString=context_df.to_json(orient='index', double_precision=15))
+        return pb2_module.Context(ContextJsonString=json.dumps(context_df.to_dict(orient=orient)))
+
+
+class DataFrameDecoder:
+    """ Decodes DataFrame messages of either service into dataframes.
+
+    """
+
+    @staticmethod
+    def decode_dataframe(dataframe_pb2) -> pd.DataFrame:
+        index = DataFrameDecoder.decode_column(dataframe_pb2.Index) if dataframe_pb2.HasField('Index') else None
+        columns = {column_pb2.Name: DataFrameDecoder.decode_column(column_pb2) for column_pb2 in dataframe_pb2.Columns}
+        return pd.DataFrame(columns, index=index, columns=[column_pb2.Name for column_pb2 in dataframe_pb2.Columns])
+
+    @staticmethod
+    def decode_column(column_pb2):
+        if column_pb2.Type == OptimizerService_pb2.ColumnType.JSON:
+            return np.array(json.loads(column_pb2.JsonValues), dtype=object)
+        # np.frombuffer doesn't copy, the DataFrame constructor does.
+        #
+        return np.frombuffer(column_pb2.PackedValues, dtype=DataFrameEncoder._packed_dtypes[column_pb2.Type])  # pylint: disable=protected-access
+
+    @staticmethod
+    def decode_features_dataframe(features_pb2, orient='index') -> pd.DataFrame:
+        """ Decodes a Features message, whether it carries a columnar DataFrame or a JSON string.
+
+        :param features_pb2:
+        :param orient: the orientation the JSON string was produced with.
+        :return:
+        """
+        if features_pb2.HasField('FeaturesDataFrame'):
+            return DataFrameDecoder.decode_dataframe(features_pb2.FeaturesDataFrame)
+        return DataFrameDecoder._decode_json(features_pb2.FeaturesJsonString, orient)
+
+    @staticmethod
+    def decode_objective_values_dataframe(objective_values_pb2, orient='index') -> pd.DataFrame:
+        """ Decodes an ObjectiveValues message, whether it carries a columnar DataFrame or a JSON string.
+
+        """
+        if objective_values_pb2.HasField('ObjectiveValuesDataFrame'):
+            return DataFrameDecoder.decode_dataframe(objective_values_pb2.ObjectiveValuesDataFrame)
+        return DataFrameDecoder._decode_json(objective_values_pb2.ObjectiveValuesJsonString, orient)
+
+    @staticmethod
+    def decode_context_dataframe(context_pb2, orient='index'):
+        """ Decodes the context columns in a Context message. Returns None if the message carries no context.
+
+        """
+        if context_pb2.HasField('ContextDataFrame'):
+            return DataFrameDecoder.decode_dataframe(context_pb2.ContextDataFrame)
+        if context_pb2.ContextJsonString == "":
+            return None
+        return DataFrameDecoder._decode_json(context_pb2.ContextJsonString, orient)
+
+    @staticmethod
+    def _decode_json(json_string, orient):
+        if orient == 'index':
+            return pd.read_json(json_string, orient='index').sort_index()
+        return pd.DataFrame(json.loads(json_string))
@@ -11,13 +11,19 @@ from mlos.Logger import create_logger
 class OptimizerMonitor:
     """Enables monitoring optimizers existing within the OptimizerMicroservice.
 
+    Proxies returned by the monitor stream observations and predictions in chunks of at most max_rows_per_message rows,
+    so that inspecting long-running optimizers or predicting over large grids takes bounded memory.
     """
 
-    def __init__(self, grpc_channel, logger=None):
+    def __init__(self, grpc_channel, logger=None, max_rows_per_message=10000):
         self.logger = logger if logger is not None else create_logger("OptimizerMonitor")
         self._grpc_channel = grpc_channel
         self._optimizer_monitoring_stub = OptimizerMonitoringServiceStub(channel=self._grpc_channel)
-        self._optimizer_factory = BayesianOptimizerFactory(grpc_channel=self._grpc_channel, logger=self.logger)
+        self._optimizer_factory = BayesianOptimizerFactory(
+            grpc_channel=self._grpc_channel,
+            logger=self.logger,
+            max_rows_per_message=max_rows_per_message
+        )
 
     def __repr__(self):
         return f"OptimizerMonitor(grpc_channel='{self._grpc_channel._channel.target().decode()}')"  # pylint: disable=protected-access
@@ -3,14 +3,12 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 #
-import json
-
-import pandas as pd
-
 from mlos.global_values import serialize_to_bytes_string
+from mlos.Grpc.DataFrameEncoderDecoder import DataFrameDecoder, DataFrameEncoder, DataFrameFormat
+from mlos.Grpc import OptimizerMonitoringService_pb2
 from mlos.Grpc.OptimizerMonitoringService_pb2_grpc import OptimizerMonitoringServiceServicer
 from mlos.Grpc.OptimizerMonitoringService_pb2 import OptimizerConvergenceState, OptimizerList, PredictResponse, SingleObjectivePrediction, Empty, \
-    OptimizerInfo, OptimizerHandle, Observations, Features, ObjectiveValues, SimpleBoolean, SimpleString
+    OptimizerInfo, OptimizerHandle, Observations, Features, ObjectiveValues, SimpleBoolean, SimpleInteger, SimpleString
 from mlos.Grpc.OptimizerMonitoringServiceEncoderDecoder import OptimizerMonitoringServiceEncoder
 from mlos.MlosOptimizationServices.BayesianOptimizerStore.BayesianOptimizerStoreBase import BayesianOptimizerStoreBase
 from mlos.Optimizers.RegressionModels.Prediction import Prediction
@@ -25,6 +23,10 @@ class OptimizerMonitoringService(OptimizerMonitoringServiceServicer):
 
     """
 
+    # Upper bound on the number of rows in a single message of a streamed response.
+    #
+    max_rows_per_chunk = 10000
+
     def __init__(self, bayesian_optimizer_store: BayesianOptimizerStoreBase, logger=None):
         self._bayesian_optimizer_store = bayesian_optimizer_store
         if logger is None:
@@ -33,11 +35,12 @@ class OptimizerMonitoringService(OptimizerMonitoringServiceServicer):
 
     def ListExistingOptimizers(self, request: Empty, context):
         optimizers_info = []
-        for optimizer_id, optimizer in self._bayesian_optimizer_store.list_optimizers():
+        for optimizer_id in self._bayesian_optimizer_store.list_optimizer_ids():
+            optimizer_config, optimization_problem = self._bayesian_optimizer_store.describe_optimizer(optimizer_id)
             optimizers_info.append(OptimizerInfo(
                 OptimizerHandle=OptimizerHandle(Id=optimizer_id),
-                OptimizerConfigJsonString=optimizer.optimizer_config.to_json(),
-                OptimizationProblem=OptimizerMonitoringServiceEncoder.encode_optimization_problem(optimizer.optimization_problem)
+                OptimizerConfigJsonString=optimizer_config.to_json(),
+                OptimizationProblem=OptimizerMonitoringServiceEncoder.encode_optimization_problem(optimization_problem)
             ))
         return OptimizerList(Optimizers=optimizers_info)
 
@@ -45,15 +48,15 @@ class OptimizerMonitoringService(OptimizerMonitoringServiceServicer):
         # TODO: Learn about and leverage gRPC's error handling model for a case
         # TODO: when the handle is invalid.
         optimizer_id = request.Id
-        optimizer = self._bayesian_optimizer_store.get_optimizer(optimizer_id)
+        optimizer_config, optimization_problem = self._bayesian_optimizer_store.describe_optimizer(optimizer_id)
         return OptimizerInfo(
             OptimizerHandle=OptimizerHandle(Id=request.Id),
-            OptimizerConfigJsonString=optimizer.optimizer_config.to_json(),
-            OptimizationProblem=OptimizerMonitoringServiceEncoder.encode_optimization_problem(optimizer.optimization_problem)
+            OptimizerConfigJsonString=optimizer_config.to_json(),
+            OptimizationProblem=OptimizerMonitoringServiceEncoder.encode_optimization_problem(optimization_problem)
         )
 
     def GetOptimizerConvergenceState(self, request, context):
-        with self._bayesian_optimizer_store.exclusive_optimizer(optimizer_id=request.Id) as optimizer:
+        with self._bayesian_optimizer_store.shared_optimizer(optimizer_id=request.Id) as optimizer:
             serialized_convergence_state = serialize_to_bytes_string(optimizer.get_optimizer_convergence_state())
 
         return OptimizerConvergenceState(
@@ -62,32 +65,112 @@ class OptimizerMonitoringService(OptimizerMonitoringServiceServicer):
         )
 
     def IsTrained(self, request, context): # pylint: disable=unused-argument
-        with self._bayesian_optimizer_store.exclusive_optimizer(optimizer_id=request.Id) as optimizer:
-            is_trained = optimizer.trained
-        return SimpleBoolean(Value=is_trained)
+        snapshot = self._bayesian_optimizer_store.get_optimizer_snapshot(optimizer_id=request.Id)
+        return SimpleBoolean(Value=snapshot.trained)
 
     def ComputeGoodnessOfFitMetrics(self, request, context):
-        with self._bayesian_optimizer_store.exclusive_optimizer(optimizer_id=request.Id) as optimizer:
+        with self._bayesian_optimizer_store.shared_optimizer(optimizer_id=request.Id) as optimizer:
             gof_metrics = optimizer.compute_surrogate_model_goodness_of_fit()
         return SimpleString(Value=gof_metrics.to_json())
 
-    def GetAllObservations(self, request, context): # pylint: disable=unused-argument
-        with self._bayesian_optimizer_store.exclusive_optimizer(optimizer_id=request.Id) as optimizer:
-            features_df, objectives_df, _ = optimizer.get_all_observations()
+    def GetNumObservations(self, request, context): # pylint: disable=unused-argument
+        snapshot = self._bayesian_optimizer_store.get_optimizer_snapshot(optimizer_id=request.Id)
+        return SimpleInteger(Value=len(snapshot.features_df.index))
+
+    def GetAllObservations(self, request, context):
+        snapshot = self._bayesian_optimizer_store.get_optimizer_snapshot(optimizer_id=request.Id)
+        features_df, objectives_df, context_df = snapshot.get_all_observations()
+
+        return self.encode_observations(features_df, objectives_df, DataFrameFormat.from_grpc_context(context), context_df=context_df)
+
+    def GetAllObservationsStream(self, request, context):
+        """ Streams all observations in chunks of at most request.MaxRowsPerChunk rows.
+
+        At least one chunk is sent, even if there are no observations, so that the client learns the column names.
+        """
+        snapshot = self._bayesian_optimizer_store.get_optimizer_snapshot(optimizer_id=request.OptimizerHandle.Id)
+        features_df, objectives_df, context_df = snapshot.get_all_observations()
+
+        max_rows_per_chunk = self.max_rows_per_chunk
+        if 0 < request.MaxRowsPerChunk < max_rows_per_chunk:
+            max_rows_per_chunk = request.MaxRowsPerChunk
+
+        # The generator is only advanced as the transport's flow control lets messages out, so slow clients don't make
+        # the server encode chunks ahead of them.
+        #
+        yield from self.encode_observations_in_chunks(
+            features_df=features_df,
+            objectives_df=objectives_df,
+            max_rows_per_chunk=max_rows_per_chunk,
+            dataframe_format=DataFrameFormat.from_grpc_context(context),
+            context_df=context_df
+        )
+
+    @staticmethod
+    def encode_observations_in_chunks(features_df, objectives_df, max_rows_per_chunk: int, dataframe_format: DataFrameFormat, context_df=None):
+        for chunk_start in range(0, max(len(features_df.index), 1), max_rows_per_chunk):
+            chunk_end = chunk_start + max_rows_per_chunk
+            yield OptimizerMonitoringService.encode_observations(
+                features_df=features_df.iloc[chunk_start:chunk_end],
+                objectives_df=objectives_df.iloc[chunk_start:chunk_end],
+                dataframe_format=dataframe_format,
+                context_df=context_df.iloc[chunk_start:chunk_end] if context_df is not None else None
+            )
+
+    @staticmethod
+    def encode_observations(features_df, objectives_df, dataframe_format: DataFrameFormat, context_df=None) -> Observations:
+        """ Encodes observations, with their context columns if context_df has any.
+
+        """
+        encoded_context = DataFrameEncoder.encode_context_dataframe(context_df, dataframe_format, pb2_module=OptimizerMonitoringService_pb2)
+        if dataframe_format == DataFrameFormat.COLUMNAR:
+            return Observations(
+                Features=Features(FeaturesDataFrame=DataFrameEncoder.encode_dataframe(features_df, pb2_module=OptimizerMonitoringService_pb2)),
+                ObjectiveValues=ObjectiveValues(
+                    ObjectiveValuesDataFrame=DataFrameEncoder.encode_dataframe(objectives_df, pb2_module=OptimizerMonitoringService_pb2)
+                ),
+                Context=encoded_context
+            )
 
         return Observations(
             Features=Features(FeaturesJsonString=features_df.to_json(orient='index', double_precision=15)),
-            ObjectiveValues=ObjectiveValues(ObjectiveValuesJsonString=objectives_df.to_json(orient='index', double_precision=15))
+            ObjectiveValues=ObjectiveValues(ObjectiveValuesJsonString=objectives_df.to_json(orient='index', double_precision=15)),
+            Context=encoded_context
         )
 
-    def Predict(self, request, context): # pylint: disable=unused-argument
+    def Predict(self, request, context):
+        return self._predict(request, DataFrameFormat.from_grpc_context(context))
 
-        features_dict = json.loads(request.Features.FeaturesJsonString)
-        features_df = pd.DataFrame(features_dict)
-        with self._bayesian_optimizer_store.exclusive_optimizer(optimizer_id=request.OptimizerHandle.Id) as optimizer:
-            prediction = optimizer.predict(features_df)
+    def PredictStream(self, request_iterator, context):
+        """ Responds to each chunk of features with the predictions for it.
+
+        Each chunk is predicted as soon as it arrives, and the optimizer is only share-locked for the duration of a single chunk.
+        """
+        dataframe_format = DataFrameFormat.from_grpc_context(context)
+        for request in request_iterator:
+            yield self._predict(request, dataframe_format)
+
+    def _predict(self, request, dataframe_format: DataFrameFormat) -> PredictResponse:
+        features_df = DataFrameDecoder.decode_features_dataframe(request.Features, orient='list')
+        context_df = DataFrameDecoder.decode_context_dataframe(request.Context, orient='list')
+        with self._bayesian_optimizer_store.shared_optimizer(optimizer_id=request.OptimizerHandle.Id) as optimizer:
+            prediction = optimizer.predict(features_df, context_values_pandas_frame=context_df)
+        return self.encode_prediction(prediction, dataframe_format)
+
+    @staticmethod
+    def encode_prediction(prediction: Prediction, dataframe_format: DataFrameFormat) -> PredictResponse:
         assert isinstance(prediction, Prediction)
 
+        if dataframe_format == DataFrameFormat.COLUMNAR:
+            return PredictResponse(
+                ObjectivePredictions=[
+                    SingleObjectivePrediction(
+                        ObjectiveName=prediction.objective_name,
+                        PredictionDataFrame=DataFrameEncoder.encode_dataframe(prediction.get_dataframe(), pb2_module=OptimizerMonitoringService_pb2)
+                    )
+                ]
+            )
+
         response = PredictResponse(
             ObjectivePredictions=[
                 SingleObjectivePrediction(
@@ -20,9 +20,45 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n*mlos/Grpc/OptimizerMonitoringService.proto\x12!mlos.optimizer_monitoring_service\"\x95\x01\n\x19OptimizerConvergenceState\x12K\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x12+\n#SerializedOptimizerConvergenceState\x18\x02 \x01(\t\"U\n\rOptimizerList\x12\x44\n\nOptimizers\x18\x01 \x03(\x0b\x32\x30.mlos.optimizer_monitoring_service.OptimizerInfo\"\x9c\x01\n\x0ePredictRequest\x12K\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x12=\n\x08\x46\x65\x61tures\x18\x02 \x01(\x0b\x32+.mlos.optimizer_monitoring_service.Features\"Y\n\x19SingleObjectivePrediction\x12\x15\n\rObjectiveName\x18\x01 \x01(\t\x12%\n\x1dPredictionDataFrameJsonString\x18\x02 \x01(\t\"m\n\x0fPredictResponse\x12Z\n\x14ObjectivePredictions\x18\x01 \x03(\x0b\x32<.mlos.optimizer_monitoring_service.SingleObjectivePrediction\"\xae\x01\n\x1aRegisterObservationRequest\x12K\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x12\x43\n\x0bObservation\x18\x02 \x01(\x0b\x32..mlos.optimizer_monitoring_service.Observation\"\xb1\x01\n\x1bRegisterObservationsRequest\x12K\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x12\x45\n\x0cObservations\x18\x02 \x01(\x0b\x32/.mlos.optimizer_monitoring_service.Observations\"\xcf\x02\n\x13OptimizationProblem\x12J\n\x0eParameterSpace\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.SimpleHypergrid\x12M\n\x0c\x43ontextSpace\x18\x02 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.SimpleHypergridH\x00\x88\x01\x01\x12J\n\x0eObjectiveSpace\x18\x03 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.SimpleHypergrid\x12@\n\nObjectives\x18\x04 \x03(\x0b\x32,.mlos.optimizer_monitoring_service.ObjectiveB\x0f\n\r_ContextSpace\"\x1d\n\x0fOptimizerHandle\x12\n\n\x02Id\x18\x01 \x01(\t\"\xd4\x01\n\rOptimizerInfo\x12K\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x12!\n\x19OptimizerConfigJsonString\x18\x02 \x01(\t\x12S\n\x13OptimizationProblem\x18\x03 \x01(\x0b\x32\x36.mlos.optimizer_monitoring_service.OptimizationProblem\"\x99\x01\n\x0bObservation\x12=\n\x08\x46\x65\x61tures\x18\x01 \x01(\x0b\x32+.mlos.optimizer_monitoring_service.Features\x12K\n\x0fObjectiveValues\x18\x02 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.ObjectiveValues\"\x9a\x01\n\x0cObservations\x12=\n\x08\x46\x65\x61tures\x18\x01 \x01(\x0b\x32+.mlos.optimizer_monitoring_service.Features\x12K\n\x0fObjectiveValues\x18\x02 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.ObjectiveValues\"&\n\x08\x46\x65\x61tures\x12\x1a\n\x12\x46\x65\x61turesJsonString\x18\x01 \x01(\t\"7\n\x17\x43onfigurationParameters\x12\x1c\n\x14ParametersJsonString\x18\x01 \x01(\t\"$\n\x07\x43ontext\x12\x19\n\x11\x43ontextJsonString\x18\x01 \x01(\t\"4\n\x0fObjectiveValues\x12!\n\x19ObjectiveValuesJsonString\x18\x01 \x01(\t\"+\n\tObjective\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x10\n\x08Minimize\x18\x02 \x01(\x08\"\x1e\n\rSimpleBoolean\x12\r\n\x05Value\x18\x01 \x01(\x08\"\x1d\n\x0cSimpleString\x12\r\n\x05Value\x18\x01 \x01(\t\"\x07\n\x05\x45mpty\"g\n\x0e\x45mptyDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12G\n\rDimensionType\x18\x02 \x01(\x0e\x32\x30.mlos.optimizer_monitoring_service.DimensionType\"e\n\x13\x43ontinuousDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0b\n\x03Min\x18\x02 \x01(\x01\x12\x0b\n\x03Max\x18\x03 \x01(\x01\x12\x12\n\nIncludeMin\x18\x04 \x01(\x08\x12\x12\n\nIncludeMax\x18\x05 \x01(\x08\";\n\x11\x44iscreteDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0b\n\x03Min\x18\x02 \x01(\x03\x12\x0b\n\x03Max\x18\x03 \x01(\x03\"}\n\x10OrdinalDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x11\n\tAscending\x18\x02 \x01(\x08\x12H\n\rOrderedValues\x18\x03 \x03(\x0b\x32\x31.mlos.optimizer_monitoring_service.PrimitiveValue\"g\n\x14\x43\x61tegoricalDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x41\n\x06Values\x18\x02 \x03(\x0b\x32\x31.mlos.optimizer_monitoring_service.PrimitiveValue\"\xa5\x01\n\x12\x43ompositeDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x43\n\tChunkType\x18\x02 \x01(\x0e\x32\x30.mlos.optimizer_monitoring_service.DimensionType\x12<\n\x06\x43hunks\x18\x03 \x03(\x0b\x32,.mlos.optimizer_monitoring_service.Dimension\"p\n\x0ePrimitiveValue\x12\x12\n\x08IntValue\x18\x01 \x01(\x03H\x00\x12\x15\n\x0b\x44oubleValue\x18\x02 \x01(\x01H\x00\x12\x13\n\tBoolValue\x18\x03 \x01(\x08H\x00\x12\x15\n\x0bStringValue\x18\x04 \x01(\tH\x00\x42\x07\n\x05Value\"\x8e\x04\n\tDimension\x12U\n\x13\x43ontinuousDimension\x18\x01 \x01(\x0b\x32\x36.mlos.optimizer_monitoring_service.ContinuousDimensionH\x00\x12Q\n\x11\x44iscreteDimension\x18\x02 \x01(\x0b\x32\x34.mlos.optimizer_monitoring_service.DiscreteDimensionH\x00\x12O\n\x10OrdinalDimension\x18\x03 \x01(\x0b\x32\x33.mlos.optimizer_monitoring_service.OrdinalDimensionH\x00\x12W\n\x14\x43\x61tegoricalDimension\x18\x04 \x01(\x0b\x32\x37.mlos.optimizer_monitoring_service.CategoricalDimensionH\x00\x12K\n\x0e\x45mptyDimension\x18\x05 \x01(\x0b\x32\x31.mlos.optimizer_monitoring_service.EmptyDimensionH\x00\x12S\n\x12\x43ompositeDimension\x18\x06 \x01(\x0b\x32\x35.mlos.optimizer_monitoring_service.CompositeDimensionH\x00\x42\x0b\n\tDimension\"\xa9\x01\n\x0fSimpleHypergrid\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12@\n\nDimensions\x18\x02 \x03(\x0b\x32,.mlos.optimizer_monitoring_service.Dimension\x12\x46\n\rGuestSubgrids\x18\x03 \x03(\x0b\x32/.mlos.optimizer_monitoring_service.GuestSubgrid\"\xa1\x01\n\x0cGuestSubgrid\x12\x43\n\x07Subgrid\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.SimpleHypergrid\x12L\n\x16\x45xternalPivotDimension\x18\x02 \x01(\x0b\x32,.mlos.optimizer_monitoring_service.Dimension\"N\n\x05Point\x12\x45\n\x0cKeyValuePair\x18\x01 \x03(\x0b\x32/.mlos.optimizer_monitoring_service.KeyValuePair\"]\n\x0cKeyValuePair\x12\x0b\n\x03Key\x18\x01 \x01(\t\x12@\n\x05Value\x18\x02 \x01(\x0b\x32\x31.mlos.optimizer_monitoring_service.DimensionValue\"\x8b\x01\n\x0e\x44imensionValue\x12@\n\x05Value\x18\x01 \x01(\x0b\x32\x31.mlos.optimizer_monitoring_service.PrimitiveValue\x12\x37\n\x05Point\x18\x02 \x01(\x0b\x32(.mlos.optimizer_monitoring_service.Point*K\n\rDimensionType\x12\x0f\n\x0b\x43\x41TEGORICAL\x10\x00\x12\x0e\n\nCONTINUOUS\x10\x01\x12\x0c\n\x08\x44ISCRETE\x10\x02\x12\x0b\n\x07ORDINAL\x10\x03\x32\xe3\x08\n\x1aOptimizerMonitoringService\x12t\n\x16ListExistingOptimizers\x12(.mlos.optimizer_monitoring_service.Empty\x1a\x30.mlos.optimizer_monitoring_service.OptimizerList\x12x\n\x10GetOptimizerInfo\x12\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x1a\x30.mlos.optimizer_monitoring_service.OptimizerInfo\x12\x90\x01\n\x1cGetOptimizerConvergenceState\x12\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x1a<.mlos.optimizer_monitoring_service.OptimizerConvergenceState\x12\x82\x01\n\x1b\x43omputeGoodnessOfFitMetrics\x12\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x1a/.mlos.optimizer_monitoring_service.SimpleString\x12q\n\tIsTrained\x12\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x1a\x30.mlos.optimizer_monitoring_service.SimpleBoolean\x12\x80\x01\n\x14RegisterObservations\x12>.mlos.optimizer_monitoring_service.RegisterObservationsRequest\x1a(.mlos.optimizer_monitoring_service.Empty\x12p\n\x07Predict\x12\x31.mlos.optimizer_monitoring_service.PredictRequest\x1a\x32.mlos.optimizer_monitoring_service.PredictResponse\x12y\n\x12GetAllObservations\x12\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x1a/.mlos.optimizer_monitoring_service.Observations\x12Z\n\x04\x45\x63ho\x12(.mlos.optimizer_monitoring_service.Empty\x1a(.mlos.optimizer_monitoring_service.Emptyb\x06proto3'
+  serialized_pb=b'\n*mlos/Grpc/OptimizerMonitoringService.proto\x12!mlos.optimizer_monitoring_service\"\x95\x01\n\x19OptimizerConvergenceState\x12K\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x12+\n#SerializedOptimizerConvergenceState\x18\x02 \x01(\t\"U\n\rOptimizerList\x12\x44\n\nOptimizers\x18\x01 \x03(\x0b\x32\x30.mlos.optimizer_monitoring_service.OptimizerInfo\"\xd9\x01\n\x0ePredictRequest\x12K\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x12=\n\x08\x46\x65\x61tures\x18\x02 \x01(\x0b\x32+.mlos.optimizer_monitoring_service.Features\x12;\n\x07\x43ontext\x18\x03 \x01(\x0b\x32*.mlos.optimizer_monitoring_service.Context\"\xa4\x01\n\x19SingleObjectivePrediction\x12\x15\n\rObjectiveName\x18\x01 \x01(\t\x12%\n\x1dPredictionDataFrameJsonString\x18\x02 \x01(\t\x12I\n\x13PredictionDataFrame\x18\x03 \x01(\x0b\x32,.mlos.optimizer_monitoring_service.DataFrame\"\x81\x01\n\x19GetAllObservationsRequest\x12K\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x12\x17\n\x0fMaxRowsPerChunk\x18\x02 \x01(\x03\"m\n\x0fPredictResponse\x12Z\n\x14ObjectivePredictions\x18\x01 \x03(\x0b\x32<.mlos.optimizer_monitoring_service.SingleObjectivePrediction\"\xae\x01\n\x1aRegisterObservationRequest\x12K\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x12\x43\n\x0bObservation\x18\x02 \x01(\x0b\x32..mlos.optimizer_monitoring_service.Observation\"\xb1\x01\n\x1bRegisterObservationsRequest\x12K\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x12\x45\n\x0cObservations\x18\x02 \x01(\x0b\x32/.mlos.optimizer_monitoring_service.Observations\"\xcf\x02\n\x13OptimizationProblem\x12J\n\x0eParameterSpace\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.SimpleHypergrid\x12M\n\x0c\x43ontextSpace\x18\x02 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.SimpleHypergridH\x00\x88\x01\x01\x12J\n\x0eObjectiveSpace\x18\x03 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.SimpleHypergrid\x12@\n\nObjectives\x18\x04 \x03(\x0b\x32,.mlos.optimizer_monitoring_service.ObjectiveB\x0f\n\r_ContextSpace\"\x1d\n\x0fOptimizerHandle\x12\n\n\x02Id\x18\x01 \x01(\t\"\xd4\x01\n\rOptimizerInfo\x12K\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x12!\n\x19OptimizerConfigJsonString\x18\x02 \x01(\t\x12S\n\x13OptimizationProblem\x18\x03 \x01(\x0b\x32\x36.mlos.optimizer_monitoring_service.OptimizationProblem\"\xd6\x01\n\x0bObservation\x12=\n\x08\x46\x65\x61tures\x18\x01 \x01(\x0b\x32+.mlos.optimizer_monitoring_service.Features\x12K\n\x0fObjectiveValues\x18\x02 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.ObjectiveValues\x12;\n\x07\x43ontext\x18\x03 \x01(\x0b\x32*.mlos.optimizer_monitoring_service.Context\"\xd7\x01\n\x0cObservations\x12=\n\x08\x46\x65\x61tures\x18\x01 \x01(\x0b\x32+.mlos.optimizer_monitoring_service.Features\x12K\n\x0fObjectiveValues\x18\x02 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.ObjectiveValues\x12;\n\x07\x43ontext\x18\x03 \x01(\x0b\x32*.mlos.optimizer_monitoring_service.Context\"o\n\x08\x46\x65\x61tures\x12\x1a\n\x12\x46\x65\x61turesJsonString\x18\x01 \x01(\t\x12G\n\x11\x46\x65\x61turesDataFrame\x18\x02 \x01(\x0b\x32,.mlos.optimizer_monitoring_service.DataFrame\"7\n\x17\x43onfigurationParameters\x12\x1c\n\x14ParametersJsonString\x18\x01 \x01(\t\"l\n\x07\x43ontext\x12\x19\n\x11\x43ontextJsonString\x18\x01 \x01(\t\x12\x46\n\x10\x43ontextDataFrame\x18\x02 \x01(\x0b\x32,.mlos.optimizer_monitoring_service.DataFrame\"\x84\x01\n\x0fObjectiveValues\x12!\n\x19ObjectiveValuesJsonString\x18\x01 \x01(\t\x12N\n\x18ObjectiveValuesDataFrame\x18\x02 \x01(\x0b\x32,.mlos.optimizer_monitoring_service.DataFrame\"\x81\x01\n\tDataFrame\x12\x38\n\x05Index\x18\x01 \x01(\x0b\x32).mlos.optimizer_monitoring_service.Column\x12:\n\x07\x43olumns\x18\x02 \x03(\x0b\x32).mlos.optimizer_monitoring_service.Column\"}\n\x06\x43olumn\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12;\n\x04Type\x18\x02 \x01(\x0e\x32-.mlos.optimizer_monitoring_service.ColumnType\x12\x14\n\x0cPackedValues\x18\x03 \x01(\x0c\x12\x12\n\nJsonValues\x18\x04 \x01(\t\"+\n\tObjective\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x10\n\x08Minimize\x18\x02 \x01(\x08\"\x1e\n\rSimpleBoolean\x12\r\n\x05Value\x18\x01 \x01(\x08\"\x1d\n\x0cSimpleString\x12\r\n\x05Value\x18\x01 \x01(\t\"\x1e\n\rSimpleInteger\x12\r\n\x05Value\x18\x01 \x01(\x03\"\x07\n\x05\x45mpty\"g\n\x0e\x45mptyDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12G\n\rDimensionType\x18\x02 \x01(\x0e\x32\x30.mlos.optimizer_monitoring_service.DimensionType\"e\n\x13\x43ontinuousDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0b\n\x03Min\x18\x02 \x01(\x01\x12\x0b\n\x03Max\x18\x03 \x01(\x01\x12\x12\n\nIncludeMin\x18\x04 \x01(\x08\x12\x12\n\nIncludeMax\x18\x05 \x01(\x08\";\n\x11\x44iscreteDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0b\n\x03Min\x18\x02 \x01(\x03\x12\x0b\n\x03Max\x18\x03 \x01(\x03\"}\n\x10OrdinalDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x11\n\tAscending\x18\x02 \x01(\x08\x12H\n\rOrderedValues\x18\x03 \x03(\x0b\x32\x31.mlos.optimizer_monitoring_service.PrimitiveValue\"g\n\x14\x43\x61tegoricalDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x41\n\x06Values\x18\x02 \x03(\x0b\x32\x31.mlos.optimizer_monitoring_service.PrimitiveValue\"\xa5\x01\n\x12\x43ompositeDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x43\n\tChunkType\x18\x02 \x01(\x0e\x32\x30.mlos.optimizer_monitoring_service.DimensionType\x12<\n\x06\x43hunks\x18\x03 \x03(\x0b\x32,.mlos.optimizer_monitoring_service.Dimension\"p\n\x0ePrimitiveValue\x12\x12\n\x08IntValue\x18\x01 \x01(\x03H\x00\x12\x15\n\x0b\x44oubleValue\x18\x02 \x01(\x01H\x00\x12\x13\n\tBoolValue\x18\x03 \x01(\x08H\x00\x12\x15\n\x0bStringValue\x18\x04 \x01(\tH\x00\x42\x07\n\x05Value\"\x8e\x04\n\tDimension\x12U\n\x13\x43ontinuousDimension\x18\x01 \x01(\x0b\x32\x36.mlos.optimizer_monitoring_service.ContinuousDimensionH\x00\x12Q\n\x11\x44iscreteDimension\x18\x02 \x01(\x0b\x32\x34.mlos.optimizer_monitoring_service.DiscreteDimensionH\x00\x12O\n\x10OrdinalDimension\x18\x03 \x01(\x0b\x32\x33.mlos.optimizer_monitoring_service.OrdinalDimensionH\x00\x12W\n\x14\x43\x61tegoricalDimension\x18\x04 \x01(\x0b\x32\x37.mlos.optimizer_monitoring_service.CategoricalDimensionH\x00\x12K\n\x0e\x45mptyDimension\x18\x05 \x01(\x0b\x32\x31.mlos.optimizer_monitoring_service.EmptyDimensionH\x00\x12S\n\x12\x43ompositeDimension\x18\x06 \x01(\x0b\x32\x35.mlos.optimizer_monitoring_service.CompositeDimensionH\x00\x42\x0b\n\tDimension\"\xa9\x01\n\x0fSimpleHypergrid\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12@\n\nDimensions\x18\x02 \x03(\x0b\x32,.mlos.optimizer_monitoring_service.Dimension\x12\x46\n\rGuestSubgrids\x18\x03 \x03(\x0b\x32/.mlos.optimizer_monitoring_service.GuestSubgrid\"\xa1\x01\n\x0cGuestSubgrid\x12\x43\n\x07Subgrid\x18\x01 \x01(\x0b\x32\x32.mlos.optimizer_monitoring_service.SimpleHypergrid\x12L\n\x16\x45xternalPivotDimension\x18\x02 \x01(\x0b\x32,.mlos.optimizer_monitoring_service.Dimension\"N\n\x05Point\x12\x45\n\x0cKeyValuePair\x18\x01 \x03(\x0b\x32/.mlos.optimizer_monitoring_service.KeyValuePair\"]\n\x0cKeyValuePair\x12\x0b\n\x03Key\x18\x01 \x01(\t\x12@\n\x05Value\x18\x02 \x01(\x0b\x32\x31.mlos.optimizer_monitoring_service.DimensionValue\"\x8b\x01\n\x0e\x44imensionValue\x12@\n\x05Value\x18\x01 \x01(\x0b\x32\x31.mlos.optimizer_monitoring_service.PrimitiveValue\x12\x37\n\x05Point\x18\x02 \x01(\x0b\x32(.mlos.optimizer_monitoring_service.Point*8\n\nColumnType\x12\x0b\n\x07\x46LOAT64\x10\x00\x12\t\n\x05INT64\x10\x01\x12\x08\n\x04\x42OOL\x10\x02\x12\x08\n\x04JSON\x10\x03*K\n\rDimensionType\x12\x0f\n\x0b\x43\x41TEGORICAL\x10\x00\x12\x0e\n\nCONTINUOUS\x10\x01\x12\x0c\n\x08\x44ISCRETE\x10\x02\x12\x0b\n\x07ORDINAL\x10\x03\x32\xe9\x0b\n\x1aOptimizerMonitoringService\x12t\n\x16ListExistingOptimizers\x12(.mlos.optimizer_monitoring_service.Empty\x1a\x30.mlos.optimizer_monitoring_service.OptimizerList\x12x\n\x10GetOptimizerInfo\x12\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x1a\x30.mlos.optimizer_monitoring_service.OptimizerInfo\x12\x90\x01\n\x1cGetOptimizerConvergenceState\x12\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x1a<.mlos.optimizer_monitoring_service.OptimizerConvergenceState\x12\x82\x01\n\x1b\x43omputeGoodnessOfFitMetrics\x12\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x1a/.mlos.optimizer_monitoring_service.SimpleString\x12q\n\tIsTrained\x12\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x1a\x30.mlos.optimizer_monitoring_service.SimpleBoolean\x12\x80\x01\n\x14RegisterObservations\x12>.mlos.optimizer_monitoring_service.RegisterObservationsRequest\x1a(.mlos.optimizer_monitoring_service.Empty\x12p\n\x07Predict\x12\x31.mlos.optimizer_monitoring_service.PredictRequest\x1a\x32.mlos.optimizer_monitoring_service.PredictResponse\x12z\n\rPredictStream\x12\x31.mlos.optimizer_monitoring_service.PredictRequest\x1a\x32.mlos.optimizer_monitoring_service.PredictResponse(\x01\x30\x01\x12z\n\x12GetNumObservations\x12\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x1a\x30.mlos.optimizer_monitoring_service.SimpleInteger\x12y\n\x12GetAllObservations\x12\x32.mlos.optimizer_monitoring_service.OptimizerHandle\x1a/.mlos.optimizer_monitoring_service.Observations\x12\x8b\x01\n\x18GetAllObservationsStream\x12<.mlos.optimizer_monitoring_service.GetAllObservationsRequest\x1a/.mlos.optimizer_monitoring_service.Observations0\x01\x12Z\n\x04\x45\x63ho\x12(.mlos.optimizer_monitoring_service.Empty\x1a(.mlos.optimizer_monitoring_service.Emptyb\x06proto3'
 )
 
+_COLUMNTYPE = _descriptor.EnumDescriptor(
+  name='ColumnType',
+  full_name='mlos.optimizer_monitoring_service.ColumnType',
+  filename=None,
+  file=DESCRIPTOR,
+  create_key=_descriptor._internal_create_key,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='FLOAT64', index=0, number=0,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+    _descriptor.EnumValueDescriptor(
+      name='INT64', index=1, number=1,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+    _descriptor.EnumValueDescriptor(
+      name='BOOL', index=2, number=2,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+    _descriptor.EnumValueDescriptor(
+      name='JSON', index=3, number=3,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+  ],
+  containing_type=None,
+  serialized_options=None,
+  serialized_start=5114,
+  serialized_end=5170,
+)
+_sym_db.RegisterEnumDescriptor(_COLUMNTYPE)
+
+ColumnType = enum_type_wrapper.EnumTypeWrapper(_COLUMNTYPE)
 _DIMENSIONTYPE = _descriptor.EnumDescriptor(
   name='DimensionType',
   full_name='mlos.optimizer_monitoring_service.DimensionType',
@@ -53,12 +89,16 @@ _DIMENSIONTYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=4206,
-  serialized_end=4281,
+  serialized_start=5172,
+  serialized_end=5247,
 )
 _sym_db.RegisterEnumDescriptor(_DIMENSIONTYPE)
 
 DimensionType = enum_type_wrapper.EnumTypeWrapper(_DIMENSIONTYPE)
+FLOAT64 = 0
+INT64 = 1
+BOOL = 2
+JSON = 3
 CATEGORICAL = 0
 CONTINUOUS = 1
 DISCRETE = 2
@@ -159,6 +199,13 @@ _PREDICTREQUEST = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='Context', full_name='mlos.optimizer_monitoring_service.PredictRequest.Context', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -172,7 +219,7 @@ _PREDICTREQUEST = _descriptor.Descriptor(
   oneofs=[
   ],
   serialized_start=321,
-  serialized_end=477,
+  serialized_end=538,
 )
 
 
@@ -198,6 +245,13 @@ _SINGLEOBJECTIVEPREDICTION = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='PredictionDataFrame', full_name='mlos.optimizer_monitoring_service.SingleObjectivePrediction.PredictionDataFrame', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -210,8 +264,47 @@ _SINGLEOBJECTIVEPREDICTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=479,
-  serialized_end=568,
+  serialized_start=541,
+  serialized_end=705,
+)
+
+
+_GETALLOBSERVATIONSREQUEST = _descriptor.Descriptor(
+  name='GetAllObservationsRequest',
+  full_name='mlos.optimizer_monitoring_service.GetAllObservationsRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='OptimizerHandle', full_name='mlos.optimizer_monitoring_service.GetAllObservationsRequest.OptimizerHandle', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='MaxRowsPerChunk', full_name='mlos.optimizer_monitoring_service.GetAllObservationsRequest.MaxRowsPerChunk', index=1,
+      number=2, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=708,
+  serialized_end=837,
 )
 
 
@@ -242,8 +335,8 @@ _PREDICTRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=570,
-  serialized_end=679,
+  serialized_start=839,
+  serialized_end=948,
 )
 
 
@@ -281,8 +374,8 @@ _REGISTEROBSERVATIONREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=682,
-  serialized_end=856,
+  serialized_start=951,
+  serialized_end=1125,
 )
 
 
@@ -320,8 +413,8 @@ _REGISTEROBSERVATIONSREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=859,
-  serialized_end=1036,
+  serialized_start=1128,
+  serialized_end=1305,
 )
 
 
@@ -378,8 +471,8 @@ _OPTIMIZATIONPROBLEM = _descriptor.Descriptor(
       create_key=_descriptor._internal_create_key,
     fields=[]),
   ],
-  serialized_start=1039,
-  serialized_end=1374,
+  serialized_start=1308,
+  serialized_end=1643,
 )
 
 
@@ -410,8 +503,8 @@ _OPTIMIZERHANDLE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1376,
-  serialized_end=1405,
+  serialized_start=1645,
+  serialized_end=1674,
 )
 
 
@@ -456,8 +549,8 @@ _OPTIMIZERINFO = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1408,
-  serialized_end=1620,
+  serialized_start=1677,
+  serialized_end=1889,
 )
 
 
@@ -483,6 +576,13 @@ _OBSERVATION = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='Context', full_name='mlos.optimizer_monitoring_service.Observation.Context', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -495,8 +595,8 @@ _OBSERVATION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1623,
-  serialized_end=1776,
+  serialized_start=1892,
+  serialized_end=2106,
 )
 
 
@@ -522,6 +622,13 @@ _OBSERVATIONS = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='Context', full_name='mlos.optimizer_monitoring_service.Observations.Context', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -534,8 +641,8 @@ _OBSERVATIONS = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1779,
-  serialized_end=1933,
+  serialized_start=2109,
+  serialized_end=2324,
 )
 
 
@@ -554,6 +661,13 @@ _FEATURES = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='FeaturesDataFrame', full_name='mlos.optimizer_monitoring_service.Features.FeaturesDataFrame', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -566,8 +680,8 @@ _FEATURES = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1935,
-  serialized_end=1973,
+  serialized_start=2326,
+  serialized_end=2437,
 )
 
 
@@ -598,8 +712,8 @@ _CONFIGURATIONPARAMETERS = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1975,
-  serialized_end=2030,
+  serialized_start=2439,
+  serialized_end=2494,
 )
 
 
@@ -618,6 +732,13 @@ _CONTEXT = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='ContextDataFrame', full_name='mlos.optimizer_monitoring_service.Context.ContextDataFrame', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -630,8 +751,8 @@ _CONTEXT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2032,
-  serialized_end=2068,
+  serialized_start=2496,
+  serialized_end=2604,
 )
 
 
@@ -650,6 +771,105 @@ _OBJECTIVEVALUES = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='ObjectiveValuesDataFrame', full_name='mlos.optimizer_monitoring_service.ObjectiveValues.ObjectiveValuesDataFrame', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2607,
+  serialized_end=2739,
+)
+
+
+_DATAFRAME = _descriptor.Descriptor(
+  name='DataFrame',
+  full_name='mlos.optimizer_monitoring_service.DataFrame',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='Index', full_name='mlos.optimizer_monitoring_service.DataFrame.Index', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='Columns', full_name='mlos.optimizer_monitoring_service.DataFrame.Columns', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2742,
+  serialized_end=2871,
+)
+
+
+_COLUMN = _descriptor.Descriptor(
+  name='Column',
+  full_name='mlos.optimizer_monitoring_service.Column',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='Name', full_name='mlos.optimizer_monitoring_service.Column.Name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='Type', full_name='mlos.optimizer_monitoring_service.Column.Type', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='PackedValues', full_name='mlos.optimizer_monitoring_service.Column.PackedValues', index=2,
+      number=3, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='JsonValues', full_name='mlos.optimizer_monitoring_service.Column.JsonValues', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -662,8 +882,8 @@ _OBJECTIVEVALUES = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2070,
-  serialized_end=2122,
+  serialized_start=2873,
+  serialized_end=2998,
 )
 
 
@@ -701,8 +921,8 @@ _OBJECTIVE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2124,
-  serialized_end=2167,
+  serialized_start=3000,
+  serialized_end=3043,
 )
 
 
@@ -733,8 +953,8 @@ _SIMPLEBOOLEAN = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2169,
-  serialized_end=2199,
+  serialized_start=3045,
+  serialized_end=3075,
 )
 
 
@@ -765,8 +985,40 @@ _SIMPLESTRING = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2201,
-  serialized_end=2230,
+  serialized_start=3077,
+  serialized_end=3106,
+)
+
+
+_SIMPLEINTEGER = _descriptor.Descriptor(
+  name='SimpleInteger',
+  full_name='mlos.optimizer_monitoring_service.SimpleInteger',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='Value', full_name='mlos.optimizer_monitoring_service.SimpleInteger.Value', index=0,
+      number=1, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3108,
+  serialized_end=3138,
 )
 
 
@@ -790,8 +1042,8 @@ _EMPTY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2232,
-  serialized_end=2239,
+  serialized_start=3140,
+  serialized_end=3147,
 )
 
 
@@ -829,8 +1081,8 @@ _EMPTYDIMENSION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2241,
-  serialized_end=2344,
+  serialized_start=3149,
+  serialized_end=3252,
 )
 
 
@@ -889,8 +1141,8 @@ _CONTINUOUSDIMENSION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2346,
-  serialized_end=2447,
+  serialized_start=3254,
+  serialized_end=3355,
 )
 
 
@@ -935,8 +1187,8 @@ _DISCRETEDIMENSION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2449,
-  serialized_end=2508,
+  serialized_start=3357,
+  serialized_end=3416,
 )
 
 
@@ -981,8 +1233,8 @@ _ORDINALDIMENSION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2510,
-  serialized_end=2635,
+  serialized_start=3418,
+  serialized_end=3543,
 )
 
 
@@ -1020,8 +1272,8 @@ _CATEGORICALDIMENSION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2637,
-  serialized_end=2740,
+  serialized_start=3545,
+  serialized_end=3648,
 )
 
 
@@ -1066,8 +1318,8 @@ _COMPOSITEDIMENSION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2743,
-  serialized_end=2908,
+  serialized_start=3651,
+  serialized_end=3816,
 )
 
 
@@ -1124,8 +1376,8 @@ _PRIMITIVEVALUE = _descriptor.Descriptor(
       create_key=_descriptor._internal_create_key,
     fields=[]),
   ],
-  serialized_start=2910,
-  serialized_end=3022,
+  serialized_start=3818,
+  serialized_end=3930,
 )
 
 
@@ -1196,8 +1448,8 @@ _DIMENSION = _descriptor.Descriptor(
       create_key=_descriptor._internal_create_key,
     fields=[]),
   ],
-  serialized_start=3025,
-  serialized_end=3551,
+  serialized_start=3933,
+  serialized_end=4459,
 )
 
 
@@ -1242,8 +1494,8 @@ _SIMPLEHYPERGRID = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3554,
-  serialized_end=3723,
+  serialized_start=4462,
+  serialized_end=4631,
 )
 
 
@@ -1281,8 +1533,8 @@ _GUESTSUBGRID = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3726,
-  serialized_end=3887,
+  serialized_start=4634,
+  serialized_end=4795,
 )
 
 
@@ -1313,8 +1565,8 @@ _POINT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3889,
-  serialized_end=3967,
+  serialized_start=4797,
+  serialized_end=4875,
 )
 
 
@@ -1352,8 +1604,8 @@ _KEYVALUEPAIR = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3969,
-  serialized_end=4062,
+  serialized_start=4877,
+  serialized_end=4970,
 )
 
 
@@ -1391,14 +1643,17 @@ _DIMENSIONVALUE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=4065,
-  serialized_end=4204,
+  serialized_start=4973,
+  serialized_end=5112,
 )
 
 _OPTIMIZERCONVERGENCESTATE.fields_by_name['OptimizerHandle'].message_type = _OPTIMIZERHANDLE
 _OPTIMIZERLIST.fields_by_name['Optimizers'].message_type = _OPTIMIZERINFO
 _PREDICTREQUEST.fields_by_name['OptimizerHandle'].message_type = _OPTIMIZERHANDLE
 _PREDICTREQUEST.fields_by_name['Features'].message_type = _FEATURES
+_PREDICTREQUEST.fields_by_name['Context'].message_type = _CONTEXT
+_SINGLEOBJECTIVEPREDICTION.fields_by_name['PredictionDataFrame'].message_type = _DATAFRAME
+_GETALLOBSERVATIONSREQUEST.fields_by_name['OptimizerHandle'].message_type = _OPTIMIZERHANDLE
 _PREDICTRESPONSE.fields_by_name['ObjectivePredictions'].message_type = _SINGLEOBJECTIVEPREDICTION
 _REGISTEROBSERVATIONREQUEST.fields_by_name['OptimizerHandle'].message_type = _OPTIMIZERHANDLE
 _REGISTEROBSERVATIONREQUEST.fields_by_name['Observation'].message_type = _OBSERVATION
@@ -1415,8 +1670,16 @@ _OPTIMIZERINFO.fields_by_name['OptimizerHandle'].message_type = _OPTIMIZERHANDLE
 _OPTIMIZERINFO.fields_by_name['OptimizationProblem'].message_type = _OPTIMIZATIONPROBLEM
 _OBSERVATION.fields_by_name['Features'].message_type = _FEATURES
 _OBSERVATION.fields_by_name['ObjectiveValues'].message_type = _OBJECTIVEVALUES
+_OBSERVATION.fields_by_name['Context'].message_type = _CONTEXT
 _OBSERVATIONS.fields_by_name['Features'].message_type = _FEATURES
 _OBSERVATIONS.fields_by_name['ObjectiveValues'].message_type = _OBJECTIVEVALUES
+_OBSERVATIONS.fields_by_name['Context'].message_type = _CONTEXT
+_FEATURES.fields_by_name['FeaturesDataFrame'].message_type = _DATAFRAME
+_CONTEXT.fields_by_name['ContextDataFrame'].message_type = _DATAFRAME
+_OBJECTIVEVALUES.fields_by_name['ObjectiveValuesDataFrame'].message_type = _DATAFRAME
+_DATAFRAME.fields_by_name['Index'].message_type = _COLUMN
+_DATAFRAME.fields_by_name['Columns'].message_type = _COLUMN
+_COLUMN.fields_by_name['Type'].enum_type = _COLUMNTYPE
 _EMPTYDIMENSION.fields_by_name['DimensionType'].enum_type = _DIMENSIONTYPE
 _ORDINALDIMENSION.fields_by_name['OrderedValues'].message_type = _PRIMITIVEVALUE
 _CATEGORICALDIMENSION.fields_by_name['Values'].message_type = _PRIMITIVEVALUE
@@ -1470,6 +1733,7 @@ DESCRIPTOR.message_types_by_name['OptimizerConvergenceState'] = _OPTIMIZERCONVER
 DESCRIPTOR.message_types_by_name['OptimizerList'] = _OPTIMIZERLIST
 DESCRIPTOR.message_types_by_name['PredictRequest'] = _PREDICTREQUEST
 DESCRIPTOR.message_types_by_name['SingleObjectivePrediction'] = _SINGLEOBJECTIVEPREDICTION
+DESCRIPTOR.message_types_by_name['GetAllObservationsRequest'] = _GETALLOBSERVATIONSREQUEST
 DESCRIPTOR.message_types_by_name['PredictResponse'] = _PREDICTRESPONSE
 DESCRIPTOR.message_types_by_name['RegisterObservationRequest'] = _REGISTEROBSERVATIONREQUEST
 DESCRIPTOR.message_types_by_name['RegisterObservationsRequest'] = _REGISTEROBSERVATIONSREQUEST
@@ -1482,9 +1746,12 @@ DESCRIPTOR.message_types_by_name['Features'] = _FEATURES
 DESCRIPTOR.message_types_by_name['ConfigurationParameters'] = _CONFIGURATIONPARAMETERS
 DESCRIPTOR.message_types_by_name['Context'] = _CONTEXT
 DESCRIPTOR.message_types_by_name['ObjectiveValues'] = _OBJECTIVEVALUES
+DESCRIPTOR.message_types_by_name['DataFrame'] = _DATAFRAME
+DESCRIPTOR.message_types_by_name['Column'] = _COLUMN
 DESCRIPTOR.message_types_by_name['Objective'] = _OBJECTIVE
 DESCRIPTOR.message_types_by_name['SimpleBoolean'] = _SIMPLEBOOLEAN
 DESCRIPTOR.message_types_by_name['SimpleString'] = _SIMPLESTRING
+DESCRIPTOR.message_types_by_name['SimpleInteger'] = _SIMPLEINTEGER
 DESCRIPTOR.message_types_by_name['Empty'] = _EMPTY
 DESCRIPTOR.message_types_by_name['EmptyDimension'] = _EMPTYDIMENSION
 DESCRIPTOR.message_types_by_name['ContinuousDimension'] = _CONTINUOUSDIMENSION
@@ -1499,6 +1766,7 @@ DESCRIPTOR.message_types_by_name['GuestSubgrid'] = _GUESTSUBGRID
 DESCRIPTOR.message_types_by_name['Point'] = _POINT
 DESCRIPTOR.message_types_by_name['KeyValuePair'] = _KEYVALUEPAIR
 DESCRIPTOR.message_types_by_name['DimensionValue'] = _DIMENSIONVALUE
+DESCRIPTOR.enum_types_by_name['ColumnType'] = _COLUMNTYPE
 DESCRIPTOR.enum_types_by_name['DimensionType'] = _DIMENSIONTYPE
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
@@ -1530,6 +1798,13 @@ SingleObjectivePrediction = _reflection.GeneratedProtocolMessageType('SingleObje
   })
 _sym_db.RegisterMessage(SingleObjectivePrediction)
 
+GetAllObservationsRequest = _reflection.GeneratedProtocolMessageType('GetAllObservationsRequest', (_message.Message,), {
+  'DESCRIPTOR' : _GETALLOBSERVATIONSREQUEST,
+  '__module__' : 'mlos.Grpc.OptimizerMonitoringService_pb2'
+  # @@protoc_insertion_point(class_scope:mlos.optimizer_monitoring_service.GetAllObservationsRequest)
+  })
+_sym_db.RegisterMessage(GetAllObservationsRequest)
+
 PredictResponse = _reflection.GeneratedProtocolMessageType('PredictResponse', (_message.Message,), {
   'DESCRIPTOR' : _PREDICTRESPONSE,
   '__module__' : 'mlos.Grpc.OptimizerMonitoringService_pb2'
@@ -1614,6 +1889,20 @@ ObjectiveValues = _reflection.GeneratedProtocolMessageType('ObjectiveValues', (_
   })
 _sym_db.RegisterMessage(ObjectiveValues)
 
+DataFrame = _reflection.GeneratedProtocolMessageType('DataFrame', (_message.Message,), {
+  'DESCRIPTOR' : _DATAFRAME,
+  '__module__' : 'mlos.Grpc.OptimizerMonitoringService_pb2'
+  # @@protoc_insertion_point(class_scope:mlos.optimizer_monitoring_service.DataFrame)
+  })
+_sym_db.RegisterMessage(DataFrame)
+
+Column = _reflection.GeneratedProtocolMessageType('Column', (_message.Message,), {
+  'DESCRIPTOR' : _COLUMN,
+  '__module__' : 'mlos.Grpc.OptimizerMonitoringService_pb2'
+  # @@protoc_insertion_point(class_scope:mlos.optimizer_monitoring_service.Column)
+  })
+_sym_db.RegisterMessage(Column)
+
 Objective = _reflection.GeneratedProtocolMessageType('Objective', (_message.Message,), {
   'DESCRIPTOR' : _OBJECTIVE,
   '__module__' : 'mlos.Grpc.OptimizerMonitoringService_pb2'
@@ -1635,6 +1924,13 @@ SimpleString = _reflection.GeneratedProtocolMessageType('SimpleString', (_messag
   })
 _sym_db.RegisterMessage(SimpleString)
 
+SimpleInteger = _reflection.GeneratedProtocolMessageType('SimpleInteger', (_message.Message,), {
+  'DESCRIPTOR' : _SIMPLEINTEGER,
+  '__module__' : 'mlos.Grpc.OptimizerMonitoringService_pb2'
+  # @@protoc_insertion_point(class_scope:mlos.optimizer_monitoring_service.SimpleInteger)
+  })
+_sym_db.RegisterMessage(SimpleInteger)
+
 Empty = _reflection.GeneratedProtocolMessageType('Empty', (_message.Message,), {
   'DESCRIPTOR' : _EMPTY,
   '__module__' : 'mlos.Grpc.OptimizerMonitoringService_pb2'
@@ -1742,8 +2038,8 @@ _OPTIMIZERMONITORINGSERVICE = _descriptor.ServiceDescriptor(
   index=0,
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_start=4284,
-  serialized_end=5407,
+  serialized_start=5250,
+  serialized_end=6763,
   methods=[
   _descriptor.MethodDescriptor(
     name='ListExistingOptimizers',
@@ -1815,20 +2111,50 @@ _OPTIMIZERMONITORINGSERVICE = _descriptor.ServiceDescriptor(
     serialized_options=None,
     create_key=_descriptor._internal_create_key,
   ),
+  _descriptor.MethodDescriptor(
+    name='PredictStream',
+    full_name='mlos.optimizer_monitoring_service.OptimizerMonitoringService.PredictStream',
+    index=7,
+    containing_service=None,
+    input_type=_PREDICTREQUEST,
+    output_type=_PREDICTRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='GetNumObservations',
+    full_name='mlos.optimizer_monitoring_service.OptimizerMonitoringService.GetNumObservations',
+    index=8,
+    containing_service=None,
+    input_type=_OPTIMIZERHANDLE,
+    output_type=_SIMPLEINTEGER,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
   _descriptor.MethodDescriptor(
     name='GetAllObservations',
     full_name='mlos.optimizer_monitoring_service.OptimizerMonitoringService.GetAllObservations',
-    index=7,
+    index=9,
     containing_service=None,
     input_type=_OPTIMIZERHANDLE,
     output_type=_OBSERVATIONS,
     serialized_options=None,
     create_key=_descriptor._internal_create_key,
   ),
+  _descriptor.MethodDescriptor(
+    name='GetAllObservationsStream',
+    full_name='mlos.optimizer_monitoring_service.OptimizerMonitoringService.GetAllObservationsStream',
+    index=10,
+    containing_service=None,
+    input_type=_GETALLOBSERVATIONSREQUEST,
+    output_type=_OBSERVATIONS,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
   _descriptor.MethodDescriptor(
     name='Echo',
     full_name='mlos.optimizer_monitoring_service.OptimizerMonitoringService.Echo',
-    index=8,
+    index=11,
     containing_service=None,
     input_type=_EMPTY,
     output_type=_EMPTY,
@@ -51,11 +51,26 @@ class OptimizerMonitoringServiceStub(object):
                 request_serializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.PredictRequest.SerializeToString,
                 response_deserializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.PredictResponse.FromString,
                 )
+        self.PredictStream = channel.stream_stream(
+                '/mlos.optimizer_monitoring_service.OptimizerMonitoringService/PredictStream',
+                request_serializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.PredictRequest.SerializeToString,
+                response_deserializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.PredictResponse.FromString,
+                )
+        self.GetNumObservations = channel.unary_unary(
+                '/mlos.optimizer_monitoring_service.OptimizerMonitoringService/GetNumObservations',
+                request_serializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.OptimizerHandle.SerializeToString,
+                response_deserializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.SimpleInteger.FromString,
+                )
         self.GetAllObservations = channel.unary_unary(
                 '/mlos.optimizer_monitoring_service.OptimizerMonitoringService/GetAllObservations',
                 request_serializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.OptimizerHandle.SerializeToString,
                 response_deserializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.Observations.FromString,
                 )
+        self.GetAllObservationsStream = channel.unary_stream(
+                '/mlos.optimizer_monitoring_service.OptimizerMonitoringService/GetAllObservationsStream',
+                request_serializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.GetAllObservationsRequest.SerializeToString,
+                response_deserializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.Observations.FromString,
+                )
         self.Echo = channel.unary_unary(
                 '/mlos.optimizer_monitoring_service.OptimizerMonitoringService/Echo',
                 request_serializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.Empty.SerializeToString,
@@ -124,6 +139,23 @@ class OptimizerMonitoringServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PredictStream(self, request_iterator, context):
+        """Produces predictions for features streamed in chunks. The server responds to each chunk with predictions for that
+        chunk, so neither side has to hold more than a few chunks at a time.
+        
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetNumObservations(self, request, context):
+        """Returns the number of observations registered for a given optimizer.
+        
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetAllObservations(self, request, context):
         """Returns all observations registered for a given optimizer.
         
@@ -132,6 +164,14 @@ class OptimizerMonitoringServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetAllObservationsStream(self, request, context):
+        """Returns all observations registered for a given optimizer in chunks of at most MaxRowsPerChunk rows.
+        
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Echo(self, request, context):
         """Like ping.
         
@@ -178,11 +218,26 @@ def add_OptimizerMonitoringServiceServicer_to_server(servicer, server):
                     request_deserializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.PredictRequest.FromString,
                     response_serializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.PredictResponse.SerializeToString,
             ),
+            'PredictStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.PredictStream,
+                    request_deserializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.PredictRequest.FromString,
+                    response_serializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.PredictResponse.SerializeToString,
+            ),
+            'GetNumObservations': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetNumObservations,
+                    request_deserializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.OptimizerHandle.FromString,
+                    response_serializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.SimpleInteger.SerializeToString,
+            ),
             'GetAllObservations': grpc.unary_unary_rpc_method_handler(
                     servicer.GetAllObservations,
                     request_deserializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.OptimizerHandle.FromString,
                     response_serializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.Observations.SerializeToString,
             ),
+            'GetAllObservationsStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetAllObservationsStream,
+                    request_deserializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.GetAllObservationsRequest.FromString,
+                    response_serializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.Observations.SerializeToString,
+            ),
             'Echo': grpc.unary_unary_rpc_method_handler(
                     servicer.Echo,
                     request_deserializer=mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.Empty.FromString,
@@ -319,6 +374,40 @@ class OptimizerMonitoringService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def PredictStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/mlos.optimizer_monitoring_service.OptimizerMonitoringService/PredictStream',
+            mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.PredictRequest.SerializeToString,
+            mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.PredictResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetNumObservations(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlos.optimizer_monitoring_service.OptimizerMonitoringService/GetNumObservations',
+            mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.OptimizerHandle.SerializeToString,
+            mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.SimpleInteger.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def GetAllObservations(request,
             target,
@@ -336,6 +425,23 @@ class OptimizerMonitoringService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def GetAllObservationsStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/mlos.optimizer_monitoring_service.OptimizerMonitoringService/GetAllObservationsStream',
+            mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.GetAllObservationsRequest.SerializeToString,
+            mlos_dot_Grpc_dot_OptimizerMonitoringService__pb2.Observations.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def Echo(request,
             target,
@@ -0,0 +1,249 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+from typing import Iterable, Tuple
+from uuid import uuid4
+
+from mlos.Exceptions import OptimizerQueueFullException, OptimizerWorkerLostException
+import mlos.global_values as global_values
+from mlos.Logger import create_logger
+from mlos.Optimizers.BayesianOptimizer import BayesianOptimizer
+from mlos.Optimizers.OptimizationProblem import OptimizationProblem
+from mlos.Spaces import Point
+
+
+class OptimizerRecord:
+    """ What the front end knows about an optimizer without asking its worker.
+
+    The optimization problem and config never change, and trained and num_observations are refreshed after every call
+    to the worker, so cheap requests can be answered from the record alone.
+    """
+
+    def __init__(self, optimizer_id: str, optimization_problem: OptimizationProblem, optimizer_config: Point, worker_index: int):
+        self.optimizer_id = optimizer_id
+        self.optimization_problem = optimization_problem
+        self.optimizer_config = optimizer_config
+        self.worker_index = worker_index
+        self.trained = False
+        self.num_observations = 0
+        self.work_queue = None
+
+
+class OptimizerWorkQueue:
+    """ Runs calls to a single optimizer one at a time, in the order they were submitted, on the optimizer's worker.
+
+    The queue is bounded so that a burst of requests for one optimizer fails fast instead of piling up latency for
+    everyone behind it.
+    """
+
+    def __init__(self, executor: ProcessPoolExecutor, max_queued_calls: int):
+        self.executor = executor
+        self._queue = asyncio.Queue(maxsize=max_queued_calls)
+        self._running_call_future = None
+        self._consumer_task = asyncio.get_event_loop().create_task(self._consume())
+
+    async def submit(self, function, *args):
+        """ Runs function(*args) on the worker once all previously submitted calls are done and returns its result.
+
+        :raises OptimizerQueueFullException: if max_queued_calls calls are already waiting.
+        """
+        future = asyncio.get_event_loop().create_future()
+        try:
+            self._queue.put_nowait((function, args, future))
+        except asyncio.QueueFull:
+            raise OptimizerQueueFullException(f"{self._queue.maxsize} requests are already waiting for this optimizer.")
+        return await future
+
+    def close(self, exception: Exception = None):
+        """ Stops running calls. Calls that haven't completed fail with exception or, if it is None, are cancelled.
+
+        """
+        self._consumer_task.cancel()
+        pending_futures = [self._running_call_future] if self._running_call_future is not None else []
+        while not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            pending_futures.append(future)
+        for future in pending_futures:
+            if future.done():
+                continue
+            if exception is None:
+                future.cancel()
+            else:
+                future.set_exception(exception)
+
+    async def _consume(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            function, args, future = await self._queue.get()
+            if future.cancelled():
+                # The client gave up while the call was queued.
+                #
+                continue
+            self._running_call_future = future
+            try:
+                result = await loop.run_in_executor(self.executor, function, *args)
+            except Exception as e:  # pylint: disable=broad-except
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            self._running_call_future = None
+
+
+class OptimizerProcessPool:
+    """ Hosts optimizers in worker processes and serializes the work for each of them.
+
+    Every optimizer is owned by exactly one worker process, which keeps it in memory for its whole life. Suggestions
+    advance the optimizer's random state, so the worker's copy is the only one that is kept up to date; the front end
+    only keeps an OptimizerRecord for each optimizer. Calls to an optimizer go through its OptimizerWorkQueue, so they
+    never overlap, while calls to optimizers owned by different workers run in parallel without sharing a GIL.
+
+    New optimizers go to the worker that owns the fewest optimizers.
+
+    If a worker process dies, its optimizers are lost with it: the worker is replaced by a fresh process and the
+    records of its optimizers are dropped, so that clients can recreate them.
+
+    Parameters
+    ----------
+    num_workers : int, default=None
+        Number of worker processes. Defaults to the number of CPUs.
+
+    max_queued_calls_per_optimizer : int, default=100
+        How many calls can be waiting for a single optimizer before new ones are rejected.
+
+    logger : logger, default=None
+        Logger to use. By default, a new logger is created internally.
+    """
+
+    def __init__(self, num_workers=None, max_queued_calls_per_optimizer=100, logger=None):
+        if logger is None:
+            logger = create_logger(self.__class__.__name__)
+        self.logger = logger
+
+        self.num_workers = num_workers if num_workers is not None else os.cpu_count()
+        self.max_queued_calls_per_optimizer = max_queued_calls_per_optimizer
+        self._executors = []
+        self._num_optimizers_by_worker = [0] * self.num_workers
+        self._records_by_optimizer_id = dict()
+
+    def start(self):
+        """ Starts the worker processes.
+
+        Workers are spawned rather than forked, and all of them are started right away: forking a process once gRPC's
+        threads are running is not safe.
+        """
+        assert not self._executors, "Already started."
+        self._executors = [self._create_executor() for _ in range(self.num_workers)]
+        for executor in self._executors:
+            executor.submit(_initialize_worker).result()
+        self.logger.info(f"Started {self.num_workers} optimizer worker processes.")
+
+    def shutdown(self):
+        for record in self._records_by_optimizer_id.values():
+            if record.work_queue is not None:
+                record.work_queue.close()
+        for executor in self._executors:
+            executor.shutdown(wait=False)
+        self._executors = []
+
+    def get_optimizer_record(self, optimizer_id: str) -> OptimizerRecord:
+        """ Returns the record for the optimizer.
+
+        :raises KeyError: if there is no such optimizer.
+        """
+        return self._records_by_optimizer_id[optimizer_id]
+
+    def list_optimizers(self) -> Iterable[Tuple[str, OptimizerRecord]]:
+        return list(self._records_by_optimizer_id.items())
+
+    async def create_optimizer(self, optimization_problem: OptimizationProblem, optimizer_config: Point) -> OptimizerRecord:
+        optimizer_id = str(uuid4())
+        worker_index = min(range(self.num_workers), key=lambda index: self._num_optimizers_by_worker[index])
+        record = OptimizerRecord(
+            optimizer_id=optimizer_id,
+            optimization_problem=optimization_problem,
+            optimizer_config=optimizer_config,
+            worker_index=worker_index
+        )
+        record.work_queue = OptimizerWorkQueue(executor=self._executors[worker_index], max_queued_calls=self.max_queued_calls_per_optimizer)
+        try:
+            await record.work_queue.submit(_create_optimizer, optimizer_id, optimization_problem, optimizer_config)
+        except BrokenProcessPool as e:
+            record.work_queue.close()
+            self._replace_worker(worker_index, broken_executor=record.work_queue.executor)
+            raise OptimizerWorkerLostException(f"Optimizer worker {worker_index} died while creating optimizer {optimizer_id}.") from e
+
+        self._num_optimizers_by_worker[worker_index] += 1
+        self._records_by_optimizer_id[optimizer_id] = record
+        self.logger.info(f"Created optimizer {optimizer_id} on worker {worker_index}.")
+        return record
+
+    async def call(self, optimizer_id: str, method_name: str, *args, **kwargs):
+        """ Calls the named method of the optimizer on its worker and returns the result.
+
+        :raises KeyError: if there is no such optimizer.
+        :raises OptimizerQueueFullException: if too many calls are already waiting for the optimizer.
+        :raises OptimizerWorkerLostException: if the optimizer's worker died. The optimizer is gone, but the worker is replaced.
+        """
+        record = self._records_by_optimizer_id[optimizer_id]
+        try:
+            result, record.trained, record.num_observations = await record.work_queue.submit(_call_optimizer_method, optimizer_id, method_name, args, kwargs)
+        except BrokenProcessPool as e:
+            self._replace_worker(record.worker_index, broken_executor=record.work_queue.executor)
+            raise OptimizerWorkerLostException(f"Optimizer worker {record.worker_index} hosting optimizer {optimizer_id} died.") from e
+        return result
+
+    def _replace_worker(self, worker_index: int, broken_executor: ProcessPoolExecutor):
+        """ Replaces a dead worker with a fresh process and forgets the optimizers it owned.
+
+        Calls to the worker's other optimizers that are still queued or running fail with OptimizerWorkerLostException.
+        """
+        if self._executors[worker_index] is not broken_executor:
+            return
+
+        self.logger.error(f"Optimizer worker {worker_index} died. Starting a new one.")
+        lost_optimizer_ids = [optimizer_id for optimizer_id, record in self._records_by_optimizer_id.items() if record.worker_index == worker_index]
+        for optimizer_id in lost_optimizer_ids:
+            record = self._records_by_optimizer_id.pop(optimizer_id)
+            record.work_queue.close(exception=OptimizerWorkerLostException(f"Optimizer worker {worker_index} hosting optimizer {optimizer_id} died."))
+        if lost_optimizer_ids:
+            self.logger.error(f"Lost optimizers: {', '.join(lost_optimizer_ids)}.")
+        self._num_optimizers_by_worker[worker_index] = 0
+
+        broken_executor.shutdown(wait=False)
+        self._executors[worker_index] = self._create_executor()
+
+    @staticmethod
+    def _create_executor() -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'), initializer=_initialize_worker)
+
+
+# Everything below runs in the worker processes.
+#
+# Optimizers owned by this worker, keyed by their ids.
+#
+_worker_optimizers_by_id = dict()
+
+
+def _initialize_worker():
+    global_values.declare_singletons()
+
+
+def _create_optimizer(optimizer_id, optimization_problem, optimizer_config):
+    _worker_optimizers_by_id[optimizer_id] = BayesianOptimizer(
+        optimization_problem=optimization_problem,
+        optimizer_config=optimizer_config
+    )
+
+
+def _call_optimizer_method(optimizer_id, method_name, args, kwargs):
+    optimizer = _worker_optimizers_by_id[optimizer_id]
+    result = getattr(optimizer, method_name)(*args, **kwargs)
+    return result, optimizer.trained, optimizer.num_observed_samples
@@ -7,9 +7,12 @@ import json
 
 import pandas as pd
 
-from mlos.Grpc.OptimizerService_pb2 import CreateOptimizerRequest, ConfigurationParameters, Empty, OptimizerHandle, OptimizerInfo
+from mlos.Grpc.DataFrameEncoderDecoder import DataFrameDecoder
+from mlos.Grpc.OptimizerService_pb2 import CreateOptimizerRequest, ConfigurationParameters, ConfigurationParametersBatch, Empty, OptimizerHandle, \
+    OptimizerInfo
 from mlos.Grpc.OptimizerService_pb2_grpc import OptimizerServiceServicer
 from mlos.Grpc.OptimizerServiceEncoderDecoder import OptimizerServiceDecoder, OptimizerServiceEncoder
+from mlos.Grpc.SuggestionPrefetcher import SuggestionPrefetcher
 from mlos.MlosOptimizationServices.BayesianOptimizerStore.BayesianOptimizerStoreBase import BayesianOptimizerStoreBase
 from mlos.Optimizers.BayesianOptimizer import BayesianOptimizer, bayesian_optimizer_config_store
 from mlos.Spaces import Point
@@ -22,10 +25,14 @@ class OptimizerService(OptimizerServiceServicer):
 
     The state of the microservice will be persisted in a DB. Until then we use local variables.
 
+    If a SuggestionPrefetcher is provided, non-random suggestions without context are served from its queues whenever
+    they are ready.
+
     """
 
-    def __init__(self, bayesian_optimizer_store: BayesianOptimizerStoreBase, logger=None):
+    def __init__(self, bayesian_optimizer_store: BayesianOptimizerStoreBase, logger=None, suggestion_prefetcher: SuggestionPrefetcher = None):
         self._bayesian_optimizer_store = bayesian_optimizer_store
+        self._suggestion_prefetcher = suggestion_prefetcher
         if logger is None:
             logger = create_logger(self.__class__.__name__)
         self.logger = logger
@@ -46,6 +53,8 @@ class OptimizerService(OptimizerServiceServicer):
 
         optimizer_id = self._bayesian_optimizer_store.get_next_optimizer_id()
         self._bayesian_optimizer_store.add_optimizer(optimizer_id=optimizer_id, optimizer=optimizer)
+        if self._suggestion_prefetcher is not None:
+            self._suggestion_prefetcher.request_refill(optimizer_id)
 
         self.logger.info(f"Created optimizer {optimizer_id} with config: {optimizer.optimizer_config.to_json(indent=2)}")
         return OptimizerHandle(Id=optimizer_id)
@@ -54,11 +63,11 @@ class OptimizerService(OptimizerServiceServicer):
         # TODO: Learn about and leverage gRPC's error handling model for a case
         # TODO: when the handle is invalid.
         optimizer_id = request.Id
-        optimizer = self._bayesian_optimizer_store.get_optimizer(optimizer_id)
+        optimizer_config, optimization_problem = self._bayesian_optimizer_store.describe_optimizer(optimizer_id)
         return OptimizerInfo(
             OptimizerHandle=OptimizerHandle(Id=request.Id),
-            OptimizerConfigJsonString=optimizer.optimizer_config.to_json(),
-            OptimizationProblem=OptimizerServiceEncoder.encode_optimization_problem(optimizer.optimization_problem)
+            OptimizerConfigJsonString=optimizer_config.to_json(),
+            OptimizationProblem=OptimizerServiceEncoder.encode_optimization_problem(optimization_problem)
         )
 
     def Suggest(self, request, context): # pylint: disable=unused-argument
@@ -66,42 +75,132 @@ class OptimizerService(OptimizerServiceServicer):
 
         # TODO: return an error if optimizer not found
         #
-        if request.Context.ContextJsonString != "":
-            raise NotImplementedError("Context not currently supported in remote optimizers")
-        with self._bayesian_optimizer_store.exclusive_optimizer(optimizer_id=request.OptimizerHandle.Id) as optimizer:
-            # TODO handle context here
-            suggested_params = optimizer.suggest(random=request.Random)
+        suggested_params = self._suggest(
+            optimizer_id=request.OptimizerHandle.Id,
+            random=request.Random,
+            context=OptimizerServiceDecoder.decode_context(request.Context),
+            num_suggestions=1
+        )[0]
 
         return ConfigurationParameters(
             ParametersJsonString=json.dumps(suggested_params.to_dict())
         )
 
-    def RegisterObservation(self, request, context): # pylint: disable=unused-argument
-        # TODO: add an API to register observations in bulk.
-        # TODO: stop ignoring context
-        #
-        feature_values = json.loads(request.Observation.Features.FeaturesJsonString)
-        feature_values_dataframe = pd.DataFrame(feature_values, index=[0])
+    def SuggestBatch(self, request, context): # pylint: disable=unused-argument
+        self.logger.info(f"Suggesting {request.NumSuggestions} configurations")
+
+        if request.NumSuggestions == 0:
+            raise ValueError("NumSuggestions must be positive.")
+        suggestions = self._suggest(
+            optimizer_id=request.OptimizerHandle.Id,
+            random=request.Random,
+            context=OptimizerServiceDecoder.decode_context(request.Context),
+            num_suggestions=request.NumSuggestions
+        )
+
+        return ConfigurationParametersBatch(
+            Configurations=[
+                ConfigurationParameters(ParametersJsonString=json.dumps(suggested_params.to_dict()))
+                for suggested_params in suggestions
+            ]
+        )
+
+    def _suggest(self, optimizer_id, random, context, num_suggestions):
+        """ Returns num_suggestions suggestions, taking as many as are ready from the prefetcher and computing the rest.
 
-        objective_values = json.loads(request.Observation.ObjectiveValues.ObjectiveValuesJsonString)
-        objective_values_dataframe = pd.DataFrame(objective_values, index=[0])
+        Prefetched suggestions are never random and have no context, so other requests always compute their suggestions.
+        """
+        suggestions = []
+        if self._suggestion_prefetcher is not None and not random and context is None:
+            suggestions = self._suggestion_prefetcher.take_suggestions(optimizer_id=optimizer_id, max_num_suggestions=num_suggestions)
 
-        with self._bayesian_optimizer_store.exclusive_optimizer(optimizer_id=request.OptimizerHandle.Id) as optimizer:
-            optimizer.register(parameter_values_pandas_frame=feature_values_dataframe, target_values_pandas_frame=objective_values_dataframe)
+        if len(suggestions) < num_suggestions:
+            with self._bayesian_optimizer_store.exclusive_optimizer(optimizer_id=optimizer_id) as optimizer:
+                suggestions.extend(optimizer.suggest(random=random, context=context) for _ in range(num_suggestions - len(suggestions)))
+        return suggestions
 
+    def RegisterObservation(self, request, context): # pylint: disable=unused-argument
+        features_df, objectives_df, context_df = self.decode_observation(request.Observation)
+        self._register(optimizer_id=request.OptimizerHandle.Id, features_df=features_df, objectives_df=objectives_df, context_df=context_df)
         return Empty()
 
     def RegisterObservations(self, request, context): # pylint: disable=unused-argument
-        # TODO: stop ignoring context
-        #
-        observations = request.Observations
-        features_df = pd.read_json(observations.Features.FeaturesJsonString, orient='index').sort_index()
-        objectives_df = pd.read_json(observations.ObjectiveValues.ObjectiveValuesJsonString, orient='index').sort_index()
-
-        with self._bayesian_optimizer_store.exclusive_optimizer(optimizer_id=request.OptimizerHandle.Id) as optimizer:
-            optimizer.register(parameter_values_pandas_frame=features_df, target_values_pandas_frame=objectives_df)
+        features_df, objectives_df, context_df = self.decode_observations(request.Observations)
+        self._register(optimizer_id=request.OptimizerHandle.Id, features_df=features_df, objectives_df=objectives_df, context_df=context_df)
+        return Empty()
 
+    def RegisterObservationsStream(self, request_iterator, context): # pylint: disable=unused-argument
+        """ Registers observations streamed in chunks.
+
+        Chunks are decoded as they arrive, so apart from the decoded observations the server only holds the chunk it is
+        currently decoding. They are all registered at once after the last chunk, since every call to register() refits
+        the surrogate models.
+        """
+        optimizer_id = None
+        decoded_chunks = []
+        for request in request_iterator:
+            if optimizer_id is None:
+                optimizer_id = request.OptimizerHandle.Id
+            elif request.OptimizerHandle.Id != optimizer_id:
+                raise ValueError(f"All chunks must be for the same optimizer. Expected {optimizer_id}, got {request.OptimizerHandle.Id}.")
+            decoded_chunks.append(self.decode_observations(request.Observations))
+
+        if optimizer_id is None:
+            return Empty()
+
+        features_df, objectives_df, context_df = self.concatenate_observation_chunks(decoded_chunks)
+        self._register(optimizer_id=optimizer_id, features_df=features_df, objectives_df=objectives_df, context_df=context_df)
         return Empty()
 
+    @staticmethod
+    def decode_observation(observation_pb2):
+        """ Decodes a single Observation into one-row features, objectives and context dataframes. The context is None if absent.
+
+        """
+        features_df = pd.DataFrame(json.loads(observation_pb2.Features.FeaturesJsonString), index=[0])
+        objectives_df = pd.DataFrame(json.loads(observation_pb2.ObjectiveValues.ObjectiveValuesJsonString), index=[0])
+        context_df = None
+        if observation_pb2.Context.ContextJsonString != "":
+            context_df = pd.DataFrame(json.loads(observation_pb2.Context.ContextJsonString), index=[0])
+        return features_df, objectives_df, context_df
+
+    @staticmethod
+    def decode_observations(observations_pb2):
+        """ Decodes Observations into features, objectives and context dataframes. The context is None if absent.
+
+        """
+        return (
+            DataFrameDecoder.decode_features_dataframe(observations_pb2.Features),
+            DataFrameDecoder.decode_objective_values_dataframe(observations_pb2.ObjectiveValues),
+            DataFrameDecoder.decode_context_dataframe(observations_pb2.Context)
+        )
+
+    @staticmethod
+    def concatenate_observation_chunks(decoded_chunks):
+        """ Concatenates the (features_df, objectives_df, context_df) tuples returned by decode_observations for each chunk.
+
+        """
+        if len(decoded_chunks) == 1:
+            return decoded_chunks[0]
+        features_dfs, objectives_dfs, context_dfs = zip(*decoded_chunks)
+        context_df = None
+        if any(chunk_context_df is not None for chunk_context_df in context_dfs):
+            if any(chunk_context_df is None for chunk_context_df in context_dfs):
+                raise ValueError("Either all or none of the chunks must carry context.")
+            context_df = pd.concat(context_dfs)
+        return pd.concat(features_dfs), pd.concat(objectives_dfs), context_df
+
+    def _register(self, optimizer_id, features_df, objectives_df, context_df):
+        with self._bayesian_optimizer_store.exclusive_optimizer(optimizer_id=optimizer_id) as optimizer:
+            optimizer.register(
+                parameter_values_pandas_frame=features_df,
+                target_values_pandas_frame=objectives_df,
+                context_values_pandas_frame=context_df
+            )
+            model_version = optimizer.model_version
+
+        if self._suggestion_prefetcher is not None:
+            self._suggestion_prefetcher.notify_observations_registered(optimizer_id=optimizer_id, model_version=model_version)
+
     def Echo(self, request: Empty, context): # pylint: disable=unused-argument
         return Empty()
@@ -8,7 +8,7 @@ from typing import Union
 from mlos.Grpc import OptimizerService_pb2
 from mlos.Optimizers.OptimizationProblem import Objective, OptimizationProblem
 from mlos.Spaces import CategoricalDimension, CompositeDimension, ContinuousDimension, Dimension, DiscreteDimension, \
-    EmptyDimension, OrdinalDimension, SimpleHypergrid
+    EmptyDimension, OrdinalDimension, Point, SimpleHypergrid
 
 
 class OptimizerServiceEncoder:
@@ -48,6 +48,12 @@ class OptimizerServiceEncoder:
             OptimizerServiceEncoder.encode_hypergrid(optimization_problem.context_space)
         )
 
+    @staticmethod
+    def encode_context(context: Point) -> OptimizerService_pb2.Context:
+        if context is None:
+            return None
+        return OptimizerService_pb2.Context(ContextJsonString=context.to_json())
+
     @staticmethod
     def encode_continuous_dimension(dimension: ContinuousDimension) -> OptimizerService_pb2.ContinuousDimension:
         assert isinstance(dimension, ContinuousDimension)
@@ -221,6 +227,15 @@ class OptimizerServiceDecoder:
             OptimizerServiceDecoder.decode_hypergrid(optimization_problem_pb2.ContextSpace)
         )
 
+    @staticmethod
+    def decode_context(context_pb2: OptimizerService_pb2.Context) -> Point:
+        """ Decodes the context point of a SuggestRequest. Returns None if the request carries no context.
+
+        """
+        if context_pb2.ContextJsonString == "":
+            return None
+        return Point.from_json(context_pb2.ContextJsonString)
+
     @staticmethod
     def decode_continuous_dimension(serialized: OptimizerService_pb2.ContinuousDimension) -> ContinuousDimension:
         assert isinstance(serialized, OptimizerService_pb2.ContinuousDimension)
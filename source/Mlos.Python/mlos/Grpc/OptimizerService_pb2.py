@@ -20,9 +20,45 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n mlos/Grpc/OptimizerService.proto\x12\x16mlos.optimizer_service\"\x98\x01\n\x16\x43reateOptimizerRequest\x12H\n\x13OptimizationProblem\x18\x01 \x01(\x0b\x32+.mlos.optimizer_service.OptimizationProblem\x12\x1b\n\x13OptimizerConfigName\x18\x02 \x01(\t\x12\x17\n\x0fOptimizerConfig\x18\x03 \x01(\t\"\x94\x01\n\x0eSuggestRequest\x12@\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\'.mlos.optimizer_service.OptimizerHandle\x12\x0e\n\x06Random\x18\x02 \x01(\x08\x12\x30\n\x07\x43ontext\x18\x03 \x01(\x0b\x32\x1f.mlos.optimizer_service.Context\"\x98\x01\n\x1aRegisterObservationRequest\x12@\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\'.mlos.optimizer_service.OptimizerHandle\x12\x38\n\x0bObservation\x18\x02 \x01(\x0b\x32#.mlos.optimizer_service.Observation\"\x9b\x01\n\x1bRegisterObservationsRequest\x12@\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\'.mlos.optimizer_service.OptimizerHandle\x12:\n\x0cObservations\x18\x02 \x01(\x0b\x32$.mlos.optimizer_service.Observations\"\xa3\x02\n\x13OptimizationProblem\x12?\n\x0eParameterSpace\x18\x01 \x01(\x0b\x32\'.mlos.optimizer_service.SimpleHypergrid\x12\x42\n\x0c\x43ontextSpace\x18\x02 \x01(\x0b\x32\'.mlos.optimizer_service.SimpleHypergridH\x00\x88\x01\x01\x12?\n\x0eObjectiveSpace\x18\x03 \x01(\x0b\x32\'.mlos.optimizer_service.SimpleHypergrid\x12\x35\n\nObjectives\x18\x04 \x03(\x0b\x32!.mlos.optimizer_service.ObjectiveB\x0f\n\r_ContextSpace\"\x1d\n\x0fOptimizerHandle\x12\n\n\x02Id\x18\x01 \x01(\t\"\xbe\x01\n\rOptimizerInfo\x12@\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\'.mlos.optimizer_service.OptimizerHandle\x12!\n\x19OptimizerConfigJsonString\x18\x02 \x01(\t\x12H\n\x13OptimizationProblem\x18\x03 \x01(\x0b\x32+.mlos.optimizer_service.OptimizationProblem\"\x83\x01\n\x0bObservation\x12\x32\n\x08\x46\x65\x61tures\x18\x01 \x01(\x0b\x32 .mlos.optimizer_service.Features\x12@\n\x0fObjectiveValues\x18\x02 \x01(\x0b\x32\'.mlos.optimizer_service.ObjectiveValues\"\x84\x01\n\x0cObservations\x12\x32\n\x08\x46\x65\x61tures\x18\x01 \x01(\x0b\x32 .mlos.optimizer_service.Features\x12@\n\x0fObjectiveValues\x18\x02 \x01(\x0b\x32\'.mlos.optimizer_service.ObjectiveValues\"&\n\x08\x46\x65\x61tures\x12\x1a\n\x12\x46\x65\x61turesJsonString\x18\x01 \x01(\t\"7\n\x17\x43onfigurationParameters\x12\x1c\n\x14ParametersJsonString\x18\x01 \x01(\t\"$\n\x07\x43ontext\x12\x19\n\x11\x43ontextJsonString\x18\x01 \x01(\t\"4\n\x0fObjectiveValues\x12!\n\x19ObjectiveValuesJsonString\x18\x01 \x01(\t\"+\n\tObjective\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x10\n\x08Minimize\x18\x02 \x01(\x08\"\x1e\n\rSimpleBoolean\x12\r\n\x05Value\x18\x01 \x01(\x08\"\x1d\n\x0cSimpleString\x12\r\n\x05Value\x18\x01 \x01(\t\"\x07\n\x05\x45mpty\"\\\n\x0e\x45mptyDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12<\n\rDimensionType\x18\x02 \x01(\x0e\x32%.mlos.optimizer_service.DimensionType\"e\n\x13\x43ontinuousDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0b\n\x03Min\x18\x02 \x01(\x01\x12\x0b\n\x03Max\x18\x03 \x01(\x01\x12\x12\n\nIncludeMin\x18\x04 \x01(\x08\x12\x12\n\nIncludeMax\x18\x05 \x01(\x08\";\n\x11\x44iscreteDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0b\n\x03Min\x18\x02 \x01(\x03\x12\x0b\n\x03Max\x18\x03 \x01(\x03\"r\n\x10OrdinalDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x11\n\tAscending\x18\x02 \x01(\x08\x12=\n\rOrderedValues\x18\x03 \x03(\x0b\x32&.mlos.optimizer_service.PrimitiveValue\"\\\n\x14\x43\x61tegoricalDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x36\n\x06Values\x18\x02 \x03(\x0b\x32&.mlos.optimizer_service.PrimitiveValue\"\x8f\x01\n\x12\x43ompositeDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x38\n\tChunkType\x18\x02 \x01(\x0e\x32%.mlos.optimizer_service.DimensionType\x12\x31\n\x06\x43hunks\x18\x03 \x03(\x0b\x32!.mlos.optimizer_service.Dimension\"p\n\x0ePrimitiveValue\x12\x12\n\x08IntValue\x18\x01 \x01(\x03H\x00\x12\x15\n\x0b\x44oubleValue\x18\x02 \x01(\x01H\x00\x12\x13\n\tBoolValue\x18\x03 \x01(\x08H\x00\x12\x15\n\x0bStringValue\x18\x04 \x01(\tH\x00\x42\x07\n\x05Value\"\xcc\x03\n\tDimension\x12J\n\x13\x43ontinuousDimension\x18\x01 \x01(\x0b\x32+.mlos.optimizer_service.ContinuousDimensionH\x00\x12\x46\n\x11\x44iscreteDimension\x18\x02 \x01(\x0b\x32).mlos.optimizer_service.DiscreteDimensionH\x00\x12\x44\n\x10OrdinalDimension\x18\x03 \x01(\x0b\x32(.mlos.optimizer_service.OrdinalDimensionH\x00\x12L\n\x14\x43\x61tegoricalDimension\x18\x04 \x01(\x0b\x32,.mlos.optimizer_service.CategoricalDimensionH\x00\x12@\n\x0e\x45mptyDimension\x18\x05 \x01(\x0b\x32&.mlos.optimizer_service.EmptyDimensionH\x00\x12H\n\x12\x43ompositeDimension\x18\x06 \x01(\x0b\x32*.mlos.optimizer_service.CompositeDimensionH\x00\x42\x0b\n\tDimension\"\x93\x01\n\x0fSimpleHypergrid\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x35\n\nDimensions\x18\x02 \x03(\x0b\x32!.mlos.optimizer_service.Dimension\x12;\n\rGuestSubgrids\x18\x03 \x03(\x0b\x32$.mlos.optimizer_service.GuestSubgrid\"\x8b\x01\n\x0cGuestSubgrid\x12\x38\n\x07Subgrid\x18\x01 \x01(\x0b\x32\'.mlos.optimizer_service.SimpleHypergrid\x12\x41\n\x16\x45xternalPivotDimension\x18\x02 \x01(\x0b\x32!.mlos.optimizer_service.Dimension\"C\n\x05Point\x12:\n\x0cKeyValuePair\x18\x01 \x03(\x0b\x32$.mlos.optimizer_service.KeyValuePair\"R\n\x0cKeyValuePair\x12\x0b\n\x03Key\x18\x01 \x01(\t\x12\x35\n\x05Value\x18\x02 \x01(\x0b\x32&.mlos.optimizer_service.DimensionValue\"u\n\x0e\x44imensionValue\x12\x35\n\x05Value\x18\x01 \x01(\x0b\x32&.mlos.optimizer_service.PrimitiveValue\x12,\n\x05Point\x18\x02 \x01(\x0b\x32\x1d.mlos.optimizer_service.Point*K\n\rDimensionType\x12\x0f\n\x0b\x43\x41TEGORICAL\x10\x00\x12\x0e\n\nCONTINUOUS\x10\x01\x12\x0c\n\x08\x44ISCRETE\x10\x02\x12\x0b\n\x07ORDINAL\x10\x03\x32\xe2\x04\n\x10OptimizerService\x12j\n\x0f\x43reateOptimizer\x12..mlos.optimizer_service.CreateOptimizerRequest\x1a\'.mlos.optimizer_service.OptimizerHandle\x12\x62\n\x10GetOptimizerInfo\x12\'.mlos.optimizer_service.OptimizerHandle\x1a%.mlos.optimizer_service.OptimizerInfo\x12\x62\n\x07Suggest\x12&.mlos.optimizer_service.SuggestRequest\x1a/.mlos.optimizer_service.ConfigurationParameters\x12h\n\x13RegisterObservation\x12\x32.mlos.optimizer_service.RegisterObservationRequest\x1a\x1d.mlos.optimizer_service.Empty\x12j\n\x14RegisterObservations\x12\x33.mlos.optimizer_service.RegisterObservationsRequest\x1a\x1d.mlos.optimizer_service.Empty\x12\x44\n\x04\x45\x63ho\x12\x1d.mlos.optimizer_service.Empty\x1a\x1d.mlos.optimizer_service.Emptyb\x06proto3'
+  serialized_pb=b'\n mlos/Grpc/OptimizerService.proto\x12\x16mlos.optimizer_service\"\x98\x01\n\x16\x43reateOptimizerRequest\x12H\n\x13OptimizationProblem\x18\x01 \x01(\x0b\x32+.mlos.optimizer_service.OptimizationProblem\x12\x1b\n\x13OptimizerConfigName\x18\x02 \x01(\t\x12\x17\n\x0fOptimizerConfig\x18\x03 \x01(\t\"\x94\x01\n\x0eSuggestRequest\x12@\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\'.mlos.optimizer_service.OptimizerHandle\x12\x0e\n\x06Random\x18\x02 \x01(\x08\x12\x30\n\x07\x43ontext\x18\x03 \x01(\x0b\x32\x1f.mlos.optimizer_service.Context\"\xb1\x01\n\x13SuggestBatchRequest\x12@\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\'.mlos.optimizer_service.OptimizerHandle\x12\x0e\n\x06Random\x18\x02 \x01(\x08\x12\x30\n\x07\x43ontext\x18\x03 \x01(\x0b\x32\x1f.mlos.optimizer_service.Context\x12\x16\n\x0eNumSuggestions\x18\x04 \x01(\r\"\x98\x01\n\x1aRegisterObservationRequest\x12@\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\'.mlos.optimizer_service.OptimizerHandle\x12\x38\n\x0bObservation\x18\x02 \x01(\x0b\x32#.mlos.optimizer_service.Observation\"\x9b\x01\n\x1bRegisterObservationsRequest\x12@\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\'.mlos.optimizer_service.OptimizerHandle\x12:\n\x0cObservations\x18\x02 \x01(\x0b\x32$.mlos.optimizer_service.Observations\"\xa3\x02\n\x13OptimizationProblem\x12?\n\x0eParameterSpace\x18\x01 \x01(\x0b\x32\'.mlos.optimizer_service.SimpleHypergrid\x12\x42\n\x0c\x43ontextSpace\x18\x02 \x01(\x0b\x32\'.mlos.optimizer_service.SimpleHypergridH\x00\x88\x01\x01\x12?\n\x0eObjectiveSpace\x18\x03 \x01(\x0b\x32\'.mlos.optimizer_service.SimpleHypergrid\x12\x35\n\nObjectives\x18\x04 \x03(\x0b\x32!.mlos.optimizer_service.ObjectiveB\x0f\n\r_ContextSpace\"\x1d\n\x0fOptimizerHandle\x12\n\n\x02Id\x18\x01 \x01(\t\"\xbe\x01\n\rOptimizerInfo\x12@\n\x0fOptimizerHandle\x18\x01 \x01(\x0b\x32\'.mlos.optimizer_service.OptimizerHandle\x12!\n\x19OptimizerConfigJsonString\x18\x02 \x01(\t\x12H\n\x13OptimizationProblem\x18\x03 \x01(\x0b\x32+.mlos.optimizer_service.OptimizationProblem\"\xb5\x01\n\x0bObservation\x12\x32\n\x08\x46\x65\x61tures\x18\x01 \x01(\x0b\x32 .mlos.optimizer_service.Features\x12@\n\x0fObjectiveValues\x18\x02 \x01(\x0b\x32\'.mlos.optimizer_service.ObjectiveValues\x12\x30\n\x07\x43ontext\x18\x03 \x01(\x0b\x32\x1f.mlos.optimizer_service.Context\"\xb6\x01\n\x0cObservations\x12\x32\n\x08\x46\x65\x61tures\x18\x01 \x01(\x0b\x32 .mlos.optimizer_service.Features\x12@\n\x0fObjectiveValues\x18\x02 \x01(\x0b\x32\'.mlos.optimizer_service.ObjectiveValues\x12\x30\n\x07\x43ontext\x18\x03 \x01(\x0b\x32\x1f.mlos.optimizer_service.Context\"d\n\x08\x46\x65\x61tures\x12\x1a\n\x12\x46\x65\x61turesJsonString\x18\x01 \x01(\t\x12<\n\x11\x46\x65\x61turesDataFrame\x18\x02 \x01(\x0b\x32!.mlos.optimizer_service.DataFrame\"7\n\x17\x43onfigurationParameters\x12\x1c\n\x14ParametersJsonString\x18\x01 \x01(\t\"g\n\x1c\x43onfigurationParametersBatch\x12G\n\x0e\x43onfigurations\x18\x01 \x03(\x0b\x32/.mlos.optimizer_service.ConfigurationParameters\"a\n\x07\x43ontext\x12\x19\n\x11\x43ontextJsonString\x18\x01 \x01(\t\x12;\n\x10\x43ontextDataFrame\x18\x02 \x01(\x0b\x32!.mlos.optimizer_service.DataFrame\"y\n\x0fObjectiveValues\x12!\n\x19ObjectiveValuesJsonString\x18\x01 \x01(\t\x12\x43\n\x18ObjectiveValuesDataFrame\x18\x02 \x01(\x0b\x32!.mlos.optimizer_service.DataFrame\"k\n\tDataFrame\x12-\n\x05Index\x18\x01 \x01(\x0b\x32\x1e.mlos.optimizer_service.Column\x12/\n\x07\x43olumns\x18\x02 \x03(\x0b\x32\x1e.mlos.optimizer_service.Column\"r\n\x06\x43olumn\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x30\n\x04Type\x18\x02 \x01(\x0e\x32\".mlos.optimizer_service.ColumnType\x12\x14\n\x0cPackedValues\x18\x03 \x01(\x0c\x12\x12\n\nJsonValues\x18\x04 \x01(\t\"+\n\tObjective\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x10\n\x08Minimize\x18\x02 \x01(\x08\"\x1e\n\rSimpleBoolean\x12\r\n\x05Value\x18\x01 \x01(\x08\"\x1d\n\x0cSimpleString\x12\r\n\x05Value\x18\x01 \x01(\t\"\x07\n\x05\x45mpty\"\\\n\x0e\x45mptyDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12<\n\rDimensionType\x18\x02 \x01(\x0e\x32%.mlos.optimizer_service.DimensionType\"e\n\x13\x43ontinuousDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0b\n\x03Min\x18\x02 \x01(\x01\x12\x0b\n\x03Max\x18\x03 \x01(\x01\x12\x12\n\nIncludeMin\x18\x04 \x01(\x08\x12\x12\n\nIncludeMax\x18\x05 \x01(\x08\";\n\x11\x44iscreteDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0b\n\x03Min\x18\x02 \x01(\x03\x12\x0b\n\x03Max\x18\x03 \x01(\x03\"r\n\x10OrdinalDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x11\n\tAscending\x18\x02 \x01(\x08\x12=\n\rOrderedValues\x18\x03 \x03(\x0b\x32&.mlos.optimizer_service.PrimitiveValue\"\\\n\x14\x43\x61tegoricalDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x36\n\x06Values\x18\x02 \x03(\x0b\x32&.mlos.optimizer_service.PrimitiveValue\"\x8f\x01\n\x12\x43ompositeDimension\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x38\n\tChunkType\x18\x02 \x01(\x0e\x32%.mlos.optimizer_service.DimensionType\x12\x31\n\x06\x43hunks\x18\x03 \x03(\x0b\x32!.mlos.optimizer_service.Dimension\"p\n\x0ePrimitiveValue\x12\x12\n\x08IntValue\x18\x01 \x01(\x03H\x00\x12\x15\n\x0b\x44oubleValue\x18\x02 \x01(\x01H\x00\x12\x13\n\tBoolValue\x18\x03 \x01(\x08H\x00\x12\x15\n\x0bStringValue\x18\x04 \x01(\tH\x00\x42\x07\n\x05Value\"\xcc\x03\n\tDimension\x12J\n\x13\x43ontinuousDimension\x18\x01 \x01(\x0b\x32+.mlos.optimizer_service.ContinuousDimensionH\x00\x12\x46\n\x11\x44iscreteDimension\x18\x02 \x01(\x0b\x32).mlos.optimizer_service.DiscreteDimensionH\x00\x12\x44\n\x10OrdinalDimension\x18\x03 \x01(\x0b\x32(.mlos.optimizer_service.OrdinalDimensionH\x00\x12L\n\x14\x43\x61tegoricalDimension\x18\x04 \x01(\x0b\x32,.mlos.optimizer_service.CategoricalDimensionH\x00\x12@\n\x0e\x45mptyDimension\x18\x05 \x01(\x0b\x32&.mlos.optimizer_service.EmptyDimensionH\x00\x12H\n\x12\x43ompositeDimension\x18\x06 \x01(\x0b\x32*.mlos.optimizer_service.CompositeDimensionH\x00\x42\x0b\n\tDimension\"\x93\x01\n\x0fSimpleHypergrid\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x35\n\nDimensions\x18\x02 \x03(\x0b\x32!.mlos.optimizer_service.Dimension\x12;\n\rGuestSubgrids\x18\x03 \x03(\x0b\x32$.mlos.optimizer_service.GuestSubgrid\"\x8b\x01\n\x0cGuestSubgrid\x12\x38\n\x07Subgrid\x18\x01 \x01(\x0b\x32\'.mlos.optimizer_service.SimpleHypergrid\x12\x41\n\x16\x45xternalPivotDimension\x18\x02 \x01(\x0b\x32!.mlos.optimizer_service.Dimension\"C\n\x05Point\x12:\n\x0cKeyValuePair\x18\x01 \x03(\x0b\x32$.mlos.optimizer_service.KeyValuePair\"R\n\x0cKeyValuePair\x12\x0b\n\x03Key\x18\x01 \x01(\t\x12\x35\n\x05Value\x18\x02 \x01(\x0b\x32&.mlos.optimizer_service.DimensionValue\"u\n\x0e\x44imensionValue\x12\x35\n\x05Value\x18\x01 \x01(\x0b\x32&.mlos.optimizer_service.PrimitiveValue\x12,\n\x05Point\x18\x02 \x01(\x0b\x32\x1d.mlos.optimizer_service.Point*8\n\nColumnType\x12\x0b\n\x07\x46LOAT64\x10\x00\x12\t\n\x05INT64\x10\x01\x12\x08\n\x04\x42OOL\x10\x02\x12\x08\n\x04JSON\x10\x03*K\n\rDimensionType\x12\x0f\n\x0b\x43\x41TEGORICAL\x10\x00\x12\x0e\n\nCONTINUOUS\x10\x01\x12\x0c\n\x08\x44ISCRETE\x10\x02\x12\x0b\n\x07ORDINAL\x10\x03\x32\xc9\x06\n\x10OptimizerService\x12j\n\x0f\x43reateOptimizer\x12..mlos.optimizer_service.CreateOptimizerRequest\x1a\'.mlos.optimizer_service.OptimizerHandle\x12\x62\n\x10GetOptimizerInfo\x12\'.mlos.optimizer_service.OptimizerHandle\x1a%.mlos.optimizer_service.OptimizerInfo\x12\x62\n\x07Suggest\x12&.mlos.optimizer_service.SuggestRequest\x1a/.mlos.optimizer_service.ConfigurationParameters\x12q\n\x0cSuggestBatch\x12+.mlos.optimizer_service.SuggestBatchRequest\x1a\x34.mlos.optimizer_service.ConfigurationParametersBatch\x12h\n\x13RegisterObservation\x12\x32.mlos.optimizer_service.RegisterObservationRequest\x1a\x1d.mlos.optimizer_service.Empty\x12j\n\x14RegisterObservations\x12\x33.mlos.optimizer_service.RegisterObservationsRequest\x1a\x1d.mlos.optimizer_service.Empty\x12r\n\x1aRegisterObservationsStream\x12\x33.mlos.optimizer_service.RegisterObservationsRequest\x1a\x1d.mlos.optimizer_service.Empty(\x01\x12\x44\n\x04\x45\x63ho\x12\x1d.mlos.optimizer_service.Empty\x1a\x1d.mlos.optimizer_service.Emptyb\x06proto3'
 )
 
+_COLUMNTYPE = _descriptor.EnumDescriptor(
+  name='ColumnType',
+  full_name='mlos.optimizer_service.ColumnType',
+  filename=None,
+  file=DESCRIPTOR,
+  create_key=_descriptor._internal_create_key,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='FLOAT64', index=0, number=0,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+    _descriptor.EnumValueDescriptor(
+      name='INT64', index=1, number=1,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+    _descriptor.EnumValueDescriptor(
+      name='BOOL', index=2, number=2,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+    _descriptor.EnumValueDescriptor(
+      name='JSON', index=3, number=3,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+  ],
+  containing_type=None,
+  serialized_options=None,
+  serialized_start=4329,
+  serialized_end=4385,
+)
+_sym_db.RegisterEnumDescriptor(_COLUMNTYPE)
+
+ColumnType = enum_type_wrapper.EnumTypeWrapper(_COLUMNTYPE)
 _DIMENSIONTYPE = _descriptor.EnumDescriptor(
   name='DimensionType',
   full_name='mlos.optimizer_service.DimensionType',
@@ -53,12 +89,16 @@ _DIMENSIONTYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=3527,
-  serialized_end=3602,
+  serialized_start=4387,
+  serialized_end=4462,
 )
 _sym_db.RegisterEnumDescriptor(_DIMENSIONTYPE)
 
 DimensionType = enum_type_wrapper.EnumTypeWrapper(_DIMENSIONTYPE)
+FLOAT64 = 0
+INT64 = 1
+BOOL = 2
+JSON = 3
 CATEGORICAL = 0
 CONTINUOUS = 1
 DISCRETE = 2
@@ -158,6 +198,59 @@ _SUGGESTREQUEST = _descriptor.Descriptor(
 )
 
 
+_SUGGESTBATCHREQUEST = _descriptor.Descriptor(
+  name='SuggestBatchRequest',
+  full_name='mlos.optimizer_service.SuggestBatchRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='OptimizerHandle', full_name='mlos.optimizer_service.SuggestBatchRequest.OptimizerHandle', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='Random', full_name='mlos.optimizer_service.SuggestBatchRequest.Random', index=1,
+      number=2, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='Context', full_name='mlos.optimizer_service.SuggestBatchRequest.Context', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='NumSuggestions', full_name='mlos.optimizer_service.SuggestBatchRequest.NumSuggestions', index=3,
+      number=4, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=367,
+  serialized_end=544,
+)
+
+
 _REGISTEROBSERVATIONREQUEST = _descriptor.Descriptor(
   name='RegisterObservationRequest',
   full_name='mlos.optimizer_service.RegisterObservationRequest',
@@ -192,8 +285,8 @@ _REGISTEROBSERVATIONREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=367,
-  serialized_end=519,
+  serialized_start=547,
+  serialized_end=699,
 )
 
 
@@ -231,8 +324,8 @@ _REGISTEROBSERVATIONSREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=522,
-  serialized_end=677,
+  serialized_start=702,
+  serialized_end=857,
 )
 
 
@@ -289,8 +382,8 @@ _OPTIMIZATIONPROBLEM = _descriptor.Descriptor(
       create_key=_descriptor._internal_create_key,
     fields=[]),
   ],
-  serialized_start=680,
-  serialized_end=971,
+  serialized_start=860,
+  serialized_end=1151,
 )
 
 
@@ -321,8 +414,8 @@ _OPTIMIZERHANDLE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=973,
-  serialized_end=1002,
+  serialized_start=1153,
+  serialized_end=1182,
 )
 
 
@@ -367,8 +460,8 @@ _OPTIMIZERINFO = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1005,
-  serialized_end=1195,
+  serialized_start=1185,
+  serialized_end=1375,
 )
 
 
@@ -394,6 +487,13 @@ _OBSERVATION = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='Context', full_name='mlos.optimizer_service.Observation.Context', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -406,8 +506,8 @@ _OBSERVATION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1198,
-  serialized_end=1329,
+  serialized_start=1378,
+  serialized_end=1559,
 )
 
 
@@ -433,6 +533,13 @@ _OBSERVATIONS = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='Context', full_name='mlos.optimizer_service.Observations.Context', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -445,8 +552,8 @@ _OBSERVATIONS = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1332,
-  serialized_end=1464,
+  serialized_start=1562,
+  serialized_end=1744,
 )
 
 
@@ -465,6 +572,13 @@ _FEATURES = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='FeaturesDataFrame', full_name='mlos.optimizer_service.Features.FeaturesDataFrame', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -477,8 +591,8 @@ _FEATURES = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1466,
-  serialized_end=1504,
+  serialized_start=1746,
+  serialized_end=1846,
 )
 
 
@@ -509,8 +623,40 @@ _CONFIGURATIONPARAMETERS = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1506,
-  serialized_end=1561,
+  serialized_start=1848,
+  serialized_end=1903,
+)
+
+
+_CONFIGURATIONPARAMETERSBATCH = _descriptor.Descriptor(
+  name='ConfigurationParametersBatch',
+  full_name='mlos.optimizer_service.ConfigurationParametersBatch',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='Configurations', full_name='mlos.optimizer_service.ConfigurationParametersBatch.Configurations', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1905,
+  serialized_end=2008,
 )
 
 
@@ -529,6 +675,13 @@ _CONTEXT = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='ContextDataFrame', full_name='mlos.optimizer_service.Context.ContextDataFrame', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -541,8 +694,8 @@ _CONTEXT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1563,
-  serialized_end=1599,
+  serialized_start=2010,
+  serialized_end=2107,
 )
 
 
@@ -561,6 +714,52 @@ _OBJECTIVEVALUES = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='ObjectiveValuesDataFrame', full_name='mlos.optimizer_service.ObjectiveValues.ObjectiveValuesDataFrame', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2109,
+  serialized_end=2230,
+)
+
+
+_DATAFRAME = _descriptor.Descriptor(
+  name='DataFrame',
+  full_name='mlos.optimizer_service.DataFrame',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='Index', full_name='mlos.optimizer_service.DataFrame.Index', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='Columns', full_name='mlos.optimizer_service.DataFrame.Columns', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -573,8 +772,61 @@ _OBJECTIVEVALUES = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1601,
-  serialized_end=1653,
+  serialized_start=2232,
+  serialized_end=2339,
+)
+
+
+_COLUMN = _descriptor.Descriptor(
+  name='Column',
+  full_name='mlos.optimizer_service.Column',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='Name', full_name='mlos.optimizer_service.Column.Name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='Type', full_name='mlos.optimizer_service.Column.Type', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='PackedValues', full_name='mlos.optimizer_service.Column.PackedValues', index=2,
+      number=3, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='JsonValues', full_name='mlos.optimizer_service.Column.JsonValues', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2341,
+  serialized_end=2455,
 )
 
 
@@ -612,8 +864,8 @@ _OBJECTIVE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1655,
-  serialized_end=1698,
+  serialized_start=2457,
+  serialized_end=2500,
 )
 
 
@@ -644,8 +896,8 @@ _SIMPLEBOOLEAN = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1700,
-  serialized_end=1730,
+  serialized_start=2502,
+  serialized_end=2532,
 )
 
 
@@ -676,8 +928,8 @@ _SIMPLESTRING = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1732,
-  serialized_end=1761,
+  serialized_start=2534,
+  serialized_end=2563,
 )
 
 
@@ -701,8 +953,8 @@ _EMPTY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1763,
-  serialized_end=1770,
+  serialized_start=2565,
+  serialized_end=2572,
 )
 
 
@@ -740,8 +992,8 @@ _EMPTYDIMENSION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1772,
-  serialized_end=1864,
+  serialized_start=2574,
+  serialized_end=2666,
 )
 
 
@@ -800,8 +1052,8 @@ _CONTINUOUSDIMENSION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1866,
-  serialized_end=1967,
+  serialized_start=2668,
+  serialized_end=2769,
 )
 
 
@@ -846,8 +1098,8 @@ _DISCRETEDIMENSION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1969,
-  serialized_end=2028,
+  serialized_start=2771,
+  serialized_end=2830,
 )
 
 
@@ -892,8 +1144,8 @@ _ORDINALDIMENSION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2030,
-  serialized_end=2144,
+  serialized_start=2832,
+  serialized_end=2946,
 )
 
 
@@ -931,8 +1183,8 @@ _CATEGORICALDIMENSION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2146,
-  serialized_end=2238,
+  serialized_start=2948,
+  serialized_end=3040,
 )
 
 
@@ -977,8 +1229,8 @@ _COMPOSITEDIMENSION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2241,
-  serialized_end=2384,
+  serialized_start=3043,
+  serialized_end=3186,
 )
 
 
@@ -1035,8 +1287,8 @@ _PRIMITIVEVALUE = _descriptor.Descriptor(
       create_key=_descriptor._internal_create_key,
     fields=[]),
   ],
-  serialized_start=2386,
-  serialized_end=2498,
+  serialized_start=3188,
+  serialized_end=3300,
 )
 
 
@@ -1107,8 +1359,8 @@ _DIMENSION = _descriptor.Descriptor(
       create_key=_descriptor._internal_create_key,
     fields=[]),
   ],
-  serialized_start=2501,
-  serialized_end=2961,
+  serialized_start=3303,
+  serialized_end=3763,
 )
 
 
@@ -1153,8 +1405,8 @@ _SIMPLEHYPERGRID = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2964,
-  serialized_end=3111,
+  serialized_start=3766,
+  serialized_end=3913,
 )
 
 
@@ -1192,8 +1444,8 @@ _GUESTSUBGRID = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3114,
-  serialized_end=3253,
+  serialized_start=3916,
+  serialized_end=4055,
 )
 
 
@@ -1224,8 +1476,8 @@ _POINT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3255,
-  serialized_end=3322,
+  serialized_start=4057,
+  serialized_end=4124,
 )
 
 
@@ -1263,8 +1515,8 @@ _KEYVALUEPAIR = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3324,
-  serialized_end=3406,
+  serialized_start=4126,
+  serialized_end=4208,
 )
 
 
@@ -1302,13 +1554,15 @@ _DIMENSIONVALUE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=3408,
-  serialized_end=3525,
+  serialized_start=4210,
+  serialized_end=4327,
 )
 
 _CREATEOPTIMIZERREQUEST.fields_by_name['OptimizationProblem'].message_type = _OPTIMIZATIONPROBLEM
 _SUGGESTREQUEST.fields_by_name['OptimizerHandle'].message_type = _OPTIMIZERHANDLE
 _SUGGESTREQUEST.fields_by_name['Context'].message_type = _CONTEXT
+_SUGGESTBATCHREQUEST.fields_by_name['OptimizerHandle'].message_type = _OPTIMIZERHANDLE
+_SUGGESTBATCHREQUEST.fields_by_name['Context'].message_type = _CONTEXT
 _REGISTEROBSERVATIONREQUEST.fields_by_name['OptimizerHandle'].message_type = _OPTIMIZERHANDLE
 _REGISTEROBSERVATIONREQUEST.fields_by_name['Observation'].message_type = _OBSERVATION
 _REGISTEROBSERVATIONSREQUEST.fields_by_name['OptimizerHandle'].message_type = _OPTIMIZERHANDLE
@@ -1324,8 +1578,17 @@ _OPTIMIZERINFO.fields_by_name['OptimizerHandle'].message_type = _OPTIMIZERHANDLE
 _OPTIMIZERINFO.fields_by_name['OptimizationProblem'].message_type = _OPTIMIZATIONPROBLEM
 _OBSERVATION.fields_by_name['Features'].message_type = _FEATURES
 _OBSERVATION.fields_by_name['ObjectiveValues'].message_type = _OBJECTIVEVALUES
+_OBSERVATION.fields_by_name['Context'].message_type = _CONTEXT
 _OBSERVATIONS.fields_by_name['Features'].message_type = _FEATURES
 _OBSERVATIONS.fields_by_name['ObjectiveValues'].message_type = _OBJECTIVEVALUES
+_OBSERVATIONS.fields_by_name['Context'].message_type = _CONTEXT
+_FEATURES.fields_by_name['FeaturesDataFrame'].message_type = _DATAFRAME
+_CONFIGURATIONPARAMETERSBATCH.fields_by_name['Configurations'].message_type = _CONFIGURATIONPARAMETERS
+_CONTEXT.fields_by_name['ContextDataFrame'].message_type = _DATAFRAME
+_OBJECTIVEVALUES.fields_by_name['ObjectiveValuesDataFrame'].message_type = _DATAFRAME
+_DATAFRAME.fields_by_name['Index'].message_type = _COLUMN
+_DATAFRAME.fields_by_name['Columns'].message_type = _COLUMN
+_COLUMN.fields_by_name['Type'].enum_type = _COLUMNTYPE
 _EMPTYDIMENSION.fields_by_name['DimensionType'].enum_type = _DIMENSIONTYPE
 _ORDINALDIMENSION.fields_by_name['OrderedValues'].message_type = _PRIMITIVEVALUE
 _CATEGORICALDIMENSION.fields_by_name['Values'].message_type = _PRIMITIVEVALUE
@@ -1377,6 +1640,7 @@ _DIMENSIONVALUE.fields_by_name['Value'].message_type = _PRIMITIVEVALUE
 _DIMENSIONVALUE.fields_by_name['Point'].message_type = _POINT
 DESCRIPTOR.message_types_by_name['CreateOptimizerRequest'] = _CREATEOPTIMIZERREQUEST
 DESCRIPTOR.message_types_by_name['SuggestRequest'] = _SUGGESTREQUEST
+DESCRIPTOR.message_types_by_name['SuggestBatchRequest'] = _SUGGESTBATCHREQUEST
 DESCRIPTOR.message_types_by_name['RegisterObservationRequest'] = _REGISTEROBSERVATIONREQUEST
 DESCRIPTOR.message_types_by_name['RegisterObservationsRequest'] = _REGISTEROBSERVATIONSREQUEST
 DESCRIPTOR.message_types_by_name['OptimizationProblem'] = _OPTIMIZATIONPROBLEM
@@ -1386,8 +1650,11 @@ DESCRIPTOR.message_types_by_name['Observation'] = _OBSERVATION
 DESCRIPTOR.message_types_by_name['Observations'] = _OBSERVATIONS
 DESCRIPTOR.message_types_by_name['Features'] = _FEATURES
 DESCRIPTOR.message_types_by_name['ConfigurationParameters'] = _CONFIGURATIONPARAMETERS
+DESCRIPTOR.message_types_by_name['ConfigurationParametersBatch'] = _CONFIGURATIONPARAMETERSBATCH
 DESCRIPTOR.message_types_by_name['Context'] = _CONTEXT
 DESCRIPTOR.message_types_by_name['ObjectiveValues'] = _OBJECTIVEVALUES
+DESCRIPTOR.message_types_by_name['DataFrame'] = _DATAFRAME
+DESCRIPTOR.message_types_by_name['Column'] = _COLUMN
 DESCRIPTOR.message_types_by_name['Objective'] = _OBJECTIVE
 DESCRIPTOR.message_types_by_name['SimpleBoolean'] = _SIMPLEBOOLEAN
 DESCRIPTOR.message_types_by_name['SimpleString'] = _SIMPLESTRING
@@ -1405,6 +1672,7 @@ DESCRIPTOR.message_types_by_name['GuestSubgrid'] = _GUESTSUBGRID
 DESCRIPTOR.message_types_by_name['Point'] = _POINT
 DESCRIPTOR.message_types_by_name['KeyValuePair'] = _KEYVALUEPAIR
 DESCRIPTOR.message_types_by_name['DimensionValue'] = _DIMENSIONVALUE
+DESCRIPTOR.enum_types_by_name['ColumnType'] = _COLUMNTYPE
 DESCRIPTOR.enum_types_by_name['DimensionType'] = _DIMENSIONTYPE
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
@@ -1422,6 +1690,13 @@ SuggestRequest = _reflection.GeneratedProtocolMessageType('SuggestRequest', (_me
   })
 _sym_db.RegisterMessage(SuggestRequest)
 
+SuggestBatchRequest = _reflection.GeneratedProtocolMessageType('SuggestBatchRequest', (_message.Message,), {
+  'DESCRIPTOR' : _SUGGESTBATCHREQUEST,
+  '__module__' : 'mlos.Grpc.OptimizerService_pb2'
+  # @@protoc_insertion_point(class_scope:mlos.optimizer_service.SuggestBatchRequest)
+  })
+_sym_db.RegisterMessage(SuggestBatchRequest)
+
 RegisterObservationRequest = _reflection.GeneratedProtocolMessageType('RegisterObservationRequest', (_message.Message,), {
   'DESCRIPTOR' : _REGISTEROBSERVATIONREQUEST,
   '__module__' : 'mlos.Grpc.OptimizerService_pb2'
@@ -1485,6 +1760,13 @@ ConfigurationParameters = _reflection.GeneratedProtocolMessageType('Configuratio
   })
 _sym_db.RegisterMessage(ConfigurationParameters)
 
+ConfigurationParametersBatch = _reflection.GeneratedProtocolMessageType('ConfigurationParametersBatch', (_message.Message,), {
+  'DESCRIPTOR' : _CONFIGURATIONPARAMETERSBATCH,
+  '__module__' : 'mlos.Grpc.OptimizerService_pb2'
+  # @@protoc_insertion_point(class_scope:mlos.optimizer_service.ConfigurationParametersBatch)
+  })
+_sym_db.RegisterMessage(ConfigurationParametersBatch)
+
 Context = _reflection.GeneratedProtocolMessageType('Context', (_message.Message,), {
   'DESCRIPTOR' : _CONTEXT,
   '__module__' : 'mlos.Grpc.OptimizerService_pb2'
@@ -1499,6 +1781,20 @@ ObjectiveValues = _reflection.GeneratedProtocolMessageType('ObjectiveValues', (_
   })
 _sym_db.RegisterMessage(ObjectiveValues)
 
+DataFrame = _reflection.GeneratedProtocolMessageType('DataFrame', (_message.Message,), {
+  'DESCRIPTOR' : _DATAFRAME,
+  '__module__' : 'mlos.Grpc.OptimizerService_pb2'
+  # @@protoc_insertion_point(class_scope:mlos.optimizer_service.DataFrame)
+  })
+_sym_db.RegisterMessage(DataFrame)
+
+Column = _reflection.GeneratedProtocolMessageType('Column', (_message.Message,), {
+  'DESCRIPTOR' : _COLUMN,
+  '__module__' : 'mlos.Grpc.OptimizerService_pb2'
+  # @@protoc_insertion_point(class_scope:mlos.optimizer_service.Column)
+  })
+_sym_db.RegisterMessage(Column)
+
 Objective = _reflection.GeneratedProtocolMessageType('Objective', (_message.Message,), {
   'DESCRIPTOR' : _OBJECTIVE,
   '__module__' : 'mlos.Grpc.OptimizerService_pb2'
@@ -1627,8 +1923,8 @@ _OPTIMIZERSERVICE = _descriptor.ServiceDescriptor(
   index=0,
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_start=3605,
-  serialized_end=4215,
+  serialized_start=4465,
+  serialized_end=5306,
   methods=[
   _descriptor.MethodDescriptor(
     name='CreateOptimizer',
@@ -1660,10 +1956,20 @@ _OPTIMIZERSERVICE = _descriptor.ServiceDescriptor(
     serialized_options=None,
     create_key=_descriptor._internal_create_key,
   ),
+  _descriptor.MethodDescriptor(
+    name='SuggestBatch',
+    full_name='mlos.optimizer_service.OptimizerService.SuggestBatch',
+    index=3,
+    containing_service=None,
+    input_type=_SUGGESTBATCHREQUEST,
+    output_type=_CONFIGURATIONPARAMETERSBATCH,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
   _descriptor.MethodDescriptor(
     name='RegisterObservation',
     full_name='mlos.optimizer_service.OptimizerService.RegisterObservation',
-    index=3,
+    index=4,
     containing_service=None,
     input_type=_REGISTEROBSERVATIONREQUEST,
     output_type=_EMPTY,
@@ -1673,7 +1979,17 @@ _OPTIMIZERSERVICE = _descriptor.ServiceDescriptor(
   _descriptor.MethodDescriptor(
     name='RegisterObservations',
     full_name='mlos.optimizer_service.OptimizerService.RegisterObservations',
-    index=4,
+    index=5,
+    containing_service=None,
+    input_type=_REGISTEROBSERVATIONSREQUEST,
+    output_type=_EMPTY,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='RegisterObservationsStream',
+    full_name='mlos.optimizer_service.OptimizerService.RegisterObservationsStream',
+    index=6,
     containing_service=None,
     input_type=_REGISTEROBSERVATIONSREQUEST,
     output_type=_EMPTY,
@@ -1683,7 +1999,7 @@ _OPTIMIZERSERVICE = _descriptor.ServiceDescriptor(
   _descriptor.MethodDescriptor(
     name='Echo',
     full_name='mlos.optimizer_service.OptimizerService.Echo',
-    index=5,
+    index=7,
     containing_service=None,
     input_type=_EMPTY,
     output_type=_EMPTY,
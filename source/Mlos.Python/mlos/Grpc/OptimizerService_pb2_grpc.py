@@ -31,6 +31,11 @@ class OptimizerServiceStub(object):
                 request_serializer=mlos_dot_Grpc_dot_OptimizerService__pb2.SuggestRequest.SerializeToString,
                 response_deserializer=mlos_dot_Grpc_dot_OptimizerService__pb2.ConfigurationParameters.FromString,
                 )
+        self.SuggestBatch = channel.unary_unary(
+                '/mlos.optimizer_service.OptimizerService/SuggestBatch',
+                request_serializer=mlos_dot_Grpc_dot_OptimizerService__pb2.SuggestBatchRequest.SerializeToString,
+                response_deserializer=mlos_dot_Grpc_dot_OptimizerService__pb2.ConfigurationParametersBatch.FromString,
+                )
         self.RegisterObservation = channel.unary_unary(
                 '/mlos.optimizer_service.OptimizerService/RegisterObservation',
                 request_serializer=mlos_dot_Grpc_dot_OptimizerService__pb2.RegisterObservationRequest.SerializeToString,
@@ -41,6 +46,11 @@ class OptimizerServiceStub(object):
                 request_serializer=mlos_dot_Grpc_dot_OptimizerService__pb2.RegisterObservationsRequest.SerializeToString,
                 response_deserializer=mlos_dot_Grpc_dot_OptimizerService__pb2.Empty.FromString,
                 )
+        self.RegisterObservationsStream = channel.stream_unary(
+                '/mlos.optimizer_service.OptimizerService/RegisterObservationsStream',
+                request_serializer=mlos_dot_Grpc_dot_OptimizerService__pb2.RegisterObservationsRequest.SerializeToString,
+                response_deserializer=mlos_dot_Grpc_dot_OptimizerService__pb2.Empty.FromString,
+                )
         self.Echo = channel.unary_unary(
                 '/mlos.optimizer_service.OptimizerService/Echo',
                 request_serializer=mlos_dot_Grpc_dot_OptimizerService__pb2.Empty.SerializeToString,
@@ -77,6 +87,14 @@ class OptimizerServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SuggestBatch(self, request, context):
+        """Request a batch of suggestions, e.g. one for each of the client's workers.
+        
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def RegisterObservation(self, request, context):
         """Adds an observation to the optimizer's data set.
         
@@ -93,6 +111,15 @@ class OptimizerServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def RegisterObservationsStream(self, request_iterator, context):
+        """Adds observations to the optimizer's data set, streamed in chunks. All chunks must be for the same optimizer.
+        The observations are registered once the client completes the stream.
+        
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Echo(self, request, context):
         """Like ping.
         
@@ -119,6 +146,11 @@ def add_OptimizerServiceServicer_to_server(servicer, server):
                     request_deserializer=mlos_dot_Grpc_dot_OptimizerService__pb2.SuggestRequest.FromString,
                     response_serializer=mlos_dot_Grpc_dot_OptimizerService__pb2.ConfigurationParameters.SerializeToString,
             ),
+            'SuggestBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.SuggestBatch,
+                    request_deserializer=mlos_dot_Grpc_dot_OptimizerService__pb2.SuggestBatchRequest.FromString,
+                    response_serializer=mlos_dot_Grpc_dot_OptimizerService__pb2.ConfigurationParametersBatch.SerializeToString,
+            ),
             'RegisterObservation': grpc.unary_unary_rpc_method_handler(
                     servicer.RegisterObservation,
                     request_deserializer=mlos_dot_Grpc_dot_OptimizerService__pb2.RegisterObservationRequest.FromString,
@@ -129,6 +161,11 @@ def add_OptimizerServiceServicer_to_server(servicer, server):
                     request_deserializer=mlos_dot_Grpc_dot_OptimizerService__pb2.RegisterObservationsRequest.FromString,
                     response_serializer=mlos_dot_Grpc_dot_OptimizerService__pb2.Empty.SerializeToString,
             ),
+            'RegisterObservationsStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.RegisterObservationsStream,
+                    request_deserializer=mlos_dot_Grpc_dot_OptimizerService__pb2.RegisterObservationsRequest.FromString,
+                    response_serializer=mlos_dot_Grpc_dot_OptimizerService__pb2.Empty.SerializeToString,
+            ),
             'Echo': grpc.unary_unary_rpc_method_handler(
                     servicer.Echo,
                     request_deserializer=mlos_dot_Grpc_dot_OptimizerService__pb2.Empty.FromString,
@@ -197,6 +234,23 @@ class OptimizerService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def SuggestBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mlos.optimizer_service.OptimizerService/SuggestBatch',
+            mlos_dot_Grpc_dot_OptimizerService__pb2.SuggestBatchRequest.SerializeToString,
+            mlos_dot_Grpc_dot_OptimizerService__pb2.ConfigurationParametersBatch.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def RegisterObservation(request,
             target,
@@ -231,6 +285,23 @@ class OptimizerService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def RegisterObservationsStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(request_iterator, target, '/mlos.optimizer_service.OptimizerService/RegisterObservationsStream',
+            mlos_dot_Grpc_dot_OptimizerService__pb2.RegisterObservationsRequest.SerializeToString,
+            mlos_dot_Grpc_dot_OptimizerService__pb2.Empty.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def Echo(request,
             target,
@@ -4,13 +4,17 @@
 # Licensed under the MIT License.
 #
 from concurrent.futures import ThreadPoolExecutor
+import threading
 
 import grpc
 
 from mlos.Grpc import OptimizerService_pb2_grpc, OptimizerMonitoringService_pb2_grpc
 from mlos.Grpc.OptimizerService import OptimizerService
 from mlos.Grpc.OptimizerMonitoringService import OptimizerMonitoringService
+from mlos.Grpc.SuggestionPrefetcher import SuggestionPrefetcher
+from mlos.MlosOptimizationServices.BayesianOptimizerStore.BayesianOptimizerFileSystemStore import BayesianOptimizerFileSystemStore
 from mlos.MlosOptimizationServices.BayesianOptimizerStore.BayesianOptimizerInMemoryStore import BayesianOptimizerInMemoryStore
+from mlos.MlosOptimizationServices.BayesianOptimizerStore.BayesianOptimizerShardedStore import BayesianOptimizerShardedStore
 from mlos.Logger import create_logger
 
 
@@ -21,24 +25,68 @@ class OptimizerServicesServer:
     The functionality to stand up the gRPC server is needed in unit tests (in process)
     as well as in the 'start_optimizer_microservice.py' launcher script. Both of them
     should instantiate an object of this class to achieve that.
+
+    Setting num_prefetched_suggestions opts into suggestion prefetching: that many suggestions are kept ready for every
+    optimizer, so that Suggest doesn't have to wait for the optimizer.
+
+    Setting optimizer_store_directory persists the optimizers in that directory, and recovers the ones persisted there
+    by a previous server.
+
+    Setting num_shards hosts the optimizers in that many worker processes instead, so that suggestions and registrations
+    for different optimizers don't compete for the GIL. The shards are started right away, so the server must be
+    constructed before any other gRPC threads are running.
+
+    Setting memory_budget_bytes caps the estimated memory taken by the optimizers kept in the server process: idle
+    optimizers are evicted to eviction_directory and reloaded when they are next used. Only applies to optimizers
+    that are neither persisted nor sharded.
     """
 
-    def __init__(self, port, num_threads=10, logger=None):
+    def __init__(
+            self,
+            port,
+            num_threads=10,
+            logger=None,
+            num_prefetched_suggestions=0,
+            optimizer_store_directory=None,
+            num_shards=0,
+            memory_budget_bytes=None,
+            eviction_directory=None
+    ):
         self.port = port
         self.num_threads = num_threads
+        self.num_prefetched_suggestions = num_prefetched_suggestions
         self.started = False
         self._server = None
         if logger is None:
             logger = create_logger("OptimizerMicroserviceServer init")
         self.logger = logger
-        self._optimizer_store = BayesianOptimizerInMemoryStore(logger=logger)
+        assert optimizer_store_directory is None or num_shards == 0, "Sharded optimizers can't be persisted."
+        assert memory_budget_bytes is None or (optimizer_store_directory is None and num_shards == 0), \
+            "Memory budget only applies to optimizers kept in memory of the server process."
+        if num_shards > 0:
+            self._optimizer_store = BayesianOptimizerShardedStore(num_shards=num_shards, logger=logger)
+        elif optimizer_store_directory is not None:
+            self._optimizer_store = BayesianOptimizerFileSystemStore(root_directory=optimizer_store_directory, logger=logger)
+        else:
+            self._optimizer_store = BayesianOptimizerInMemoryStore(
+                logger=logger,
+                memory_budget_bytes=memory_budget_bytes,
+                eviction_directory=eviction_directory
+            )
+        self._suggestion_prefetcher = None
+        if num_prefetched_suggestions > 0:
+            self._suggestion_prefetcher = SuggestionPrefetcher(
+                bayesian_optimizer_store=self._optimizer_store,
+                num_prefetched_suggestions=num_prefetched_suggestions,
+                logger=logger
+            )
 
 
     def start(self):
         assert self._server is None, "Server already started"
         self._server = grpc.server(ThreadPoolExecutor(max_workers=self.num_threads))
         OptimizerService_pb2_grpc.add_OptimizerServiceServicer_to_server(
-            OptimizerService(bayesian_optimizer_store=self._optimizer_store, logger=self.logger),
+            OptimizerService(bayesian_optimizer_store=self._optimizer_store, logger=self.logger, suggestion_prefetcher=self._suggestion_prefetcher),
             self._server
         )
 
@@ -54,9 +102,19 @@ class OptimizerServicesServer:
 
     def stop(self, grace=None):
         stop_event = self._server.stop(grace=grace)
+        if self._suggestion_prefetcher is not None:
+            self._suggestion_prefetcher.shutdown()
+
+        # Requests in flight may still need the store, so we close it only once they are done.
+        #
+        threading.Thread(target=self._close_optimizer_store, args=(stop_event,), daemon=True).start()
         self.logger.info("OptimizerMicroserviceServer stop requested")
         return stop_event
 
+    def _close_optimizer_store(self, stop_event):
+        stop_event.wait()
+        self._optimizer_store.close()
+
     def wait_for_termination(self, timeout=None):
         if self._server:
             return self._server.wait_for_termination(timeout=timeout)
@@ -0,0 +1,161 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+from typing import List
+
+from mlos.Logger import create_logger
+from mlos.MlosOptimizationServices.BayesianOptimizerStore.BayesianOptimizerStoreBase import BayesianOptimizerStoreBase
+from mlos.Spaces import Point
+
+
+class _PrefetchedSuggestions:
+    """ Suggestions prefetched for a single optimizer. All fields are guarded by the prefetcher's lock.
+
+    """
+
+    def __init__(self):
+        self.suggestions = deque()
+        self.model_version = None
+
+        # Incremented whenever the suggestions are invalidated, so that a refill that started before can tell that the
+        # suggestion it computed is stale.
+        #
+        self.generation = 0
+        self.refill_future = None
+
+        # Set once we learn that the optimizer has a context space.
+        #
+        self.disabled = False
+
+
+class SuggestionPrefetcher:
+    """ Keeps a small queue of precomputed suggestions for every optimizer, so that Suggest only has to pop one.
+
+    Queues are refilled in the background whenever a suggestion is taken. Prefetched suggestions stay valid for as long
+    as the optimizer's model_version stays the same: registering observations that don't refit the surrogate model
+    doesn't change what the optimizer would suggest materially, so only the observations that do refit it flush the
+    queue.
+
+    Refills lock the optimizer for one suggestion at a time, so requests to the optimizer wait for at most one
+    background suggestion.
+
+    Suggestions for optimizers with a context space depend on the context of each request, so they are never prefetched.
+
+    Parameters
+    ----------
+    bayesian_optimizer_store : BayesianOptimizerStoreBase
+        Store holding the optimizers.
+
+    num_prefetched_suggestions : int
+        How many suggestions to keep ready for each optimizer.
+
+    num_threads : int, default=1
+        Number of threads computing suggestions in the background.
+
+    logger : logger, default=None
+        Logger to use. By default, a new logger is created internally.
+    """
+
+    def __init__(self, bayesian_optimizer_store: BayesianOptimizerStoreBase, num_prefetched_suggestions: int, num_threads=1, logger=None):
+        assert num_prefetched_suggestions > 0
+        if logger is None:
+            logger = create_logger(self.__class__.__name__)
+        self.logger = logger
+
+        self._bayesian_optimizer_store = bayesian_optimizer_store
+        self.num_prefetched_suggestions = num_prefetched_suggestions
+        self._executor = ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix=self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._prefetched_suggestions_by_optimizer_id = dict()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def take_suggestions(self, optimizer_id: str, max_num_suggestions: int) -> List[Point]:
+        """ Pops up to max_num_suggestions prefetched suggestions and starts refilling the queue.
+
+        Returns fewer suggestions, possibly none, if not enough are ready. The caller is expected to compute the rest.
+        """
+        with self._lock:
+            prefetched_suggestions = self._get_prefetched_suggestions(optimizer_id)
+            num_suggestions = min(max_num_suggestions, len(prefetched_suggestions.suggestions))
+            suggestions = [prefetched_suggestions.suggestions.popleft() for _ in range(num_suggestions)]
+        self.request_refill(optimizer_id)
+        return suggestions
+
+    def notify_observations_registered(self, optimizer_id: str, model_version) -> None:
+        """ Flushes the optimizer's prefetched suggestions if its model_version changed since they were computed.
+
+        :param optimizer_id:
+        :param model_version: the optimizer's model_version right after the observations were registered.
+        """
+        with self._lock:
+            prefetched_suggestions = self._get_prefetched_suggestions(optimizer_id)
+            if model_version != prefetched_suggestions.model_version:
+                self._invalidate(prefetched_suggestions, model_version)
+        self.request_refill(optimizer_id)
+
+    def request_refill(self, optimizer_id: str) -> Future:
+        """ Starts refilling the optimizer's queue in the background, unless it is full or already being refilled.
+
+        :return: the future of the refill in progress, or None if the queue is full or prefetching is disabled for the optimizer.
+        """
+        with self._lock:
+            prefetched_suggestions = self._get_prefetched_suggestions(optimizer_id)
+            if prefetched_suggestions.disabled:
+                return None
+            if prefetched_suggestions.refill_future is None and len(prefetched_suggestions.suggestions) < self.num_prefetched_suggestions:
+                prefetched_suggestions.refill_future = self._executor.submit(self._refill, optimizer_id, prefetched_suggestions)
+            return prefetched_suggestions.refill_future
+
+    def _get_prefetched_suggestions(self, optimizer_id: str) -> _PrefetchedSuggestions:
+        prefetched_suggestions = self._prefetched_suggestions_by_optimizer_id.get(optimizer_id, None)
+        if prefetched_suggestions is None:
+            prefetched_suggestions = _PrefetchedSuggestions()
+            self._prefetched_suggestions_by_optimizer_id[optimizer_id] = prefetched_suggestions
+        return prefetched_suggestions
+
+    @staticmethod
+    def _invalidate(prefetched_suggestions: _PrefetchedSuggestions, model_version) -> None:
+        prefetched_suggestions.suggestions.clear()
+        prefetched_suggestions.model_version = model_version
+        prefetched_suggestions.generation += 1
+
+    def _refill(self, optimizer_id: str, prefetched_suggestions: _PrefetchedSuggestions) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if len(prefetched_suggestions.suggestions) >= self.num_prefetched_suggestions:
+                        prefetched_suggestions.refill_future = None
+                        return
+                    generation = prefetched_suggestions.generation
+
+                with self._bayesian_optimizer_store.exclusive_optimizer(optimizer_id=optimizer_id) as optimizer:
+                    if optimizer.optimization_problem.context_space is not None:
+                        with self._lock:
+                            prefetched_suggestions.disabled = True
+                            prefetched_suggestions.refill_future = None
+                        return
+                    model_version = optimizer.model_version
+                    suggestion = optimizer.suggest()
+
+                with self._lock:
+                    if generation != prefetched_suggestions.generation:
+                        # Observations were registered while we were suggesting.
+                        #
+                        continue
+                    if model_version != prefetched_suggestions.model_version:
+                        # Either the first suggestion for this optimizer or one that beat the notification about new
+                        # observations. Either way the suggestion is current and the ones before it are not.
+                        #
+                        self._invalidate(prefetched_suggestions, model_version)
+                    prefetched_suggestions.suggestions.append(suggestion)
+        except Exception:
+            self.logger.error(f"Failed to prefetch suggestions for optimizer {optimizer_id}.", exc_info=True)
+            with self._lock:
+                prefetched_suggestions.refill_future = None
+            raise
@@ -0,0 +1,81 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlos.Grpc import OptimizerMonitoringService_pb2, OptimizerService_pb2
+from mlos.Grpc.DataFrameEncoderDecoder import DataFrameDecoder, DataFrameEncoder, DataFrameFormat
+
+
+class _FakeGrpcContext:
+
+    def __init__(self, metadata):
+        self._metadata = metadata
+
+    def invocation_metadata(self):
+        return self._metadata
+
+
+class TestDataFrameEncoderDecoder:
+    """ Tests encoding and decoding of columnar dataframes.
+
+    """
+
+    def setup_method(self, method):
+        num_rows = 1000
+        self.dataframe = pd.DataFrame(
+            {
+                'x': np.random.uniform(size=num_rows),
+                'n': np.random.randint(0, 100, size=num_rows),
+                'flag': np.random.uniform(size=num_rows) > 0.5,
+                'color': np.random.choice(['red', 'green', 'blue'], size=num_rows),
+                'sparse': [np.nan if i % 3 == 0 else float(i) for i in range(num_rows)],
+                'mixed': [None if i % 5 == 0 else 'a' for i in range(num_rows)]
+            },
+            index=np.random.permutation(num_rows) + 10
+        )
+
+    @pytest.mark.parametrize('pb2_module', [OptimizerService_pb2, OptimizerMonitoringService_pb2])
+    def test_round_trip(self, pb2_module):
+        serialized = DataFrameEncoder.encode_dataframe(self.dataframe, pb2_module=pb2_module)
+        assert isinstance(serialized, pb2_module.DataFrame)
+        column_types = {column.Name: column.Type for column in serialized.Columns}
+        assert column_types['x'] == pb2_module.ColumnType.FLOAT64
+        assert column_types['n'] == pb2_module.ColumnType.INT64
+        assert column_types['flag'] == pb2_module.ColumnType.BOOL
+        assert column_types['sparse'] == pb2_module.ColumnType.FLOAT64
+        assert column_types['color'] == pb2_module.ColumnType.JSON
+
+        deserialized = DataFrameDecoder.decode_dataframe(pb2_module.DataFrame.FromString(serialized.SerializeToString()))
+        assert list(deserialized.columns) == list(self.dataframe.columns)
+        assert (deserialized.index == self.dataframe.index).all()
+        for column_name in ['x', 'n', 'flag']:
+            assert deserialized[column_name].dtype == self.dataframe[column_name].dtype
+            assert (deserialized[column_name] == self.dataframe[column_name]).all()
+        assert (deserialized['color'] == self.dataframe['color']).all()
+        assert deserialized['sparse'].equals(self.dataframe['sparse'])
+        assert (deserialized['mixed'].isnull() == self.dataframe['mixed'].isnull()).all()
+
+    def test_empty_dataframe(self):
+        empty_dataframe = self.dataframe.iloc[:0]
+        deserialized = DataFrameDecoder.decode_dataframe(DataFrameEncoder.encode_dataframe(empty_dataframe))
+        assert len(deserialized.index) == 0
+        assert list(deserialized.columns) == list(empty_dataframe.columns)
+
+    def test_features_fall_back_to_json(self):
+        features_pb2 = OptimizerService_pb2.Features(FeaturesJsonString=self.dataframe[['x', 'n']].to_json(orient='index', double_precision=15))
+        features_df = DataFrameDecoder.decode_features_dataframe(features_pb2)
+        assert np.allclose(features_df['x'].to_numpy(), self.dataframe[['x']].sort_index()['x'].to_numpy())
+
+        features_pb2 = OptimizerService_pb2.Features(FeaturesDataFrame=DataFrameEncoder.encode_dataframe(self.dataframe[['x', 'n']]))
+        features_df = DataFrameDecoder.decode_features_dataframe(features_pb2)
+        assert features_df.equals(self.dataframe[['x', 'n']])
+
+    def test_format_negotiation(self):
+        assert DataFrameFormat.from_grpc_context(None) == DataFrameFormat.JSON
+        assert DataFrameFormat.from_grpc_context(_FakeGrpcContext(metadata=())) == DataFrameFormat.JSON
+        assert DataFrameFormat.from_grpc_context(_FakeGrpcContext(metadata=DataFrameFormat.COLUMNAR.to_metadata())) == DataFrameFormat.COLUMNAR
+        assert DataFrameFormat.from_grpc_context(_FakeGrpcContext(metadata=(('mlos-dataframe-format', 'xml'),))) == DataFrameFormat.JSON
@@ -0,0 +1,96 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import mlos.global_values as global_values
+from mlos.Grpc.SuggestionPrefetcher import SuggestionPrefetcher
+from mlos.MlosOptimizationServices.BayesianOptimizerStore.BayesianOptimizerInMemoryStore import BayesianOptimizerInMemoryStore
+from mlos.OptimizerEvaluationTools.ObjectiveFunctionFactory import ObjectiveFunctionFactory, objective_function_config_store
+from mlos.Optimizers.BayesianOptimizer import BayesianOptimizer, bayesian_optimizer_config_store
+from mlos.Optimizers.OptimizationProblem import OptimizationProblem, Objective
+
+
+class TestSuggestionPrefetcher:
+    """ Tests prefetching and invalidation of suggestions.
+
+    """
+
+    @classmethod
+    def setup_class(cls):
+        global_values.declare_singletons()
+
+    def setup_method(self, method):
+        objective_function_config = objective_function_config_store.get_config_by_name('2d_quadratic_concave_up')
+        self.objective_function = ObjectiveFunctionFactory.create_objective_function(objective_function_config)
+        optimization_problem = OptimizationProblem(
+            parameter_space=self.objective_function.parameter_space,
+            objective_space=self.objective_function.output_space,
+            objectives=[Objective(name='y', minimize=True)]
+        )
+
+        self.optimizer_store = BayesianOptimizerInMemoryStore()
+        self.optimizer_id = self.optimizer_store.get_next_optimizer_id()
+        self.optimizer_store.add_optimizer(
+            optimizer_id=self.optimizer_id,
+            optimizer=BayesianOptimizer(optimization_problem=optimization_problem, optimizer_config=bayesian_optimizer_config_store.default)
+        )
+        self.num_prefetched_suggestions = 3
+        self.suggestion_prefetcher = SuggestionPrefetcher(
+            bayesian_optimizer_store=self.optimizer_store,
+            num_prefetched_suggestions=self.num_prefetched_suggestions
+        )
+
+    def teardown_method(self, method):
+        self.suggestion_prefetcher.shutdown()
+
+    def wait_for_refill(self):
+        refill_future = self.suggestion_prefetcher.request_refill(self.optimizer_id)
+        if refill_future is not None:
+            refill_future.result(timeout=60)
+
+    def get_prefetched_suggestions(self):
+        return list(self.suggestion_prefetcher._prefetched_suggestions_by_optimizer_id[self.optimizer_id].suggestions)  # pylint: disable=protected-access
+
+    def register_observations(self, num_observations):
+        with self.optimizer_store.exclusive_optimizer(optimizer_id=self.optimizer_id) as optimizer:
+            parameters_df = optimizer.optimization_problem.parameter_space.random_dataframe(num_samples=num_observations)
+            optimizer.register(parameters_df, self.objective_function.evaluate_dataframe(parameters_df))
+            model_version = optimizer.model_version
+        self.suggestion_prefetcher.notify_observations_registered(optimizer_id=self.optimizer_id, model_version=model_version)
+
+    def test_queue_is_refilled_after_suggestions_are_taken(self):
+        self.wait_for_refill()
+        suggestions = self.suggestion_prefetcher.take_suggestions(optimizer_id=self.optimizer_id, max_num_suggestions=10)
+        assert len(suggestions) == self.num_prefetched_suggestions
+
+        with self.optimizer_store.exclusive_optimizer(optimizer_id=self.optimizer_id) as optimizer:
+            assert all(suggestion in optimizer.optimization_problem.parameter_space for suggestion in suggestions)
+
+        self.wait_for_refill()
+        assert len(self.suggestion_prefetcher.take_suggestions(optimizer_id=self.optimizer_id, max_num_suggestions=1)) == 1
+
+    def test_suggestions_are_invalidated_when_model_changes(self):
+        self.wait_for_refill()
+
+        # Before the optimizer switches to guided suggestions, new observations don't change the suggestions materially.
+        #
+        self.register_observations(num_observations=1)
+        suggestions = self.suggestion_prefetcher.take_suggestions(optimizer_id=self.optimizer_id, max_num_suggestions=10)
+        assert len(suggestions) == self.num_prefetched_suggestions
+
+        # Once the surrogate model is fit, the random suggestions are stale.
+        #
+        self.wait_for_refill()
+        stale_suggestions = self.get_prefetched_suggestions()
+        assert len(stale_suggestions) == self.num_prefetched_suggestions
+
+        # Each tree in the surrogate forest only sees a fraction of the observations, so it takes a few more for them to fit.
+        #
+        self.register_observations(num_observations=2 * bayesian_optimizer_config_store.default.min_samples_required_for_guided_design_of_experiments)
+        with self.optimizer_store.exclusive_optimizer(optimizer_id=self.optimizer_id) as optimizer:
+            assert optimizer.trained
+
+        self.wait_for_refill()
+        fresh_suggestions = self.suggestion_prefetcher.take_suggestions(optimizer_id=self.optimizer_id, max_num_suggestions=10)
+        assert len(fresh_suggestions) == self.num_prefetched_suggestions
+        assert not any(fresh_suggestion == stale_suggestion for fresh_suggestion in fresh_suggestions for stale_suggestion in stale_suggestions)
@@ -0,0 +1,245 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+from contextlib import contextmanager
+import os
+import struct
+import threading
+from typing import Iterator, List
+import zlib
+
+import pandas as pd
+
+from mlos.Logger import create_logger
+from mlos.MlosOptimizationServices.BayesianOptimizerStore.BayesianOptimizerInMemoryStore import BayesianOptimizerInMemoryStore
+from mlos.MlosOptimizationServices.BayesianOptimizerStore.ObservationLog import ObservationLog, fsync_directory
+from mlos.Optimizers.BayesianOptimizer import BayesianOptimizer
+from mlos.Optimizers.OptimizerCheckpoint import OptimizerCheckpoint
+
+
+class _PersistedOptimizerState:
+    """ Tracks what of an optimizer has been persisted. Only accessed while holding the optimizer's writer lock.
+
+    """
+
+    def __init__(self, directory: str, observation_log: ObservationLog, num_logged_observations: int, snapshot_sequence_number: int):
+        self.directory = directory
+        self.observation_log = observation_log
+        self.num_logged_observations = num_logged_observations
+        self.snapshot_sequence_number = snapshot_sequence_number
+
+
+class BayesianOptimizerFileSystemStore(BayesianOptimizerInMemoryStore):
+    """Keeps the optimizers in memory, like the BayesianOptimizerInMemoryStore, and persists them in a directory.
+
+    Goal
+        Optimizers survive restarts of the microservice, and restarting takes time proportional to the number of
+        observations registered since the last snapshot, rather than to the whole history.
+
+    Layout
+        root_directory/
+            optimizer_ids                   - ids of the optimizers in the order they were added, one per line
+            <optimizer_id>/
+                snapshot.<sequence_number>  - a checkpoint of the optimizer after applying the log up to sequence_number
+                observations.<n>.log        - segments of the optimizer's ObservationLog
+
+    Functionality
+        Whenever exclusive use of an optimizer ends, the observations registered in the meantime are appended to its
+        ObservationLog. The log is checksummed and fsync'ed in batches, see ObservationLog for the guarantees.
+
+        Every num_log_records_between_snapshots records, a snapshot of the whole optimizer - observations, fitted
+        models and all - is written to a temporary file, fsync'ed and atomically renamed into place. The log then moves
+        on to a new segment. The previous snapshot is retained as a fallback in case the latest one is unreadable;
+        older snapshots and the log segments that only they need are deleted.
+
+        On construction, the store recovers every optimizer in root_directory: it loads the latest readable snapshot
+        and registers all the observations logged after it in a single call, so the models are refit at most once.
+
+        Suggestions don't change the persisted state. Anything about the optimizer that changes when it suggests
+        (e.g. its random state) is only as recent as the latest snapshot after a restart.
+
+    """
+
+    _snapshot_header = struct.Struct('<8sQI')
+    _snapshot_magic = b'MLOSOPT1'
+    _snapshot_file_prefix = "snapshot."
+    _optimizer_ids_file_name = "optimizer_ids"
+
+    def __init__(
+            self,
+            root_directory: str,
+            num_log_records_between_snapshots: int = 100,
+            fsync_batch_size: int = 16,
+            fsync_interval_s: float = 1.0,
+            logger=None
+    ):
+        assert num_log_records_between_snapshots > 0
+        if logger is None:
+            logger = create_logger(self.__class__.__name__)
+        BayesianOptimizerInMemoryStore.__init__(self, logger=logger)
+
+        self.root_directory = root_directory
+        self.num_log_records_between_snapshots = num_log_records_between_snapshots
+        self.fsync_batch_size = fsync_batch_size
+        self.fsync_interval_s = fsync_interval_s
+
+        self._persisted_state_by_optimizer_id = dict()
+
+        # Serializes appends to the optimizer_ids file.
+        #
+        self._optimizer_ids_file_lock = threading.Lock()
+
+        os.makedirs(self.root_directory, exist_ok=True)
+        self._recover()
+
+    @contextmanager
+    def exclusive_optimizer(self, optimizer_id: str, optimizer_version: int = None) -> Iterator[BayesianOptimizer]:
+        """ Same as in the BayesianOptimizerInMemoryStore, but persists the observations registered in the meantime on the way out.
+
+        """
+        with BayesianOptimizerInMemoryStore.exclusive_optimizer(self, optimizer_id=optimizer_id, optimizer_version=optimizer_version) as optimizer:
+            try:
+                yield optimizer
+            finally:
+                self._persist(optimizer_id=optimizer_id, optimizer=optimizer)
+
+    def add_optimizer(self, optimizer_id: str, optimizer: BayesianOptimizer) -> None:
+        optimizer_directory = os.path.join(self.root_directory, optimizer_id)
+        os.makedirs(optimizer_directory)
+        self._write_snapshot(optimizer_directory=optimizer_directory, sequence_number=0, optimizer=optimizer)
+        self._persisted_state_by_optimizer_id[optimizer_id] = _PersistedOptimizerState(
+            directory=optimizer_directory,
+            observation_log=self._open_observation_log(optimizer_directory),
+            num_logged_observations=optimizer.num_observed_samples,
+            snapshot_sequence_number=0
+        )
+        with self._optimizer_ids_file_lock:
+            with open(os.path.join(self.root_directory, self._optimizer_ids_file_name), 'a') as optimizer_ids_file:
+                optimizer_ids_file.write(optimizer_id + "\n")
+                optimizer_ids_file.flush()
+                os.fsync(optimizer_ids_file.fileno())
+        BayesianOptimizerInMemoryStore.add_optimizer(self, optimizer_id=optimizer_id, optimizer=optimizer)
+
+    def close(self) -> None:
+        """ Syncs and closes all observation logs.
+
+        """
+        for optimizer_id in self.list_optimizer_ids():
+            with BayesianOptimizerInMemoryStore.exclusive_optimizer(self, optimizer_id=optimizer_id):
+                self._persisted_state_by_optimizer_id[optimizer_id].observation_log.close()
+        BayesianOptimizerInMemoryStore.close(self)
+
+    def _persist(self, optimizer_id: str, optimizer: BayesianOptimizer) -> None:
+        persisted_state = self._persisted_state_by_optimizer_id[optimizer_id]
+        if optimizer.num_observed_samples == persisted_state.num_logged_observations:
+            return
+
+        features_df, objectives_df, context_df = optimizer.get_observations_since(persisted_state.num_logged_observations)
+        if len(context_df.columns) == 0:
+            context_df = None
+        sequence_number = persisted_state.observation_log.append(features_df, objectives_df, context_df)
+        persisted_state.num_logged_observations = optimizer.num_observed_samples
+
+        if sequence_number - persisted_state.snapshot_sequence_number >= self.num_log_records_between_snapshots:
+            persisted_state.observation_log.sync()
+            self._write_snapshot(optimizer_directory=persisted_state.directory, sequence_number=sequence_number, optimizer=optimizer)
+            persisted_state.observation_log.start_new_segment()
+
+            # Keep the previous snapshot, and the log segments needed to roll it forward, in case this one turns out unreadable.
+            #
+            previous_snapshot_sequence_number = persisted_state.snapshot_sequence_number
+            persisted_state.snapshot_sequence_number = sequence_number
+            for snapshot_sequence_number in self._list_snapshots(persisted_state.directory):
+                if snapshot_sequence_number < previous_snapshot_sequence_number:
+                    os.remove(self._snapshot_path(persisted_state.directory, snapshot_sequence_number))
+            persisted_state.observation_log.delete_segments_before(previous_snapshot_sequence_number + 1)
+
+    def _recover(self) -> None:
+        optimizer_ids_path = os.path.join(self.root_directory, self._optimizer_ids_file_name)
+        if not os.path.exists(optimizer_ids_path):
+            return
+
+        with open(optimizer_ids_path, 'r') as optimizer_ids_file:
+            # A crash mid-append can leave the last line incomplete, but then its optimizer was never acknowledged as created.
+            #
+            optimizer_ids = [line[:-1] for line in optimizer_ids_file if line.endswith("\n")]
+
+        for optimizer_id in optimizer_ids:
+            optimizer_directory = os.path.join(self.root_directory, optimizer_id)
+            snapshot_sequence_number, optimizer = self._load_latest_snapshot(optimizer_directory)
+            if optimizer is None:
+                self.logger.error(f"Found no readable snapshot of optimizer {optimizer_id}. Skipping it.")
+                continue
+
+            observation_log = self._open_observation_log(optimizer_directory)
+            tail_records = list(observation_log.read_records(after_sequence_number=snapshot_sequence_number))
+            if len(tail_records) > 0:
+                _, features_dfs, objectives_dfs, context_dfs = zip(*tail_records)
+                optimizer.register(
+                    parameter_values_pandas_frame=pd.concat(features_dfs, ignore_index=True),
+                    target_values_pandas_frame=pd.concat(objectives_dfs, ignore_index=True),
+                    context_values_pandas_frame=pd.concat(context_dfs, ignore_index=True) if context_dfs[0] is not None else None
+                )
+            self.logger.info(f"Recovered optimizer {optimizer_id} from snapshot {snapshot_sequence_number} and {len(tail_records)} log records.")
+
+            self._persisted_state_by_optimizer_id[optimizer_id] = _PersistedOptimizerState(
+                directory=optimizer_directory,
+                observation_log=observation_log,
+                num_logged_observations=optimizer.num_observed_samples,
+                snapshot_sequence_number=snapshot_sequence_number
+            )
+            BayesianOptimizerInMemoryStore.add_optimizer(self, optimizer_id=optimizer_id, optimizer=optimizer)
+
+    def _open_observation_log(self, optimizer_directory: str) -> ObservationLog:
+        return ObservationLog(
+            directory=optimizer_directory,
+            fsync_batch_size=self.fsync_batch_size,
+            fsync_interval_s=self.fsync_interval_s,
+            logger=self.logger
+        )
+
+    def _write_snapshot(self, optimizer_directory: str, sequence_number: int, optimizer: BayesianOptimizer) -> None:
+        payload = OptimizerCheckpoint.dumps(optimizer)
+        header = self._snapshot_header.pack(self._snapshot_magic, sequence_number, zlib.crc32(payload))
+        snapshot_path = self._snapshot_path(optimizer_directory, sequence_number)
+        temp_snapshot_path = snapshot_path + ".tmp"
+        with open(temp_snapshot_path, 'wb') as snapshot_file:
+            snapshot_file.write(header)
+            snapshot_file.write(payload)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temp_snapshot_path, snapshot_path)
+        fsync_directory(optimizer_directory)
+
+    def _load_latest_snapshot(self, optimizer_directory: str):
+        """ Returns (sequence_number, optimizer) from the latest readable snapshot, or (None, None) if there is none.
+
+        """
+        for sequence_number in reversed(self._list_snapshots(optimizer_directory)):
+            snapshot_path = self._snapshot_path(optimizer_directory, sequence_number)
+            with open(snapshot_path, 'rb') as snapshot_file:
+                snapshot_bytes = snapshot_file.read()
+            header = snapshot_bytes[:self._snapshot_header.size]
+            payload = snapshot_bytes[self._snapshot_header.size:]
+            if len(header) == self._snapshot_header.size:
+                magic, header_sequence_number, checksum = self._snapshot_header.unpack(header)
+                if magic == self._snapshot_magic and header_sequence_number == sequence_number and zlib.crc32(payload) == checksum:
+                    # Snapshots written before optimizers were checkpointed are pickles, which OptimizerCheckpoint also loads.
+                    #
+                    return sequence_number, OptimizerCheckpoint.loads(payload, logger=self.logger)
+            self.logger.warning(f"Snapshot {snapshot_path} is corrupt. Falling back to an earlier one.")
+        return None, None
+
+    def _snapshot_path(self, optimizer_directory: str, sequence_number: int) -> str:
+        return os.path.join(optimizer_directory, f"{self._snapshot_file_prefix}{sequence_number:020d}")
+
+    def _list_snapshots(self, optimizer_directory: str) -> List[int]:
+        """ Returns the sequence numbers of all complete snapshots in ascending order.
+
+        """
+        return sorted(
+            int(file_name[len(self._snapshot_file_prefix):])
+            for file_name in os.listdir(optimizer_directory)
+            if file_name.startswith(self._snapshot_file_prefix) and file_name[len(self._snapshot_file_prefix):].isdigit()
+        )
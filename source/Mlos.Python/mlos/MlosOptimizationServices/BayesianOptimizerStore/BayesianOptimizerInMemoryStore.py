@@ -2,13 +2,69 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 #
+from collections import OrderedDict
 from contextlib import contextmanager
-import multiprocessing
+from enum import Enum
+import os
+import pickle
+import tempfile
+import threading
 from typing import Iterable, Iterator, Tuple
 
 from mlos.Logger import create_logger
 from mlos.MlosOptimizationServices.BayesianOptimizerStore.BayesianOptimizerStoreBase import BayesianOptimizerStoreBase
+from mlos.MlosOptimizationServices.BayesianOptimizerStore.OptimizerSnapshot import OptimizerSnapshot
 from mlos.Optimizers.BayesianOptimizer import BayesianOptimizer
+from mlos.Optimizers.OptimizationProblem import OptimizationProblem
+from mlos.Optimizers.OptimizerCheckpoint import OptimizerCheckpoint
+from mlos.Spaces import Point
+from mlos.Utils.ReaderWriterLock import ReaderWriterLock
+
+
+class OptimizerEvictionPolicy(Enum):
+    """ Determines which optimizers are evicted first when the store exceeds its memory budget.
+
+    """
+
+    LEAST_RECENTLY_USED = 'least_recently_used'
+    LARGEST_FIRST = 'largest_first'
+
+
+class _OptimizerEntry:
+    """ An optimizer along with its lock, version, latest snapshot and memory accounting.
+
+    """
+
+    def __init__(self, optimizer: BayesianOptimizer):
+        self.optimizer = optimizer
+        self.lock = ReaderWriterLock()
+
+        # Kept even while the optimizer is evicted, so that listing optimizers doesn't have to reload them.
+        #
+        self.optimizer_config = optimizer.optimizer_config
+        self.optimization_problem = optimizer.optimization_problem
+
+        # Incremented every time an exclusive use of the optimizer ends. Only written while holding the writer lock.
+        #
+        self.version = 0
+
+        # Replaced, never modified, so readers can grab it without locking.
+        #
+        self.snapshot = None
+
+        # The fields below are only used if the store has a memory budget. The optimizer is None while it is evicted
+        # and evicted_path is None while it is not. Both are only changed while holding the writer lock.
+        #
+        self.evicted_path = None
+        self.pinned = False
+        self.footprint_bytes = 0
+
+        # Pickling the model to measure it is expensive, so we only do it when the model changes.
+        #
+        self.model_version = None
+        self.model_footprint_bytes = 0
+        self.num_observations = None
+        self.observations_footprint_bytes = 0
 
 
 class BayesianOptimizerInMemoryStore(BayesianOptimizerStoreBase):
@@ -23,37 +79,91 @@ class BayesianOptimizerInMemoryStore(BayesianOptimizerStoreBase):
         Stores optimizers in memory and retrieves them to help satisfy the requests handled by the Optimizer
         Microservice.
 
-        All optimizers have an associated lock which is used to provide exlcusive access to the optimizer in
-        a multi-threaded set up. A reader-writer lock would have been more efficient, and keeping the optimizer
-        versioned might also help.
+        All optimizers have an associated reader-writer lock. Requests that modify the optimizer (suggest, register)
+        hold the writer lock, requests that only query the model (predict, goodness of fit) share the reader lock.
 
-    """
+        Each optimizer is also versioned: the version is bumped every time the writer lock is released. Monitoring
+        requests that only need the observations and metadata read an OptimizerSnapshot of the latest version, which
+        is taken on the first such request after a change and then shared until the next one. While a writer holds
+        the optimizer, they are served the previous snapshot and don't wait at all.
+
+        The registry of optimizers is copy-on-write: adding an optimizer replaces the dictionary, so lookups and
+        enumeration never lock.
+
+    Memory budget
+        If memory_budget_bytes is set, the store keeps track of the estimated footprint of every optimizer: the memory
+        taken by its observations plus the pickled size of its surrogate model. Whenever the total exceeds the budget,
+        idle optimizers are evicted, in the order given by the eviction_policy, until it doesn't. Evicted optimizers are
+        checkpointed (see OptimizerCheckpoint) to eviction_directory, and transparently reloaded by the next request for them.
+
+        Optimizers that are in use are never evicted, nor are pinned optimizers. If the optimizers in use alone exceed the
+        budget, the store exceeds it too.
+
+        Snapshots are dropped when their optimizer is evicted. Their memory is not accounted for.
 
-    def __init__(self, logger=None):
-        self._lock_manager = multiprocessing.Manager()
+    Parameters
+    ----------
+    logger : logger, default=None
+        Logger to use. By default, a new logger is created internally.
 
-        self._optimizers_by_id = dict()
-        self._ordered_optimizer_ids = []
-        self._optimizer_locks_by_optimizer_id = dict()
+    memory_budget_bytes : int, default=None
+        Total estimated footprint of the optimizers kept in memory. By default, all optimizers are kept in memory.
 
-        # This lock is to protect the data structures above mostly making sure that we don't insert another optimizer while enumerating
-        # exisitng ones or don't try to retrieve from the dictionary while another thread is inserting into it.
+    eviction_directory : str, default=None
+        Directory to write evicted optimizers to. Defaults to a new temporary directory.
+
+    eviction_policy : OptimizerEvictionPolicy, default=OptimizerEvictionPolicy.LEAST_RECENTLY_USED
+        Which optimizers to evict first.
+    """
+
+    def __init__(
+            self,
+            logger=None,
+            memory_budget_bytes: int = None,
+            eviction_directory: str = None,
+            eviction_policy: OptimizerEvictionPolicy = OptimizerEvictionPolicy.LEAST_RECENTLY_USED
+    ):
+        self._entries_by_optimizer_id = dict()
+        self._ordered_optimizer_ids = tuple()
+
+        # Serializes adding optimizers. Readers of the two fields above don't need it, since they are only ever replaced.
         #
-        self._lock = self._lock_manager.RLock()
+        self._lock = threading.Lock()
 
         if logger is None:
             logger = create_logger(self.__class__.__name__)
         self.logger = logger
+
+        assert memory_budget_bytes is None or memory_budget_bytes > 0
+        self.memory_budget_bytes = memory_budget_bytes
+        self.eviction_policy = eviction_policy
+        if memory_budget_bytes is not None and eviction_directory is None:
+            eviction_directory = tempfile.mkdtemp(prefix="mlos_evicted_optimizers_")
+        self.eviction_directory = eviction_directory
+        if eviction_directory is not None:
+            os.makedirs(eviction_directory, exist_ok=True)
+
+        # Guards the accounting below. Never held while waiting for an optimizer's lock.
+        #
+        self._memory_lock = threading.Lock()
+        self.total_footprint_bytes = 0
+
+        # Ids of optimizers in memory, least recently used first.
+        #
+        self._resident_optimizer_ids = OrderedDict()
+
         self.logger.info(f"{self.__class__.__name__} initialized.")
 
 
     @contextmanager
     def exclusive_optimizer(self, optimizer_id: str, optimizer_version: int = None) -> Iterator[BayesianOptimizer]:
-        """ Context manager to acquire the optimizer lock and yield the corresponding optimizer.
+        """ Context manager to acquire the optimizer's writer lock and yield the corresponding optimizer.
 
         This makes sure that:
             1. The lock is acquired before any operation on the optimizer commences.
             2. The lock is released even if exceptions are flying.
+            3. The optimizer's version is bumped, so that the next snapshot reflects the changes.
+            4. The optimizer is reloaded first if it was evicted.
 
 
         :param optimizer_id:
@@ -61,28 +171,204 @@ class BayesianOptimizerInMemoryStore(BayesianOptimizerStoreBase):
         :return:
         :raises: KeyError if the optimizer_id was not found.
         """
-        with self._optimizer_locks_by_optimizer_id[optimizer_id]:
-            with self._lock:
-                optimizer = self._optimizers_by_id[optimizer_id]
-            yield optimizer
+        entry = self._entries_by_optimizer_id[optimizer_id]
+        with entry.lock.writer():
+            self._reload_if_evicted(optimizer_id, entry)
+            self._touch(optimizer_id)
+            try:
+                yield entry.optimizer
+            finally:
+                entry.version += 1
+                self._update_footprint(entry)
+        self._enforce_memory_budget(keep_optimizer_id=optimizer_id)
+
+    @contextmanager
+    def shared_optimizer(self, optimizer_id: str) -> Iterator[BayesianOptimizer]:
+        """ Context manager to acquire the optimizer's reader lock and yield the corresponding optimizer.
+
+        The optimizer must not be modified.
+
+        :param optimizer_id:
+        :return:
+        :raises: KeyError if the optimizer_id was not found.
+        """
+        entry = self._entries_by_optimizer_id[optimizer_id]
+        while True:
+            with entry.lock.reader():
+                if entry.optimizer is not None:
+                    self._touch(optimizer_id)
+                    yield entry.optimizer
+                    return
+
+            # Reloading needs the writer lock. Someone may evict the optimizer again before we get the reader lock back,
+            # in which case we just try again.
+            #
+            with entry.lock.writer():
+                self._reload_if_evicted(optimizer_id, entry)
+            self._enforce_memory_budget(keep_optimizer_id=optimizer_id)
+
+    def get_optimizer_snapshot(self, optimizer_id: str) -> OptimizerSnapshot:
+        entry = self._entries_by_optimizer_id[optimizer_id]
+        snapshot = entry.snapshot
+        if snapshot is not None and snapshot.version == entry.version:
+            return snapshot
+
+        with self.shared_optimizer(optimizer_id) as optimizer:
+            # Concurrent readers may both take a snapshot of the same version. Either one will do.
+            #
+            snapshot = entry.snapshot
+            if snapshot is None or snapshot.version != entry.version:
+                snapshot = OptimizerSnapshot(optimizer_id=optimizer_id, version=entry.version, optimizer=optimizer)
+                entry.snapshot = snapshot
+        return snapshot
 
     def list_optimizers(self) -> Iterable[Tuple[str, BayesianOptimizer]]:
-        with self._lock:
-            for optimizer_id in self._ordered_optimizer_ids:
-                yield optimizer_id, self._optimizers_by_id[optimizer_id]
+        """ Yields (optimizer_id, optimizer) for all optimizers, reloading the evicted ones.
+
+        Use list_optimizer_ids() and describe_optimizer() to list optimizers without reloading them.
+        """
+        for optimizer_id in self.list_optimizer_ids():
+            yield optimizer_id, self.get_optimizer(optimizer_id)
+
+    def list_optimizer_ids(self) -> Iterable[str]:
+        return self._ordered_optimizer_ids
+
+    def describe_optimizer(self, optimizer_id: str) -> Tuple[Point, OptimizationProblem]:
+        entry = self._entries_by_optimizer_id[optimizer_id]
+        return entry.optimizer_config, entry.optimization_problem
 
     def get_optimizer(self, optimizer_id: str) -> BayesianOptimizer:
-        with self._lock:
-            optimizer = self._optimizers_by_id[optimizer_id]
+        entry = self._entries_by_optimizer_id[optimizer_id]
+        optimizer = entry.optimizer
+        if optimizer is None:
+            with self.shared_optimizer(optimizer_id) as reloaded_optimizer:
+                optimizer = reloaded_optimizer
         return optimizer
 
     def add_optimizer(self, optimizer_id: str, optimizer: BayesianOptimizer) -> None:
-        # To avoid a race condition we acquire the lock before inserting the lock and the optimizer into their respective
-        # dictionaries. Otherwise we could end up with a situation where a lock is in the dictionary, but the optimizer
-        # is not.
         self.logger.info(f"Adding optimizer {optimizer_id}.")
-        optimizer_lock = self._lock_manager.RLock()
-        with optimizer_lock, self._lock:
-            self._optimizer_locks_by_optimizer_id[optimizer_id] = optimizer_lock
-            self._optimizers_by_id[optimizer_id] = optimizer
-            self._ordered_optimizer_ids.append(optimizer_id)
+        entry = _OptimizerEntry(optimizer)
+        self._update_footprint(entry)
+        with self._lock:
+            entries_by_optimizer_id = dict(self._entries_by_optimizer_id)
+            entries_by_optimizer_id[optimizer_id] = entry
+            self._entries_by_optimizer_id = entries_by_optimizer_id
+            self._ordered_optimizer_ids = self._ordered_optimizer_ids + (optimizer_id,)
+        self._touch(optimizer_id)
+        self._enforce_memory_budget(keep_optimizer_id=optimizer_id)
+
+    def pin_optimizer(self, optimizer_id: str, pinned: bool = True) -> None:
+        """ Pinned optimizers are never evicted. Pinning an evicted optimizer doesn't reload it until it's next used.
+
+        """
+        entry = self._entries_by_optimizer_id[optimizer_id]
+        with entry.lock.writer():
+            entry.pinned = pinned
+        if not pinned:
+            self._enforce_memory_budget()
+
+    def is_evicted(self, optimizer_id: str) -> bool:
+        return self._entries_by_optimizer_id[optimizer_id].optimizer is None
+
+    def close(self) -> None:
+        """ Deletes the files of evicted optimizers.
+
+        """
+        for entry in self._entries_by_optimizer_id.values():
+            with entry.lock.writer():
+                if entry.evicted_path is not None:
+                    os.remove(entry.evicted_path)
+                    entry.evicted_path = None
+
+    def _touch(self, optimizer_id: str) -> None:
+        if self.memory_budget_bytes is None:
+            return
+        with self._memory_lock:
+            self._resident_optimizer_ids[optimizer_id] = None
+            self._resident_optimizer_ids.move_to_end(optimizer_id)
+
+    def _update_footprint(self, entry: _OptimizerEntry) -> None:
+        """ Re-estimates the footprint of a resident optimizer. Must hold the writer lock, unless the entry isn't visible yet.
+
+        """
+        if self.memory_budget_bytes is None:
+            return
+        optimizer = entry.optimizer
+        model_version = optimizer.model_version
+        if model_version != entry.model_version:
+            entry.model_footprint_bytes = len(pickle.dumps(optimizer.surrogate_model, protocol=pickle.HIGHEST_PROTOCOL))
+            entry.model_version = model_version
+        num_observations = optimizer.num_observed_samples
+        if num_observations != entry.num_observations:
+            entry.observations_footprint_bytes = sum(
+                int(df.memory_usage(index=True, deep=True).sum())
+                for df in optimizer.get_all_observations()
+            )
+            entry.num_observations = num_observations
+        footprint_bytes = entry.model_footprint_bytes + entry.observations_footprint_bytes
+        with self._memory_lock:
+            self.total_footprint_bytes += footprint_bytes - entry.footprint_bytes
+        entry.footprint_bytes = footprint_bytes
+
+    def _enforce_memory_budget(self, keep_optimizer_id: str = None) -> None:
+        """ Evicts idle optimizers until the total footprint is within the budget or there are none left to evict.
+
+        Only optimizers whose writer lock can be acquired without waiting are evicted, so this never waits for, or
+        deadlocks with, a request in flight.
+        """
+        if self.memory_budget_bytes is None:
+            return
+
+        with self._memory_lock:
+            if self.total_footprint_bytes <= self.memory_budget_bytes:
+                return
+            candidate_optimizer_ids = [optimizer_id for optimizer_id in self._resident_optimizer_ids if optimizer_id != keep_optimizer_id]
+
+        if self.eviction_policy == OptimizerEvictionPolicy.LARGEST_FIRST:
+            candidate_optimizer_ids.sort(key=lambda optimizer_id: self._entries_by_optimizer_id[optimizer_id].footprint_bytes, reverse=True)
+
+        for optimizer_id in candidate_optimizer_ids:
+            with self._memory_lock:
+                if self.total_footprint_bytes <= self.memory_budget_bytes:
+                    return
+            entry = self._entries_by_optimizer_id[optimizer_id]
+            with entry.lock.try_writer() as acquired:
+                if acquired and entry.optimizer is not None and not entry.pinned:
+                    self._evict(optimizer_id, entry)
+
+        with self._memory_lock:
+            if self.total_footprint_bytes > self.memory_budget_bytes:
+                self.logger.info(f"Optimizers in use take {self.total_footprint_bytes} bytes, more than the budget of {self.memory_budget_bytes} bytes.")
+
+    def _evict(self, optimizer_id: str, entry: _OptimizerEntry) -> None:
+        """ Writes the optimizer to the eviction directory and drops it from memory. Must hold the writer lock.
+
+        """
+        evicted_path = os.path.join(self.eviction_directory, f"{optimizer_id}.evicted")
+        temp_evicted_path = evicted_path + ".tmp"
+        OptimizerCheckpoint.dump(entry.optimizer, temp_evicted_path, compress=True)
+        os.replace(temp_evicted_path, evicted_path)
+
+        entry.evicted_path = evicted_path
+        entry.optimizer = None
+        entry.snapshot = None
+        with self._memory_lock:
+            self.total_footprint_bytes -= entry.footprint_bytes
+            self._resident_optimizer_ids.pop(optimizer_id, None)
+        entry.footprint_bytes = 0
+        self.logger.info(f"Evicted optimizer {optimizer_id}.")
+
+    def _reload_if_evicted(self, optimizer_id: str, entry: _OptimizerEntry) -> None:
+        """ Must hold the writer lock.
+
+        """
+        if entry.optimizer is not None:
+            return
+        # The file is removed right away, so it must not stay memory-mapped.
+        #
+        entry.optimizer = OptimizerCheckpoint.load(entry.evicted_path, use_mmap=False, logger=self.logger)
+        os.remove(entry.evicted_path)
+        entry.evicted_path = None
+        self._update_footprint(entry)
+        self._touch(optimizer_id)
+        self.logger.info(f"Reloaded optimizer {optimizer_id}.")
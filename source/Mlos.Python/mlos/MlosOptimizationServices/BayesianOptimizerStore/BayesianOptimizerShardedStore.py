@@ -0,0 +1,306 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import multiprocessing
+import os
+import threading
+from typing import Dict
+import zlib
+
+import mlos.global_values as global_values
+from mlos.Logger import create_logger
+from mlos.MlosOptimizationServices.BayesianOptimizerStore.BayesianOptimizerInMemoryStore import BayesianOptimizerInMemoryStore
+from mlos.Optimizers.BayesianOptimizer import BayesianOptimizer
+from mlos.Optimizers.OptimizerCheckpoint import OptimizerCheckpoint
+
+
+class OptimizerShard:
+    """ A worker process owning a subset of the optimizers, and the pipe to talk to it.
+
+    The worker handles one request at a time, so the front end sends a request and waits for the response while holding
+    the shard's lock. Nothing is shared with the worker but the pipe.
+    """
+
+    def __init__(self, shard_index: int, mp_context):
+        self.shard_index = shard_index
+        self.num_optimizers = 0
+        self._lock = threading.Lock()
+        self._connection, worker_connection = mp_context.Pipe(duplex=True)
+        self._process = mp_context.Process(
+            target=_run_shard,
+            args=(worker_connection,),
+            name=f"OptimizerShard{shard_index}",
+            daemon=True
+        )
+        self._process.start()
+        worker_connection.close()
+
+    def request(self, command: str, *args):
+        """ Executes the command on the worker and returns its result, or raises the exception it raised.
+
+        """
+        with self._lock:
+            try:
+                self._connection.send((command, args))
+                succeeded, result = self._connection.recv()
+            except (EOFError, OSError) as e:
+                raise RuntimeError(f"Optimizer shard {self.shard_index} is not running.") from e
+        if not succeeded:
+            raise result
+        return result
+
+    def stop(self):
+        with self._lock:
+            try:
+                self._connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._connection.close()
+        self._process.join(timeout=10)
+
+
+class ShardedOptimizerProxy:
+    """ Stands in for an optimizer owned by a shard. Every call is forwarded to the shard currently owning the optimizer.
+
+    Exposes the subset of the BayesianOptimizer's interface that the services use. The optimization problem and the
+    optimizer config never change, so they are kept in the front end.
+    """
+
+    def __init__(self, optimizer_id: str, optimizer: BayesianOptimizer, sharded_store):
+        self.optimizer_id = optimizer_id
+        self.optimization_problem = optimizer.optimization_problem
+        self.optimizer_config = optimizer.optimizer_config
+        self._sharded_store = sharded_store
+
+    @property
+    def trained(self):
+        return self._get('trained')
+
+    @property
+    def num_observed_samples(self):
+        return self._get('num_observed_samples')
+
+    @property
+    def model_version(self):
+        return self._get('model_version')
+
+    def suggest(self, random=False, context=None):
+        return self._call('suggest', random=random, context=context)
+
+    def register(self, parameter_values_pandas_frame, target_values_pandas_frame, context_values_pandas_frame=None):
+        return self._call(
+            'register',
+            parameter_values_pandas_frame=parameter_values_pandas_frame,
+            target_values_pandas_frame=target_values_pandas_frame,
+            context_values_pandas_frame=context_values_pandas_frame
+        )
+
+    def predict(self, parameter_values_pandas_frame, t=None, context_values_pandas_frame=None, objective_name=None):
+        return self._call(
+            'predict',
+            parameter_values_pandas_frame=parameter_values_pandas_frame,
+            t=t,
+            context_values_pandas_frame=context_values_pandas_frame,
+            objective_name=objective_name
+        )
+
+    def compute_surrogate_model_goodness_of_fit(self):
+        return self._call('compute_surrogate_model_goodness_of_fit')
+
+    def get_optimizer_convergence_state(self):
+        return self._call('get_optimizer_convergence_state')
+
+    def get_all_observations(self):
+        return self._call('get_all_observations')
+
+    def get_observations_since(self, num_observations: int):
+        return self._call('get_observations_since', num_observations)
+
+    def _get(self, attribute_name):
+        return self._sharded_store.get_shard(self.optimizer_id).request('get', self.optimizer_id, attribute_name)
+
+    def _call(self, method_name, *args, **kwargs):
+        return self._sharded_store.get_shard(self.optimizer_id).request('call', self.optimizer_id, method_name, args, kwargs)
+
+
+class BayesianOptimizerShardedStore(BayesianOptimizerInMemoryStore):
+    """Hosts the optimizers in a fixed number of worker processes, so that work on different optimizers doesn't share a GIL.
+
+    Goal
+        Throughput across many independent optimizers scales with the number of cores.
+
+    Functionality
+        Every optimizer is owned by exactly one OptimizerShard. Optimizers are assigned to shards by a stable hash of
+        their ids, and can later be migrated to another shard for load balancing. The shard's worker keeps the only
+        copy of the optimizer and executes the requests for it. No locks are shared across processes: the worker
+        handles its requests one at a time.
+
+        The front end keeps a ShardedOptimizerProxy for each optimizer, in the place where the in-memory store keeps the
+        optimizer itself. So the reader-writer locks, versioning and snapshots of the BayesianOptimizerInMemoryStore
+        apply unchanged: exclusive use of an optimizer still excludes all other use, while requests for optimizers in
+        different shards run in parallel.
+
+        Requests and responses are pickled over a pipe to the worker. This is cheap compared to the suggest and
+        register calls the shards are meant to offload, but it makes very frequent, very small requests more expensive
+        than with the in-memory store.
+
+        Shards are spawned rather than forked, all of them right away: forking a process once gRPC's threads are running
+        is not safe. So the store must be created before the server is started.
+
+    """
+
+    def __init__(self, num_shards: int = None, logger=None):
+        if logger is None:
+            logger = create_logger(self.__class__.__name__)
+        BayesianOptimizerInMemoryStore.__init__(self, logger=logger)
+
+        self.num_shards = num_shards if num_shards is not None else os.cpu_count()
+        assert self.num_shards > 0
+        mp_context = multiprocessing.get_context('spawn')
+        self._shards = [OptimizerShard(shard_index=shard_index, mp_context=mp_context) for shard_index in range(self.num_shards)]
+        for shard in self._shards:
+            shard.request('echo')
+
+        # Only modified while holding the optimizer's writer lock, or before the optimizer is visible to anyone.
+        #
+        self._shard_index_by_optimizer_id = dict()
+
+        # Serializes updating the shards' optimizer counts.
+        #
+        self._shard_counts_lock = threading.Lock()
+        self.logger.info(f"Started {self.num_shards} optimizer shards.")
+
+    def get_shard_index(self, optimizer_id: str) -> int:
+        return self._shard_index_by_optimizer_id[optimizer_id]
+
+    def get_shard(self, optimizer_id: str) -> OptimizerShard:
+        return self._shards[self._shard_index_by_optimizer_id[optimizer_id]]
+
+    def get_num_optimizers_by_shard(self) -> Dict[int, int]:
+        with self._shard_counts_lock:
+            return {shard.shard_index: shard.num_optimizers for shard in self._shards}
+
+    def add_optimizer(self, optimizer_id: str, optimizer: BayesianOptimizer) -> None:
+        shard_index = self.hash_optimizer_id(optimizer_id, self.num_shards)
+        self._shards[shard_index].request('adopt', optimizer_id, OptimizerCheckpoint.dumps(optimizer))
+        self._shard_index_by_optimizer_id[optimizer_id] = shard_index
+        with self._shard_counts_lock:
+            self._shards[shard_index].num_optimizers += 1
+        self.logger.info(f"Optimizer {optimizer_id} placed in shard {shard_index}.")
+        BayesianOptimizerInMemoryStore.add_optimizer(
+            self,
+            optimizer_id=optimizer_id,
+            optimizer=ShardedOptimizerProxy(optimizer_id=optimizer_id, optimizer=optimizer, sharded_store=self)
+        )
+
+    def migrate_optimizer(self, optimizer_id: str, target_shard_index: int) -> None:
+        """ Moves the optimizer to the target shard. Requests for the optimizer wait until it has arrived.
+
+        """
+        assert 0 <= target_shard_index < self.num_shards
+        with BayesianOptimizerInMemoryStore.exclusive_optimizer(self, optimizer_id=optimizer_id):
+            source_shard_index = self._shard_index_by_optimizer_id[optimizer_id]
+            if source_shard_index == target_shard_index:
+                return
+            source_shard = self._shards[source_shard_index]
+            target_shard = self._shards[target_shard_index]
+
+            # The front end only passes the optimizer's checkpoint along, it never restores it.
+            #
+            optimizer_checkpoint = source_shard.request('release', optimizer_id)
+            try:
+                target_shard.request('adopt', optimizer_id, optimizer_checkpoint)
+            except Exception:
+                source_shard.request('adopt', optimizer_id, optimizer_checkpoint)
+                raise
+            self._shard_index_by_optimizer_id[optimizer_id] = target_shard_index
+            with self._shard_counts_lock:
+                source_shard.num_optimizers -= 1
+                target_shard.num_optimizers += 1
+        self.logger.info(f"Migrated optimizer {optimizer_id} from shard {source_shard_index} to shard {target_shard_index}.")
+
+    def rebalance(self) -> int:
+        """ Migrates optimizers from the shards owning the most to the shards owning the fewest, until they differ by at most one.
+
+        :return: number of migrated optimizers.
+        """
+        num_migrations = 0
+        optimizer_ids_by_shard_index = {shard_index: [] for shard_index in range(self.num_shards)}
+        for optimizer_id in self.list_optimizer_ids():
+            optimizer_ids_by_shard_index[self.get_shard_index(optimizer_id)].append(optimizer_id)
+
+        while True:
+            fullest_shard_index = max(optimizer_ids_by_shard_index, key=lambda shard_index: len(optimizer_ids_by_shard_index[shard_index]))
+            emptiest_shard_index = min(optimizer_ids_by_shard_index, key=lambda shard_index: len(optimizer_ids_by_shard_index[shard_index]))
+            if len(optimizer_ids_by_shard_index[fullest_shard_index]) - len(optimizer_ids_by_shard_index[emptiest_shard_index]) <= 1:
+                return num_migrations
+            optimizer_id = optimizer_ids_by_shard_index[fullest_shard_index].pop()
+            self.migrate_optimizer(optimizer_id=optimizer_id, target_shard_index=emptiest_shard_index)
+            optimizer_ids_by_shard_index[emptiest_shard_index].append(optimizer_id)
+            num_migrations += 1
+
+    def close(self) -> None:
+        """ Stops all shards. Their optimizers are lost.
+
+        """
+        for shard in self._shards:
+            shard.stop()
+        BayesianOptimizerInMemoryStore.close(self)
+
+    @staticmethod
+    def hash_optimizer_id(optimizer_id: str, num_shards: int) -> int:
+        """ Returns the index of the shard the optimizer is initially placed in.
+
+        Python's hash() of strings differs between processes, so we use a checksum instead.
+        """
+        return zlib.crc32(optimizer_id.encode()) % num_shards
+
+
+# Everything below runs in the shard processes.
+#
+def _run_shard(connection):
+    global_values.declare_singletons()
+    optimizers_by_id = dict()
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+
+        command, args = request
+        try:
+            result = _execute_shard_command(optimizers_by_id, command, args)
+            response = (True, result)
+        except Exception as e:  # pylint: disable=broad-except
+            response = (False, e)
+
+        try:
+            connection.send(response)
+        except Exception as e:  # pylint: disable=broad-except
+            # Most likely the result or the exception could not be pickled.
+            #
+            connection.send((False, RuntimeError(f"Failed to send the response to {command}: {e}")))
+
+
+def _execute_shard_command(optimizers_by_id, command, args):
+    if command == 'call':
+        optimizer_id, method_name, method_args, method_kwargs = args
+        return getattr(optimizers_by_id[optimizer_id], method_name)(*method_args, **method_kwargs)
+    if command == 'get':
+        optimizer_id, attribute_name = args
+        return getattr(optimizers_by_id[optimizer_id], attribute_name)
+    if command == 'adopt':
+        optimizer_id, optimizer_checkpoint = args
+        optimizers_by_id[optimizer_id] = OptimizerCheckpoint.loads(optimizer_checkpoint)
+        return None
+    if command == 'release':
+        optimizer_id, = args
+        optimizer_checkpoint = OptimizerCheckpoint.dumps(optimizers_by_id[optimizer_id])
+        del optimizers_by_id[optimizer_id]
+        return optimizer_checkpoint
+    if command == 'echo':
+        return None
+    raise ValueError(f"Unknown command: {command}")
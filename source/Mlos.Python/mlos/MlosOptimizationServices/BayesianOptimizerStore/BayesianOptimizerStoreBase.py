@@ -4,10 +4,13 @@
 #
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
-from typing import Iterable, Iterator
+from typing import Iterable, Iterator, Tuple
 from uuid import uuid4
 
+from mlos.MlosOptimizationServices.BayesianOptimizerStore.OptimizerSnapshot import OptimizerSnapshot
 from mlos.Optimizers.BayesianOptimizer import BayesianOptimizer
+from mlos.Optimizers.OptimizationProblem import OptimizationProblem
+from mlos.Spaces import Point
 
 
 class BayesianOptimizerStoreBase(ABC):
@@ -23,8 +26,9 @@ class BayesianOptimizerStoreBase(ABC):
         3. One based on MLFlow maybe
         4. File system based one
 
-    All such implementations must support a way to retrieve an optimizer and operate on it with an exclusive lock, or a reader-writer
-    lock (for purely querying an optimizer).
+    All such implementations must support a way to retrieve an optimizer and operate on it with an exclusive lock, or a shared
+    lock (for purely querying an optimizer), and a way to retrieve a snapshot of the optimizer's observations and metadata without
+    waiting for either.
 
 
     """
@@ -36,8 +40,15 @@ class BayesianOptimizerStoreBase(ABC):
     @abstractmethod
     @contextmanager
     def exclusive_optimizer(self, optimizer_id: str, optimizer_version: int = None) -> Iterator[BayesianOptimizer]:
-        # Some day we may wish to build this out to use reader writer locks.
-        #
+        raise NotImplementedError
+
+    @abstractmethod
+    @contextmanager
+    def shared_optimizer(self, optimizer_id: str) -> Iterator[BayesianOptimizer]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_optimizer_snapshot(self, optimizer_id: str) -> OptimizerSnapshot:
         raise NotImplementedError
 
     @abstractmethod
@@ -48,6 +59,21 @@ class BayesianOptimizerStoreBase(ABC):
     def get_optimizer(self, optimizer_id: str) -> BayesianOptimizer:
         raise NotImplementedError
 
+    def list_optimizer_ids(self) -> Iterable[str]:
+        return [optimizer_id for optimizer_id, _ in self.list_optimizers()]
+
+    def describe_optimizer(self, optimizer_id: str) -> Tuple[Point, OptimizationProblem]:
+        """ Returns the optimizer's config and optimization problem. Stores that can do so without retrieving the optimizer should.
+
+        """
+        optimizer = self.get_optimizer(optimizer_id)
+        return optimizer.optimizer_config, optimizer.optimization_problem
+
     @abstractmethod
     def add_optimizer(self, optimizer_id: str, optimizer: BayesianOptimizer) -> None:
         raise NotImplementedError
+
+    def close(self) -> None:
+        """ Releases the resources held by the store. The store must not be used afterwards.
+
+        """
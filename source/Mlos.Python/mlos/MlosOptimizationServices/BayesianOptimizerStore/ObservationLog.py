@@ -0,0 +1,204 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import os
+import pickle
+import struct
+import time
+from typing import Iterator, List, Tuple
+import zlib
+
+import pandas as pd
+
+from mlos.Logger import create_logger
+
+
+class ObservationLog:
+    """ An append-only, checksummed log of the observations registered with a single optimizer.
+
+    Each batch of observations is written as one record:
+
+        sequence_number : uint64
+        payload_length  : uint32
+        checksum        : uint32, CRC32 of the sequence number and the payload
+        payload         : pickled (features_df, objectives_df, context_df)
+
+    Sequence numbers start at 1 and increase by one with every record.
+
+    Durability
+        Records are handed to the OS as soon as they are appended, so they survive the process crashing. They are
+        fsync'ed in batches, once fsync_batch_size records are pending or fsync_interval_s seconds have passed since the
+        oldest pending one was appended, whichever comes first. So a power failure can lose the records appended since
+        the last fsync, but never corrupts the ones before.
+
+    Segments
+        The log is split into segment files named after the sequence number of their first record. The store starts a
+        new segment whenever it takes a snapshot, so that segments covered by snapshots can be deleted wholesale.
+
+    Recovery
+        Opening the log validates the records in the last segment and truncates it after the last intact record,
+        dropping a record torn by a crash mid-append.
+
+    """
+
+    _record_header = struct.Struct('<QII')
+    _segment_file_prefix = "observations."
+    _segment_file_suffix = ".log"
+
+    def __init__(self, directory: str, fsync_batch_size: int = 16, fsync_interval_s: float = 1.0, logger=None):
+        assert fsync_batch_size > 0
+        if logger is None:
+            logger = create_logger(self.__class__.__name__)
+        self.logger = logger
+
+        self.directory = directory
+        self.fsync_batch_size = fsync_batch_size
+        self.fsync_interval_s = fsync_interval_s
+
+        self._num_pending_records = 0
+        self._oldest_pending_record_time = None
+        self._segment_file = None
+
+        os.makedirs(self.directory, exist_ok=True)
+        segment_first_sequence_numbers = self._list_segments()
+        if len(segment_first_sequence_numbers) == 0:
+            self.last_sequence_number = 0
+            self._open_segment(first_sequence_number=1)
+        else:
+            last_segment_first_sequence_number = segment_first_sequence_numbers[-1]
+            last_segment_path = self._segment_path(last_segment_first_sequence_number)
+            self.last_sequence_number = last_segment_first_sequence_number - 1
+            valid_length = 0
+            for sequence_number, _, end_offset in self._scan_segment(last_segment_path):
+                self.last_sequence_number = sequence_number
+                valid_length = end_offset
+
+            if valid_length < os.path.getsize(last_segment_path):
+                self.logger.warning(f"Truncating torn records at the end of {last_segment_path}.")
+                with open(last_segment_path, 'r+b') as segment_file:
+                    segment_file.truncate(valid_length)
+                    segment_file.flush()
+                    os.fsync(segment_file.fileno())
+            self._segment_file = open(last_segment_path, 'ab')
+
+    def append(self, features_df: pd.DataFrame, objectives_df: pd.DataFrame, context_df: pd.DataFrame = None) -> int:
+        """ Appends a batch of observations and returns its sequence number.
+
+        """
+        sequence_number = self.last_sequence_number + 1
+        payload = pickle.dumps((features_df, objectives_df, context_df), protocol=pickle.HIGHEST_PROTOCOL)
+        header = self._record_header.pack(sequence_number, len(payload), self._checksum(sequence_number, payload))
+        self._segment_file.write(header + payload)
+        self._segment_file.flush()
+        self.last_sequence_number = sequence_number
+
+        now = time.monotonic()
+        if self._num_pending_records == 0:
+            self._oldest_pending_record_time = now
+        self._num_pending_records += 1
+        if self._num_pending_records >= self.fsync_batch_size or now - self._oldest_pending_record_time >= self.fsync_interval_s:
+            self.sync()
+        return sequence_number
+
+    def sync(self) -> None:
+        """ Makes sure that all appended records are on disk.
+
+        """
+        if self._num_pending_records > 0:
+            os.fsync(self._segment_file.fileno())
+            self._num_pending_records = 0
+            self._oldest_pending_record_time = None
+
+    def start_new_segment(self) -> None:
+        """ Closes the current segment and directs subsequent appends to a new one.
+
+        """
+        self.sync()
+        self._segment_file.close()
+        self._open_segment(first_sequence_number=self.last_sequence_number + 1)
+
+    def delete_segments_before(self, sequence_number: int) -> None:
+        """ Deletes the segments that only contain records with sequence numbers lower than sequence_number.
+
+        """
+        segment_first_sequence_numbers = self._list_segments()
+        for first_sequence_number, next_first_sequence_number in zip(segment_first_sequence_numbers, segment_first_sequence_numbers[1:]):
+            if next_first_sequence_number <= sequence_number:
+                os.remove(self._segment_path(first_sequence_number))
+
+    def read_records(self, after_sequence_number: int = 0) -> Iterator[Tuple[int, pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+        """ Yields (sequence_number, features_df, objectives_df, context_df) for all records after after_sequence_number.
+
+        Only the segments that can contain such records are read.
+        """
+        segment_first_sequence_numbers = self._list_segments()
+        expected_sequence_number = None
+        for i, first_sequence_number in enumerate(segment_first_sequence_numbers):
+            if i + 1 < len(segment_first_sequence_numbers) and segment_first_sequence_numbers[i + 1] <= after_sequence_number + 1:
+                continue
+            for sequence_number, payload, _ in self._scan_segment(self._segment_path(first_sequence_number)):
+                if expected_sequence_number is not None and sequence_number != expected_sequence_number:
+                    raise RuntimeError(f"Observation log in {self.directory} is missing records {expected_sequence_number} to {sequence_number - 1}.")
+                expected_sequence_number = sequence_number + 1
+                if sequence_number > after_sequence_number:
+                    features_df, objectives_df, context_df = pickle.loads(payload)
+                    yield sequence_number, features_df, objectives_df, context_df
+
+    def close(self) -> None:
+        if self._segment_file is not None:
+            self.sync()
+            self._segment_file.close()
+            self._segment_file = None
+
+    def _open_segment(self, first_sequence_number: int) -> None:
+        self._segment_file = open(self._segment_path(first_sequence_number), 'ab')
+        fsync_directory(self.directory)
+
+    def _segment_path(self, first_sequence_number: int) -> str:
+        return os.path.join(self.directory, f"{self._segment_file_prefix}{first_sequence_number:020d}{self._segment_file_suffix}")
+
+    def _list_segments(self) -> List[int]:
+        """ Returns the first sequence numbers of all segments in ascending order.
+
+        """
+        return sorted(
+            int(file_name[len(self._segment_file_prefix):-len(self._segment_file_suffix)])
+            for file_name in os.listdir(self.directory)
+            if file_name.startswith(self._segment_file_prefix) and file_name.endswith(self._segment_file_suffix)
+        )
+
+    def _scan_segment(self, segment_path: str) -> Iterator[Tuple[int, bytes, int]]:
+        """ Yields (sequence_number, payload, end_offset) for every intact record in the segment, stopping at the first one that isn't.
+
+        """
+        with open(segment_path, 'rb') as segment_file:
+            offset = 0
+            while True:
+                header = segment_file.read(self._record_header.size)
+                if len(header) < self._record_header.size:
+                    return
+                sequence_number, payload_length, checksum = self._record_header.unpack(header)
+                payload = segment_file.read(payload_length)
+                if len(payload) < payload_length or self._checksum(sequence_number, payload) != checksum:
+                    self.logger.warning(f"Found a corrupt record at offset {offset} of {segment_path}.")
+                    return
+                offset += self._record_header.size + payload_length
+                yield sequence_number, payload, offset
+
+    @staticmethod
+    def _checksum(sequence_number: int, payload: bytes) -> int:
+        return zlib.crc32(payload, zlib.crc32(struct.pack('<Q', sequence_number)))
+
+
+def fsync_directory(directory: str) -> None:
+    """ Makes file creations, renames and deletions in the directory durable. A no-op where directories can't be opened.
+
+    """
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    directory_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(directory_fd)
+    finally:
+        os.close(directory_fd)
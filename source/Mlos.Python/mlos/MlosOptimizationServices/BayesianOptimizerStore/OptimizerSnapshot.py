@@ -0,0 +1,27 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+from mlos.Optimizers.BayesianOptimizer import BayesianOptimizer
+
+
+class OptimizerSnapshot:
+    """A read-only copy of the state of an optimizer that monitoring requests need, taken at a given version.
+
+    Snapshots are never modified once taken: when the optimizer changes, the store takes a new snapshot instead. So they
+    can be read without any locks, while the optimizer itself is busy suggesting or registering observations.
+
+    The optimizer_config and the optimization_problem are shared with the optimizer, since they don't change over its
+    lifetime. The observation dataframes are copies and must not be modified.
+    """
+
+    def __init__(self, optimizer_id: str, version: int, optimizer: BayesianOptimizer):
+        self.optimizer_id = optimizer_id
+        self.version = version
+        self.optimizer_config = optimizer.optimizer_config
+        self.optimization_problem = optimizer.optimization_problem
+        self.trained = optimizer.trained
+        self.features_df, self.objectives_df, self.context_df = optimizer.get_all_observations()
+
+    def get_all_observations(self):
+        return self.features_df, self.objectives_df, self.context_df
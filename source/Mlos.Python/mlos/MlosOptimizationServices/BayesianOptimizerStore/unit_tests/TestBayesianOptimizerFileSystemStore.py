@@ -0,0 +1,132 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import os
+
+import numpy as np
+
+import mlos.global_values as global_values
+from mlos.MlosOptimizationServices.BayesianOptimizerStore.BayesianOptimizerFileSystemStore import BayesianOptimizerFileSystemStore
+from mlos.MlosOptimizationServices.BayesianOptimizerStore.ObservationLog import ObservationLog
+from mlos.OptimizerEvaluationTools.ObjectiveFunctionFactory import ObjectiveFunctionFactory, objective_function_config_store
+from mlos.Optimizers.BayesianOptimizer import BayesianOptimizer, bayesian_optimizer_config_store
+from mlos.Optimizers.OptimizationProblem import OptimizationProblem, Objective
+
+
+class TestBayesianOptimizerFileSystemStore:
+    """ Tests persistence and crash recovery of the file system store.
+
+    """
+
+    @classmethod
+    def setup_class(cls):
+        global_values.declare_singletons()
+
+    def setup_method(self, method):
+        objective_function_config = objective_function_config_store.get_config_by_name('2d_quadratic_concave_up')
+        self.objective_function = ObjectiveFunctionFactory.create_objective_function(objective_function_config)
+        self.optimization_problem = OptimizationProblem(
+            parameter_space=self.objective_function.parameter_space,
+            objective_space=self.objective_function.output_space,
+            objectives=[Objective(name='y', minimize=True)]
+        )
+
+    def create_store(self, root_directory, **kwargs):
+        return BayesianOptimizerFileSystemStore(root_directory=str(root_directory), **kwargs)
+
+    def add_optimizer(self, optimizer_store):
+        optimizer_id = optimizer_store.get_next_optimizer_id()
+        optimizer_store.add_optimizer(
+            optimizer_id=optimizer_id,
+            optimizer=BayesianOptimizer(optimization_problem=self.optimization_problem, optimizer_config=bayesian_optimizer_config_store.default)
+        )
+        return optimizer_id
+
+    def register_observations(self, optimizer_store, optimizer_id, num_observations):
+        with optimizer_store.exclusive_optimizer(optimizer_id=optimizer_id) as optimizer:
+            parameters_df = optimizer.optimization_problem.parameter_space.random_dataframe(num_samples=num_observations)
+            optimizer.register(parameters_df, self.objective_function.evaluate_dataframe(parameters_df))
+
+    @staticmethod
+    def assert_same_observations(optimizer, recovered_optimizer):
+        for df, recovered_df in zip(optimizer.get_all_observations(), recovered_optimizer.get_all_observations()):
+            assert list(df.columns) == list(recovered_df.columns)
+            assert len(df.index) == len(recovered_df.index)
+            if len(df.columns) > 0:
+                assert np.allclose(df.to_numpy(dtype=float), recovered_df.to_numpy(dtype=float))
+
+    def test_optimizers_survive_restarts(self, tmp_path):
+        optimizer_store = self.create_store(tmp_path, num_log_records_between_snapshots=3)
+        optimizer_ids = [self.add_optimizer(optimizer_store) for _ in range(3)]
+        for i, optimizer_id in enumerate(optimizer_ids):
+            for _ in range(2 * i + 1):
+                self.register_observations(optimizer_store, optimizer_id, num_observations=5)
+        optimizer_store.close()
+
+        recovered_store = self.create_store(tmp_path, num_log_records_between_snapshots=3)
+        assert [optimizer_id for optimizer_id, _ in recovered_store.list_optimizers()] == optimizer_ids
+        for optimizer_id in optimizer_ids:
+            optimizer = optimizer_store.get_optimizer(optimizer_id)
+            recovered_optimizer = recovered_store.get_optimizer(optimizer_id)
+            self.assert_same_observations(optimizer, recovered_optimizer)
+            assert recovered_optimizer.trained == optimizer.trained
+
+        # The recovered store keeps logging where the original left off.
+        #
+        self.register_observations(recovered_store, optimizer_ids[0], num_observations=5)
+        recovered_store.close()
+        assert self.create_store(tmp_path).get_optimizer(optimizer_ids[0]).num_observed_samples == 10
+
+    def test_recovery_only_replays_the_log_tail(self, tmp_path):
+        optimizer_store = self.create_store(tmp_path, num_log_records_between_snapshots=4)
+        optimizer_id = self.add_optimizer(optimizer_store)
+        for _ in range(10):
+            self.register_observations(optimizer_store, optimizer_id, num_observations=3)
+        optimizer_store.close()
+
+        # Snapshots were taken after records 4 and 8. Only the latest two are kept, and only the segments needed to roll
+        # the older of them forward.
+        #
+        optimizer_directory = os.path.join(str(tmp_path), optimizer_id)
+        assert optimizer_store._list_snapshots(optimizer_directory) == [4, 8]  # pylint: disable=protected-access
+        observation_log = ObservationLog(directory=optimizer_directory)
+        assert [sequence_number for sequence_number, _, _, _ in observation_log.read_records(after_sequence_number=8)] == [9, 10]
+        assert [sequence_number for sequence_number, _, _, _ in observation_log.read_records(after_sequence_number=4)] == list(range(5, 11))
+        observation_log.close()
+
+        recovered_store = self.create_store(tmp_path)
+        self.assert_same_observations(optimizer_store.get_optimizer(optimizer_id), recovered_store.get_optimizer(optimizer_id))
+        recovered_store.close()
+
+    def test_recovery_from_torn_log_and_corrupt_snapshot(self, tmp_path):
+        optimizer_store = self.create_store(tmp_path, num_log_records_between_snapshots=4)
+        optimizer_id = self.add_optimizer(optimizer_store)
+        for _ in range(6):
+            self.register_observations(optimizer_store, optimizer_id, num_observations=2)
+        optimizer_store.close()
+
+        optimizer_directory = os.path.join(str(tmp_path), optimizer_id)
+
+        # Simulate a crash in the middle of appending a record...
+        #
+        last_segment_path = sorted(file_name for file_name in os.listdir(optimizer_directory) if file_name.endswith(".log"))[-1]
+        with open(os.path.join(optimizer_directory, last_segment_path), 'ab') as segment_file:
+            segment_file.write(b'\x07\x00\x00')
+
+        # ... and a snapshot that didn't make it to disk intact.
+        #
+        latest_snapshot_path = optimizer_store._snapshot_path(optimizer_directory, 4)  # pylint: disable=protected-access
+        with open(latest_snapshot_path, 'r+b') as snapshot_file:
+            snapshot_file.seek(-10, os.SEEK_END)
+            snapshot_file.write(b'\x00' * 10)
+
+        # We fall back to the initial snapshot, replay all six records, and drop the torn one.
+        #
+        recovered_store = self.create_store(tmp_path)
+        recovered_optimizer = recovered_store.get_optimizer(optimizer_id)
+        self.assert_same_observations(optimizer_store.get_optimizer(optimizer_id), recovered_optimizer)
+        self.register_observations(recovered_store, optimizer_id, num_observations=2)
+        recovered_store.close()
+
+        assert self.create_store(tmp_path).get_optimizer(optimizer_id).num_observed_samples == 14
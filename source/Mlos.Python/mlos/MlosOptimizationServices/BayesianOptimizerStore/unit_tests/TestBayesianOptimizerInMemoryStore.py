@@ -0,0 +1,220 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+
+import numpy as np
+
+import mlos.global_values as global_values
+from mlos.MlosOptimizationServices.BayesianOptimizerStore.BayesianOptimizerInMemoryStore import BayesianOptimizerInMemoryStore, OptimizerEvictionPolicy
+from mlos.OptimizerEvaluationTools.ObjectiveFunctionFactory import ObjectiveFunctionFactory, objective_function_config_store
+from mlos.Optimizers.BayesianOptimizer import BayesianOptimizer, bayesian_optimizer_config_store
+from mlos.Optimizers.OptimizationProblem import OptimizationProblem, Objective
+from mlos.Optimizers.RegressionModels.RegressionModel import RegressionModel
+
+
+class TestBayesianOptimizerInMemoryStore:
+    """ Tests locking, snapshots and eviction in the in-memory store.
+
+    """
+
+    @classmethod
+    def setup_class(cls):
+        global_values.declare_singletons()
+
+    def setup_method(self, method):
+        objective_function_config = objective_function_config_store.get_config_by_name('2d_quadratic_concave_up')
+        self.objective_function = ObjectiveFunctionFactory.create_objective_function(objective_function_config)
+        self.optimization_problem = OptimizationProblem(
+            parameter_space=self.objective_function.parameter_space,
+            objective_space=self.objective_function.output_space,
+            objectives=[Objective(name='y', minimize=True)]
+        )
+        self.optimizer_store = BayesianOptimizerInMemoryStore()
+
+    def add_optimizer(self):
+        optimizer_id = self.optimizer_store.get_next_optimizer_id()
+        self.optimizer_store.add_optimizer(
+            optimizer_id=optimizer_id,
+            optimizer=BayesianOptimizer(optimization_problem=self.optimization_problem, optimizer_config=bayesian_optimizer_config_store.default)
+        )
+        return optimizer_id
+
+    def register_observations(self, optimizer_id, num_observations):
+        with self.optimizer_store.exclusive_optimizer(optimizer_id=optimizer_id) as optimizer:
+            parameters_df = optimizer.optimization_problem.parameter_space.random_dataframe(num_samples=num_observations)
+            optimizer.register(parameters_df, self.objective_function.evaluate_dataframe(parameters_df))
+
+    def test_list_optimizers(self):
+        optimizer_ids = [self.add_optimizer() for _ in range(5)]
+        assert [optimizer_id for optimizer_id, _ in self.optimizer_store.list_optimizers()] == optimizer_ids
+        for optimizer_id, optimizer in self.optimizer_store.list_optimizers():
+            assert self.optimizer_store.get_optimizer(optimizer_id) is optimizer
+
+    def test_snapshots_are_versioned(self):
+        optimizer_id = self.add_optimizer()
+        snapshot = self.optimizer_store.get_optimizer_snapshot(optimizer_id)
+        assert len(snapshot.features_df.index) == 0
+        assert self.optimizer_store.get_optimizer_snapshot(optimizer_id) is snapshot
+
+        # Shared use doesn't change the version.
+        #
+        with self.optimizer_store.shared_optimizer(optimizer_id) as optimizer:
+            assert optimizer.num_observed_samples == 0
+        assert self.optimizer_store.get_optimizer_snapshot(optimizer_id) is snapshot
+
+        self.register_observations(optimizer_id, num_observations=10)
+        new_snapshot = self.optimizer_store.get_optimizer_snapshot(optimizer_id)
+        assert new_snapshot.version > snapshot.version
+        assert len(new_snapshot.features_df.index) == 10
+
+        # The old snapshot is unaffected.
+        #
+        assert len(snapshot.features_df.index) == 0
+
+    def test_snapshot_reads_dont_wait_for_writers(self):
+        optimizer_id = self.add_optimizer()
+        self.register_observations(optimizer_id, num_observations=10)
+        snapshot = self.optimizer_store.get_optimizer_snapshot(optimizer_id)
+
+        writer_inside = threading.Event()
+        release_writer = threading.Event()
+
+        def write():
+            with self.optimizer_store.exclusive_optimizer(optimizer_id=optimizer_id):
+                writer_inside.set()
+                release_writer.wait(timeout=60)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            writer_future = executor.submit(write)
+            assert writer_inside.wait(timeout=60)
+            try:
+                # The writer is still holding the optimizer, so we get the last complete snapshot.
+                #
+                assert self.optimizer_store.get_optimizer_snapshot(optimizer_id) is snapshot
+            finally:
+                release_writer.set()
+            writer_future.result()
+
+        assert self.optimizer_store.get_optimizer_snapshot(optimizer_id).version > snapshot.version
+
+    def test_concurrent_predictions(self, monkeypatch):
+        """ Readers share the optimizer, and with it the surrogate models' prediction caches.
+
+        A small cache makes every predict() call evict rows that other threads are looking up.
+        """
+        monkeypatch.setattr(RegressionModel, 'prediction_cache_size', 50)
+        optimizer_id = self.add_optimizer()
+        self.register_observations(optimizer_id, num_observations=100)
+
+        parameters_df = self.optimization_problem.parameter_space.random_dataframe(num_samples=200)
+        with self.optimizer_store.shared_optimizer(optimizer_id) as optimizer:
+            assert optimizer.trained
+            expected_predictions_df = optimizer.predict(parameters_df).get_dataframe()
+
+        def predict(thread_index):
+            random_state = np.random.RandomState(thread_index)
+            for _ in range(20):
+                sample_df = parameters_df.sample(n=40, random_state=random_state)
+                with self.optimizer_store.shared_optimizer(optimizer_id) as optimizer:
+                    predictions_df = optimizer.predict(sample_df).get_dataframe()
+                expected_sample_df = expected_predictions_df.loc[expected_predictions_df.index.intersection(sample_df.index)]
+                assert predictions_df.sort_index().equals(expected_sample_df.sort_index())
+
+        num_threads = 8
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            for future in [executor.submit(predict, thread_index) for thread_index in range(num_threads)]:
+                future.result()
+
+    def use_memory_budget(self, eviction_directory, memory_budget_bytes=1, eviction_policy=OptimizerEvictionPolicy.LEAST_RECENTLY_USED):
+        self.optimizer_store = BayesianOptimizerInMemoryStore(
+            memory_budget_bytes=memory_budget_bytes,
+            eviction_directory=str(eviction_directory),
+            eviction_policy=eviction_policy
+        )
+
+    def test_idle_optimizers_are_evicted(self, tmp_path):
+        self.use_memory_budget(tmp_path)
+        optimizer_ids = [self.add_optimizer() for _ in range(3)]
+        for optimizer_id in optimizer_ids:
+            self.register_observations(optimizer_id, num_observations=10)
+
+        # With a budget this small only the most recently used optimizer stays in memory.
+        #
+        assert [self.optimizer_store.is_evicted(optimizer_id) for optimizer_id in optimizer_ids] == [True, True, False]
+        assert sorted(os.listdir(tmp_path)) == sorted(f"{optimizer_id}.evicted" for optimizer_id in optimizer_ids[:2])
+
+        # Listing and describing optimizers doesn't reload them.
+        #
+        assert list(self.optimizer_store.list_optimizer_ids()) == optimizer_ids
+        optimizer_config, optimization_problem = self.optimizer_store.describe_optimizer(optimizer_ids[0])
+        assert optimizer_config == bayesian_optimizer_config_store.default
+        assert optimization_problem.objectives[0].name == 'y'
+        assert self.optimizer_store.is_evicted(optimizer_ids[0])
+
+    def test_evicted_optimizers_are_reloaded(self, tmp_path):
+        self.use_memory_budget(tmp_path)
+        first_optimizer_id = self.add_optimizer()
+        self.register_observations(first_optimizer_id, num_observations=10)
+        features_df, objectives_df, _ = self.optimizer_store.get_optimizer(first_optimizer_id).get_all_observations()
+
+        second_optimizer_id = self.add_optimizer()
+        self.register_observations(second_optimizer_id, num_observations=10)
+        assert self.optimizer_store.is_evicted(first_optimizer_id)
+
+        with self.optimizer_store.shared_optimizer(first_optimizer_id) as optimizer:
+            reloaded_features_df, reloaded_objectives_df, _ = optimizer.get_all_observations()
+            assert reloaded_features_df.equals(features_df)
+            assert reloaded_objectives_df.equals(objectives_df)
+        assert not self.optimizer_store.is_evicted(first_optimizer_id)
+        assert self.optimizer_store.is_evicted(second_optimizer_id)
+
+        self.register_observations(first_optimizer_id, num_observations=5)
+        assert self.optimizer_store.get_optimizer_snapshot(first_optimizer_id).features_df.shape[0] == 15
+
+    def test_pinned_optimizers_are_not_evicted(self, tmp_path):
+        self.use_memory_budget(tmp_path)
+        pinned_optimizer_id = self.add_optimizer()
+        self.optimizer_store.pin_optimizer(pinned_optimizer_id)
+        optimizer_ids = [self.add_optimizer() for _ in range(2)]
+        for optimizer_id in [pinned_optimizer_id] + optimizer_ids:
+            self.register_observations(optimizer_id, num_observations=10)
+
+        assert not self.optimizer_store.is_evicted(pinned_optimizer_id)
+        assert self.optimizer_store.is_evicted(optimizer_ids[0])
+
+        # Once unpinned, it is evicted along with every other idle optimizer.
+        #
+        self.optimizer_store.pin_optimizer(pinned_optimizer_id, pinned=False)
+        assert self.optimizer_store.is_evicted(pinned_optimizer_id)
+        assert self.optimizer_store.total_footprint_bytes == 0
+
+    def test_eviction_policies(self, tmp_path):
+        for eviction_policy, expected_evicted_index in [(OptimizerEvictionPolicy.LEAST_RECENTLY_USED, 0), (OptimizerEvictionPolicy.LARGEST_FIRST, 1)]:
+            eviction_directory = tmp_path / eviction_policy.name
+            self.use_memory_budget(eviction_directory, memory_budget_bytes=2 ** 40, eviction_policy=eviction_policy)
+            optimizer_ids = [self.add_optimizer() for _ in range(3)]
+            for optimizer_id, num_observations in zip(optimizer_ids, [10, 50, 10]):
+                self.register_observations(optimizer_id, num_observations=num_observations)
+
+            # Shrinking the budget by a byte is enough for one eviction on the next use.
+            #
+            self.optimizer_store.memory_budget_bytes = self.optimizer_store.total_footprint_bytes - 1
+            with self.optimizer_store.exclusive_optimizer(optimizer_ids[2]):
+                pass
+
+            evicted = [self.optimizer_store.is_evicted(optimizer_id) for optimizer_id in optimizer_ids]
+            assert evicted == [index == expected_evicted_index for index in range(3)]
+            assert self.optimizer_store.total_footprint_bytes <= self.optimizer_store.memory_budget_bytes
+
+    def test_close_removes_evicted_optimizers(self, tmp_path):
+        self.use_memory_budget(tmp_path)
+        for _ in range(3):
+            self.register_observations(self.add_optimizer(), num_observations=10)
+        assert len(os.listdir(tmp_path)) == 2
+
+        self.optimizer_store.close()
+        assert os.listdir(tmp_path) == []
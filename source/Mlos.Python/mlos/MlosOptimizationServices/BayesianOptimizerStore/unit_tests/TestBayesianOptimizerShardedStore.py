@@ -0,0 +1,111 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import mlos.global_values as global_values
+from mlos.MlosOptimizationServices.BayesianOptimizerStore.BayesianOptimizerShardedStore import BayesianOptimizerShardedStore
+from mlos.OptimizerEvaluationTools.ObjectiveFunctionFactory import ObjectiveFunctionFactory, objective_function_config_store
+from mlos.Optimizers.BayesianOptimizer import BayesianOptimizer, bayesian_optimizer_config_store
+from mlos.Optimizers.OptimizationProblem import OptimizationProblem, Objective
+
+
+class TestBayesianOptimizerShardedStore:
+    """ Tests routing of requests to shards and migration of optimizers between them.
+
+    """
+
+    @classmethod
+    def setup_class(cls):
+        global_values.declare_singletons()
+        objective_function_config = objective_function_config_store.get_config_by_name('2d_quadratic_concave_up')
+        cls.objective_function = ObjectiveFunctionFactory.create_objective_function(objective_function_config)
+        cls.optimization_problem = OptimizationProblem(
+            parameter_space=cls.objective_function.parameter_space,
+            objective_space=cls.objective_function.output_space,
+            objectives=[Objective(name='y', minimize=True)]
+        )
+        cls.num_shards = 3
+        cls.optimizer_store = BayesianOptimizerShardedStore(num_shards=cls.num_shards)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.optimizer_store.close()
+
+    def add_optimizer(self):
+        optimizer_id = self.optimizer_store.get_next_optimizer_id()
+        self.optimizer_store.add_optimizer(
+            optimizer_id=optimizer_id,
+            optimizer=BayesianOptimizer(optimization_problem=self.optimization_problem, optimizer_config=bayesian_optimizer_config_store.default)
+        )
+        return optimizer_id
+
+    def run_iterations(self, optimizer_id, num_iterations):
+        for _ in range(num_iterations):
+            with self.optimizer_store.exclusive_optimizer(optimizer_id=optimizer_id) as optimizer:
+                suggestion = optimizer.suggest()
+                assert suggestion in self.optimization_problem.parameter_space
+                optimizer.register(suggestion.to_dataframe(), self.objective_function.evaluate_point(suggestion).to_dataframe())
+
+    def test_optimizers_are_placed_by_hash(self):
+        optimizer_ids = [self.add_optimizer() for _ in range(10)]
+        for optimizer_id in optimizer_ids:
+            assert self.optimizer_store.get_shard_index(optimizer_id) == BayesianOptimizerShardedStore.hash_optimizer_id(optimizer_id, self.num_shards)
+
+    def test_optimizers_in_different_shards_work_in_parallel(self):
+        # Each tree in the surrogate forest trains on a subsample, so it takes more than a dozen observations to train them all.
+        #
+        num_iterations = 30
+        optimizer_ids = [self.add_optimizer() for _ in range(2 * self.num_shards)]
+        with ThreadPoolExecutor(max_workers=len(optimizer_ids)) as executor:
+            for future in [executor.submit(self.run_iterations, optimizer_id, num_iterations) for optimizer_id in optimizer_ids]:
+                future.result()
+
+        for optimizer_id in optimizer_ids:
+            snapshot = self.optimizer_store.get_optimizer_snapshot(optimizer_id)
+            assert len(snapshot.features_df.index) == num_iterations
+            with self.optimizer_store.shared_optimizer(optimizer_id) as optimizer:
+                assert optimizer.trained
+                prediction = optimizer.predict(snapshot.features_df)
+                assert len(prediction.get_dataframe().index) == num_iterations
+
+    def test_migration_preserves_the_optimizer(self):
+        optimizer_id = self.add_optimizer()
+        self.run_iterations(optimizer_id, 12)
+        features_df, objectives_df, _ = self.optimizer_store.get_optimizer(optimizer_id).get_all_observations()
+
+        source_shard_index = self.optimizer_store.get_shard_index(optimizer_id)
+        target_shard_index = (source_shard_index + 1) % self.num_shards
+        self.optimizer_store.migrate_optimizer(optimizer_id=optimizer_id, target_shard_index=target_shard_index)
+        assert self.optimizer_store.get_shard_index(optimizer_id) == target_shard_index
+
+        migrated_features_df, migrated_objectives_df, _ = self.optimizer_store.get_optimizer(optimizer_id).get_all_observations()
+        assert migrated_features_df.equals(features_df)
+        assert migrated_objectives_df.equals(objectives_df)
+        self.run_iterations(optimizer_id, 2)
+        assert self.optimizer_store.get_optimizer(optimizer_id).num_observed_samples == 14
+
+        # The source shard no longer has the optimizer.
+        #
+        with pytest.raises(KeyError):
+            self.optimizer_store._shards[source_shard_index].request('get', optimizer_id, 'trained')  # pylint: disable=protected-access
+
+    def test_rebalance(self):
+        for _ in range(5):
+            optimizer_id = self.add_optimizer()
+            self.optimizer_store.migrate_optimizer(optimizer_id=optimizer_id, target_shard_index=0)
+
+        self.optimizer_store.rebalance()
+        num_optimizers_by_shard = self.optimizer_store.get_num_optimizers_by_shard()
+        assert sum(num_optimizers_by_shard.values()) == len(list(self.optimizer_store.list_optimizers()))
+        assert max(num_optimizers_by_shard.values()) - min(num_optimizers_by_shard.values()) <= 1
+
+    def test_exceptions_are_raised_in_the_front_end(self):
+        optimizer_id = self.add_optimizer()
+        with self.optimizer_store.exclusive_optimizer(optimizer_id=optimizer_id) as optimizer:
+            with pytest.raises(ValueError):
+                parameters_df = self.optimization_problem.parameter_space.random_dataframe(num_samples=3)
+                optimizer.register(parameters_df, parameters_df)
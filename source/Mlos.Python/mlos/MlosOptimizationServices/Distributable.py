@@ -6,10 +6,30 @@ from functools import wraps
 import json
 
 from mlos import global_values
-from mlos.Spaces.HypergridsJsonEncoderDecoder import HypergridJsonEncoder
+from mlos.Spaces.HypergridsBinaryEncoderDecoder import HypergridBinaryDecoder, HypergridBinaryEncoder
+from mlos.Spaces.HypergridsJsonEncoderDecoder import HypergridJsonDecoder
 
 from .ModelsDatabase.Relations.RemoteProcedureCall import RemoteProcedureCall
 
+def encode_rpc_payload(payload):
+    """ Encodes execution contexts, arguments and results of remote procedure calls for storage in the models database.
+
+    :return:
+    """
+    return HypergridBinaryEncoder.encode_to_string(payload)
+
+def decode_rpc_payload(payload_string):
+    """ Decodes payloads encoded by encode_rpc_payload(), as well as the JSON payloads written by older clients.
+
+    Remote procedures own their arguments and results, and e.g. join the hypergrids of an OptimizationProblem into its
+    feature space, so the hypergrids are not shared through the decoder's cache.
+
+    :return:
+    """
+    if HypergridBinaryDecoder.is_binary_string(payload_string):
+        return HypergridBinaryDecoder.decode_from_string(payload_string, use_cache=False)
+    return json.loads(payload_string, cls=HypergridJsonDecoder)
+
 def remotely_executable(timeout_s=120):
     """ Allows a function to execute remotely.
 
@@ -24,7 +44,7 @@ def remotely_executable(timeout_s=120):
 
         @wraps(wrapped_function)
         def wrapper(*args, **kwargs):
-            assert len(args) == 1, "Remotely executable functions must be called with json-serializable key-word arguments only."
+            assert len(args) == 1, "Remotely executable functions must be called with serializable key-word arguments only."
             self = args[0]
 
             if not self.execute_remotely:
@@ -32,8 +52,8 @@ def remotely_executable(timeout_s=120):
 
             rpc = RemoteProcedureCall(
                 remote_procedure_name=wrapped_function.__qualname__,
-                execution_context=json.dumps(self.get_execution_context(), cls=HypergridJsonEncoder),
-                arguments=json.dumps(kwargs, cls=HypergridJsonEncoder)
+                execution_context=encode_rpc_payload(self.get_execution_context()),
+                arguments=encode_rpc_payload(kwargs)
             )
             return global_values.ml_model_services_proxy.execute_rpc(rpc, timeout_s=timeout_s)
         return wrapper
@@ -2,15 +2,14 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 #
-import json
 import time
 
 from mlos import global_values
 from mlos.global_values import serialize_to_bytes_string
 
 from mlos.Logger import create_logger
-from mlos.Spaces.HypergridsJsonEncoderDecoder import HypergridJsonEncoder, HypergridJsonDecoder
 
+from .Distributable import decode_rpc_payload, encode_rpc_payload
 from .ModelsDatabase.ModelsDatabase import ModelsDatabase
 
 class MlosOptimizationRuntime:
@@ -79,15 +78,15 @@ class MlosOptimizationRuntime:
     def complete_rpc(self, rpc):
         try:
             optimizer_class, function_name = self.rpc_handlers[rpc.remote_procedure_name]
-            execution_context = json.loads(rpc.execution_context, cls=HypergridJsonDecoder)
+            execution_context = decode_rpc_payload(rpc.execution_context)
             optimizer_instance = self.execution_context_cache.get((execution_context["optimizer_id"], execution_context['model_versions'][0]), None)
             if optimizer_instance is None:
                 optimizer_instance = optimizer_class.restore_from_execution_context(execution_context, self.models_database)
                 self.execution_context_cache[(execution_context["optimizer_id"], execution_context['model_versions'][0])] = optimizer_instance
             method_to_call = getattr(optimizer_instance, function_name)
-            kwargs = json.loads(rpc.arguments, cls=HypergridJsonDecoder)
+            kwargs = decode_rpc_payload(rpc.arguments)
             result = method_to_call(**kwargs)
-            rpc.result = json.dumps(result, cls=HypergridJsonEncoder)
+            rpc.result = encode_rpc_payload(result)
             rpc.request_status = 'complete'
             self.models_database.complete_rpc(rpc)
 
@@ -3,13 +3,12 @@
 # Licensed under the MIT License.
 #
 import datetime
-import json
 import time
 
 from mlos.global_values import deserialize_from_bytes_string
 from mlos.Logger import create_logger
-from mlos.Spaces.HypergridsJsonEncoderDecoder import HypergridJsonDecoder
 
+from .Distributable import decode_rpc_payload
 from .ModelsDatabase.ModelsDatabase import ModelsDatabase
 from .ModelsDatabase.Relations.RemoteProcedureCall import RemoteProcedureCall
 
@@ -37,7 +36,7 @@ class MlosOptimizationServicesProxy:
             if submitted_rpc.request_status != old_status:
                 if submitted_rpc.request_status == 'complete':
                     #self.models_database.remove_rpc(submitted_rpc)
-                    return json.loads(submitted_rpc.result, cls=HypergridJsonDecoder)
+                    return decode_rpc_payload(submitted_rpc.result)
                 if submitted_rpc.request_status == 'in progress':
                     continue
                 if submitted_rpc.request_status == 'failed':
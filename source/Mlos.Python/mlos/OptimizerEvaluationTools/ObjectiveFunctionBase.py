@@ -7,7 +7,7 @@ from abc import ABC, abstractmethod
 import pandas as pd
 
 from mlos.Optimizers.OptimizationProblem import OptimizationProblem, Objective
-from mlos.Spaces import Hypergrid, Point
+from mlos.Spaces import Hypergrid, Point, PointBatch
 
 
 class ObjectiveFunctionBase(ABC):
@@ -57,9 +57,18 @@ class ObjectiveFunctionBase(ABC):
         #
         point_df = point.to_dataframe()
         values_df = self.evaluate_dataframe(point_df)
-        values_point = Point.from_dataframe(values_df)
+        values_point = PointBatch.from_dataframe(values_df)[0]
         return values_point
 
+    def evaluate_points(self, points: PointBatch) -> PointBatch:
+        """ Evaluates a whole batch of points with a single call to evaluate_dataframe().
+
+        :param points:
+        :return:
+        """
+        values_df = self.evaluate_dataframe(points.to_dataframe())
+        return PointBatch.from_dataframe(values_df)
+
     @abstractmethod
     def evaluate_dataframe(self, dataframe: pd.DataFrame) -> pd.DataFrame:
         raise NotImplementedError
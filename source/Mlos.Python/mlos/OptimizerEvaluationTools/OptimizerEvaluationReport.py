@@ -20,7 +20,7 @@ class OptimizerEvaluationReport:
     This includes:
         * optimizer configuration
         * objective function configuration
-        * serialized optimizer (with random seeds, and all observations)
+        * optimizer checkpoints (with random seeds, and all observations), see OptimizerCheckpoint
         * serialized objective function (with random seeds)
         * evaluation parameters:
             * num optimization iterations
@@ -59,7 +59,7 @@ class OptimizerEvaluationReport:
         self.optimizer_configuration = optimizer_configuration
         self.objective_function_configuration = objective_function_configuration
 
-        # Dictionary with iteration number as key and pickled optimizer as value
+        # Dictionary with iteration number as key and optimizer checkpoint as value. Restore with OptimizerCheckpoint.loads().
         #
         self.pickled_optimizers_over_time: Dict[int, bytes] = {}
         self.pickled_objective_function_initial_state = pickled_objective_function_initial_state
@@ -90,7 +90,7 @@ class OptimizerEvaluationReport:
         - execution_trace.json
         - execution_info.json
         - pickled_optimizers:
-            - {iteration_number}.pickle
+            - {iteration_number}.checkpoint
 
         """
         optimizer_config_file = os.path.join(target_folder, "optimizer_config.json")
@@ -106,7 +106,7 @@ class OptimizerEvaluationReport:
             if not os.path.exists(pickled_optimizers_dir):
                 os.mkdir(pickled_optimizers_dir)
             for iteration, pickled_optimizer in self.pickled_optimizers_over_time.items():
-                with open(os.path.join(pickled_optimizers_dir, f"{iteration}.pickle"), 'wb') as out_file:
+                with open(os.path.join(pickled_optimizers_dir, f"{iteration}.checkpoint"), 'wb') as out_file:
                     out_file.write(pickled_optimizer)
 
         if self.pickled_objective_function_initial_state is not None:
@@ -167,8 +167,10 @@ class OptimizerEvaluationReport:
         pickled_optimizers_dir = os.path.join(target_folder, "pickled_optimizers")
         if os.path.exists(pickled_optimizers_dir):
             for file_name in os.listdir(pickled_optimizers_dir):
+                # Reports written before optimizers were checkpointed hold pickles. OptimizerCheckpoint.loads() reads both.
+                #
                 iteration_number, file_extension = file_name.split(".")
-                assert file_extension == "pickle"
+                assert file_extension in ("checkpoint", "pickle")
                 iteration_number = int(iteration_number)
                 with open(os.path.join(pickled_optimizers_dir, file_name), 'rb') as in_file:
                     optimizer_evaluation_report.pickled_optimizers_over_time[iteration_number] = in_file.read()
@@ -15,6 +15,7 @@ from mlos.OptimizerEvaluationTools.OptimizerEvaluationReport import OptimizerEva
 from mlos.OptimizerEvaluationTools.OptimizerEvaluatorConfigStore import optimizer_evaluator_config_store
 from mlos.OptimizerEvaluationTools.OptimumOverTime import OptimumOverTime
 from mlos.Optimizers.BayesianOptimizerFactory import BayesianOptimizerFactory, bayesian_optimizer_config_store
+from mlos.Optimizers.OptimizerCheckpoint import OptimizerCheckpoint
 from mlos.Optimizers.OptimizerBase import OptimizerBase
 from mlos.Optimizers.OptimumDefinition import OptimumDefinition
 from mlos.Optimizers.RegressionModels.GoodnessOfFitMetrics import DataSetType
@@ -121,7 +122,7 @@ class OptimizerEvaluator:
             evaluation_report.pickled_objective_function_initial_state = pickle.dumps(self.objective_function)
 
         if self.optimizer_evaluator_config.include_pickled_optimizer_in_report:
-            evaluation_report.pickled_optimizer_initial_state = pickle.dumps(self.optimizer)
+            evaluation_report.pickled_optimizer_initial_state = OptimizerCheckpoint.dumps(self.optimizer, compress=True)
 
         multi_objective_regression_model_fit_state = MultiObjectiveRegressionModelFitState(objective_names=self.optimizer.optimization_problem.objective_names)
         for objective_name in self.optimizer.optimization_problem.objective_names:
@@ -164,7 +165,7 @@ class OptimizerEvaluator:
                         self.logger.info(f"[{i + 1}/{self.optimizer_evaluator_config.num_iterations}]")
                         with traced(scope_name="evaluating_optimizer"):
                             if self.optimizer_evaluator_config.include_pickled_optimizer_in_report:
-                                evaluation_report.add_pickled_optimizer(iteration=i, pickled_optimizer=pickle.dumps(self.optimizer))
+                                evaluation_report.add_pickled_optimizer(iteration=i, pickled_optimizer=OptimizerCheckpoint.dumps(self.optimizer, compress=True))
 
                             if self.optimizer.trained:
                                 multi_objective_gof_metrics = self.optimizer.compute_surrogate_model_goodness_of_fit()
@@ -237,7 +238,7 @@ class OptimizerEvaluator:
             mlos.global_values.tracer.clear_events()
 
         if self.optimizer_evaluator_config.include_pickled_optimizer_in_report:
-            evaluation_report.add_pickled_optimizer(iteration=i, pickled_optimizer=pickle.dumps(self.optimizer))
+            evaluation_report.add_pickled_optimizer(iteration=i, pickled_optimizer=OptimizerCheckpoint.dumps(self.optimizer, compress=True))
 
         if self.optimizer_evaluator_config.include_pickled_objective_function_in_report:
             evaluation_report.pickled_objective_function_final_state = pickle.dumps(self.objective_function)
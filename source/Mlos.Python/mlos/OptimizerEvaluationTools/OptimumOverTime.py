@@ -2,11 +2,12 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 #
+import numpy as np
 import pandas as pd
 
 from mlos.Optimizers.OptimumDefinition import OptimumDefinition
 from mlos.Optimizers.OptimizationProblem import OptimizationProblem
-from mlos.Spaces import Point
+from mlos.Spaces import Point, PointBatch
 
 class OptimumOverTime:
     """Keeps track of a single definition of optimum over time.
@@ -37,15 +38,24 @@ class OptimumOverTime:
 
         iteration_df = pd.DataFrame({'iteration': self._iteration_numbers})
 
-        config_dicts = [config.to_dict() for config in self._optimal_configs]
-        config_df = pd.DataFrame(config_dicts)
-
-        optimum_dicts = [optimum.to_dict() for optimum in self._optimum_values]
-        optimum_df = pd.DataFrame(optimum_dicts)
+        config_df = self._points_to_dataframe(self._optimal_configs)
+        optimum_df = self._points_to_dataframe(self._optimum_values)
 
         combined_df = pd.concat([iteration_df, config_df, optimum_df], axis=1)
         return combined_df
 
+    @staticmethod
+    def _points_to_dataframe(points) -> pd.DataFrame:
+        """ Just like Point.to_dict(), turns numbers that are whole into ints - so columns of whole numbers are int64.
+
+        """
+        df = PointBatch.from_points(points).to_dataframe()
+        for column_name in df.columns:
+            column = df[column_name]
+            if column.dtype.kind == 'f' and np.isfinite(column).all() and (column == np.floor(column)).all():
+                df[column_name] = column.astype(np.int64)
+        return df
+
 
     def get_last_optimum(self):
         if len(self._optimal_configs) > 0 and len(self._optimum_values) > 0:
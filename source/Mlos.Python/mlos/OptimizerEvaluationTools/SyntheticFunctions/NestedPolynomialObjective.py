@@ -6,7 +6,7 @@ import math
 
 import pandas as pd
 
-from mlos.Spaces import CategoricalDimension, ContinuousDimension, DiscreteDimension, Hypergrid, Point, SimpleHypergrid
+from mlos.Spaces import CategoricalDimension, ContinuousDimension, DiscreteDimension, Hypergrid, Point, PointBatch, SimpleHypergrid
 from mlos.OptimizerEvaluationTools.ObjectiveFunctionBase import ObjectiveFunctionBase
 from mlos.OptimizerEvaluationTools.SyntheticFunctions.PolynomialObjective import PolynomialObjective
 from mlos.OptimizerEvaluationTools.SyntheticFunctions.PolynomialObjectiveWrapper import PolynomialObjectiveWrapper
@@ -84,9 +84,7 @@ class NestedPolynomialObjective(ObjectiveFunctionBase):
     def evaluate_dataframe(self, dataframe: pd.DataFrame) -> pd.DataFrame:
         # For now:
         values = []
-        for i in range(len(dataframe.index)):
-            row = dataframe.loc[[i]]
-            point = Point.from_dataframe(row)
+        for point in PointBatch.from_dataframe(dataframe):
             value = self.evaluate_point(point)
             values.append(value.y)
         return pd.DataFrame({'y': values})
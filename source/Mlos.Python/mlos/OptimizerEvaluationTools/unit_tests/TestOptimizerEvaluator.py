@@ -17,6 +17,7 @@ from mlos.OptimizerEvaluationTools.OptimizerEvaluatorConfigStore import optimize
 from mlos.OptimizerEvaluationTools.OptimizerEvaluationReport import OptimizerEvaluationReport
 from mlos.OptimizerEvaluationTools.ObjectiveFunctionFactory import objective_function_config_store
 from mlos.Optimizers.BayesianOptimizerFactory import bayesian_optimizer_config_store
+from mlos.Optimizers.OptimizerCheckpoint import OptimizerCheckpoint
 from mlos.Optimizers.RegressionModels.GoodnessOfFitMetrics import DataSetType, GoodnessOfFitMetrics
 from mlos.Spaces import Point
 from mlos.Tracer import Tracer, traced
@@ -83,7 +84,7 @@ class TestOptimizerEvaluator:
         # Now let's do it again with the unpickled optimizer.
         #
         unpickled_objective_function = pickle.loads(optimizer_evaluation_report.pickled_objective_function_initial_state)
-        unpickled_optimizer = pickle.loads(optimizer_evaluation_report.pickled_optimizer_initial_state)
+        unpickled_optimizer = OptimizerCheckpoint.loads(optimizer_evaluation_report.pickled_optimizer_initial_state)
         optimizer_evaluator_2 = OptimizerEvaluator(
             optimizer_evaluator_config=optimizer_evaluator_config,
             objective_function=unpickled_objective_function,
@@ -142,8 +143,8 @@ class TestOptimizerEvaluator:
 
         # Finally, let's make sure that the optimizers serialized to disk are usable.
         #
-        final_optimizer_from_disk = pickle.loads(restored_evaluation_report.pickled_optimizers_over_time[49])
-        final_optimizer_from_report = pickle.loads(optimizer_evaluation_report.pickled_optimizers_over_time[49])
+        final_optimizer_from_disk = OptimizerCheckpoint.loads(restored_evaluation_report.pickled_optimizers_over_time[49])
+        final_optimizer_from_report = OptimizerCheckpoint.loads(optimizer_evaluation_report.pickled_optimizers_over_time[49])
 
         for _ in range(20):
             assert final_optimizer_from_disk.suggest() in final_optimizer_from_report.optimization_problem.parameter_space
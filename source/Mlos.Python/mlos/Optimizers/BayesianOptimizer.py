@@ -17,6 +17,8 @@ from mlos.Optimizers.RegressionModels.MultiObjectiveHomogeneousRandomForest impo
 from mlos.Optimizers.RegressionModels.MultiObjectiveLassoCrossValidated import MultiObjectiveLassoCrossValidated
 from mlos.Optimizers.RegressionModels.MultiObjectiveRegressionEnhancedRandomForest import MultiObjectiveRegressionEnhancedRandomForest
 from mlos.Optimizers.RegressionModels.MultiObjectiveRegressionModel import MultiObjectiveRegressionModel
+from mlos.Optimizers.RegressionModels.MultiObjectiveNativeRandomForest import MultiObjectiveNativeRandomForest
+from mlos.Optimizers.RegressionModels.MultiObjectiveGaussianProcess import MultiObjectiveGaussianProcess
 from mlos.Optimizers.RegressionModels.Prediction import Prediction
 from mlos.Tracer import trace
 from mlos.Spaces import Point
@@ -66,7 +68,9 @@ class BayesianOptimizer(OptimizerBase):
             HomogeneousRandomForestRegressionModel.__name__,
             MultiObjectiveHomogeneousRandomForest.__name__,
             MultiObjectiveLassoCrossValidated.__name__,
-            MultiObjectiveRegressionEnhancedRandomForest.__name__
+            MultiObjectiveRegressionEnhancedRandomForest.__name__,
+            MultiObjectiveNativeRandomForest.__name__,
+            MultiObjectiveGaussianProcess.__name__
         )
 
         # Note that even if the user requested a HomogeneousRandomForestRegressionModel, we still create a MultiObjectiveRegressionModel
@@ -100,6 +104,20 @@ class BayesianOptimizer(OptimizerBase):
                 output_space=self.surrogate_model_output_space,
                 logger=self.logger
             )
+        elif self.optimizer_config.surrogate_model_implementation == MultiObjectiveNativeRandomForest.__name__:
+            self.surrogate_model: MultiObjectiveRegressionModel = MultiObjectiveNativeRandomForest(
+                model_config=self.optimizer_config.native_random_forest_regression_model_config,
+                input_space=self.optimization_problem.feature_space,
+                output_space=self.surrogate_model_output_space,
+                logger=self.logger
+            )
+        elif self.optimizer_config.surrogate_model_implementation == MultiObjectiveGaussianProcess.__name__:
+            self.surrogate_model: MultiObjectiveRegressionModel = MultiObjectiveGaussianProcess(
+                model_config=self.optimizer_config.gaussian_process_regression_model_config,
+                input_space=self.optimization_problem.feature_space,
+                output_space=self.surrogate_model_output_space,
+                logger=self.logger
+            )
         else:
             raise RuntimeError(f"Unrecognized surrogate_model_implementation {self.optimizer_config.surrogate_model_implementation}")
 
@@ -142,6 +160,16 @@ class BayesianOptimizer(OptimizerBase):
     def num_observed_samples(self):
         return len(self._parameter_values_df.index)
 
+    @property
+    def model_version(self):
+        """ Changes whenever the optimizer's suggestions may have changed materially.
+
+        That is when the surrogate model is refit, and when the optimizer switches from random to guided suggestions.
+        Observations that are registered without triggering a refit leave the version unchanged.
+        """
+        guided = self.num_observed_samples >= self.optimizer_config.min_samples_required_for_guided_design_of_experiments
+        return guided, self.surrogate_model.fit_version
+
     def compute_surrogate_model_goodness_of_fit(self):
         if not self.surrogate_model.trained:
             raise RuntimeError("Model has not been trained yet.")
@@ -162,6 +190,16 @@ class BayesianOptimizer(OptimizerBase):
     def get_all_observations(self):
         return self._parameter_values_df.copy(), self._target_values_df.copy(), self._context_values_df.copy()
 
+    def get_observations_since(self, num_observations: int):
+        """ Returns the observations registered after the first num_observations ones, in the same format as get_all_observations().
+
+        """
+        return (
+            self._parameter_values_df.iloc[num_observations:].copy(),
+            self._target_values_df.iloc[num_observations:].copy(),
+            self._context_values_df.iloc[num_observations:].copy()
+        )
+
     @trace()
     def suggest(self, random=False, context: Point = None):
         if self.optimization_problem.context_space is not None:
@@ -216,6 +254,20 @@ class BayesianOptimizer(OptimizerBase):
             if len(context_columns_to_retain) == 0:
                 raise ValueError(f"None of the {context_values_pandas_frame.columns} is a context recognized by this optimizer.")
             context_values_pandas_frame = context_values_pandas_frame[context_columns_to_retain]
+
+        # Before the new observations are used for training, let's score them as a holdout set. This costs O(new observations).
+        #
+        if self.surrogate_model.trained:
+            new_feature_values_pandas_frame = self.optimization_problem.construct_feature_dataframe(
+                parameters_df=parameter_values_pandas_frame.reset_index(drop=True),
+                context_df=context_values_pandas_frame.reset_index(drop=True) if context_values_pandas_frame is not None else None
+            )
+            self.surrogate_model.update_holdout_goodness_of_fit(
+                features_df=new_feature_values_pandas_frame,
+                targets_df=target_values_pandas_frame.reset_index(drop=True)
+            )
+
+        if context_values_pandas_frame is not None:
             self._context_values_df = self._context_values_df.append(context_values_pandas_frame, ignore_index=True)
 
         self._parameter_values_df = self._parameter_values_df.append(parameter_values_pandas_frame, ignore_index=True)
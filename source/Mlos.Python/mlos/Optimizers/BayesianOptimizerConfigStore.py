@@ -12,6 +12,10 @@ from mlos.Optimizers.RegressionModels.LassoCrossValidatedConfigStore import lass
 from mlos.Optimizers.RegressionModels.MultiObjectiveLassoCrossValidated import MultiObjectiveLassoCrossValidated
 from mlos.Optimizers.RegressionModels.RegressionEnhancedRandomForestConfigStore import regression_enhanced_random_forest_config_store
 from mlos.Optimizers.RegressionModels.MultiObjectiveRegressionEnhancedRandomForest import MultiObjectiveRegressionEnhancedRandomForest
+from mlos.Optimizers.RegressionModels.NativeRandomForestConfigStore import native_random_forest_config_store
+from mlos.Optimizers.RegressionModels.MultiObjectiveNativeRandomForest import MultiObjectiveNativeRandomForest
+from mlos.Optimizers.RegressionModels.GaussianProcessConfigStore import gaussian_process_config_store
+from mlos.Optimizers.RegressionModels.MultiObjectiveGaussianProcess import MultiObjectiveGaussianProcess
 
 bayesian_optimizer_config_store = ComponentConfigStore(
     parameter_space=SimpleHypergrid(
@@ -21,7 +25,9 @@ bayesian_optimizer_config_store = ComponentConfigStore(
                 HomogeneousRandomForestRegressionModel.__name__,
                 MultiObjectiveHomogeneousRandomForest.__name__,
                 MultiObjectiveLassoCrossValidated.__name__,
-                MultiObjectiveRegressionEnhancedRandomForest.__name__
+                MultiObjectiveRegressionEnhancedRandomForest.__name__,
+                MultiObjectiveNativeRandomForest.__name__,
+                MultiObjectiveGaussianProcess.__name__
             ]),
             CategoricalDimension(name="experiment_designer_implementation", values=[ExperimentDesigner.__name__]),
             DiscreteDimension(name="min_samples_required_for_guided_design_of_experiments", min=2, max=100)
@@ -48,6 +54,20 @@ bayesian_optimizer_config_store = ComponentConfigStore(
             values=[
                 MultiObjectiveRegressionEnhancedRandomForest.__name__
             ])
+    ).join(
+        subgrid=native_random_forest_config_store.parameter_space,
+        on_external_dimension=CategoricalDimension(
+            name="surrogate_model_implementation",
+            values=[
+                MultiObjectiveNativeRandomForest.__name__
+            ])
+    ).join(
+        subgrid=gaussian_process_config_store.parameter_space,
+        on_external_dimension=CategoricalDimension(
+            name="surrogate_model_implementation",
+            values=[
+                MultiObjectiveGaussianProcess.__name__
+            ])
     ).join(
         subgrid=experiment_designer_config_store.parameter_space,
         on_external_dimension=CategoricalDimension(name="experiment_designer_implementation", values=[ExperimentDesigner.__name__])
@@ -110,3 +130,29 @@ bayesian_optimizer_config_store.add_config_by_name(
     config_name="default_multi_objective_optimizer_config",
     config_point=default_multi_objective_optimizer_config
 )
+
+# A default config with the random forest backed by a single sklearn forest.
+#
+bayesian_optimizer_config_store.add_config_by_name(
+    config_name="default_with_native_random_forest",
+    config_point=Point(
+        surrogate_model_implementation=MultiObjectiveNativeRandomForest.__name__,
+        experiment_designer_implementation=ExperimentDesigner.__name__,
+        min_samples_required_for_guided_design_of_experiments=10,
+        native_random_forest_regression_model_config=native_random_forest_config_store.default,
+        experiment_designer_config=experiment_designer_config_store.default
+    )
+)
+
+# A default config with the Gaussian process surrogate.
+#
+bayesian_optimizer_config_store.add_config_by_name(
+    config_name="default_with_gaussian_process",
+    config_point=Point(
+        surrogate_model_implementation=MultiObjectiveGaussianProcess.__name__,
+        experiment_designer_implementation=ExperimentDesigner.__name__,
+        min_samples_required_for_guided_design_of_experiments=10,
+        gaussian_process_regression_model_config=gaussian_process_config_store.default,
+        experiment_designer_config=experiment_designer_config_store.default
+    )
+)
@@ -25,11 +25,15 @@ class BayesianOptimizerFactory:
 
     logger : Logger
         Logger object
+
+    max_rows_per_message : int
+        Passed on to the BayesianOptimizerProxies: dataframes with more rows are streamed to and from the service in chunks.
     """
 
-    def __init__(self, grpc_channel=None, logger=None):
+    def __init__(self, grpc_channel=None, logger=None, max_rows_per_message=10000):
         self.logger = logger if logger is not None else create_logger("BayesianOptimizerFactory")
         self._grpc_channel = grpc_channel
+        self.max_rows_per_message = max_rows_per_message
         self._optimizer_service_stub = None
         if self._grpc_channel is not None:
             self._optimizer_service_stub = OptimizerServiceStub(channel=self._grpc_channel)
@@ -85,7 +89,8 @@ class BayesianOptimizerFactory:
             optimization_problem=optimization_problem,
             optimizer_config=optimizer_config,
             id=optimizer_handle.Id,
-            logger=self.logger
+            logger=self.logger,
+            max_rows_per_message=self.max_rows_per_message
         )
 
     def connect_to_existing_remote_optimizer(self, optimizer_info: OptimizerInfo) -> BayesianOptimizerProxy:
@@ -106,5 +111,6 @@ class BayesianOptimizerFactory:
             OptimizerMonitoringServiceDecoder.decode_optimization_problem(optimizer_info.OptimizationProblem),
             optimizer_config=Point.from_json(optimizer_info.OptimizerConfigJsonString),
             id=optimizer_info.OptimizerHandle.Id,
-            logger=self.logger
+            logger=self.logger,
+            max_rows_per_message=self.max_rows_per_message
         )
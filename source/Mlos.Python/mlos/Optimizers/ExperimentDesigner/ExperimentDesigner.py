@@ -9,7 +9,7 @@ from mlos.Logger import create_logger
 from mlos.Optimizers.RegressionModels.MultiObjectiveRegressionModel import MultiObjectiveRegressionModel
 from mlos.Optimizers.OptimizationProblem import OptimizationProblem
 from mlos.Optimizers.ParetoFrontier import ParetoFrontier
-from mlos.Spaces import CategoricalDimension, ContinuousDimension, Point, SimpleHypergrid
+from mlos.Spaces import CategoricalDimension, ContinuousDimension, HypergridSampler, Point, PointBatch, SamplingStrategy, SimpleHypergrid
 from mlos.Spaces.Configs.ComponentConfigStore import ComponentConfigStore
 
 from .UtilityFunctionOptimizers.RandomNearIncumbentOptimizer import RandomNearIncumbentOptimizer, random_near_incumbent_optimizer_config_store
@@ -137,6 +137,16 @@ class ExperimentDesigner:
         self.surrogate_model: MultiObjectiveRegressionModel = surrogate_model
         self.rng = np.random.Generator(np.random.PCG64())
 
+        # Random suggestions make up the initial design of experiments, so we draw them from a scrambled Sobol sequence
+        # to spread them evenly over the parameter space.
+        #
+        self._random_suggestions_sampler = None
+        if isinstance(self.optimization_problem.parameter_space, SimpleHypergrid):
+            self._random_suggestions_sampler = HypergridSampler(
+                hypergrid=self.optimization_problem.parameter_space,
+                sampling_strategy=SamplingStrategy.SOBOL
+            )
+
         if designer_config.utility_function_implementation == ConfidenceBoundUtilityFunction.__name__:
             self.utility_function = ConfidenceBoundUtilityFunction(
                 function_config=self.config.confidence_bound_utility_function_config,
@@ -181,7 +191,7 @@ class ExperimentDesigner:
         override_random = random_number < self.config.fraction_random_suggestions
         random = random or override_random
         if random:
-            suggestion = self.optimization_problem.parameter_space.random()
+            suggestion = self._random_suggestion()
             self.logger.info(f"Producing random suggestion: {suggestion}")
             return suggestion
         try:
@@ -190,4 +200,12 @@ class ExperimentDesigner:
             return suggestion
         except UnableToProduceGuidedSuggestionException:
             self.logger.info("Failed to produce guided suggestion. Producing random suggestion instead.")
+            return self._random_suggestion()
+
+    def _random_suggestion(self):
+        if self._random_suggestions_sampler is None:
             return self.optimization_problem.parameter_space.random()
+        return PointBatch.from_dataframe(
+            self._random_suggestions_sampler.sample_dataframe(num_samples=1),
+            point_class=self.optimization_problem.parameter_space.point_class
+        )[0]
@@ -10,7 +10,7 @@ from mlos.Exceptions import UtilityValueUnavailableException
 from mlos.Optimizers.ExperimentDesigner.UtilityFunctionOptimizers.UtilityFunctionOptimizer import UtilityFunctionOptimizer
 from mlos.Optimizers.ExperimentDesigner.UtilityFunctions.UtilityFunction import UtilityFunction
 from mlos.Optimizers.OptimizationProblem import OptimizationProblem
-from mlos.Spaces import ContinuousDimension, DiscreteDimension, Point, SimpleHypergrid
+from mlos.Spaces import ContinuousDimension, DiscreteDimension, Point, PointBatch, SimpleHypergrid
 from mlos.Spaces.Configs.ComponentConfigStore import ComponentConfigStore
 from mlos.Spaces.HypergridAdapters import DiscreteToUnitContinuousHypergridAdapter
 from mlos.Tracer import trace, traced
@@ -147,7 +147,7 @@ class GlowWormSwarmOptimizer(UtilityFunctionOptimizer):
         # TODO: return the max of all seen configs - not just the configs that the glowworms occupied in this iteration.
         idx_of_max = worms['utility'].idxmax()
         best_config = worms.loc[[idx_of_max], self.dimension_names]
-        config_to_suggest = Point.from_dataframe(best_config)
+        config_to_suggest = PointBatch.from_dataframe(best_config)[0]
         self.logger.info(f"Suggesting: {str(config_to_suggest)}.")
         # TODO: we might have to go for second or nth best if the projection won't work out. But then again if we were
         # TODO: able to compute the utility function then the projection has worked out once before...
@@ -157,12 +157,16 @@ class GlowWormSwarmOptimizer(UtilityFunctionOptimizer):
     def compute_utility(self, worms, context_values_df):
         """ Computes utility function values for each worm.
 
-        Since some worm positions will produce a NaN, we need to keep producing new utility values for those.
+        Since some worm positions will produce a NaN, we need to keep producing new utility values for those. Worms
+        whose positions violate the constraints of the parameter space get no utility value and are dropped the same way.
 
         :param worms:
         :return:
         """
         unprojected_params_df = self.parameter_adapter.unproject_dataframe(worms[self.dimension_names], in_place=False)
+        parameter_space = self.optimization_problem.parameter_space
+        if isinstance(parameter_space, SimpleHypergrid) and parameter_space.has_constraints():
+            unprojected_params_df = unprojected_params_df[parameter_space.constraints_mask(unprojected_params_df)]
         features_df = self.optimization_problem.construct_feature_dataframe(unprojected_params_df, context_values_df, product=False)
         utility_function_values = self.utility_function(features_df.copy(deep=False))
         worms['utility'] = utility_function_values
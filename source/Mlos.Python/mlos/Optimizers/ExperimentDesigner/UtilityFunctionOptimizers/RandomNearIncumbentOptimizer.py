@@ -11,7 +11,7 @@ from mlos.Optimizers.ExperimentDesigner.UtilityFunctionOptimizers.UtilityFunctio
 from mlos.Optimizers.ExperimentDesigner.UtilityFunctions.UtilityFunction import UtilityFunction
 from mlos.Optimizers.OptimizationProblem import OptimizationProblem
 from mlos.Optimizers.ParetoFrontier import ParetoFrontier
-from mlos.Spaces import ContinuousDimension, DiscreteDimension, Point, SimpleHypergrid
+from mlos.Spaces import ContinuousDimension, DiscreteDimension, Point, PointBatch, SimpleHypergrid
 from mlos.Spaces.Configs.ComponentConfigStore import ComponentConfigStore
 from mlos.Spaces.HypergridAdapters import DiscreteToUnitContinuousHypergridAdapter
 from mlos.Tracer import trace
@@ -223,7 +223,7 @@ class RandomNearIncumbentOptimizer(UtilityFunctionOptimizer):
 
         idx_of_max = incumbents_df['utility'].idxmax()
         best_config_df = incumbents_df.loc[[idx_of_max], self.parameter_dimension_names]
-        config_to_suggest = Point.from_dataframe(best_config_df)
+        config_to_suggest = PointBatch.from_dataframe(best_config_df)[0]
         unprojected_config_to_suggest = self.parameter_adapter.unproject_point(config_to_suggest)
         self.logger.info(f"After {num_iterations} iterations suggesting: {unprojected_config_to_suggest.to_json(indent=2)}")
         return unprojected_config_to_suggest
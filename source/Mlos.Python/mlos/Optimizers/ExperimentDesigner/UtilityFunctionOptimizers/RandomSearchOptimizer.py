@@ -2,13 +2,15 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 #
+from collections import OrderedDict
+
 import pandas as pd
 
 from mlos.Exceptions import UtilityValueUnavailableException
 from mlos.Optimizers.OptimizationProblem import OptimizationProblem
 from mlos.Optimizers.ExperimentDesigner.UtilityFunctionOptimizers.UtilityFunctionOptimizer import UtilityFunctionOptimizer
 from mlos.Optimizers.ExperimentDesigner.UtilityFunctions.UtilityFunction import UtilityFunction
-from mlos.Spaces import SimpleHypergrid, DiscreteDimension, Point
+from mlos.Spaces import CategoricalDimension, DiscreteDimension, Point, PointBatch, SamplingStrategy, SimpleHypergrid
 from mlos.Spaces.Configs.ComponentConfigStore import ComponentConfigStore
 from mlos.Tracer import trace
 
@@ -17,11 +19,17 @@ random_search_optimizer_config_store = ComponentConfigStore(
     parameter_space=SimpleHypergrid(
         name="random_search_optimizer_config",
         dimensions=[
-            DiscreteDimension(name="num_samples_per_iteration", min=1, max=100000)
+            DiscreteDimension(name="num_samples_per_iteration", min=1, max=100000),
+            CategoricalDimension(name="sampling_strategy", values=[sampling_strategy.value for sampling_strategy in SamplingStrategy]),
+            DiscreteDimension(name="num_cached_candidates_per_context", min=0, max=10000),
+            DiscreteDimension(name="max_num_cached_contexts", min=1, max=100000)
         ]
     ),
     default=Point(
-        num_samples_per_iteration=1000
+        num_samples_per_iteration=1000,
+        sampling_strategy=SamplingStrategy.SOBOL.value,
+        num_cached_candidates_per_context=10,
+        max_num_cached_contexts=100
     )
 )
 
@@ -32,6 +40,11 @@ class RandomSearchOptimizer(UtilityFunctionOptimizer):
     This is the simplest optimizer to implement and a good baseline for all other optimizers
     to beat.
 
+    The best num_cached_candidates_per_context runners-up of each search are kept in a candidate pool keyed by the context
+    they were evaluated in, and compete again with the fresh samples the next time a suggestion for that context is requested.
+    This way the search effectively accumulates samples across calls without having to evaluate more of them per call. Pools
+    for at most max_num_cached_contexts contexts are kept, the least recently used ones are evicted first.
+
     """
 
     def __init__(
@@ -42,6 +55,22 @@ class RandomSearchOptimizer(UtilityFunctionOptimizer):
             logger=None
     ):
         UtilityFunctionOptimizer.__init__(self, optimizer_config, optimization_problem, utility_function, logger)
+        self._candidate_pools = OrderedDict()
+
+    @staticmethod
+    def _make_candidate_pool_key(context_values_dataframe: pd.DataFrame):
+        """ Returns a hashable key identifying the context, or None if there is no context.
+
+        """
+        if context_values_dataframe is None or len(context_values_dataframe.index) == 0:
+            return None
+        context_values = context_values_dataframe.iloc[0]
+        return tuple(sorted(
+            (dimension_name, value)
+            for dimension_name, value
+            in context_values.items()
+            if not pd.isnull(value)
+        ))
 
     @trace()
     def suggest(self, context_values_dataframe: pd.DataFrame = None):
@@ -49,12 +78,23 @@ class RandomSearchOptimizer(UtilityFunctionOptimizer):
 
         It does so by generating num_samples_per_iteration random configurations,
         passing them through the utility function and selecting the configuration with
-        the highest utility value.
+        the highest utility value. The configurations are drawn with the configured
+        sampling strategy, so low-discrepancy strategies cover the space with fewer samples.
+
+        The candidates cached for this context are evaluated alongside the fresh samples.
 
-        TODO: make it capable of consuming the context values
         :return:
         """
-        parameter_values_dataframe = self.optimization_problem.parameter_space.random_dataframe(num_samples=self.optimizer_config.num_samples_per_iteration)
+        parameter_values_dataframe = self.optimization_problem.parameter_space.sample_dataframe(
+            num_samples=self.optimizer_config.num_samples_per_iteration,
+            sampling_strategy=SamplingStrategy(self.optimizer_config.sampling_strategy)
+        )
+
+        candidate_pool_key = self._make_candidate_pool_key(context_values_dataframe)
+        cached_candidates_dataframe = self._candidate_pools.pop(candidate_pool_key, None)
+        if cached_candidates_dataframe is not None:
+            parameter_values_dataframe = pd.concat([cached_candidates_dataframe, parameter_values_dataframe], ignore_index=True)
+
         feature_values_dataframe = self.optimization_problem.construct_feature_dataframe(
             parameters_df=parameter_values_dataframe,
             context_df=context_values_dataframe,
@@ -67,7 +107,27 @@ class RandomSearchOptimizer(UtilityFunctionOptimizer):
             raise UtilityValueUnavailableException(f"Utility function {self.utility_function.__class__.__name__} produced no values.")
 
         index_of_max_value = utility_function_values[['utility']].idxmax()['utility']
-        argmax_point = Point.from_dataframe(feature_values_dataframe.loc[[index_of_max_value]])
-        config_to_suggest = argmax_point[self.optimization_problem.parameter_space.name]
+        self._cache_candidates(
+            candidate_pool_key=candidate_pool_key,
+            parameter_values_dataframe=parameter_values_dataframe,
+            utility_function_values=utility_function_values,
+            index_of_max_value=index_of_max_value
+        )
+        argmax_batch = PointBatch.from_dataframe(feature_values_dataframe.loc[[index_of_max_value]])
+        config_to_suggest = argmax_batch.subgrid(self.optimization_problem.parameter_space.name)[0]
         self.logger.debug(f"Suggesting: {str(config_to_suggest)}")
         return config_to_suggest
+
+    def _cache_candidates(self, candidate_pool_key, parameter_values_dataframe, utility_function_values, index_of_max_value):
+        """ Keeps the best candidates other than the suggested one in the candidate pool for this context.
+
+        The suggested candidate is left out so that consecutive suggestions don't repeat it before the model learns from it.
+        """
+        num_cached_candidates = self.optimizer_config.num_cached_candidates_per_context
+        if num_cached_candidates == 0:
+            return
+
+        runners_up_index = utility_function_values['utility'].drop(index_of_max_value).nlargest(num_cached_candidates).index
+        self._candidate_pools[candidate_pool_key] = parameter_values_dataframe.loc[runners_up_index].reset_index(drop=True)
+        while len(self._candidate_pools) > self.optimizer_config.max_num_cached_contexts:
+            self._candidate_pools.popitem(last=False)
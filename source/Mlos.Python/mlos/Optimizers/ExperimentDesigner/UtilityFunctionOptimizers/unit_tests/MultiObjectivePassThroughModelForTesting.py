@@ -122,6 +122,12 @@ class MultiObjectivePassThroughModelForTesting(MultiObjectiveRegressionModel):
     def trained(self) -> bool:
         return True
 
+    @property
+    def fit_version(self):
+        # The objective function never changes, so neither do the predictions.
+        #
+        return 0
+
     def fit(self, features_df: pd.DataFrame, targets_df: pd.DataFrame, iteration_number: int) -> None:
         ...
 
@@ -106,6 +106,26 @@ class TestUtilityFunctionOptimizers:
             print(suggested_params.to_json())
             assert suggested_params in self.parameter_space
 
+    @trace()
+    def test_random_search_optimizer_candidate_pool(self):
+        optimizer_config = random_search_optimizer_config_store.default.copy()
+        optimizer_config.num_samples_per_iteration = 100
+        optimizer_config.num_cached_candidates_per_context = 7
+        random_search_optimizer = RandomSearchOptimizer(
+            optimization_problem=self.optimization_problem,
+            utility_function=self.utility_function,
+            optimizer_config=optimizer_config,
+            logger=self.logger
+        )
+        for _ in range(5):
+            suggested_params = random_search_optimizer.suggest()
+            assert suggested_params in self.parameter_space
+
+            # The problem has no context, so all candidates are pooled under the None key.
+            #
+            assert list(random_search_optimizer._candidate_pools.keys()) == [None]  # pylint: disable=protected-access
+            assert len(random_search_optimizer._candidate_pools[None].index) == 7  # pylint: disable=protected-access
+
     @trace()
     def test_glow_worm_swarm_optimizer(self):
         print("##############################################")
@@ -0,0 +1,161 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import pickle
+
+from mlos.Logger import create_logger
+from mlos.Optimizers.BayesianOptimizer import BayesianOptimizer
+from mlos.Optimizers.OptimizationProblem import OptimizationProblem, objective_from_dict, objective_to_dict
+from mlos.Spaces.HypergridsBinaryEncoderDecoder import HypergridBinaryDecoder, HypergridBinaryEncoder
+from mlos.Utils.Checkpoint import MAGIC, CheckpointReader, CheckpointWriter
+
+
+class OptimizerCheckpoint:
+    """ Saves BayesianOptimizers to checkpoints and restores them.
+
+    A checkpoint (see mlos.Utils.Checkpoint) holds the following entries:
+        problem                         - the optimization problem and the optimizer config, in the binary hypergrid format
+        parameters, targets, context    - the observations, one raw array per column
+        state                           - the optimizer's attributes listed in _state_attribute_names: surrogate model,
+                                          experiment designer, pareto frontier, random states and so on
+
+    The state is pickled, but every numpy array in it - such as the node arrays of fitted sklearn trees - is stored as a raw
+    entry, and the optimization problem, its hypergrids, the optimizer config and the logger are referenced instead of
+    copied. The restored optimizer uses the logger it is loaded with.
+
+    Only the state is tied to pickle compatibility. If it was left out, or can no longer be loaded, e.g. because the classes
+    it refers to have changed since, the optimizer is recreated from the problem and config, and the observations are
+    registered with it again. This refits the surrogate model.
+
+    Pickled optimizers, which is what checkpoints used to be, are still loaded.
+    """
+
+    _observation_attribute_names_by_entry_name = {
+        'parameters': '_parameter_values_df',
+        'targets': '_target_values_df',
+        'context': '_context_values_df'
+    }
+
+    # Everything else the optimizer needs, besides its logger and the observations above. Any attribute added to
+    # BayesianOptimizer has to be listed here to survive a checkpoint.
+    #
+    _state_attribute_names = (
+        'optimization_problem',
+        'optimizer_config',
+        'surrogate_model_output_space',
+        'pareto_frontier',
+        'surrogate_model',
+        'experiment_designer',
+        '_optimizer_convergence_state',
+        '_parameter_names',
+        '_parameter_names_set',
+        '_context_names',
+        '_context_names_set',
+        '_target_names',
+        '_target_names_set'
+    )
+
+    @classmethod
+    def dumps(cls, optimizer: BayesianOptimizer, compress: bool = False, include_state: bool = True) -> bytes:
+        return cls._make_writer(optimizer, compress=compress, include_state=include_state).to_bytes()
+
+    @classmethod
+    def dump(cls, optimizer: BayesianOptimizer, path: str, compress: bool = False, include_state: bool = True) -> None:
+        cls._make_writer(optimizer, compress=compress, include_state=include_state).write(path)
+
+    @classmethod
+    def loads(cls, data, logger=None) -> BayesianOptimizer:
+        if not CheckpointReader.is_checkpoint(data):
+            return pickle.loads(data)
+        return cls._restore(CheckpointReader(data), logger=logger)
+
+    @classmethod
+    def load(cls, path: str, use_mmap: bool = True, logger=None) -> BayesianOptimizer:
+        """ Loads the optimizer from a checkpoint file.
+
+        With use_mmap, the file is memory-mapped and the restored optimizer may keep referring to the mapping. Callers that
+        want to delete or replace the file right away should pass use_mmap=False.
+        """
+        with open(path, 'rb') as checkpoint_file:
+            if not CheckpointReader.is_checkpoint(checkpoint_file.read(len(MAGIC))):
+                checkpoint_file.seek(0)
+                return pickle.load(checkpoint_file)
+        return cls._restore(CheckpointReader.open(path, use_mmap=use_mmap), logger=logger)
+
+    @staticmethod
+    def _external_objects(optimization_problem: OptimizationProblem, optimizer_config, logger):
+        return {
+            'logger': logger,
+            'optimization_problem': optimization_problem,
+            'parameter_space': optimization_problem.parameter_space,
+            'objective_space': optimization_problem.objective_space,
+            'context_space': optimization_problem.context_space,
+            'feature_space': optimization_problem.feature_space,
+            'optimizer_config': optimizer_config
+        }
+
+    @classmethod
+    def _make_writer(cls, optimizer: BayesianOptimizer, compress: bool, include_state: bool) -> CheckpointWriter:
+        optimization_problem = optimizer.optimization_problem
+        writer = CheckpointWriter(compress=compress)
+        writer.add_bytes('problem', HypergridBinaryEncoder.encode({
+            'parameter_space': optimization_problem.parameter_space,
+            'objective_space': optimization_problem.objective_space,
+            'context_space': optimization_problem.context_space,
+            'objectives': [objective_to_dict(objective) for objective in optimization_problem.objectives],
+            'optimizer_config': optimizer.optimizer_config
+        }))
+
+        for entry_name, attribute_name in cls._observation_attribute_names_by_entry_name.items():
+            writer.add_dataframe(entry_name, getattr(optimizer, attribute_name))
+
+        if include_state:
+            state = {attribute_name: getattr(optimizer, attribute_name) for attribute_name in cls._state_attribute_names}
+            writer.add_object(
+                'state',
+                state,
+                external_objects=cls._external_objects(optimization_problem, optimizer.optimizer_config, optimizer.logger)
+            )
+        return writer
+
+    @classmethod
+    def _restore(cls, reader: CheckpointReader, logger=None) -> BayesianOptimizer:
+        if logger is None:
+            logger = create_logger(cls.__name__)
+
+        problem = HypergridBinaryDecoder.decode(reader.get_bytes('problem'), use_cache=False)
+        optimization_problem = OptimizationProblem(
+            parameter_space=problem['parameter_space'],
+            objective_space=problem['objective_space'],
+            objectives=[objective_from_dict(objective_dict) for objective_dict in problem['objectives']],
+            context_space=problem['context_space']
+        )
+        optimizer_config = problem['optimizer_config']
+        observations = {
+            entry_name: reader.get_dataframe(entry_name)
+            for entry_name in cls._observation_attribute_names_by_entry_name
+        }
+
+        if 'state' in reader:
+            try:
+                state = reader.get_object('state', external_objects=cls._external_objects(optimization_problem, optimizer_config, logger))
+                optimizer = BayesianOptimizer.__new__(BayesianOptimizer)
+                optimizer.logger = logger
+                for attribute_name in cls._state_attribute_names:
+                    setattr(optimizer, attribute_name, state[attribute_name])
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(f"Failed to restore the optimizer's state, the surrogate model will be refit instead. Reason: {e}")
+            else:
+                for entry_name, attribute_name in cls._observation_attribute_names_by_entry_name.items():
+                    setattr(optimizer, attribute_name, observations[entry_name])
+                return optimizer
+
+        optimizer = BayesianOptimizer(optimization_problem=optimization_problem, optimizer_config=optimizer_config, logger=logger)
+        if len(observations['parameters'].index) > 0:
+            optimizer.register(
+                parameter_values_pandas_frame=observations['parameters'],
+                target_values_pandas_frame=observations['targets'],
+                context_values_pandas_frame=observations['context'] if optimization_problem.context_space is not None else None
+            )
+        return optimizer
@@ -47,7 +47,9 @@ decision_tree_config_store = ComponentConfigStore(
             ContinuousDimension(name="min_impurity_decrease", min=0.0, max=2**10),
             ContinuousDimension(name="ccp_alpha", min=0.0, max=2**10),
             DiscreteDimension(name="min_samples_to_fit", min=1, max=32),
-            DiscreteDimension(name="n_new_samples_before_refit", min=1, max=32)
+            DiscreteDimension(name="n_new_samples_before_refit", min=1, max=32),
+            CategoricalDimension(name="streaming_leaf_updates", values=[True, False]),
+            ContinuousDimension(name="max_leaf_size_drift", min=0.1, max=10)
         ]
     ),
     default=Point(
@@ -62,7 +64,9 @@ decision_tree_config_store = ComponentConfigStore(
         min_impurity_decrease=0.0,
         ccp_alpha=0.0,
         min_samples_to_fit=10,
-        n_new_samples_before_refit=10
+        n_new_samples_before_refit=10,
+        streaming_leaf_updates=False,
+        max_leaf_size_drift=1.0
     ),
     description="Governs the construction of an instance of a decision tree regressor. Most of the parameters are passed directly"
                 "to the DecisionTreeRegressor constructor. Two exceptions: "
@@ -88,4 +92,9 @@ decision_tree_config_store = ComponentConfigStore(
                 "min_samples_to_fit: minimum number of samples before it makes sense to try to fit this tree"
                 "n_new_samples_before_refit: It makes little sense to refit every model for every sample. This parameter controls"
                 " how frequently we refit the decision tree."
+                "streaming_leaf_updates: if True, new samples that arrive between refits are routed to the leaves of the existing tree"
+                " and the leaf statistics are updated in place. The tree structure is regrown every n_new_samples_before_refit samples."
+                " Off by default: trees in a random forest draw a fresh subsample on every fit, so they cannot stream into their leaves."
+                "max_leaf_size_drift: if any leaf grows by more than this fraction of its size at the last regrowth, the tree structure"
+                " is regrown early."
 )
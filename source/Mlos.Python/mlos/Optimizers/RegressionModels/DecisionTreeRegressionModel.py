@@ -3,6 +3,7 @@
 # Licensed under the MIT License.
 #
 import numpy as np
+import pandas as pd
 from sklearn.tree import DecisionTreeRegressor
 
 from mlos.Logger import create_logger
@@ -17,6 +18,11 @@ from mlos.Tracer import trace
 class DecisionTreeRegressionModel(RegressionModel):
     """ Wraps sklearn's DecisionTreeRegressor.
 
+    The tree keeps the count, mean and sum of squared deviations of the targets in each leaf. If streaming_leaf_updates is
+    enabled, new samples that arrive between regrowths of the tree structure are routed to their existing leaves and folded
+    into these statistics using the batched variant of Welford's algorithm (Chan et al.). The structure is regrown every
+    n_new_samples_before_refit samples, or sooner if any leaf grows by more than max_leaf_size_drift.
+
     TODO: Beef up the RegressionModel base class and actually enforce a consistent interface.
     TODO: See how much boilerplate we can remove from model creation.
     """
@@ -73,12 +79,17 @@ class DecisionTreeRegressionModel(RegressionModel):
             ccp_alpha=self.model_config.ccp_alpha
         )
 
-        # These are used to compute the variance in predictions
-        self._observations_per_leaf = dict()
-        self._mean_per_leaf = dict()
-        self._mean_variance_per_leaf = dict()
-        self._sample_variance_per_leaf = dict()
-        self._count_per_leaf = dict()
+        # These are used to compute the variance in predictions. They are indexed by the node ids returned from apply().
+        #
+        self._count_per_leaf = None
+        self._mean_per_leaf = None
+        self._sum_of_squared_deviations_per_leaf = None
+
+        # To detect leaf size drift and new samples between regrowths of the tree.
+        #
+        self._count_per_leaf_at_last_regrowth = None
+        self._last_regrowth_iteration_number = 0
+        self._observations_index = pd.Index([])
 
         self._trained = False
 
@@ -96,12 +107,16 @@ class DecisionTreeRegressionModel(RegressionModel):
         This model should be fitted under the following conditions:
         1) It has not been fitted yet and num_samples is larger than min_samples_to_fit
         2) The model has been fitted and the number of new samples is larger than n_new_samples_before_refit
+        3) The model has been fitted and streaming_leaf_updates is enabled, in which case fit() decides whether to regrow
+           the tree or to merely update the leaf statistics.
 
         :param num_samples:
         :return:
         """
         if not self.trained:
             return num_samples > self.model_config.min_samples_to_fit
+        if self.model_config.streaming_leaf_updates:
+            return True
         num_new_samples = num_samples - self.num_observations_used_to_fit
         return num_new_samples >= self.model_config.n_new_samples_before_refit
 
@@ -113,44 +128,86 @@ class DecisionTreeRegressionModel(RegressionModel):
         #
         feature_values_pandas_frame = self._input_space_adapter.project_dataframe(feature_values_pandas_frame, in_place=False)
 
+        if self._should_regrow(iteration_number):
+            self._regrow(feature_values_pandas_frame, target_values_pandas_frame, iteration_number)
+        else:
+            # Only the samples we have not seen before are routed to their leaves.
+            #
+            new_rows_mask = ~feature_values_pandas_frame.index.isin(self._observations_index)
+            if not new_rows_mask.any():
+                return
+
+            new_feature_values = feature_values_pandas_frame.loc[new_rows_mask, self.input_dimension_names].to_numpy()
+            new_target_values = target_values_pandas_frame.loc[new_rows_mask, self.target_dimension_names].to_numpy()
+            self._update_leaf_statistics(leaf_indices=self._regressor.apply(new_feature_values), target_values=new_target_values)
+            self._observations_index = self._observations_index.append(feature_values_pandas_frame.index[new_rows_mask]).unique()
+            self.logger.debug(f"Routed {new_rows_mask.sum()} new samples to existing leaves.")
+
+            if self._leaf_sizes_drifted():
+                self._regrow(feature_values_pandas_frame, target_values_pandas_frame, iteration_number)
+
+        self._trained = True
+        self.last_refit_iteration_number = iteration_number
+
+    def _should_regrow(self, iteration_number):
+        if not self.trained or not self.model_config.streaming_leaf_updates:
+            return True
+        return iteration_number - self._last_regrowth_iteration_number >= self.model_config.n_new_samples_before_refit
+
+    def _leaf_sizes_drifted(self):
+        """ Returns True if any leaf grew by more than max_leaf_size_drift since the tree structure was last regrown.
+
+        """
+        leaves_mask = self._count_per_leaf_at_last_regrowth > 0
+        growth = self._count_per_leaf[leaves_mask] / self._count_per_leaf_at_last_regrowth[leaves_mask] - 1
+        return growth.max() > self.model_config.max_leaf_size_drift
+
+    def _regrow(self, feature_values_pandas_frame, target_values_pandas_frame, iteration_number):
         feature_values = feature_values_pandas_frame[self.input_dimension_names].to_numpy()
         target_values = target_values_pandas_frame[self.target_dimension_names].to_numpy()
 
-        # Clean up state before fitting again
-        self._observations_per_leaf = dict()
-
         self._regressor.fit(feature_values, target_values)
 
         # Now that we have fit the model we can augment our tree by computing the variance
-        # TODO: this code can be easily optimized, but premature optimization is the root of all evil.
-        node_indices = self._regressor.apply(feature_values)
-        self.logger.debug(f"The resulting three has {len(node_indices)} leaf nodes.")
-
-        for node_index, sample_target_value in zip(node_indices, target_values):
-            observations_at_leaf = self._observations_per_leaf.get(node_index, [])
-            observations_at_leaf.append(sample_target_value)
-            self._observations_per_leaf[node_index] = observations_at_leaf
-
-        # Now let's compute all predictions
-        for node_index in self._observations_per_leaf:
-            # First convert the observations to a numpy array.
-            observations_at_leaf = np.array(self._observations_per_leaf[node_index])
-            self._observations_per_leaf[node_index] = observations_at_leaf
-
-            leaf_mean = np.mean(observations_at_leaf)
-            leaf_sample_variance = np.var(observations_at_leaf, ddof=1) # ddof = delta degrees of freedom. We want sample variance.
-            leaf_mean_variance = leaf_sample_variance / len(observations_at_leaf)
-
-            self._mean_per_leaf[node_index] = leaf_mean
-            self._mean_variance_per_leaf[node_index] = leaf_mean_variance
-            self._sample_variance_per_leaf[node_index] = leaf_sample_variance
-            self._count_per_leaf[node_index] = len(observations_at_leaf)
+        #
+        num_nodes = self._regressor.tree_.node_count
+        self._count_per_leaf = np.zeros(num_nodes, dtype=np.int64)
+        self._mean_per_leaf = np.zeros(num_nodes)
+        self._sum_of_squared_deviations_per_leaf = np.zeros(num_nodes)
+        self._update_leaf_statistics(leaf_indices=self._regressor.apply(feature_values), target_values=target_values)
+        self.logger.debug(f"The resulting tree has {self._regressor.get_n_leaves()} leaf nodes.")
+
+        self._count_per_leaf_at_last_regrowth = self._count_per_leaf.copy()
+        self._last_regrowth_iteration_number = iteration_number
+        self._observations_index = feature_values_pandas_frame.index.unique()
+
+    def _update_leaf_statistics(self, leaf_indices, target_values):
+        """ Merges the targets routed to each leaf into that leaf's count, mean and sum of squared deviations.
+
+        The statistics of the new batch are computed per leaf and combined with the existing ones using the parallel variant
+        of Welford's algorithm, which is numerically stable and exact regardless of how the samples are batched.
+        """
+        target_values = target_values.ravel()
+        num_nodes = len(self._count_per_leaf)
 
-        self._trained = True
-        self.last_refit_iteration_number = iteration_number
+        batch_count = np.bincount(leaf_indices, minlength=num_nodes)
+        updated_leaves_mask = batch_count > 0
+        batch_mean = np.zeros(num_nodes)
+        batch_mean[updated_leaves_mask] = np.bincount(leaf_indices, weights=target_values, minlength=num_nodes)[updated_leaves_mask] \
+                                          / batch_count[updated_leaves_mask]
+        batch_sum_of_squared_deviations = np.bincount(leaf_indices, weights=(target_values - batch_mean[leaf_indices]) ** 2, minlength=num_nodes)
+
+        old_count = self._count_per_leaf[updated_leaves_mask]
+        new_count = old_count + batch_count[updated_leaves_mask]
+        delta = batch_mean[updated_leaves_mask] - self._mean_per_leaf[updated_leaves_mask]
+
+        self._mean_per_leaf[updated_leaves_mask] += delta * batch_count[updated_leaves_mask] / new_count
+        self._sum_of_squared_deviations_per_leaf[updated_leaves_mask] += batch_sum_of_squared_deviations[updated_leaves_mask] \
+                                                                         + delta ** 2 * old_count * batch_count[updated_leaves_mask] / new_count
+        self._count_per_leaf[updated_leaves_mask] = new_count
 
     @trace()
-    def predict(self, feature_values_pandas_frame, include_only_valid_rows=True):
+    def _predict(self, feature_values_pandas_frame, include_only_valid_rows=True):
         self.logger.debug(f"Creating predictions for {len(feature_values_pandas_frame.index)} samples.")
 
         # dataframe column shortcuts
@@ -176,14 +233,22 @@ class DecisionTreeRegressionModel(RegressionModel):
         prediction_dataframe = predictions.get_dataframe()
 
         if valid_rows_index is not None and not valid_rows_index.empty:
-            prediction_dataframe['leaf_node_index'] = self._regressor.apply(features_df.loc[valid_rows_index].to_numpy())
-            prediction_dataframe[predicted_value_col] = prediction_dataframe['leaf_node_index'].map(self._mean_per_leaf)
-            prediction_dataframe[predicted_value_var_col] = prediction_dataframe['leaf_node_index'].map(self._mean_variance_per_leaf)
-            prediction_dataframe[sample_var_col] = prediction_dataframe['leaf_node_index'].map(self._sample_variance_per_leaf)
-            prediction_dataframe[sample_size_col] = prediction_dataframe['leaf_node_index'].map(self._count_per_leaf)
-            prediction_dataframe[dof_col] = prediction_dataframe[sample_size_col] - 1
+            leaf_indices = self._regressor.apply(features_df.loc[valid_rows_index].to_numpy())
+            count_per_row = self._count_per_leaf[leaf_indices]
+
+            # Sample variance is undefined for leaves with a single observation.
+            #
+            sample_variance_per_row = np.full(len(leaf_indices), np.nan)
+            multiple_observations_mask = count_per_row > 1
+            sample_variance_per_row[multiple_observations_mask] = self._sum_of_squared_deviations_per_leaf[leaf_indices][multiple_observations_mask] \
+                                                                  / (count_per_row[multiple_observations_mask] - 1)
+
+            prediction_dataframe[predicted_value_col] = self._mean_per_leaf[leaf_indices]
+            prediction_dataframe[predicted_value_var_col] = sample_variance_per_row / count_per_row
+            prediction_dataframe[sample_var_col] = sample_variance_per_row
+            prediction_dataframe[sample_size_col] = count_per_row
+            prediction_dataframe[dof_col] = count_per_row - 1
             prediction_dataframe[is_valid_input_col] = True
-            prediction_dataframe.drop(columns=['leaf_node_index'], inplace=True)
 
         predictions.validate_dataframe(prediction_dataframe)
         if not include_only_valid_rows:
@@ -0,0 +1,55 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+from enum import Enum
+
+from mlos.Spaces import SimpleHypergrid, ContinuousDimension, DiscreteDimension, CategoricalDimension, Point
+from mlos.Spaces.Configs.ComponentConfigStore import ComponentConfigStore
+
+
+class Kernel(Enum):
+    """ The stationary covariance function of the Gaussian process.
+
+    """
+    SQUARED_EXPONENTIAL = "squared_exponential"
+    MATERN_5_2 = "matern_5_2"
+
+
+gaussian_process_config_store = ComponentConfigStore(
+    parameter_space=SimpleHypergrid(
+        name="gaussian_process_regression_model_config",
+        dimensions=[
+            CategoricalDimension(name="kernel", values=[kernel.value for kernel in Kernel]),
+            ContinuousDimension(name="length_scale", min=0.01, max=10),
+            CategoricalDimension(name="optimize_length_scale", values=[True, False]),
+            ContinuousDimension(name="noise_variance", min=10**-6, max=1),
+            DiscreteDimension(name="max_exact_observations", min=10, max=2**14),
+            DiscreteDimension(name="num_inducing_points", min=10, max=2**11),
+            DiscreteDimension(name="min_samples_to_fit", min=1, max=32),
+            DiscreteDimension(name="n_new_samples_before_refit", min=1, max=32)
+        ]
+    ),
+    default=Point(
+        kernel=Kernel.MATERN_5_2.value,
+        length_scale=0.5,
+        optimize_length_scale=True,
+        noise_variance=0.01,
+        max_exact_observations=1000,
+        num_inducing_points=200,
+        min_samples_to_fit=3,
+        n_new_samples_before_refit=10
+    ),
+    description="Governs the construction of a GaussianProcessRegressionModel."
+                "kernel: the stationary covariance function over the normalized, flattened input space."
+                "length_scale: the kernel length scale, in units of the normalized [0, 1] range of each input dimension."
+                "optimize_length_scale: if True, the length scale is re-selected among multiples of length_scale by maximizing the "
+                " log marginal likelihood every time the model is fully refitted."
+                "noise_variance: the observation noise variance relative to the variance of the targets."
+                "max_exact_observations: once the number of observations exceeds this value, the model switches to the sparse"
+                " (inducing point) approximation."
+                "num_inducing_points: the number of inducing points used in the sparse mode."
+                "min_samples_to_fit: minimum number of samples before it makes sense to try to fit the model."
+                "n_new_samples_before_refit: number of new samples before the model is fully refitted. In between full refits new"
+                " samples are incorporated via incremental Cholesky updates."
+)
@@ -0,0 +1,459 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import math
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import cho_solve, solve_triangular
+
+from mlos.Logger import create_logger
+from mlos.Optimizers.RegressionModels.GaussianProcessConfigStore import gaussian_process_config_store, Kernel
+from mlos.Optimizers.RegressionModels.Prediction import Prediction
+from mlos.Optimizers.RegressionModels.RegressionModel import RegressionModel
+from mlos.Spaces import CategoricalDimension, Hypergrid, Point
+from mlos.Spaces.HypergridAdapters import HierarchicalToFlatHypergridAdapter
+from mlos.Tracer import trace
+
+
+class GaussianProcessRegressionModel(RegressionModel):
+    """ A Gaussian process regression model over the flattened input space.
+
+    The model works as follows:
+        1. The (possibly hierarchical) input space is flattened using the HierarchicalToFlatHypergridAdapter.
+        2. The kernel is hierarchy-aware. Following the arc kernel construction:
+                paper: https://arxiv.org/pdf/1409.4011.pdf
+                section: 3
+            each numeric dimension is normalized to [0, 1] and embedded on a quarter circle arc, while inactive values are
+            embedded at the center of the circle. Categorical dimensions are one-hot encoded, with inactive values embedded
+            at the origin. Two points thus have a fixed distance along a dimension if it is active in only one of them and
+            a distance that grows with the difference of their values if it is active in both. Since this is a Euclidean
+            embedding, any stationary kernel over it remains positive definite.
+        3. Targets are standardized and the signal variance is fixed to 1, so the noise_variance is relative to the
+            variance of the targets.
+        4. Up to max_exact_observations the model is an exact GP. Observations registered between full refits extend the
+            Cholesky factor of the kernel matrix one bordered block at a time, which costs O(n^2) per new observation
+            rather than the O(n^3) of a full refit.
+        5. Above max_exact_observations the model switches to the sparse Deterministic Training Conditional approximation
+            with num_inducing_points inducing points selected from the observations:
+                paper: http://www.jmlr.org/papers/volume6/quinonero-candela05a/quinonero-candela05a.pdf
+                section: 5
+            New observations are then incorporated with rank-one updates of the Cholesky factor of the m x m inner matrix.
+        6. Every n_new_samples_before_refit observations the model is fully refitted, and if optimize_length_scale is True
+            the length scale is re-selected by maximizing the log marginal likelihood.
+
+    The predicted value variance is the posterior variance of the latent function and the sample variance additionally
+    includes the observation noise. Since the targets are standardized with their sample mean and variance, the degrees
+    of freedom are set to num_observations - 1.
+    """
+
+    _PREDICTOR_OUTPUT_COLUMNS = [
+        Prediction.LegalColumnNames.IS_VALID_INPUT,
+        Prediction.LegalColumnNames.PREDICTED_VALUE,
+        Prediction.LegalColumnNames.PREDICTED_VALUE_VARIANCE,
+        Prediction.LegalColumnNames.SAMPLE_VARIANCE,
+        Prediction.LegalColumnNames.SAMPLE_SIZE,
+        Prediction.LegalColumnNames.PREDICTED_VALUE_DEGREES_OF_FREEDOM
+    ]
+
+    _LENGTH_SCALE_MULTIPLIERS = [0.25, 0.5, 1, 2, 4]
+    _JITTER = 10**-8
+
+    @trace()
+    def __init__(
+            self,
+            model_config: Point,
+            input_space: Hypergrid,
+            output_space: Hypergrid,
+            logger=None
+    ):
+        if logger is None:
+            logger = create_logger("GaussianProcessRegressionModel")
+        self.logger = logger
+
+        assert model_config in gaussian_process_config_store.parameter_space
+
+        RegressionModel.__init__(
+            self,
+            model_type=type(self),
+            model_config=model_config,
+            input_space=input_space,
+            output_space=output_space
+        )
+
+        self._flattening_adapter = HierarchicalToFlatHypergridAdapter(adaptee=self.input_space)
+        self.input_dimension_names = [dimension.name for dimension in self._flattening_adapter.dimensions]
+
+        self.target_dimension_names = [dimension.name for dimension in self.output_space.dimensions]
+        assert len(self.target_dimension_names) == 1, "Single target predictions for now."
+
+        # For each flat dimension we keep the offset and scale used to normalize numeric values. For dimensions with an
+        # unbounded range they are derived from the observations on every full refit.
+        #
+        self._offsets = {}
+        self._scales = {}
+        for dimension in self._flattening_adapter.dimensions:
+            if isinstance(dimension, CategoricalDimension):
+                continue
+            if math.isfinite(dimension.min) and math.isfinite(dimension.max):
+                self._offsets[dimension.name] = dimension.min
+                self._scales[dimension.name] = max(dimension.max - dimension.min, 10**-12)
+            else:
+                self._offsets[dimension.name] = 0
+                self._scales[dimension.name] = 1
+
+        self._length_scale = self.model_config.length_scale
+        self._noise_variance = self.model_config.noise_variance
+
+        self._trained = False
+        self._is_sparse = False
+        self._num_observations_at_last_full_refit = 0
+
+        # Training data.
+        #
+        self._train_features = None
+        self._train_targets = None
+        self._train_index = None
+        self._target_mean = 0
+        self._target_std = 1
+
+        # Exact mode state.
+        #
+        self._cholesky_factor = None
+        self._alpha = None
+
+        # Sparse mode state.
+        #
+        self._inducing_features = None
+        self._inducing_cholesky_factor = None
+        self._inner_cholesky_factor = None
+        self._projected_targets_sum = None
+        self._projected_ones_sum = None
+        self._sparse_weights = None
+
+    @property
+    def trained(self):
+        return self._trained
+
+    @property
+    def num_observations_used_to_fit(self):
+        return 0 if self._train_targets is None else len(self._train_targets)
+
+    @property
+    def is_sparse(self):
+        return self._is_sparse
+
+    @property
+    def length_scale(self):
+        return self._length_scale
+
+    def should_fit(self, num_samples):
+        """ Returns true if the model should be fitted.
+
+        This model should be fitted under the following conditions:
+        1) It has not been fitted yet and num_samples is larger than min_samples_to_fit
+        2) The model has been fitted and there is at least one new sample. New samples are cheap to incorporate
+            incrementally, full refits are governed by n_new_samples_before_refit.
+
+        :param num_samples:
+        :return:
+        """
+        if not self.trained:
+            return num_samples > self.model_config.min_samples_to_fit
+        return num_samples > self.num_observations_used_to_fit
+
+    def _encode_features(self, flat_features_df: pd.DataFrame) -> np.ndarray:
+        """ Embeds the flattened features in a Euclidean space in which inactive dimensions are handled gracefully.
+
+        Numeric values are normalized to [0, 1] and mapped onto a quarter circle arc of radius 2/pi, so that nearby values
+        are (approximately) their normalized difference apart. Inactive numeric values are mapped to the center of the
+        circle. Categorical values are one-hot encoded with a magnitude of 1/sqrt(2), so that the squared distance between
+        two different categories is 1, and inactive categorical values are all zeros.
+        """
+        num_rows = len(flat_features_df.index)
+        feature_columns = []
+        for dimension in self._flattening_adapter.dimensions:
+            if dimension.name in flat_features_df.columns:
+                column = flat_features_df[dimension.name]
+            else:
+                column = pd.Series(np.nan, index=flat_features_df.index)
+            active = column.notnull().to_numpy()
+
+            if isinstance(dimension, CategoricalDimension):
+                for value in dimension.linspace():
+                    feature_columns.append(np.where(active & (column == value).to_numpy(), 1 / math.sqrt(2), 0.0))
+            else:
+                normalized_values = (column.to_numpy(dtype=float) - self._offsets[dimension.name]) / self._scales[dimension.name]
+
+                # Values outside of the observed range of unbounded dimensions are clipped so that the arc never wraps around.
+                #
+                angles = np.clip(np.where(active, normalized_values, 0.0), -0.5, 1.5) * math.pi / 2
+                radius = 2 / math.pi
+                feature_columns.append(np.where(active, radius * np.sin(angles), 0.0))
+                feature_columns.append(np.where(active, radius * np.cos(angles), 0.0))
+
+        return np.column_stack(feature_columns) if feature_columns else np.zeros((num_rows, 0))
+
+    def _update_normalization(self, flat_features_df: pd.DataFrame):
+        """ Derives the offsets and scales of unbounded numeric dimensions from the observations.
+
+        """
+        for dimension in self._flattening_adapter.dimensions:
+            if isinstance(dimension, CategoricalDimension) or (math.isfinite(dimension.min) and math.isfinite(dimension.max)):
+                continue
+            if dimension.name not in flat_features_df.columns:
+                continue
+            column = flat_features_df[dimension.name].dropna().astype(float)
+            if len(column.index) == 0:
+                continue
+            self._offsets[dimension.name] = column.min()
+            self._scales[dimension.name] = max(column.max() - column.min(), 10**-12)
+
+    def _kernel(self, features_1: np.ndarray, features_2: np.ndarray, length_scale=None) -> np.ndarray:
+        """ Computes the kernel matrix between two sets of encoded points.
+
+        """
+        if length_scale is None:
+            length_scale = self._length_scale
+
+        squared_distances = (features_1 ** 2).sum(axis=1)[:, np.newaxis] + (features_2 ** 2).sum(axis=1)[np.newaxis, :] \
+                            - 2 * features_1 @ features_2.T
+        squared_distances = np.maximum(squared_distances, 0) / length_scale ** 2
+
+        if self.model_config.kernel == Kernel.SQUARED_EXPONENTIAL.value:
+            return np.exp(-0.5 * squared_distances)
+        if self.model_config.kernel == Kernel.MATERN_5_2.value:
+            scaled_distances = np.sqrt(5 * squared_distances)
+            return (1 + scaled_distances + scaled_distances ** 2 / 3) * np.exp(-scaled_distances)
+        raise RuntimeError(f"Unrecognized kernel: {self.model_config.kernel}")
+
+    @staticmethod
+    def _cholesky_rank_one_update(cholesky_factor: np.ndarray, vector: np.ndarray) -> None:
+        """ Updates the lower triangular cholesky_factor in place, so that L L^T becomes L L^T + v v^T.
+
+        """
+        vector = vector.copy()
+        size = len(vector)
+        for k in range(size):
+            diagonal = cholesky_factor[k, k]
+            radius = math.sqrt(diagonal ** 2 + vector[k] ** 2)
+            cosine = radius / diagonal
+            sine = vector[k] / diagonal
+            cholesky_factor[k, k] = radius
+            if k + 1 < size:
+                cholesky_factor[k + 1:, k] = (cholesky_factor[k + 1:, k] + sine * vector[k + 1:]) / cosine
+                vector[k + 1:] = cosine * vector[k + 1:] - sine * cholesky_factor[k + 1:, k]
+
+    def _standardized_targets(self):
+        return (self._train_targets - self._target_mean) / self._target_std
+
+    def _log_marginal_likelihood(self, features, standardized_targets, length_scale):
+        kernel_matrix = self._kernel(features, features, length_scale=length_scale)
+        kernel_matrix[np.diag_indices_from(kernel_matrix)] += self._noise_variance + self._JITTER
+        try:
+            cholesky_factor = np.linalg.cholesky(kernel_matrix)
+        except np.linalg.LinAlgError:
+            return -math.inf
+        alpha = cho_solve((cholesky_factor, True), standardized_targets)
+        return -0.5 * standardized_targets @ alpha - np.log(np.diag(cholesky_factor)).sum() - 0.5 * len(standardized_targets) * math.log(2 * math.pi)
+
+    def _select_length_scale(self, random_state):
+        """ Picks the length scale that maximizes the log marginal likelihood on (a subset of) the observations.
+
+        """
+        num_observations = len(self._train_targets)
+        subset = np.arange(num_observations)
+        if num_observations > self.model_config.max_exact_observations:
+            subset = random_state.choice(num_observations, size=self.model_config.max_exact_observations, replace=False)
+
+        features = self._train_features[subset]
+        standardized_targets = self._standardized_targets()[subset]
+
+        best_length_scale = self._length_scale
+        best_log_marginal_likelihood = -math.inf
+        for multiplier in self._LENGTH_SCALE_MULTIPLIERS:
+            length_scale = self.model_config.length_scale * multiplier
+            log_marginal_likelihood = self._log_marginal_likelihood(features, standardized_targets, length_scale)
+            if log_marginal_likelihood > best_log_marginal_likelihood:
+                best_length_scale = length_scale
+                best_log_marginal_likelihood = log_marginal_likelihood
+        return best_length_scale
+
+    def _full_refit(self):
+        self._num_observations_at_last_full_refit = len(self._train_targets)
+        random_state = np.random.RandomState(seed=self._num_observations_at_last_full_refit)
+        if self.model_config.optimize_length_scale:
+            self._length_scale = self._select_length_scale(random_state)
+
+        self._is_sparse = len(self._train_targets) > self.model_config.max_exact_observations
+        if not self._is_sparse:
+            kernel_matrix = self._kernel(self._train_features, self._train_features)
+            kernel_matrix[np.diag_indices_from(kernel_matrix)] += self._noise_variance + self._JITTER
+            self._cholesky_factor = np.linalg.cholesky(kernel_matrix)
+            self._inducing_features = self._inducing_cholesky_factor = self._inner_cholesky_factor = None
+            return
+
+        self._cholesky_factor = self._alpha = None
+        num_inducing_points = min(self.model_config.num_inducing_points, len(self._train_targets))
+        inducing_indices = random_state.choice(len(self._train_targets), size=num_inducing_points, replace=False)
+        self._inducing_features = self._train_features[inducing_indices]
+
+        inducing_kernel_matrix = self._kernel(self._inducing_features, self._inducing_features)
+        inducing_kernel_matrix[np.diag_indices_from(inducing_kernel_matrix)] += self._JITTER
+        self._inducing_cholesky_factor = np.linalg.cholesky(inducing_kernel_matrix)
+
+        projections = self._project_onto_inducing_points(self._train_features)
+        self._inner_cholesky_factor = np.linalg.cholesky(np.eye(num_inducing_points) + projections @ projections.T)
+        self._projected_targets_sum = projections @ self._train_targets
+        self._projected_ones_sum = projections.sum(axis=1)
+
+    def _project_onto_inducing_points(self, features):
+        """ Returns L_m^-1 K_mn / noise_std, where L_m is the Cholesky factor of the inducing points' kernel matrix.
+
+        """
+        cross_kernel_matrix = self._kernel(self._inducing_features, features)
+        return solve_triangular(self._inducing_cholesky_factor, cross_kernel_matrix, lower=True) / math.sqrt(self._noise_variance)
+
+    def _incremental_update(self, new_features, new_targets):
+        """ Incorporates new observations without refactorizing the kernel matrix.
+
+        """
+        if not self._is_sparse:
+            cross_kernel_matrix = self._kernel(self._train_features, new_features)
+            new_kernel_matrix = self._kernel(new_features, new_features)
+            new_kernel_matrix[np.diag_indices_from(new_kernel_matrix)] += self._noise_variance + self._JITTER
+
+            off_diagonal_block = solve_triangular(self._cholesky_factor, cross_kernel_matrix, lower=True).T
+            diagonal_block = np.linalg.cholesky(new_kernel_matrix - off_diagonal_block @ off_diagonal_block.T)
+
+            num_old, num_new = self._cholesky_factor.shape[0], len(new_targets)
+            cholesky_factor = np.zeros((num_old + num_new, num_old + num_new))
+            cholesky_factor[:num_old, :num_old] = self._cholesky_factor
+            cholesky_factor[num_old:, :num_old] = off_diagonal_block
+            cholesky_factor[num_old:, num_old:] = diagonal_block
+            self._cholesky_factor = cholesky_factor
+        else:
+            projections = self._project_onto_inducing_points(new_features)
+            for column_index in range(projections.shape[1]):
+                self._cholesky_rank_one_update(self._inner_cholesky_factor, projections[:, column_index])
+            self._projected_targets_sum = self._projected_targets_sum + projections @ new_targets
+            self._projected_ones_sum = self._projected_ones_sum + projections.sum(axis=1)
+
+        self._train_features = np.vstack([self._train_features, new_features])
+        self._train_targets = np.concatenate([self._train_targets, new_targets])
+
+    def _update_target_standardization(self):
+        self._target_mean = self._train_targets.mean()
+        target_std = self._train_targets.std()
+        self._target_std = target_std if target_std > 0 else 1
+
+    def _update_weights(self):
+        """ Recomputes the weights used for the posterior mean after the targets were (re)standardized.
+
+        """
+        if not self._is_sparse:
+            self._alpha = cho_solve((self._cholesky_factor, True), self._standardized_targets())
+        else:
+            projected_standardized_targets = (self._projected_targets_sum - self._target_mean * self._projected_ones_sum) / self._target_std
+            self._sparse_weights = solve_triangular(
+                self._inner_cholesky_factor,
+                projected_standardized_targets / math.sqrt(self._noise_variance),
+                lower=True
+            )
+
+    @trace()
+    def fit(self, feature_values_pandas_frame, target_values_pandas_frame, iteration_number):
+        self.logger.debug(f"Fitting a {self.__class__.__name__} with {len(feature_values_pandas_frame.index)} observations.")
+
+        target_values = target_values_pandas_frame.loc[feature_values_pandas_frame.index, self.target_dimension_names[0]]
+        target_values = target_values[target_values.notnull()]
+        if not self.should_fit(len(target_values.index)):
+            return
+
+        # We can only update incrementally if the old observations are a prefix of the new ones, no full refit is due,
+        # and the model does not need to switch to the sparse mode. The prefix is checked on the index and the targets,
+        # so that only the new observations have to be flattened and encoded.
+        #
+        num_old_observations = self.num_observations_used_to_fit
+        can_update_incrementally = self.trained \
+            and len(target_values.index) - self._num_observations_at_last_full_refit < self.model_config.n_new_samples_before_refit \
+            and (self._is_sparse or len(target_values.index) <= self.model_config.max_exact_observations) \
+            and target_values.index[:num_old_observations].equals(self._train_index) \
+            and np.array_equal(target_values.to_numpy(dtype=float)[:num_old_observations], self._train_targets)
+
+        if can_update_incrementally:
+            new_observations_index = target_values.index[num_old_observations:]
+            new_flat_features_df = self._flattening_adapter.project_dataframe(feature_values_pandas_frame.loc[new_observations_index], in_place=False)
+            self._incremental_update(
+                new_features=self._encode_features(new_flat_features_df),
+                new_targets=target_values.to_numpy(dtype=float)[num_old_observations:]
+            )
+            self._update_target_standardization()
+        else:
+            flat_features_df = self._flattening_adapter.project_dataframe(feature_values_pandas_frame.loc[target_values.index], in_place=False)
+            self._update_normalization(flat_features_df)
+            self._train_features = self._encode_features(flat_features_df)
+            self._train_targets = target_values.to_numpy(dtype=float)
+            self._update_target_standardization()
+            self._full_refit()
+
+        self._train_index = target_values.index
+        self._update_weights()
+        self._trained = True
+        self.last_refit_iteration_number = iteration_number
+
+    @trace()
+    def _predict(self, feature_values_pandas_frame, include_only_valid_rows=True):
+        self.logger.debug(f"Creating predictions for {len(feature_values_pandas_frame.index)} samples.")
+
+        # dataframe column shortcuts
+        is_valid_input_col = Prediction.LegalColumnNames.IS_VALID_INPUT.value
+        predicted_value_col = Prediction.LegalColumnNames.PREDICTED_VALUE.value
+        predicted_value_var_col = Prediction.LegalColumnNames.PREDICTED_VALUE_VARIANCE.value
+        sample_var_col = Prediction.LegalColumnNames.SAMPLE_VARIANCE.value
+        sample_size_col = Prediction.LegalColumnNames.SAMPLE_SIZE.value
+        dof_col = Prediction.LegalColumnNames.PREDICTED_VALUE_DEGREES_OF_FREEDOM.value
+
+        valid_rows_index = None
+        flat_features_df = None
+        if self.trained:
+            flat_features_df = self._flattening_adapter.project_dataframe(feature_values_pandas_frame, in_place=False)
+            flat_features_df = flat_features_df[self._flattening_adapter.get_valid_rows_mask(flat_features_df)]
+            valid_rows_index = flat_features_df.index
+
+        predictions = Prediction(
+            objective_name=self.target_dimension_names[0],
+            predictor_outputs=self._PREDICTOR_OUTPUT_COLUMNS,
+            dataframe_index=valid_rows_index
+        )
+        prediction_dataframe = predictions.get_dataframe()
+
+        if valid_rows_index is not None and not valid_rows_index.empty:
+            features = self._encode_features(flat_features_df)
+            if not self._is_sparse:
+                cross_kernel_matrix = self._kernel(self._train_features, features)
+                standardized_means = cross_kernel_matrix.T @ self._alpha
+                projections = solve_triangular(self._cholesky_factor, cross_kernel_matrix, lower=True)
+                latent_variances = 1 - (projections ** 2).sum(axis=0)
+            else:
+                cross_kernel_matrix = self._kernel(self._inducing_features, features)
+                inducing_projections = solve_triangular(self._inducing_cholesky_factor, cross_kernel_matrix, lower=True)
+                inner_projections = solve_triangular(self._inner_cholesky_factor, inducing_projections, lower=True)
+                standardized_means = inner_projections.T @ self._sparse_weights
+                latent_variances = 1 - (inducing_projections ** 2).sum(axis=0) + (inner_projections ** 2).sum(axis=0)
+
+            latent_variances = np.maximum(latent_variances, 0) + 0.0000001 # A little numerical instability correction
+            num_observations = self.num_observations_used_to_fit
+
+            prediction_dataframe[predicted_value_col] = standardized_means * self._target_std + self._target_mean
+            prediction_dataframe[predicted_value_var_col] = latent_variances * self._target_std ** 2
+            prediction_dataframe[sample_var_col] = (latent_variances + self._noise_variance) * self._target_std ** 2
+            prediction_dataframe[sample_size_col] = num_observations
+            prediction_dataframe[dof_col] = num_observations - 1
+            prediction_dataframe[is_valid_input_col] = True
+
+        predictions.validate_dataframe(prediction_dataframe)
+        if not include_only_valid_rows:
+            predictions.add_invalid_rows_at_missing_indices(desired_index=feature_values_pandas_frame.index)
+        return predictions
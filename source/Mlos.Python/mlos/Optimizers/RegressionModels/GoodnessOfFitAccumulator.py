@@ -0,0 +1,187 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from scipy.stats import t
+
+from mlos.Optimizers.RegressionModels.GoodnessOfFitMetrics import GoodnessOfFitMetrics, DataSetType
+from mlos.Optimizers.RegressionModels.Prediction import Prediction
+
+
+class GoodnessOfFitAccumulator:
+    """ Accumulates goodness of fit statistics over a stream of (target, prediction) batches.
+
+    Each call to update() costs O(batch size) and the accumulator keeps O(1) state, so the metrics can be kept
+    current as new observations arrive without re-predicting everything seen so far.
+
+    Target mean and total sum of squares are maintained with Chan's parallel variant of Welford's algorithm, so that
+    coefficient_of_determination and relative_squared_error are exact. The sum of absolute target deviations needed for the
+    relative_absolute_error is computed against the running mean at the time each batch arrives. For a single batch this is
+    exact, for a stream of batches it is an approximation.
+
+    Confidence interval hit rates are computed only over predictions with a positive number of degrees of freedom.
+    """
+
+    def __init__(self):
+        self.observation_count = 0
+        self.prediction_count = 0
+        self.target_mean = 0.0
+        self.sum_squared_target_variation = 0.0
+        self.sum_absolute_target_variation = 0.0
+        self.sum_absolute_error = 0.0
+        self.sum_squared_error = 0.0
+        self.prediction_90_ci_hit_count = 0
+        self.prediction_90_ci_eligible_count = 0
+        self.sample_90_ci_hit_count = 0
+        self.sample_90_ci_eligible_count = 0
+
+    def update(self, target_values: pd.Series, predictions_df: pd.DataFrame, observation_count: int = None) -> None:
+        """ Folds a batch of predictions and the corresponding target values into the accumulator.
+
+        :param target_values: series of target values indexed the same way as predictions_df.
+        :param predictions_df: dataframe produced by Prediction.get_dataframe(). Only valid predictions should be passed in.
+        :param observation_count: number of observations that were submitted for prediction. Defaults to len(predictions_df.index).
+        """
+        predicted_value_col = Prediction.LegalColumnNames.PREDICTED_VALUE.value
+        predicted_value_var_col = Prediction.LegalColumnNames.PREDICTED_VALUE_VARIANCE.value
+        sample_var_col = Prediction.LegalColumnNames.SAMPLE_VARIANCE.value
+        dof_col = Prediction.LegalColumnNames.PREDICTED_VALUE_DEGREES_OF_FREEDOM.value
+
+        num_predictions = len(predictions_df.index)
+        self.observation_count += observation_count if observation_count is not None else num_predictions
+        if num_predictions == 0:
+            return
+
+        target_values = target_values.loc[predictions_df.index]
+        if target_values.isnull().any():
+            predictions_df = predictions_df[target_values.notnull().to_numpy()]
+            target_values = target_values[target_values.notnull()]
+            num_predictions = len(predictions_df.index)
+            if num_predictions == 0:
+                return
+        target_values = target_values.to_numpy(dtype=float)
+        error = target_values - predictions_df[predicted_value_col].to_numpy(dtype=float)
+        absolute_error = np.abs(error)
+
+        # Chan et al. update of the running mean and total sum of squares.
+        #
+        batch_mean = target_values.mean()
+        batch_sum_squared_variation = ((target_values - batch_mean) ** 2).sum()
+        total_count = self.prediction_count + num_predictions
+        delta = batch_mean - self.target_mean
+        self.sum_squared_target_variation += batch_sum_squared_variation + delta ** 2 * self.prediction_count * num_predictions / total_count
+        self.target_mean += delta * num_predictions / total_count
+        self.sum_absolute_target_variation += np.abs(target_values - self.target_mean).sum()
+
+        self.prediction_count = total_count
+        self.sum_absolute_error += absolute_error.sum()
+        self.sum_squared_error += (error ** 2).sum()
+
+        dof = predictions_df[dof_col].to_numpy(dtype=float)
+        has_dof = dof > 0
+        if has_dof.any():
+            t_values_90_percent = t.ppf(0.95, dof[has_dof])
+            prediction_90_ci_radius = t_values_90_percent * np.sqrt(predictions_df[predicted_value_var_col].to_numpy(dtype=float)[has_dof])
+            self.prediction_90_ci_hit_count += int((absolute_error[has_dof] < prediction_90_ci_radius).sum())
+            self.prediction_90_ci_eligible_count += int(has_dof.sum())
+
+            if sample_var_col in predictions_df.columns.values:
+                sample_90_ci_radius = t_values_90_percent * np.sqrt(predictions_df[sample_var_col].to_numpy(dtype=float)[has_dof])
+                self.sample_90_ci_hit_count += int((absolute_error[has_dof] < sample_90_ci_radius).sum())
+                self.sample_90_ci_eligible_count += int(has_dof.sum())
+
+    def merge(self, other: 'GoodnessOfFitAccumulator') -> None:
+        """ Folds another accumulator into this one.
+
+        """
+        if other.prediction_count > 0:
+            total_count = self.prediction_count + other.prediction_count
+            delta = other.target_mean - self.target_mean
+            self.sum_squared_target_variation += other.sum_squared_target_variation \
+                                                 + delta ** 2 * self.prediction_count * other.prediction_count / total_count
+            self.target_mean += delta * other.prediction_count / total_count
+            self.prediction_count = total_count
+
+        self.observation_count += other.observation_count
+        self.sum_absolute_target_variation += other.sum_absolute_target_variation
+        self.sum_absolute_error += other.sum_absolute_error
+        self.sum_squared_error += other.sum_squared_error
+        self.prediction_90_ci_hit_count += other.prediction_90_ci_hit_count
+        self.prediction_90_ci_eligible_count += other.prediction_90_ci_eligible_count
+        self.sample_90_ci_hit_count += other.sample_90_ci_hit_count
+        self.sample_90_ci_eligible_count += other.sample_90_ci_eligible_count
+
+    def to_goodness_of_fit_metrics(self, last_refit_iteration_number: int, data_set_type: DataSetType) -> GoodnessOfFitMetrics:
+        mean_absolute_error = None
+        root_mean_squared_error = None
+        relative_absolute_error = None
+        relative_squared_error = None
+        coefficient_of_determination = None
+        prediction_90_ci_hit_rate = None
+        sample_90_ci_hit_rate = None
+
+        if self.prediction_count > 0:
+            mean_absolute_error = self.sum_absolute_error / self.prediction_count
+            root_mean_squared_error = np.sqrt(self.sum_squared_error / self.prediction_count)
+            if self.sum_absolute_target_variation > 0 and self.sum_squared_target_variation > 0:
+                relative_absolute_error = self.sum_absolute_error / self.sum_absolute_target_variation
+                relative_squared_error = np.sqrt(self.sum_squared_error / self.sum_squared_target_variation)
+                coefficient_of_determination = 1 - (self.sum_squared_error / self.sum_squared_target_variation)
+
+        if self.prediction_90_ci_eligible_count > 0:
+            prediction_90_ci_hit_rate = self.prediction_90_ci_hit_count / self.prediction_90_ci_eligible_count
+
+        if self.sample_90_ci_eligible_count > 0:
+            sample_90_ci_hit_rate = self.sample_90_ci_hit_count / self.sample_90_ci_eligible_count
+
+        return GoodnessOfFitMetrics(
+            last_refit_iteration_number=last_refit_iteration_number,
+            observation_count=self.observation_count,
+            prediction_count=self.prediction_count,
+            data_set_type=data_set_type,
+            mean_absolute_error=mean_absolute_error,
+            root_mean_squared_error=root_mean_squared_error,
+            relative_absolute_error=relative_absolute_error,
+            relative_squared_error=relative_squared_error,
+            coefficient_of_determination=coefficient_of_determination,
+            prediction_90_ci_hit_rate=prediction_90_ci_hit_rate,
+            sample_90_ci_hit_rate=sample_90_ci_hit_rate
+        )
+
+
+class RollingHoldoutGoodnessOfFit:
+    """ Maintains goodness of fit metrics over a bounded window of the most recently scored holdout observations.
+
+    Each registered batch is scored by the model before the model is trained on it, so these observations are a genuine
+    holdout set. Every batch gets its own GoodnessOfFitAccumulator and the oldest batches are dropped once the window
+    exceeds max_observations. Computing the metrics costs O(number of batches in the window).
+    """
+
+    def __init__(self, max_observations: int = 100):
+        assert max_observations > 0
+        self.max_observations = max_observations
+        self._accumulators = deque()
+        self._num_observations = 0
+
+    @property
+    def num_observations(self):
+        return self._num_observations
+
+    def update(self, target_values: pd.Series, predictions_df: pd.DataFrame, observation_count: int = None) -> None:
+        accumulator = GoodnessOfFitAccumulator()
+        accumulator.update(target_values=target_values, predictions_df=predictions_df, observation_count=observation_count)
+        self._accumulators.append(accumulator)
+        self._num_observations += accumulator.observation_count
+
+        while len(self._accumulators) > 1 and self._num_observations - self._accumulators[0].observation_count >= self.max_observations:
+            self._num_observations -= self._accumulators.popleft().observation_count
+
+    def to_goodness_of_fit_metrics(self, last_refit_iteration_number: int, data_set_type: DataSetType = DataSetType.TEST) -> GoodnessOfFitMetrics:
+        window_accumulator = GoodnessOfFitAccumulator()
+        for accumulator in self._accumulators:
+            window_accumulator.merge(accumulator)
+        return window_accumulator.to_goodness_of_fit_metrics(last_refit_iteration_number=last_refit_iteration_number, data_set_type=data_set_type)
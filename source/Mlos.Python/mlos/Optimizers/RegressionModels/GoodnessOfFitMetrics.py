@@ -9,7 +9,11 @@ from typing import NamedTuple
 
 class DataSetType(Enum):
     TRAIN = 0
+    # For ensemble models, these are computed on the out-of-bag observations.
+    #
     VALIDATION = 1
+    # Observations scored by the model before it was trained on them.
+    #
     TEST = 2
     # Observations known to be based on i.i.d random sampling. These observations are the result of the
     # Experiment Designer suggesting a random configuration.
@@ -13,6 +13,8 @@ from mlos.Tracer import trace
 from mlos.Logger import create_logger
 from mlos.Optimizers.RegressionModels.Prediction import Prediction
 from mlos.Optimizers.RegressionModels.DecisionTreeRegressionModel import DecisionTreeRegressionModel
+from mlos.Optimizers.RegressionModels.GoodnessOfFitAccumulator import GoodnessOfFitAccumulator
+from mlos.Optimizers.RegressionModels.GoodnessOfFitMetrics import DataSetType
 from mlos.Optimizers.RegressionModels.HomogeneousRandomForestConfigStore import homogeneous_random_forest_config_store
 from mlos.Optimizers.RegressionModels.HomogeneousRandomForestFitState import HomogeneousRandomForestFitState
 from mlos.Optimizers.RegressionModels.RegressionModel import RegressionModel
@@ -68,6 +70,13 @@ class HomogeneousRandomForestRegressionModel(RegressionModel):
         assert len(self.target_dimension_names) == 1, "Single target predictions for now."
 
         self._decision_trees = []
+
+        # Out-of-bag bookkeeping. For each tree we remember the index of the observations that were not used to fit it
+        # along with that tree's predictions for those observations. These are only recomputed for trees that were refit.
+        #
+        self._out_of_bag_index_per_tree = []
+        self._out_of_bag_predictions_per_tree = []
+
         self._create_estimators()
         self._trained = False
 
@@ -111,6 +120,12 @@ class HomogeneousRandomForestRegressionModel(RegressionModel):
         total_num_dimensions = len(all_dimension_names)
         features_per_estimator = max(1, math.ceil(total_num_dimensions * self.model_config.features_fraction_per_estimator))
 
+        # Each tree draws a fresh bootstrap sample on every fit, so the observations it saw last time are not a prefix of
+        # the ones it sees now and streaming them into the existing leaves would corrupt the leaf statistics.
+        #
+        tree_config = self.model_config.decision_tree_regression_model_config.copy()
+        tree_config.streaming_leaf_updates = False
+
         for i in range(self.model_config.n_estimators):
             estimator_input_space = self._create_random_flat_subspace(
                 original_space=self.input_space,
@@ -120,14 +135,20 @@ class HomogeneousRandomForestRegressionModel(RegressionModel):
             self.logger.info(f"Creating DecisionTreeRegressionModel with the input_space: {estimator_input_space}")
 
             estimator = DecisionTreeRegressionModel(
-                model_config=self.model_config.decision_tree_regression_model_config,
+                model_config=tree_config,
                 input_space=estimator_input_space,
                 output_space=self.output_space,
                 logger=self.logger
             )
 
+            # The forest caches its aggregate predictions, so there is no need for the trees to cache their own.
+            #
+            estimator.prediction_cache_size = 0
+
             # TODO: each one of them also needs a sample filter.
             self._decision_trees.append(estimator)
+            self._out_of_bag_index_per_tree.append(None)
+            self._out_of_bag_predictions_per_tree.append(None)
             self.fit_state.decision_trees_fit_states.append(estimator.fit_state)
 
     @staticmethod
@@ -151,7 +172,7 @@ class HomogeneousRandomForestRegressionModel(RegressionModel):
             name=subspace_name,
             dimensions=flat_dimensions
         )
-        return flat_hypergrid
+        return flat_hypergrid.freeze()
 
     @trace()
     def fit(self, feature_values_pandas_frame, target_values_pandas_frame, iteration_number):
@@ -170,6 +191,7 @@ class HomogeneousRandomForestRegressionModel(RegressionModel):
         self.logger.debug(f"Fitting a {self.__class__.__name__} with {len(feature_values_pandas_frame.index)} observations.")
 
         feature_values_pandas_frame = self._input_space_adapter.project_dataframe(feature_values_pandas_frame, in_place=False)
+        any_tree_refit = False
 
         for i, tree in enumerate(self._decision_trees):
             # Let's filter out samples with missing values
@@ -202,12 +224,96 @@ class HomogeneousRandomForestRegressionModel(RegressionModel):
                     target_values_pandas_frame=bootstrapped_targets_for_tree_training,
                     iteration_number=len(feature_values_pandas_frame.index)
                 )
+                any_tree_refit = True
+
+                out_of_bag_index = non_null_observations.index.difference(bootstrapped_observations_for_tree_training.index)
+                self._out_of_bag_index_per_tree[i] = out_of_bag_index
+                self._out_of_bag_predictions_per_tree[i] = None
+                if len(out_of_bag_index) > 0:
+                    self._out_of_bag_predictions_per_tree[i] = tree.predict(
+                        feature_values_pandas_frame=non_null_observations.loc[out_of_bag_index],
+                        include_only_valid_rows=True
+                    ).get_dataframe()
 
-        self.last_refit_iteration_number = max(tree.last_refit_iteration_number for tree in self._decision_trees)
         self._trained = any(tree.trained for tree in self._decision_trees)
 
+        if any_tree_refit:
+            # Setting the iteration number bumps the fit version, so we leave it alone if none of the trees changed.
+            #
+            self.last_refit_iteration_number = max(tree.last_refit_iteration_number for tree in self._decision_trees)
+            self.fit_state.set_gof_metrics(
+                data_set_type=DataSetType.VALIDATION,
+                gof_metrics=self._compute_out_of_bag_goodness_of_fit(target_values_pandas_frame=target_values_pandas_frame)
+            )
+
+    def _compute_out_of_bag_goodness_of_fit(self, target_values_pandas_frame):
+        """ Computes goodness of fit metrics on the out-of-bag observations.
+
+        Each observation is predicted only by the trees that did not see it during training. The per-tree out-of-bag
+        predictions are produced once, when the tree is fit, so this does not require re-predicting the training set.
+
+        :param target_values_pandas_frame:
+        :return: GoodnessOfFitMetrics with data_set_type == DataSetType.VALIDATION
+        """
+        out_of_bag_prediction_dataframes = [
+            prediction_df
+            for prediction_df in self._out_of_bag_predictions_per_tree
+            if prediction_df is not None and not prediction_df.empty
+        ]
+
+        gof_accumulator = GoodnessOfFitAccumulator()
+        if len(out_of_bag_prediction_dataframes) > 0:
+            # Only observations still present in the training set can be scored.
+            #
+            out_of_bag_prediction_dataframes = [
+                prediction_df.loc[prediction_df.index.intersection(target_values_pandas_frame.index)]
+                for prediction_df in out_of_bag_prediction_dataframes
+            ]
+            out_of_bag_predictions_df = self._aggregate_prediction_dataframes(out_of_bag_prediction_dataframes)
+            gof_accumulator.update(
+                target_values=target_values_pandas_frame[self.target_dimension_names[0]],
+                predictions_df=out_of_bag_predictions_df,
+                observation_count=len(target_values_pandas_frame.index)
+            )
+        return gof_accumulator.to_goodness_of_fit_metrics(
+            last_refit_iteration_number=self.last_refit_iteration_number,
+            data_set_type=DataSetType.VALIDATION
+        )
+
+    @staticmethod
+    def _aggregate_prediction_dataframes(prediction_dataframes):
+        """ Pools predictions of several trees into a single prediction per row.
+
+        Rows predicted by only a subset of trees are pooled over that subset. This is the same pooling as in predict():
+            paper: https://arxiv.org/pdf/1211.0906.pdf
+            section: 4.3.2
+
+        :param prediction_dataframes: list of dataframes produced by DecisionTreeRegressionModel.predict()
+        :return: dataframe with the pooled predictions.
+        """
+        predicted_value_col = Prediction.LegalColumnNames.PREDICTED_VALUE.value
+        predicted_value_var_col = Prediction.LegalColumnNames.PREDICTED_VALUE_VARIANCE.value
+        sample_var_col = Prediction.LegalColumnNames.SAMPLE_VARIANCE.value
+        sample_size_col = Prediction.LegalColumnNames.SAMPLE_SIZE.value
+        dof_col = Prediction.LegalColumnNames.PREDICTED_VALUE_DEGREES_OF_FREEDOM.value
+
+        all_predictions_df = pd.concat(prediction_dataframes, axis=0)
+        all_predictions_df['squared_predicted_value'] = all_predictions_df[predicted_value_col] ** 2
+        grouped_predictions = all_predictions_df.groupby(level=0)
+        means = grouped_predictions[[predicted_value_col, predicted_value_var_col, sample_var_col, 'squared_predicted_value']].mean()
+
+        pooled_predictions_df = pd.DataFrame(index=means.index)
+        pooled_predictions_df[predicted_value_col] = means[predicted_value_col]
+        pooled_predictions_df[predicted_value_var_col] = means[predicted_value_var_col] + means['squared_predicted_value'] \
+                                                         - means[predicted_value_col] ** 2 + 0.0000001
+        pooled_predictions_df[sample_var_col] = means[sample_var_col] + means['squared_predicted_value'] \
+                                                - means[predicted_value_col] ** 2 + 0.0000001
+        pooled_predictions_df[sample_size_col] = grouped_predictions[predicted_value_col].count()
+        pooled_predictions_df[dof_col] = grouped_predictions[sample_size_col].sum() - pooled_predictions_df[sample_size_col]
+        return pooled_predictions_df
+
     @trace()
-    def predict(self, feature_values_pandas_frame, include_only_valid_rows=True):
+    def _predict(self, feature_values_pandas_frame, include_only_valid_rows=True):
         """ Aggregate predictions from all estimators
 
         see: https://arxiv.org/pdf/1211.0906.pdf
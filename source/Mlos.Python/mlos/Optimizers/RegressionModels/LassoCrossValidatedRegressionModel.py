@@ -5,6 +5,7 @@
 import logging
 import numpy as np
 from pandas import DataFrame
+from scipy import sparse
 from sklearn.linear_model import LassoCV
 
 from mlos.Logger import create_logger
@@ -157,33 +158,52 @@ class LassoCrossValidatedRegressionModel(RegressionModel):
         self.last_refit_iteration_number = iteration_number
 
         # retain inverse(x.T * x) to use for confidence intervals on predicted values
-        condition_number = np.linalg.cond(design_matrix)
+        self._fit_partial_hat_matrix(design_matrix)
+
+        # retain standard error from base model (used for prediction confidence intervals)
+        predicted_y = self._regressor.predict(design_matrix)
+        y_residuals = y - predicted_y
+        residual_sum_of_squares = np.sum(y_residuals ** 2)
+        self.dof_ = design_matrix.shape[0] - (len(self._regressor.coef_) + 1)  # +1 for intercept
+        self.regressor_standard_error_ = residual_sum_of_squares / float(self.dof_)
+
+    def _fit_partial_hat_matrix(self, design_matrix):
+        """ Computes inverse(x.T * x) for a dense or sparse design matrix.
+
+        x.T * x is small and dense either way, and its condition number is the square of the design matrix's.
+        """
+        if sparse.issparse(design_matrix):
+            x_transpose_times_x = (design_matrix.T @ design_matrix).toarray()
+        else:
+            x_transpose_times_x = np.matmul(design_matrix.T, design_matrix)
+        condition_number = np.sqrt(np.linalg.cond(x_transpose_times_x))
         self.logger.info(
             f'LassoCV: design_matrix condition number: {condition_number}'
         )
         if condition_number > 10.0 ** 4:
-            # add small noise to x to remove singularity,
-            #  expect prediction confidence to be reduced (wider intervals) by doing this
+            # Adding N(0, sigma^2) noise to each entry of x would remove the singularity and adds num_samples * sigma^2 to
+            #  the diagonal of x.T * x in expectation. Adding just that keeps sparse design matrices sparse, and the intervals
+            #  deterministic. Expect prediction confidence to be reduced (wider intervals) by doing this.
             self.logger.info(
-                f"Adding noise to design matrix used for prediction confidence due to condition number {condition_number} > 10**4."
+                f"Regularizing x.T * x used for prediction confidence due to condition number {condition_number} > 10**4."
             )
-            design_matrix += np.random.normal(0, 10.0**-2, size=design_matrix.shape)
-            condition_number = np.linalg.cond(design_matrix)
+            x_transpose_times_x += np.eye(x_transpose_times_x.shape[0]) * design_matrix.shape[0] * (10.0 ** -2) ** 2
+            condition_number = np.sqrt(np.linalg.cond(x_transpose_times_x))
             self.logger.info(
                 f"Resulting condition number {condition_number}."
             )
-        x_transpose_times_x = np.matmul(design_matrix.T, design_matrix)
         self.partial_hat_matrix_ = np.linalg.inv(x_transpose_times_x)
 
-        # retain standard error from base model (used for prediction confidence intervals)
-        predicted_y = self._regressor.predict(design_matrix)
-        y_residuals = y - predicted_y
-        residual_sum_of_squares = np.sum(y_residuals ** 2)
-        self.dof_ = design_matrix.shape[0] - (len(self._regressor.coef_) + 1)  # +1 for intercept
-        self.regressor_standard_error_ = residual_sum_of_squares / float(self.dof_)
+    def _compute_leverages(self, design_matrix) -> np.ndarray:
+        """ Computes x_i.T * partial_hat_matrix * x_i for each row x_i of the design matrix.
+
+        """
+        if sparse.issparse(design_matrix):
+            return np.asarray(design_matrix.multiply(design_matrix @ self.partial_hat_matrix_).sum(axis=1)).reshape(-1)
+        return np.einsum('ij,jk,ik->i', design_matrix, self.partial_hat_matrix_, design_matrix)
 
     @trace()
-    def predict(self, feature_values_pandas_frame, include_only_valid_rows=True):
+    def _predict(self, feature_values_pandas_frame, include_only_valid_rows=True):
         self.logger.debug(f"Creating predictions for {len(feature_values_pandas_frame.index)} samples.")
 
         # Prediction dataframe column shortcuts
@@ -221,11 +241,8 @@ class LassoCrossValidatedRegressionModel(RegressionModel):
             prediction_dataframe[predicted_value_col] = self._regressor.predict(design_matrix)
 
             # compute variance needed for prediction interval
-            prediction_variances = []
-            for xi in design_matrix:
-                leverage_x = np.matmul(np.matmul(xi.T, self.partial_hat_matrix_), xi)
-                prediction_var = self.regressor_standard_error_ * (1.0 + leverage_x)
-                prediction_variances.append(prediction_var if prediction_var > 0 else 0)
+            prediction_variances = self.regressor_standard_error_ * (1.0 + self._compute_leverages(design_matrix))
+            prediction_variances[prediction_variances < 0] = 0
 
             prediction_dataframe[predicted_value_var_col] = prediction_variances
             prediction_dataframe[dof_col] = self.dof_
@@ -252,37 +269,39 @@ class LassoCrossValidatedRegressionModel(RegressionModel):
             design_matrix = x_df.to_numpy()
         return design_matrix
 
-    def _create_one_hot_encoded_design_matrix(self, x: DataFrame) -> np.ndarray:
+    def _create_one_hot_encoded_design_matrix(self, x: DataFrame) -> sparse.csr_matrix:
+        """ Creates a sparse design matrix with the continuous features, followed by the continuous features multiplied by each one hot encoded column.
+
+        The column block for a one hot encoded column is only nonzero in the rows where that column is hot. Since the one hot
+        encoded columns are mutually exclusive, only the products with the single hot column of each row are materialized.
+        """
         assert len(self.one_hot_encoder_adapter.get_one_hot_encoded_column_names()) > 0
 
         # use the following to create one hot encoding columns prior to constructing fit_x and powers_ table
         num_continuous_features = len(self.continuous_dimension_names)
-        continuous_features_x = x[self.continuous_dimension_names]
+        continuous_features_x = x[self.continuous_dimension_names].to_numpy(dtype=np.float64)
 
         dummy_var_cols = self.one_hot_encoder_adapter.get_one_hot_encoded_column_names()
         num_dummy_vars = len(dummy_var_cols)
 
-        # initialize the design matrix
-        fit_x = np.zeros((x.shape[0], num_continuous_features * (num_dummy_vars + 1)))
-
-        # add polynomial features weighted by oneHotEncoded columns
-        # add polynomial for 000...000 encoding
-        fit_x[:, 0:num_continuous_features] = continuous_features_x.copy().to_numpy()
-
-        # add ohe * polynomial terms for non-000...000 encodings
-        last_col_filled = num_continuous_features
-        for ohe_col_name in dummy_var_cols:
-            fit_x[:, last_col_filled:last_col_filled + num_continuous_features] = \
-                x[ohe_col_name].to_numpy().reshape(-1, 1) * continuous_features_x.copy().to_numpy()
-            last_col_filled += num_continuous_features
+        # The block weights are 1 for the 000...000 encoding block, and the one hot encoded columns for the other blocks.
+        #
+        block_weights = sparse.hstack([
+            sparse.csr_matrix(np.ones((x.shape[0], 1))),
+            sparse.csr_matrix(x[dummy_var_cols].to_numpy(dtype=np.float64))
+        ]).tocoo()
+        rows = np.repeat(block_weights.row, num_continuous_features)
+        columns = (block_weights.col.reshape(-1, 1) * num_continuous_features + np.arange(num_continuous_features)).reshape(-1)
+        values = (block_weights.data.reshape(-1, 1) * continuous_features_x[block_weights.row]).reshape(-1)
+        fit_x = sparse.csc_matrix((values, (rows, columns)), shape=(x.shape[0], num_continuous_features * (num_dummy_vars + 1)))
 
         # check for zero columns (expected with hierarchical feature hypergrids containing NaNs for some features)
         #  this should eliminate singular design matrix errors from lasso/ridge regressions
         if self.categorical_zero_cols_idx_to_delete_ is None:
-            self.categorical_zero_cols_idx_to_delete_ = np.argwhere(np.all(fit_x[..., :] == 0, axis=0))
+            self.categorical_zero_cols_idx_to_delete_ = np.argwhere(np.asarray(abs(fit_x).sum(axis=0)).reshape(-1) == 0)
         # remembered from .fit() if not set above
         zero_cols_idx = self.categorical_zero_cols_idx_to_delete_
         if zero_cols_idx.any():
-            fit_x = np.delete(fit_x, zero_cols_idx, axis=1)
+            fit_x = fit_x[:, np.delete(np.arange(fit_x.shape[1]), zero_cols_idx)]
 
-        return fit_x
+        return fit_x.tocsr()
@@ -0,0 +1,45 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import logging
+from mlos.Optimizers.RegressionModels.GaussianProcessConfigStore import gaussian_process_config_store
+from mlos.Optimizers.RegressionModels.GaussianProcessRegressionModel import GaussianProcessRegressionModel
+from mlos.Optimizers.RegressionModels.NaiveMultiObjectiveRegressionModel import NaiveMultiObjectiveRegressionModel
+from mlos.Spaces import Hypergrid, Point, SimpleHypergrid
+
+
+class MultiObjectiveGaussianProcess(NaiveMultiObjectiveRegressionModel):
+    """Maintains multiple GaussianProcessRegressionModels each predicting a different objective.
+
+    All single-objective models are configured according to model_config.
+
+    """
+    def __init__(
+            self,
+            model_config: Point,
+            input_space: Hypergrid,
+            output_space: Hypergrid,
+            logger: logging.Logger = None
+    ):
+        NaiveMultiObjectiveRegressionModel.__init__(
+            self,
+            model_type=GaussianProcessRegressionModel,
+            model_config=model_config,
+            input_space=input_space,
+            output_space=output_space,
+            logger=logger
+        )
+
+        # We just need to assert that the model config belongs in gaussian_process_config_store.parameter_space.
+        #
+        assert model_config in gaussian_process_config_store.parameter_space
+
+        for output_dimension in output_space.dimensions:
+            gaussian_process = GaussianProcessRegressionModel(
+                model_config=model_config,
+                input_space=input_space,
+                output_space=SimpleHypergrid(name=f"{output_dimension.name}_objective", dimensions=[output_dimension]),
+                logger=self.logger
+            )
+            self._regressors_by_objective_name[output_dimension.name] = gaussian_process
@@ -0,0 +1,45 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import logging
+from mlos.Optimizers.RegressionModels.NativeRandomForestConfigStore import native_random_forest_config_store
+from mlos.Optimizers.RegressionModels.NativeRandomForestRegressionModel import NativeRandomForestRegressionModel
+from mlos.Optimizers.RegressionModels.NaiveMultiObjectiveRegressionModel import NaiveMultiObjectiveRegressionModel
+from mlos.Spaces import Hypergrid, Point, SimpleHypergrid
+
+
+class MultiObjectiveNativeRandomForest(NaiveMultiObjectiveRegressionModel):
+    """Maintains multiple NativeRandomForestRegressionModels each predicting a different objective.
+
+    All single-objective models are configured according to model_config.
+
+    """
+    def __init__(
+            self,
+            model_config: Point,
+            input_space: Hypergrid,
+            output_space: Hypergrid,
+            logger: logging.Logger = None
+    ):
+        NaiveMultiObjectiveRegressionModel.__init__(
+            self,
+            model_type=NativeRandomForestRegressionModel,
+            model_config=model_config,
+            input_space=input_space,
+            output_space=output_space,
+            logger=logger
+        )
+
+        # We just need to assert that the model config belongs in native_random_forest_config_store.parameter_space.
+        #
+        assert model_config in native_random_forest_config_store.parameter_space
+
+        for output_dimension in output_space.dimensions:
+            random_forest = NativeRandomForestRegressionModel(
+                model_config=model_config,
+                input_space=input_space,
+                output_space=SimpleHypergrid(name=f"{output_dimension.name}_objective", dimensions=[output_dimension]),
+                logger=self.logger
+            )
+            self._regressors_by_objective_name[output_dimension.name] = random_forest
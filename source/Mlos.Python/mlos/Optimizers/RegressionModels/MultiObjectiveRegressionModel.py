@@ -43,6 +43,14 @@ class MultiObjectiveRegressionModel(ABC):
     def trained(self) -> bool:
         raise NotImplementedError
 
+    @property
+    @abstractmethod
+    def fit_version(self):
+        """ A hashable value that changes whenever any of the models is refit.
+
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def fit(self, features_df: pd.DataFrame, targets_df: pd.DataFrame, iteration_number: int) -> None:
         raise NotImplementedError
@@ -54,3 +62,10 @@ class MultiObjectiveRegressionModel(ABC):
     @abstractmethod
     def compute_goodness_of_fit(self, features_df: pd.DataFrame, targets_df: pd.DataFrame, data_set_type: DataSetType) -> MultiObjectiveGoodnessOfFitMetrics:
         raise NotImplementedError
+
+    def update_holdout_goodness_of_fit(self, features_df: pd.DataFrame, targets_df: pd.DataFrame) -> None:
+        """Scores new observations before they are used for training.
+
+        Models that track holdout goodness of fit metrics override this. By default it does nothing.
+        """
+        return None
@@ -53,6 +53,10 @@ class NaiveMultiObjectiveRegressionModel(MultiObjectiveRegressionModel):
     def trained(self) -> bool:
         return all(regressor.trained for _, regressor in self._regressors_by_objective_name)
 
+    @property
+    def fit_version(self):
+        return tuple(regressor.fit_version for _, regressor in self._regressors_by_objective_name)
+
     def fit(
             self,
             features_df: pd.DataFrame,
@@ -91,3 +95,9 @@ class NaiveMultiObjectiveRegressionModel(MultiObjectiveRegressionModel):
             gof_metrics = regressor.compute_goodness_of_fit(features_df=features_df, target_df=targets_df[[objective_name]], data_set_type=data_set_type)
             multi_objective_goodness_of_fit_metrics[objective_name] = gof_metrics
         return multi_objective_goodness_of_fit_metrics
+
+    def update_holdout_goodness_of_fit(self, features_df: pd.DataFrame, targets_df: pd.DataFrame) -> None:
+        for objective_name, regressor in self._regressors_by_objective_name:
+            if objective_name not in targets_df.columns:
+                continue
+            regressor.update_holdout_goodness_of_fit(features_df=features_df, target_df=targets_df[[objective_name]])
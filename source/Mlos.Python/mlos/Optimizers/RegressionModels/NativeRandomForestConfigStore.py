@@ -0,0 +1,74 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+from enum import Enum
+
+from mlos.Spaces import SimpleHypergrid, ContinuousDimension, DiscreteDimension, CategoricalDimension, Point
+from mlos.Spaces.Configs.ComponentConfigStore import ComponentConfigStore
+
+
+class ForestImplementation(Enum):
+    """ The sklearn ensemble used to back the native random forest.
+
+    """
+    RANDOM_FOREST = "RandomForestRegressor"
+    EXTRA_TREES = "ExtraTreesRegressor"
+
+
+class Criterion(Enum):
+    """ The function to measure the quality of a split.
+
+    Only the criteria for which the leaf impurity is the variance of the samples at the leaf are supported, as that
+    impurity is what we use to compute the prediction variance.
+    """
+    MSE = 'mse'
+    FRIEDMAN_MSE = 'friedman_mse'
+
+
+native_random_forest_config_store = ComponentConfigStore(
+    parameter_space=SimpleHypergrid(
+        name="native_random_forest_regression_model_config",
+        dimensions=[
+            CategoricalDimension(name="forest_implementation", values=[implementation.value for implementation in ForestImplementation]),
+            DiscreteDimension(name="n_estimators", min=1, max=256),
+            CategoricalDimension(name="criterion", values=[criterion.value for criterion in Criterion]),
+            DiscreteDimension(name="max_depth", min=0, max=2**10),
+            DiscreteDimension(name="min_samples_split", min=2, max=32),
+            DiscreteDimension(name="min_samples_leaf", min=3, max=32),
+            ContinuousDimension(name="features_fraction_per_estimator", min=0, max=1, include_min=False, include_max=True),
+            ContinuousDimension(name="samples_fraction_per_estimator", min=0.2, max=1, include_min=False, include_max=True),
+            CategoricalDimension(name="bootstrap", values=[True, False]),
+            DiscreteDimension(name="n_jobs", min=1, max=16),
+            DiscreteDimension(name="min_samples_to_fit", min=1, max=32),
+            DiscreteDimension(name="n_new_samples_before_refit", min=1, max=32)
+        ]
+    ),
+    default=Point(
+        forest_implementation=ForestImplementation.RANDOM_FOREST.value,
+        n_estimators=10,
+        criterion=Criterion.MSE.value,
+        max_depth=0,
+        min_samples_split=2,
+        min_samples_leaf=3,
+        features_fraction_per_estimator=1,
+        samples_fraction_per_estimator=1.0,
+        bootstrap=True,
+        n_jobs=1,
+        min_samples_to_fit=10,
+        n_new_samples_before_refit=10
+    ),
+    description="Governs the construction of a NativeRandomForestRegressionModel which trains a single sklearn forest on all input dimensions."
+                "forest_implementation: which sklearn ensemble to use."
+                "n_estimators: number of trees in the forest."
+                "criterion: the function to measure the quality of a split."
+                "max_depth: the maximum depth of each tree. 0 means no limit."
+                "min_samples_split: the minimum number of samples required to split an internal node."
+                "min_samples_leaf: the minimum number of samples required to be at a leaf node."
+                "features_fraction_per_estimator: the fraction of features to consider when looking for the best split."
+                "samples_fraction_per_estimator: the fraction of samples to draw for each tree if bootstrap is True."
+                "bootstrap: whether bootstrap samples are used when building trees."
+                "n_jobs: the number of jobs to run in parallel for both fit and predict."
+                "min_samples_to_fit: minimum number of samples before it makes sense to try to fit the forest."
+                "n_new_samples_before_refit: number of new samples before the forest will be refitted."
+)
@@ -0,0 +1,226 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import math
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+
+from mlos.Logger import create_logger
+from mlos.Optimizers.RegressionModels.NativeRandomForestConfigStore import native_random_forest_config_store, ForestImplementation
+from mlos.Optimizers.RegressionModels.Prediction import Prediction
+from mlos.Optimizers.RegressionModels.RegressionModel import RegressionModel
+from mlos.Spaces import ContinuousDimension, DiscreteDimension, Hypergrid, Point
+from mlos.Spaces.HypergridAdapters import CategoricalToDiscreteHypergridAdapter, HierarchicalToFlatHypergridAdapter
+from mlos.Tracer import trace
+
+
+class NativeRandomForestRegressionModel(RegressionModel):
+    """ A random forest backed by a single sklearn RandomForestRegressor or ExtraTreesRegressor.
+
+    As opposed to the HomogeneousRandomForestRegressionModel, which maintains n_estimators separate DecisionTreeRegressionModels
+    each with its own input subspace, adapter and validity filtering, this model:
+        1. Flattens the (possibly hierarchical) input space and maps categorical dimensions to discrete ones once.
+        2. Encodes the NaNs of inactive hierarchical dimensions with a per-dimension sentinel value that lies below the
+            dimension's range, so that trees can split on whether a dimension is active or not.
+        3. Trains a single sklearn forest, leveraging n_jobs for both fit and predict.
+        4. Derives the per-tree leaf means, variances and sample sizes from the forest's estimators_ in a vectorized fashion,
+            and pools them the same way HomogeneousRandomForestRegressionModel does:
+                paper: https://arxiv.org/pdf/1211.0906.pdf
+                section: 4.3.2
+
+    Note that the leaf variances are taken from the trees' impurity, which for the supported criteria is the (possibly
+    bootstrap-weighted) variance of the samples at each leaf.
+    """
+
+    _PREDICTOR_OUTPUT_COLUMNS = [
+        Prediction.LegalColumnNames.IS_VALID_INPUT,
+        Prediction.LegalColumnNames.PREDICTED_VALUE,
+        Prediction.LegalColumnNames.PREDICTED_VALUE_VARIANCE,
+        Prediction.LegalColumnNames.SAMPLE_VARIANCE,
+        Prediction.LegalColumnNames.SAMPLE_SIZE,
+        Prediction.LegalColumnNames.PREDICTED_VALUE_DEGREES_OF_FREEDOM
+    ]
+
+    @trace()
+    def __init__(
+            self,
+            model_config: Point,
+            input_space: Hypergrid,
+            output_space: Hypergrid,
+            logger=None
+    ):
+        if logger is None:
+            logger = create_logger("NativeRandomForestRegressionModel")
+        self.logger = logger
+
+        assert model_config in native_random_forest_config_store.parameter_space
+
+        RegressionModel.__init__(
+            self,
+            model_type=type(self),
+            model_config=model_config,
+            input_space=input_space,
+            output_space=output_space
+        )
+
+        self._flattening_adapter = HierarchicalToFlatHypergridAdapter(adaptee=self.input_space)
+        self._input_space_adapter = CategoricalToDiscreteHypergridAdapter(adaptee=self._flattening_adapter)
+        self.input_dimension_names = [dimension.name for dimension in self._input_space_adapter.dimensions]
+        self._missing_value_sentinels = np.array([
+            self._compute_missing_value_sentinel(dimension) for dimension in self._input_space_adapter.dimensions
+        ])
+
+        self.target_dimension_names = [dimension.name for dimension in self.output_space.dimensions]
+        assert len(self.target_dimension_names) == 1, "Single target predictions for now."
+
+        forest_kwargs = dict(
+            n_estimators=self.model_config.n_estimators,
+            criterion=self.model_config.criterion,
+            max_depth=self.model_config.max_depth if self.model_config.max_depth != 0 else None,
+            min_samples_split=self.model_config.min_samples_split,
+            min_samples_leaf=self.model_config.min_samples_leaf,
+            max_features=float(self.model_config.features_fraction_per_estimator),
+            bootstrap=self.model_config.bootstrap,
+            max_samples=float(self.model_config.samples_fraction_per_estimator) if self.model_config.bootstrap else None,
+            n_jobs=self.model_config.n_jobs,
+            random_state=self.model_config.get("random_state", None)
+        )
+
+        if self.model_config.forest_implementation == ForestImplementation.RANDOM_FOREST.value:
+            self._regressor = RandomForestRegressor(**forest_kwargs)
+        elif self.model_config.forest_implementation == ForestImplementation.EXTRA_TREES.value:
+            self._regressor = ExtraTreesRegressor(**forest_kwargs)
+        else:
+            raise RuntimeError(f"Unrecognized forest_implementation: {self.model_config.forest_implementation}")
+
+        self._trained = False
+
+    @property
+    def trained(self):
+        return self._trained
+
+    @property
+    def num_observations_used_to_fit(self):
+        return self.last_refit_iteration_number
+
+    @staticmethod
+    def _compute_missing_value_sentinel(dimension):
+        """ Returns a value strictly below the dimension's range to stand in for NaNs.
+
+        """
+        if isinstance(dimension, (ContinuousDimension, DiscreteDimension)) and math.isfinite(dimension.min) and math.isfinite(dimension.max):
+            return dimension.min - max(1, dimension.max - dimension.min)
+        return np.finfo(np.float32).min / 2
+
+    def should_fit(self, num_samples):
+        """ Returns true if the model should be fitted.
+
+        This model should be fitted under the following conditions:
+        1) It has not been fitted yet and num_samples is larger than min_samples_to_fit
+        2) The model has been fitted and the number of new samples is larger than n_new_samples_before_refit
+
+        :param num_samples:
+        :return:
+        """
+        if not self.trained:
+            return num_samples > self.model_config.min_samples_to_fit
+        num_new_samples = num_samples - self.num_observations_used_to_fit
+        return num_new_samples >= self.model_config.n_new_samples_before_refit
+
+    def _encode_features(self, projected_features_df: pd.DataFrame) -> np.ndarray:
+        """ Produces the feature matrix for the sklearn forest, with sentinels in place of NaNs.
+
+        """
+        feature_values = projected_features_df[self.input_dimension_names].to_numpy(dtype=float)
+        null_mask = np.isnan(feature_values)
+        if null_mask.any():
+            feature_values = np.where(null_mask, self._missing_value_sentinels[np.newaxis, :], feature_values)
+        return feature_values
+
+    @trace()
+    def fit(self, feature_values_pandas_frame, target_values_pandas_frame, iteration_number):
+        self.logger.debug(f"Fitting a {self.__class__.__name__} with {len(feature_values_pandas_frame.index)} observations.")
+
+        # Projecting and encoding the features is the expensive part, so we only do it if the forest is going to be refit.
+        #
+        target_values = target_values_pandas_frame.loc[feature_values_pandas_frame.index, self.target_dimension_names[0]]
+        non_null_targets_mask = target_values.notnull().to_numpy()
+        if not self.should_fit(int(non_null_targets_mask.sum())):
+            return
+
+        projected_features_df = self._input_space_adapter.project_dataframe(feature_values_pandas_frame, in_place=False)
+        feature_values = self._encode_features(projected_features_df)[non_null_targets_mask]
+        target_values = target_values.to_numpy(dtype=float)[non_null_targets_mask]
+
+        self._regressor.fit(feature_values, target_values)
+        self._trained = True
+        self.last_refit_iteration_number = iteration_number
+
+    @trace()
+    def _predict(self, feature_values_pandas_frame, include_only_valid_rows=True):
+        self.logger.debug(f"Creating predictions for {len(feature_values_pandas_frame.index)} samples.")
+
+        # dataframe column shortcuts
+        is_valid_input_col = Prediction.LegalColumnNames.IS_VALID_INPUT.value
+        predicted_value_col = Prediction.LegalColumnNames.PREDICTED_VALUE.value
+        predicted_value_var_col = Prediction.LegalColumnNames.PREDICTED_VALUE_VARIANCE.value
+        sample_var_col = Prediction.LegalColumnNames.SAMPLE_VARIANCE.value
+        sample_size_col = Prediction.LegalColumnNames.SAMPLE_SIZE.value
+        dof_col = Prediction.LegalColumnNames.PREDICTED_VALUE_DEGREES_OF_FREEDOM.value
+
+        valid_rows_index = None
+        feature_values = None
+        if self.trained:
+            flat_features_df = self._flattening_adapter.project_dataframe(feature_values_pandas_frame, in_place=False)
+            valid_features_df = feature_values_pandas_frame[self._flattening_adapter.get_valid_rows_mask(flat_features_df)]
+            projected_features_df = self._input_space_adapter.project_dataframe(valid_features_df, in_place=False)
+            valid_rows_index = projected_features_df.index
+            feature_values = self._encode_features(projected_features_df)
+
+        predictions = Prediction(
+            objective_name=self.target_dimension_names[0],
+            predictor_outputs=self._PREDICTOR_OUTPUT_COLUMNS,
+            dataframe_index=valid_rows_index
+        )
+        prediction_dataframe = predictions.get_dataframe()
+
+        if valid_rows_index is not None and not valid_rows_index.empty:
+            # leaf_indices[i, j] is the index of the leaf in tree j that sample i falls into.
+            #
+            leaf_indices = self._regressor.apply(feature_values)
+            num_trees = leaf_indices.shape[1]
+
+            leaf_means = np.empty(leaf_indices.shape)
+            leaf_variances = np.empty(leaf_indices.shape)
+            leaf_sample_sizes = np.empty(leaf_indices.shape)
+            for tree_index, estimator in enumerate(self._regressor.estimators_):
+                tree = estimator.tree_
+                tree_leaf_indices = leaf_indices[:, tree_index]
+                leaf_means[:, tree_index] = tree.value[tree_leaf_indices, 0, 0]
+                leaf_variances[:, tree_index] = tree.impurity[tree_leaf_indices]
+                leaf_sample_sizes[:, tree_index] = tree.n_node_samples[tree_leaf_indices]
+
+            # Impurity is the population variance at the leaf. Let's convert it to the sample variance.
+            #
+            leaf_sample_variances = np.where(leaf_sample_sizes > 1, leaf_variances * leaf_sample_sizes / np.maximum(leaf_sample_sizes - 1, 1), 0)
+            leaf_mean_variances = leaf_sample_variances / leaf_sample_sizes
+
+            predicted_values = leaf_means.mean(axis=1)
+            mean_of_squared_leaf_means = (leaf_means ** 2).mean(axis=1)
+
+            prediction_dataframe[predicted_value_col] = predicted_values
+            prediction_dataframe[predicted_value_var_col] = leaf_mean_variances.mean(axis=1) + mean_of_squared_leaf_means \
+                                                            - predicted_values ** 2 + 0.0000001 # A little numerical instability correction
+            prediction_dataframe[sample_var_col] = leaf_sample_variances.mean(axis=1) + mean_of_squared_leaf_means \
+                                                   - predicted_values ** 2 + 0.0000001 # A little numerical instability correction
+            prediction_dataframe[sample_size_col] = num_trees
+            prediction_dataframe[dof_col] = leaf_sample_sizes.sum(axis=1) - num_trees
+            prediction_dataframe[is_valid_input_col] = True
+
+        predictions.validate_dataframe(prediction_dataframe)
+        if not include_only_valid_rows:
+            predictions.add_invalid_rows_at_missing_indices(desired_index=feature_values_pandas_frame.index)
+        return predictions
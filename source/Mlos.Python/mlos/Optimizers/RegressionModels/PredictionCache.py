@@ -0,0 +1,123 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import threading
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class PredictionCache:
+    """ A bounded, least recently used cache of prediction rows keyed on the model's fit version and a hash of each feature row.
+
+    All entries belong to a single fit version: a lookup with a different fit version than the one the cache was filled
+    with empties the cache, since none of the previously cached predictions can be reused.
+
+    Both lookups and inserts are vectorized over batches of rows. The cached values are stored as rows of a single 2D float
+    array, so the layout of each row is up to the caller.
+
+    Optimizers serve predictions to concurrent readers, so lookups and inserts hold the cache's own lock, and the keys,
+    values and their last use times are always replaced together, as a single tuple.
+    """
+
+    def __init__(self, max_size: int):
+        assert max_size >= 0
+        self.max_size = max_size
+        self.num_hits = 0
+        self.num_misses = 0
+
+        self._lock = threading.Lock()
+        self._fit_version = None
+        self._entries = self._make_empty_entries()
+        self._clock = 0
+
+    def __len__(self):
+        keys, _, _ = self._entries
+        return len(keys)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries = self._make_empty_entries()
+
+    @staticmethod
+    def _make_empty_entries():
+        return pd.Index(np.empty(0, dtype=np.uint64)), None, np.empty(0, dtype=np.int64)
+
+    def _reset_if_stale(self, fit_version):
+        if fit_version != self._fit_version:
+            self._entries = self._make_empty_entries()
+            self._fit_version = fit_version
+
+    def lookup(self, fit_version, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """ Returns a boolean mask of cache hits and the cached rows for those hits.
+
+        :param fit_version: version of the model that produced the predictions.
+        :param keys: hashes of the feature rows.
+        :return: (hit_mask, cached_values) where cached_values[i] corresponds to the i-th True entry in hit_mask.
+        """
+        with self._lock:
+            self._reset_if_stale(fit_version)
+            cached_keys, cached_values, last_used = self._entries
+
+            if len(cached_keys) == 0:
+                self.num_misses += len(keys)
+                return np.zeros(len(keys), dtype=bool), None
+
+            positions = cached_keys.get_indexer(keys)
+            hit_mask = positions >= 0
+            hit_positions = positions[hit_mask]
+
+            self._clock += 1
+            last_used[hit_positions] = self._clock
+            self.num_hits += len(hit_positions)
+            self.num_misses += len(keys) - len(hit_positions)
+            return hit_mask, cached_values[hit_positions]
+
+    def insert(self, fit_version, keys: np.ndarray, values: np.ndarray) -> None:
+        """ Adds the rows to the cache, evicting the least recently used ones if the cache grows above max_size.
+
+        """
+        if self.max_size == 0 or len(keys) == 0:
+            return
+
+        # Let's only keep the first occurrence of each new key.
+        #
+        keys = np.asarray(keys, dtype=np.uint64)
+        _, first_occurrences = np.unique(keys, return_index=True)
+
+        with self._lock:
+            self._reset_if_stale(fit_version)
+            cached_keys, cached_values, last_used = self._entries
+
+            new_rows_mask = np.zeros(len(keys), dtype=bool)
+            new_rows_mask[first_occurrences] = True
+            if len(cached_keys) > 0:
+                new_rows_mask &= cached_keys.get_indexer(keys) < 0
+            if not new_rows_mask.any():
+                return
+
+            self._clock += 1
+            all_keys = np.concatenate([cached_keys.to_numpy(dtype=np.uint64), keys[new_rows_mask]])
+            all_values = values[new_rows_mask] if cached_values is None else np.vstack([cached_values, values[new_rows_mask]])
+            all_last_used = np.concatenate([last_used, np.full(new_rows_mask.sum(), self._clock, dtype=np.int64)])
+
+            if len(all_keys) > self.max_size:
+                # Stable sort so that among equally recently used rows the newest ones are retained.
+                #
+                retained_positions = np.sort(np.argsort(all_last_used, kind='stable')[-self.max_size:])
+                all_keys = all_keys[retained_positions]
+                all_values = all_values[retained_positions]
+                all_last_used = all_last_used[retained_positions]
+
+            self._entries = pd.Index(all_keys), all_values, all_last_used
@@ -351,7 +351,7 @@ class RegressionEnhancedRandomForestRegressionModel(RegressionModel):
         self.model_config.perform_initial_random_forest_hyper_parameter_search = False
 
     @trace()
-    def predict(
+    def _predict(
             self,
             feature_values_pandas_frame: pd.DataFrame,
             include_only_valid_rows: bool = True
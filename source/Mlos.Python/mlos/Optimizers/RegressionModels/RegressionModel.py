@@ -6,10 +6,11 @@ from abc import ABC, abstractmethod
 
 import numpy as np
 import pandas as pd
-from scipy.stats import t
 
-from mlos.Optimizers.RegressionModels.GoodnessOfFitMetrics import GoodnessOfFitMetrics, DataSetType
+from mlos.Optimizers.RegressionModels.GoodnessOfFitAccumulator import GoodnessOfFitAccumulator, RollingHoldoutGoodnessOfFit
+from mlos.Optimizers.RegressionModels.GoodnessOfFitMetrics import DataSetType
 from mlos.Optimizers.RegressionModels.Prediction import Prediction
+from mlos.Optimizers.RegressionModels.PredictionCache import PredictionCache
 from mlos.Optimizers.RegressionModels.RegressionModelFitState import RegressionModelFitState
 from mlos.Spaces import Hypergrid
 from mlos.Tracer import trace
@@ -22,6 +23,14 @@ class RegressionModel(ABC):
     so that all models can be inspected in a homogeneous way.
     """
 
+    # Number of most recent holdout observations over which DataSetType.TEST goodness of fit metrics are computed.
+    #
+    holdout_window_size = 100
+
+    # Maximum number of feature rows whose predictions are cached between refits. Set to 0 to disable the cache.
+    #
+    prediction_cache_size = 10000
+
     @abstractmethod
     def __init__(self, model_type, model_config, input_space: Hypergrid, output_space: Hypergrid, fit_state: RegressionModelFitState = None):
         self.model_type = model_type
@@ -31,7 +40,40 @@ class RegressionModel(ABC):
         self.input_dimension_names = None
         self.target_dimension_names = self.target_dimension_names = [dimension.name for dimension in self.output_space.dimensions]
         self.fit_state = fit_state if fit_state is not None else RegressionModelFitState()
+        self._fit_version = 0
+        self._prediction_cache = PredictionCache(max_size=self.prediction_cache_size)
         self.last_refit_iteration_number = 0  # Every time we refit, we update this. It serves as a version number.
+        self._holdout_goodness_of_fit = RollingHoldoutGoodnessOfFit(max_observations=self.holdout_window_size)
+
+    def __getstate__(self):
+        # Cached predictions are transient: copies and unpickled models start with an empty cache.
+        #
+        state = self.__dict__.copy()
+        state.pop('_prediction_cache', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._prediction_cache = PredictionCache(max_size=self.prediction_cache_size)
+
+    @property
+    def last_refit_iteration_number(self):
+        return self._last_refit_iteration_number
+
+    @last_refit_iteration_number.setter
+    def last_refit_iteration_number(self, value):
+        # Models set this whenever they refit. Since the same iteration number can be set more than once, we keep a
+        # separate counter to invalidate cached predictions.
+        #
+        self._last_refit_iteration_number = value
+        self._fit_version += 1
+
+    @property
+    def fit_version(self):
+        """ Changes every time the model is refit, even if the iteration number stays the same.
+
+        """
+        return self._fit_version
 
     @property
     @abstractmethod
@@ -43,79 +85,104 @@ class RegressionModel(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def predict(self, feature_values_pandas_frame, include_only_valid_rows=True):
+    def _predict(self, feature_values_pandas_frame, include_only_valid_rows=True):
         raise NotImplementedError
 
     @trace()
-    def compute_goodness_of_fit(self, features_df: pd.DataFrame, target_df: pd.DataFrame, data_set_type: DataSetType):
+    def predict(self, feature_values_pandas_frame, include_only_valid_rows=True):
+        """ Returns predictions for all rows in feature_values_pandas_frame, reusing cached predictions where possible.
+
+        Rows are looked up in the prediction cache by the hash of their values in the input space. Only the misses are
+        passed on to _predict() and their predictions (including the fact that they are invalid) are added to the cache.
+        The cache is emptied whenever the model is refitted.
+
+        :param feature_values_pandas_frame:
+        :param include_only_valid_rows:
+        :return:
+        """
+        if self.prediction_cache_size == 0 or not self.trained or not feature_values_pandas_frame.index.is_unique:
+            return self._predict(feature_values_pandas_frame, include_only_valid_rows=include_only_valid_rows)
+
+        self._prediction_cache.max_size = self.prediction_cache_size
+        output_column_names = [column.value for column in self._PREDICTOR_OUTPUT_COLUMNS]
+
+        # Each cached row holds a validity flag followed by the values of all output columns.
+        #
+        row_hashes = self._hash_feature_rows(feature_values_pandas_frame)
+        hit_mask, cached_rows = self._prediction_cache.lookup(fit_version=self._fit_version, keys=row_hashes)
+        all_rows = np.empty((len(row_hashes), len(output_column_names) + 1))
+        if hit_mask.any():
+            all_rows[hit_mask] = cached_rows
+
+        if not hit_mask.all():
+            miss_mask = ~hit_mask
+            missed_features_df = feature_values_pandas_frame[miss_mask]
+            missed_predictions_df = self._predict(missed_features_df, include_only_valid_rows=True).get_dataframe()
+            missed_rows = np.full((len(missed_features_df.index), len(output_column_names) + 1), np.nan)
+            missed_rows[:, 0] = 0
+            valid_positions = missed_features_df.index.get_indexer(missed_predictions_df.index)
+            missed_rows[valid_positions, 0] = 1
+            missed_rows[valid_positions, 1:] = missed_predictions_df[output_column_names].to_numpy(dtype=float)
+            all_rows[miss_mask] = missed_rows
+            self._prediction_cache.insert(fit_version=self._fit_version, keys=row_hashes[miss_mask], values=missed_rows)
+
+        valid_rows_mask = all_rows[:, 0] == 1
+        valid_predictions_df = pd.DataFrame(
+            all_rows[valid_rows_mask, 1:],
+            columns=output_column_names,
+            index=feature_values_pandas_frame.index[valid_rows_mask]
+        )
+        is_valid_input_col = Prediction.LegalColumnNames.IS_VALID_INPUT.value
+        if is_valid_input_col in output_column_names:
+            valid_predictions_df[is_valid_input_col] = True
+
+        predictions = Prediction(
+            objective_name=self.target_dimension_names[0],
+            predictor_outputs=self._PREDICTOR_OUTPUT_COLUMNS,
+            dataframe=valid_predictions_df
+        )
+        if not include_only_valid_rows:
+            predictions.add_invalid_rows_at_missing_indices(desired_index=feature_values_pandas_frame.index)
+        return predictions
+
+    def _hash_feature_rows(self, feature_values_pandas_frame: pd.DataFrame) -> np.ndarray:
+        """ Returns a 64 bit hash of each row's values in the input space, ignoring all other columns.
 
-        predicted_value_col = Prediction.LegalColumnNames.PREDICTED_VALUE.value
-        predicted_value_var_col = Prediction.LegalColumnNames.PREDICTED_VALUE_VARIANCE.value
-        sample_var_col = Prediction.LegalColumnNames.SAMPLE_VARIANCE.value
-        dof_col = Prediction.LegalColumnNames.PREDICTED_VALUE_DEGREES_OF_FREEDOM.value
+        """
+        features_df = feature_values_pandas_frame.reindex(columns=self.input_space.dimension_names)
+        return pd.util.hash_pandas_object(features_df, index=False).to_numpy(dtype=np.uint64)
 
+    @trace()
+    def compute_goodness_of_fit(self, features_df: pd.DataFrame, target_df: pd.DataFrame, data_set_type: DataSetType):
         predictions = self.predict(features_df.copy()) # TODO: remove the copy
-        predictions_df = predictions.get_dataframe()
-        num_predictions = len(predictions_df.index)
-
-        mean_absolute_error = None
-        root_mean_squared_error = None
-        relative_absolute_error = None
-        relative_squared_error = None
-        coefficient_of_determination = None
-        prediction_90_ci_hit_rate = None
-        sample_90_ci_hit_rate = None
-
-        if num_predictions > 0:
-            target_value = target_df.loc[predictions_df.index, self.target_dimension_names[0]]
-            target_mean = target_value.mean()
-            absolute_target_variation = (target_value - target_mean).abs()
-            squared_target_variation = absolute_target_variation ** 2
-            sum_absolute_target_variation = absolute_target_variation.sum()
-            sum_squared_target_variation = squared_target_variation.sum()  # a.k.a.: total sum of squares
-            error = target_value - predictions_df[predicted_value_col]
-            absolute_error = error.abs()
-            squared_error = error ** 2
-            sum_absolute_error = absolute_error.sum()
-            sum_squared_error = squared_error.sum()  # a.k.a.: residal sum of squares
-
-            mean_absolute_error = sum_absolute_error / num_predictions
-            root_mean_squared_error = np.sqrt(sum_squared_error / num_predictions)
-            if sum_absolute_target_variation > 0:
-                relative_absolute_error = sum_absolute_error / sum_absolute_target_variation
-                relative_squared_error = np.sqrt(sum_squared_error / sum_squared_target_variation)
-                coefficient_of_determination = 1 - (sum_squared_error/sum_squared_target_variation)
-
-            # TODO: Ask Ed about which degrees of freedom to use here...
-            # adjusted_coefficient_of_determination = ...
-
-            if not (predictions_df[dof_col] == 0).any():
-                t_values_90_percent = t.ppf(0.95, predictions_df[dof_col])
-                # t_values_95_percent = t.ppf(0.975, predictions_df[dof_col])
-                # t_values_99_percent = t.ppf(0.995, predictions_df[dof_col])
-                prediction_90_ci_radius = t_values_90_percent * np.sqrt(predictions_df[predicted_value_var_col])
-
-                if sample_var_col in predictions_df.columns.values:
-                    sample_90_ci_radius = t_values_90_percent * np.sqrt(predictions_df[sample_var_col])
-                    sample_90_ci_hit_rate = (absolute_error < sample_90_ci_radius).mean()
-                prediction_90_ci_hit_rate = (absolute_error < prediction_90_ci_radius).mean()
-
-        gof_metrics = GoodnessOfFitMetrics(
-            last_refit_iteration_number=self.last_refit_iteration_number,
-            observation_count=len(features_df.index),
-            prediction_count=len(predictions_df.index),
-            data_set_type=data_set_type,
-            mean_absolute_error=mean_absolute_error,
-            root_mean_squared_error=root_mean_squared_error,
-            relative_absolute_error=relative_absolute_error,
-            relative_squared_error=relative_squared_error,
-            coefficient_of_determination=coefficient_of_determination,
-            # adjusted_coefficient_of_determination=None,
-            prediction_90_ci_hit_rate=prediction_90_ci_hit_rate,
-            # prediction_95_ci_hit_rate=None,
-            # prediction_99_ci_hit_rate=None,
-            sample_90_ci_hit_rate=sample_90_ci_hit_rate,
-            # sample_95_ci_hit_rate=None,
-            # sample_99_ci_hit_rate=None,
+        gof_accumulator = GoodnessOfFitAccumulator()
+        gof_accumulator.update(
+            target_values=target_df[self.target_dimension_names[0]],
+            predictions_df=predictions.get_dataframe(),
+            observation_count=len(features_df.index)
+        )
+        return gof_accumulator.to_goodness_of_fit_metrics(last_refit_iteration_number=self.last_refit_iteration_number, data_set_type=data_set_type)
+
+    @trace()
+    def update_holdout_goodness_of_fit(self, features_df: pd.DataFrame, target_df: pd.DataFrame):
+        """ Scores new observations before they are used for training and records the rolling holdout metrics.
+
+        The cost is proportional to the number of new observations, not to the size of the training set. The metrics
+        are appended to fit_state under DataSetType.TEST.
+
+        :param features_df: features of the new observations.
+        :param target_df: targets of the new observations.
+        :return: the updated GoodnessOfFitMetrics or None if the model has not been trained yet.
+        """
+        if not self.trained or len(features_df.index) == 0:
+            return None
+
+        predictions = self.predict(features_df, include_only_valid_rows=True)
+        self._holdout_goodness_of_fit.update(
+            target_values=target_df[self.target_dimension_names[0]],
+            predictions_df=predictions.get_dataframe(),
+            observation_count=len(features_df.index)
         )
+        gof_metrics = self._holdout_goodness_of_fit.to_goodness_of_fit_metrics(last_refit_iteration_number=self.last_refit_iteration_number)
+        self.fit_state.set_gof_metrics(data_set_type=DataSetType.TEST, gof_metrics=gof_metrics)
         return gof_metrics
@@ -85,3 +85,41 @@ class TestDecisionTreeRegressionModel:
             gof_metrics = model.compute_goodness_of_fit(features_df=self.input_pandas_dataframe, target_df=self.output_pandas_dataframe, data_set_type=DataSetType.TRAIN)
             print(gof_metrics)
 
+
+    def test_streaming_leaf_updates(self):
+        model_config = decision_tree_config_store.default.copy()
+        model_config.streaming_leaf_updates = True
+        model_config.n_new_samples_before_refit = 32
+        model_config.max_leaf_size_drift = 10
+        model = DecisionTreeRegressionModel(
+            model_config=model_config,
+            input_space=self.input_space,
+            output_space=self.output_space
+        )
+
+        shuffled_input_df = self.input_pandas_dataframe.sample(frac=1, random_state=0)
+        shuffled_output_df = self.output_pandas_dataframe.loc[shuffled_input_df.index]
+        model.fit(shuffled_input_df.iloc[:60], shuffled_output_df.iloc[:60], iteration_number=60)
+        tree_structure = model._regressor.tree_
+        assert model.should_fit(num_samples=70)
+
+        # The next 10 samples are routed to the existing leaves, the tree structure remains the same.
+        #
+        model.fit(shuffled_input_df.iloc[:70], shuffled_output_df.iloc[:70], iteration_number=70)
+        assert model._regressor.tree_ is tree_structure
+        assert model.last_refit_iteration_number == 70
+
+        leaf_indices = model._regressor.apply(shuffled_input_df.iloc[:70].to_numpy())
+        leaf_targets = shuffled_output_df.iloc[:70]['y'].groupby(leaf_indices)
+        predictions_df = model.predict(self.input_pandas_dataframe).get_dataframe()
+        predictions_df['leaf_index'] = model._regressor.apply(self.input_pandas_dataframe.to_numpy())
+
+        assert np.allclose(predictions_df['predicted_value'], predictions_df['leaf_index'].map(leaf_targets.mean()))
+        assert np.allclose(predictions_df['sample_variance'], predictions_df['leaf_index'].map(leaf_targets.var(ddof=1)), equal_nan=True)
+        assert (predictions_df['sample_size'] == predictions_df['leaf_index'].map(leaf_targets.size())).all()
+
+        # Once n_new_samples_before_refit samples have arrived, the tree is regrown.
+        #
+        model.fit(shuffled_input_df.iloc[:92], shuffled_output_df.iloc[:92], iteration_number=92)
+        assert model._regressor.tree_ is not tree_structure
+        assert model._count_per_leaf.sum() == 92
@@ -0,0 +1,150 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mlos.global_values as global_values
+from mlos.OptimizerEvaluationTools.ObjectiveFunctionFactory import ObjectiveFunctionFactory, objective_function_config_store
+from mlos.Optimizers.RegressionModels.GaussianProcessConfigStore import gaussian_process_config_store, Kernel
+from mlos.Optimizers.RegressionModels.GaussianProcessRegressionModel import GaussianProcessRegressionModel
+from mlos.Optimizers.RegressionModels.GoodnessOfFitMetrics import DataSetType
+from mlos.Optimizers.RegressionModels.Prediction import Prediction
+from mlos.Spaces import SimpleHypergrid, ContinuousDimension
+
+
+class TestGaussianProcessRegressionModel:
+
+    @classmethod
+    def setup_class(cls) -> None:
+        global_values.declare_singletons()
+
+    def setup_method(self, method):
+        self.input_space = SimpleHypergrid(
+            name="input",
+            dimensions=[
+                ContinuousDimension(name="x", min=0, max=10)
+            ]
+        )
+
+        self.output_space = SimpleHypergrid(
+            name="output",
+            dimensions=[
+                ContinuousDimension(name="y", min=-math.inf, max=math.inf)
+            ]
+        )
+
+        input_values = np.linspace(start=0, stop=10, num=100, endpoint=True)
+        self.input_pandas_dataframe = pd.DataFrame({"x": input_values})
+        self.output_pandas_dataframe = pd.DataFrame({"y": np.sin(input_values) * 10 + input_values})
+
+    @pytest.mark.parametrize("kernel", [kernel.value for kernel in Kernel])
+    def test_default_gaussian_process_model(self, kernel):
+        model_config = gaussian_process_config_store.default
+        model_config.kernel = kernel
+        model = GaussianProcessRegressionModel(
+            model_config=model_config,
+            input_space=self.input_space,
+            output_space=self.output_space
+        )
+        model.fit(self.input_pandas_dataframe, self.output_pandas_dataframe, iteration_number=len(self.input_pandas_dataframe.index))
+        assert model.trained
+        assert not model.is_sparse
+
+        sample_inputs_pandas_dataframe = pd.DataFrame({'x': np.linspace(start=-1, stop=11, num=121, endpoint=True)})
+        predictions = model.predict(sample_inputs_pandas_dataframe, include_only_valid_rows=False)
+        predictions_df = predictions.get_dataframe()
+        assert len(predictions_df.index) == len(sample_inputs_pandas_dataframe.index)
+
+        # Inputs outside of the input space are invalid.
+        #
+        assert predictions_df[Prediction.LegalColumnNames.IS_VALID_INPUT.value].sum() == 101
+        assert (predictions_df[Prediction.LegalColumnNames.PREDICTED_VALUE_VARIANCE.value].dropna() > 0).all()
+
+        gof_metrics = model.compute_goodness_of_fit(
+            features_df=self.input_pandas_dataframe,
+            target_df=self.output_pandas_dataframe,
+            data_set_type=DataSetType.TRAIN
+        )
+        assert gof_metrics.coefficient_of_determination > 0.99
+
+    @pytest.mark.parametrize("max_exact_observations", [1000, 20])
+    def test_incremental_updates(self, max_exact_observations):
+        """ Tests that observations registered between full refits are incorporated incrementally.
+
+        In the exact mode the incrementally updated model must match a model fitted on all observations at once.
+        """
+        model_config = gaussian_process_config_store.default
+        model_config.max_exact_observations = max_exact_observations
+        model_config.num_inducing_points = 20
+        model_config.n_new_samples_before_refit = 32
+        model_config.optimize_length_scale = False
+
+        incremental_model = GaussianProcessRegressionModel(model_config=model_config, input_space=self.input_space, output_space=self.output_space)
+        incremental_model.fit(self.input_pandas_dataframe.iloc[:70], self.output_pandas_dataframe.iloc[:70], iteration_number=70)
+
+        # Only the new observations are encoded on incremental updates.
+        #
+        num_encoded_rows = []
+        encode_features = incremental_model._encode_features  # pylint: disable=protected-access
+
+        def counting_encode_features(flat_features_df):
+            num_encoded_rows.append(len(flat_features_df.index))
+            return encode_features(flat_features_df)
+
+        incremental_model._encode_features = counting_encode_features  # pylint: disable=protected-access
+        for num_observations in range(71, 101):
+            incremental_model.fit(
+                self.input_pandas_dataframe.iloc[:num_observations],
+                self.output_pandas_dataframe.iloc[:num_observations],
+                iteration_number=num_observations
+            )
+        assert num_encoded_rows == [1] * 30
+        assert incremental_model.num_observations_used_to_fit == 100
+        assert incremental_model.is_sparse == (max_exact_observations < 100)
+
+        if incremental_model.is_sparse:
+            gof_metrics = incremental_model.compute_goodness_of_fit(
+                features_df=self.input_pandas_dataframe,
+                target_df=self.output_pandas_dataframe,
+                data_set_type=DataSetType.TRAIN
+            )
+            assert gof_metrics.coefficient_of_determination > 0.9
+            return
+
+        full_model = GaussianProcessRegressionModel(model_config=model_config, input_space=self.input_space, output_space=self.output_space)
+        full_model.fit(self.input_pandas_dataframe, self.output_pandas_dataframe, iteration_number=100)
+
+        sample_inputs_pandas_dataframe = pd.DataFrame({'x': np.linspace(start=0, stop=10, num=37, endpoint=True)})
+        incremental_predictions_df = incremental_model.predict(sample_inputs_pandas_dataframe).get_dataframe()
+        full_predictions_df = full_model.predict(sample_inputs_pandas_dataframe).get_dataframe()
+        for column in [Prediction.LegalColumnNames.PREDICTED_VALUE.value, Prediction.LegalColumnNames.PREDICTED_VALUE_VARIANCE.value]:
+            assert np.allclose(incremental_predictions_df[column], full_predictions_df[column], rtol=10**-4, atol=10**-6)
+
+    @pytest.mark.parametrize("max_exact_observations", [1000, 100])
+    def test_hierarchical_input_space(self, max_exact_observations):
+        objective_function_config = objective_function_config_store.get_config_by_name('three_level_quadratic')
+        objective_function = ObjectiveFunctionFactory.create_objective_function(objective_function_config)
+
+        train_params_df = objective_function.parameter_space.random_dataframe(num_samples=300)
+        train_objectives_df = objective_function.evaluate_dataframe(train_params_df)
+        test_params_df = objective_function.parameter_space.random_dataframe(num_samples=100)
+        test_objectives_df = objective_function.evaluate_dataframe(test_params_df)
+
+        model_config = gaussian_process_config_store.default
+        model_config.max_exact_observations = max_exact_observations
+        model = GaussianProcessRegressionModel(
+            model_config=model_config,
+            input_space=objective_function.parameter_space,
+            output_space=objective_function.output_space
+        )
+        model.fit(train_params_df, train_objectives_df, iteration_number=len(train_params_df.index))
+        assert model.is_sparse == (max_exact_observations < 300)
+
+        test_gof = model.compute_goodness_of_fit(features_df=test_params_df, target_df=test_objectives_df, data_set_type=DataSetType.TEST)
+        assert test_gof.prediction_count == len(test_params_df.index)
+        assert test_gof.coefficient_of_determination > 0.9
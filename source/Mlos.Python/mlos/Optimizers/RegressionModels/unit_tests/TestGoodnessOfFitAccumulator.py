@@ -0,0 +1,118 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import math
+
+import numpy as np
+import pandas as pd
+
+import mlos.global_values as global_values
+from mlos.Optimizers.RegressionModels.GoodnessOfFitAccumulator import GoodnessOfFitAccumulator, RollingHoldoutGoodnessOfFit
+from mlos.Optimizers.RegressionModels.GoodnessOfFitMetrics import DataSetType
+from mlos.Optimizers.RegressionModels.HomogeneousRandomForestRegressionModel import HomogeneousRandomForestRegressionModel
+from mlos.Optimizers.RegressionModels.HomogeneousRandomForestConfigStore import homogeneous_random_forest_config_store
+from mlos.Optimizers.RegressionModels.Prediction import Prediction
+from mlos.Spaces import SimpleHypergrid, ContinuousDimension
+
+
+class TestGoodnessOfFitAccumulator:
+
+    @classmethod
+    def setup_class(cls) -> None:
+        global_values.declare_singletons()
+
+    def setup_method(self, method):
+        self.input_space = SimpleHypergrid(
+            name="input",
+            dimensions=[
+                ContinuousDimension(name="x", min=0, max=100)
+            ]
+        )
+
+        self.output_space = SimpleHypergrid(
+            name="output",
+            dimensions=[
+                ContinuousDimension(name="y", min=-math.inf, max=math.inf)
+            ]
+        )
+
+        input_values = np.linspace(start=0, stop=100, num=200, endpoint=True)
+        self.input_pandas_dataframe = pd.DataFrame({"x": input_values})
+        self.output_pandas_dataframe = pd.DataFrame({"y": np.sin(input_values / 10) * 10 + input_values})
+
+    @staticmethod
+    def _make_predictions_df(num_rows, random_state):
+        return pd.DataFrame({
+            Prediction.LegalColumnNames.PREDICTED_VALUE.value: random_state.normal(size=num_rows),
+            Prediction.LegalColumnNames.PREDICTED_VALUE_VARIANCE.value: random_state.uniform(0.1, 1, size=num_rows),
+            Prediction.LegalColumnNames.SAMPLE_VARIANCE.value: random_state.uniform(0.1, 1, size=num_rows),
+            Prediction.LegalColumnNames.PREDICTED_VALUE_DEGREES_OF_FREEDOM.value: random_state.randint(1, 10, size=num_rows)
+        })
+
+    def test_streaming_matches_single_batch(self):
+        random_state = np.random.RandomState(seed=0)
+        num_rows = 1000
+        predictions_df = self._make_predictions_df(num_rows, random_state)
+        target_values = pd.Series(random_state.normal(size=num_rows))
+
+        single_batch_accumulator = GoodnessOfFitAccumulator()
+        single_batch_accumulator.update(target_values=target_values, predictions_df=predictions_df)
+        single_batch_metrics = single_batch_accumulator.to_goodness_of_fit_metrics(last_refit_iteration_number=0, data_set_type=DataSetType.TEST)
+
+        streaming_accumulator = GoodnessOfFitAccumulator()
+        for batch_start in range(0, num_rows, 100):
+            batch_predictions_df = predictions_df.iloc[batch_start:batch_start + 100]
+            streaming_accumulator.update(target_values=target_values, predictions_df=batch_predictions_df)
+        streaming_metrics = streaming_accumulator.to_goodness_of_fit_metrics(last_refit_iteration_number=0, data_set_type=DataSetType.TEST)
+
+        assert single_batch_metrics.prediction_count == streaming_metrics.prediction_count == num_rows
+        for metric_name in ["mean_absolute_error", "root_mean_squared_error", "relative_squared_error", "coefficient_of_determination",
+                            "prediction_90_ci_hit_rate", "sample_90_ci_hit_rate"]:
+            assert math.isclose(getattr(single_batch_metrics, metric_name), getattr(streaming_metrics, metric_name), rel_tol=1e-9)
+
+        # The relative absolute error is approximated when streaming.
+        #
+        assert math.isclose(single_batch_metrics.relative_absolute_error, streaming_metrics.relative_absolute_error, rel_tol=0.05)
+
+    def test_rolling_holdout_window_is_bounded(self):
+        random_state = np.random.RandomState(seed=1)
+        rolling_holdout = RollingHoldoutGoodnessOfFit(max_observations=50)
+        for _ in range(20):
+            predictions_df = self._make_predictions_df(10, random_state)
+            rolling_holdout.update(target_values=pd.Series(random_state.normal(size=10)), predictions_df=predictions_df)
+            assert rolling_holdout.num_observations <= 59
+
+        gof_metrics = rolling_holdout.to_goodness_of_fit_metrics(last_refit_iteration_number=0)
+        assert gof_metrics.data_set_type == DataSetType.TEST
+        assert gof_metrics.observation_count == rolling_holdout.num_observations
+
+    def test_out_of_bag_and_holdout_metrics(self):
+        model = HomogeneousRandomForestRegressionModel(
+            model_config=homogeneous_random_forest_config_store.default,
+            input_space=self.input_space,
+            output_space=self.output_space
+        )
+
+        train_features_df = self.input_pandas_dataframe.iloc[::2]
+        train_targets_df = self.output_pandas_dataframe.iloc[::2]
+        model.fit(train_features_df, train_targets_df, iteration_number=len(train_features_df.index))
+
+        out_of_bag_metrics = model.fit_state.historical_gof_metrics[DataSetType.VALIDATION]
+        assert len(out_of_bag_metrics) == 1
+        assert out_of_bag_metrics[0].observation_count == len(train_features_df.index)
+        assert 0 < out_of_bag_metrics[0].prediction_count <= len(train_features_df.index)
+        assert out_of_bag_metrics[0].coefficient_of_determination > 0.8
+
+        holdout_features_df = self.input_pandas_dataframe.iloc[1::2]
+        holdout_targets_df = self.output_pandas_dataframe.iloc[1::2]
+        for batch_start in range(0, len(holdout_features_df.index), 10):
+            model.update_holdout_goodness_of_fit(
+                features_df=holdout_features_df.iloc[batch_start:batch_start + 10],
+                target_df=holdout_targets_df.iloc[batch_start:batch_start + 10]
+            )
+
+        holdout_metrics = model.fit_state.historical_gof_metrics[DataSetType.TEST]
+        assert len(holdout_metrics) == 10
+        assert holdout_metrics[-1].prediction_count <= model.holdout_window_size + 10
+        assert holdout_metrics[-1].coefficient_of_determination > 0.8
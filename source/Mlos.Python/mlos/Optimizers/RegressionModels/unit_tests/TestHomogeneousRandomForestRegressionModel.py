@@ -62,6 +62,25 @@ class TestHomogeneousRandomForestRegressionModel:
                                                 predictions.get_dataframe().iterrows()):
                 print(sample_input, prediction)
 
+    def test_trees_do_not_refit_on_every_sample(self):
+        """ Trees in the forest resample their observations on every fit so they must not stream into their leaves.
+
+        Streaming would also make should_fit() return True for every new observation and refit the whole forest.
+        """
+        model_config = homogeneous_random_forest_config_store.default.copy()
+        model_config.decision_tree_regression_model_config.streaming_leaf_updates = True
+        model = HomogeneousRandomForestRegressionModel(
+            model_config=model_config,
+            input_space=self.input_space,
+            output_space=self.output_space
+        )
+        assert all(not tree.model_config.streaming_leaf_updates for tree in model._decision_trees)
+
+        model.fit(self.input_pandas_dataframe.iloc[:500], self.output_pandas_dataframe.iloc[:500], iteration_number=500)
+        assert model.last_refit_iteration_number == 500
+
+        model.fit(self.input_pandas_dataframe.iloc[:501], self.output_pandas_dataframe.iloc[:501], iteration_number=501)
+        assert model.last_refit_iteration_number == 500
 
     def test_random_random_forest_models(self):
         """ Test's random forests with random configs
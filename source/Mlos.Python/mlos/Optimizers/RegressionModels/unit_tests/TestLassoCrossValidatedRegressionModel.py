@@ -6,6 +6,7 @@ import random
 import math
 import pandas as pd
 import numpy as np
+from scipy import sparse
 from sklearn.preprocessing import PolynomialFeatures
 
 from mlos.Optimizers.RegressionModels.Prediction import Prediction
@@ -225,3 +226,40 @@ class TestLassoCrossValidatedRegressionModel:
         test_threshold = 10**-6
         print(f'Asserting {unexplained_variance} < {test_threshold}')
         assert unexplained_variance < test_threshold, f'1 - R^2 = {unexplained_variance} larger than expected ({test_threshold})'
+
+    def test_lasso_sparse_and_dense_confidence_intervals_match(self):
+        """ Makes sure that the prediction confidence does not depend on whether the design matrix happens to be sparse.
+
+        :return:
+        """
+        lasso_cross_validated_model = LassoCrossValidatedRegressionModel(
+            model_config=self.model_config,
+            input_space=self.test_case_globals['categorical_deg2_poly_input_space'],
+            output_space=self.test_case_globals['degree2_output_space']
+        )
+
+        x_train_df, y_train_df = self.generate_points_nonhierarchical_categorical_quadratic(20 * 20)
+        lasso_cross_validated_model.fit(x_train_df, y_train_df, iteration_number=0)
+
+        x_test_df, _ = self.generate_points_nonhierarchical_categorical_quadratic(5 * 5)
+        train_design_matrix = lasso_cross_validated_model._transform_x(  # pylint: disable=protected-access
+            lasso_cross_validated_model.one_hot_encoder_adapter.project_dataframe(x_train_df, in_place=False)
+        )
+        test_design_matrix = lasso_cross_validated_model._transform_x(  # pylint: disable=protected-access
+            lasso_cross_validated_model.one_hot_encoder_adapter.project_dataframe(x_test_df, in_place=False)
+        )
+        assert sparse.issparse(train_design_matrix)
+
+        # Make the design matrix ill-conditioned, so that x.T * x needs to be regularized.
+        #
+        train_design_matrix = sparse.hstack([train_design_matrix, train_design_matrix[:, 0]]).tocsr()
+        test_design_matrix = sparse.hstack([test_design_matrix, test_design_matrix[:, 0]]).tocsr()
+
+        lasso_cross_validated_model._fit_partial_hat_matrix(train_design_matrix)  # pylint: disable=protected-access
+        sparse_leverages = lasso_cross_validated_model._compute_leverages(test_design_matrix)  # pylint: disable=protected-access
+
+        lasso_cross_validated_model._fit_partial_hat_matrix(train_design_matrix.toarray())  # pylint: disable=protected-access
+        dense_leverages = lasso_cross_validated_model._compute_leverages(test_design_matrix.toarray())  # pylint: disable=protected-access
+
+        assert np.all(sparse_leverages > 0)
+        assert np.allclose(sparse_leverages, dense_leverages, rtol=10 ** -6)
@@ -0,0 +1,113 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mlos.global_values as global_values
+from mlos.OptimizerEvaluationTools.ObjectiveFunctionFactory import ObjectiveFunctionFactory, objective_function_config_store
+from mlos.Optimizers.RegressionModels.GoodnessOfFitMetrics import DataSetType
+from mlos.Optimizers.RegressionModels.NativeRandomForestConfigStore import native_random_forest_config_store, ForestImplementation
+from mlos.Optimizers.RegressionModels.NativeRandomForestRegressionModel import NativeRandomForestRegressionModel
+from mlos.Optimizers.RegressionModels.Prediction import Prediction
+from mlos.Spaces import SimpleHypergrid, ContinuousDimension
+
+
+class TestNativeRandomForestRegressionModel:
+
+    @classmethod
+    def setup_class(cls) -> None:
+        global_values.declare_singletons()
+
+    def setup_method(self, method):
+        self.input_space = SimpleHypergrid(
+            name="input",
+            dimensions=[
+                ContinuousDimension(name="x", min=0, max=100)
+            ]
+        )
+
+        self.output_space = SimpleHypergrid(
+            name="output",
+            dimensions=[
+                ContinuousDimension(name="y", min=-math.inf, max=math.inf)
+            ]
+        )
+
+        input_values = np.linspace(start=0, stop=100, num=1000, endpoint=True)
+        self.input_pandas_dataframe = pd.DataFrame({"x": input_values})
+        self.output_pandas_dataframe = pd.DataFrame({"y": input_values * 10 + 10})
+
+    @pytest.mark.parametrize("forest_implementation", [implementation.value for implementation in ForestImplementation])
+    def test_default_native_random_forest_model(self, forest_implementation):
+        model_config = native_random_forest_config_store.default
+        model_config.forest_implementation = forest_implementation
+        model = NativeRandomForestRegressionModel(
+            model_config=model_config,
+            input_space=self.input_space,
+            output_space=self.output_space
+        )
+        model.fit(self.input_pandas_dataframe, self.output_pandas_dataframe, iteration_number=len(self.input_pandas_dataframe.index))
+        assert model.trained
+
+        sample_inputs_pandas_dataframe = pd.DataFrame({'x': np.linspace(start=-10, stop=110, num=121, endpoint=True)})
+        predictions = model.predict(sample_inputs_pandas_dataframe, include_only_valid_rows=False)
+        predictions_df = predictions.get_dataframe()
+        assert len(predictions_df.index) == len(sample_inputs_pandas_dataframe.index)
+
+        # Inputs outside of the input space are invalid.
+        #
+        is_valid_input_col = Prediction.LegalColumnNames.IS_VALID_INPUT.value
+        assert predictions_df[is_valid_input_col].sum() == 101
+        assert (predictions_df[Prediction.LegalColumnNames.PREDICTED_VALUE_VARIANCE.value].dropna() > 0).all()
+
+        gof_metrics = model.compute_goodness_of_fit(
+            features_df=self.input_pandas_dataframe,
+            target_df=self.output_pandas_dataframe,
+            data_set_type=DataSetType.TRAIN
+        )
+        assert gof_metrics.coefficient_of_determination > 0.99
+
+    def test_fit_is_skipped_until_enough_new_samples_arrive(self, monkeypatch):
+        model = NativeRandomForestRegressionModel(
+            model_config=native_random_forest_config_store.default,
+            input_space=self.input_space,
+            output_space=self.output_space
+        )
+        model.fit(self.input_pandas_dataframe, self.output_pandas_dataframe, iteration_number=len(self.input_pandas_dataframe.index))
+        assert model.trained
+
+        # Skipped fits must not even project the features.
+        #
+        def fail_to_project(*args, **kwargs):
+            raise AssertionError("Features were projected although the model was not refit.")
+
+        monkeypatch.setattr(model._input_space_adapter, 'project_dataframe', fail_to_project)  # pylint: disable=protected-access
+        more_inputs_df = self.input_pandas_dataframe.append(pd.DataFrame({'x': [50.5]}), ignore_index=True)
+        more_outputs_df = self.output_pandas_dataframe.append(pd.DataFrame({'y': [515]}), ignore_index=True)
+        model.fit(more_inputs_df, more_outputs_df, iteration_number=len(more_inputs_df.index))
+        assert model.last_refit_iteration_number == len(self.input_pandas_dataframe.index)
+
+    def test_hierarchical_input_space(self):
+        objective_function_config = objective_function_config_store.get_config_by_name('three_level_quadratic')
+        objective_function = ObjectiveFunctionFactory.create_objective_function(objective_function_config)
+
+        train_params_df = objective_function.parameter_space.random_dataframe(num_samples=1000)
+        train_objectives_df = objective_function.evaluate_dataframe(train_params_df)
+        test_params_df = objective_function.parameter_space.random_dataframe(num_samples=200)
+        test_objectives_df = objective_function.evaluate_dataframe(test_params_df)
+
+        model = NativeRandomForestRegressionModel(
+            model_config=native_random_forest_config_store.default,
+            input_space=objective_function.parameter_space,
+            output_space=objective_function.output_space
+        )
+        model.fit(train_params_df, train_objectives_df, iteration_number=len(train_params_df.index))
+
+        test_gof = model.compute_goodness_of_fit(features_df=test_params_df, target_df=test_objectives_df, data_set_type=DataSetType.TEST)
+        assert test_gof.prediction_count == len(test_params_df.index)
+        assert test_gof.coefficient_of_determination > 0.9
@@ -0,0 +1,108 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import numpy as np
+import pandas as pd
+
+import mlos.global_values as global_values
+from mlos.OptimizerEvaluationTools.ObjectiveFunctionFactory import ObjectiveFunctionFactory, objective_function_config_store
+from mlos.Optimizers.RegressionModels.HomogeneousRandomForestConfigStore import homogeneous_random_forest_config_store
+from mlos.Optimizers.RegressionModels.HomogeneousRandomForestRegressionModel import HomogeneousRandomForestRegressionModel
+from mlos.Optimizers.RegressionModels.PredictionCache import PredictionCache
+
+
+class TestPredictionCache:
+
+    @classmethod
+    def setup_class(cls) -> None:
+        global_values.declare_singletons()
+
+    def setup_method(self, method):
+        objective_function_config = objective_function_config_store.get_config_by_name('three_level_quadratic')
+        self.objective_function = ObjectiveFunctionFactory.create_objective_function(objective_function_config)
+        self.train_params_df = self.objective_function.parameter_space.random_dataframe(num_samples=200)
+        self.train_objectives_df = self.objective_function.evaluate_dataframe(self.train_params_df)
+
+        self.model = HomogeneousRandomForestRegressionModel(
+            model_config=homogeneous_random_forest_config_store.default,
+            input_space=self.objective_function.parameter_space,
+            output_space=self.objective_function.output_space
+        )
+        self.model.fit(self.train_params_df, self.train_objectives_df, iteration_number=len(self.train_params_df.index))
+
+    @staticmethod
+    def _assert_same_predictions(actual_predictions_df, expected_predictions_df):
+        # The forest does not guarantee the order of the rows it returns, only their index.
+        #
+        actual_predictions_df = actual_predictions_df.sort_index()
+        expected_predictions_df = expected_predictions_df.sort_index()
+        assert actual_predictions_df.index.equals(expected_predictions_df.index)
+        assert np.allclose(actual_predictions_df.to_numpy(dtype=float), expected_predictions_df.to_numpy(dtype=float), equal_nan=True)
+
+    def test_lru_eviction(self):
+        cache = PredictionCache(max_size=10)
+        keys = np.arange(10, dtype=np.uint64)
+        cache.insert(fit_version=1, keys=keys, values=np.arange(20, dtype=float).reshape(10, 2))
+        assert len(cache) == 10
+
+        # Touch the first five keys so that the last five are evicted first.
+        #
+        hit_mask, cached_values = cache.lookup(fit_version=1, keys=keys[:5])
+        assert hit_mask.all()
+        assert (cached_values[:, 0] == np.arange(0, 10, 2)).all()
+
+        cache.insert(fit_version=1, keys=np.arange(10, 15, dtype=np.uint64), values=np.zeros((5, 2)))
+        assert len(cache) == 10
+        hit_mask, _ = cache.lookup(fit_version=1, keys=np.arange(15, dtype=np.uint64))
+        assert hit_mask[:5].all() and not hit_mask[5:10].any() and hit_mask[10:].all()
+
+        # A new fit version invalidates all entries.
+        #
+        hit_mask, _ = cache.lookup(fit_version=2, keys=keys)
+        assert not hit_mask.any()
+        assert len(cache) == 0
+
+    def test_cached_predictions_match_uncached_ones(self):
+        # Let's include some invalid rows as well.
+        #
+        features_df = self.objective_function.parameter_space.random_dataframe(num_samples=100)
+        features_df.loc[[3, 7], 'vertex_height'] = 'invalid_value'
+
+        uncached_predictions_df = self.model._predict(features_df, include_only_valid_rows=False).get_dataframe()
+        for include_only_valid_rows in [True, False, True]:
+            predictions_df = self.model.predict(features_df, include_only_valid_rows=include_only_valid_rows).get_dataframe()
+            expected_predictions_df = uncached_predictions_df
+            if include_only_valid_rows:
+                expected_predictions_df = uncached_predictions_df[uncached_predictions_df['is_valid_input'] == True]
+            assert list(predictions_df.columns) == list(expected_predictions_df.columns)
+            self._assert_same_predictions(predictions_df, expected_predictions_df)
+
+        assert self.model._prediction_cache.num_hits == 200
+
+        # Partial hits must be stitched together in the original order, ignoring extra columns.
+        #
+        mixed_features_df = pd.concat([features_df.iloc[50:], self.objective_function.parameter_space.random_dataframe(num_samples=50)], ignore_index=True)
+        mixed_features_df['extra_column'] = 1
+        predictions_df = self.model.predict(mixed_features_df, include_only_valid_rows=False).get_dataframe()
+        uncached_predictions_df = self.model._predict(mixed_features_df, include_only_valid_rows=False).get_dataframe()
+        self._assert_same_predictions(predictions_df, uncached_predictions_df)
+
+    def test_refit_invalidates_cache(self):
+        features_df = self.objective_function.parameter_space.random_dataframe(num_samples=50)
+        self.model.predict(features_df)
+        assert len(self.model._prediction_cache) == 50
+
+        # Each tree only sees a subsample of the rows in its own subspace, so it takes a lot of new rows for them to refit.
+        #
+        new_params_df = self.objective_function.parameter_space.random_dataframe(num_samples=1000)
+        all_params_df = pd.concat([self.train_params_df, new_params_df], ignore_index=True)
+        all_objectives_df = self.objective_function.evaluate_dataframe(all_params_df)
+        fit_version = self.model.fit_version
+        self.model.fit(all_params_df, all_objectives_df, iteration_number=len(all_params_df.index))
+        assert self.model.fit_version > fit_version
+
+        predictions_df = self.model.predict(features_df).get_dataframe()
+        uncached_predictions_df = self.model._predict(features_df).get_dataframe()
+        self._assert_same_predictions(predictions_df, uncached_predictions_df)
+        assert self.model._prediction_cache.num_hits == 0
@@ -748,20 +748,30 @@ class TestBayesianOptimizer:
             local_optimizer.optimum(optimum_definition=OptimumDefinition.BEST_SPECULATIVE_WITHIN_CONTEXT)
 
 
-        # can't register, predict, suggest with context on remote optimizer
-        with pytest.raises(NotImplementedError, match="Context not currently supported"):
-            remote_optimizer.register(
-                parameter_values_pandas_frame=parameter_df,
-                target_values_pandas_frame=target_df,
-                context_values_pandas_frame=context_df
-            )
+        # register, predict and suggest with context on remote optimizer
+        remote_optimizer.register(
+            parameter_values_pandas_frame=parameter_df,
+            target_values_pandas_frame=target_df,
+            context_values_pandas_frame=context_df
+        )
 
-        with pytest.raises(NotImplementedError, match="Context not currently supported"):
-            remote_optimizer.predict(parameter_values_pandas_frame=parameter_df,
-                                    context_values_pandas_frame=context_df)
+        remote_parameters_df, _, remote_context_df = remote_optimizer.get_all_observations()
+        assert len(remote_parameters_df.index) == n_samples
+        assert len(remote_context_df.index) == n_samples
+        assert (remote_context_df['y'].to_numpy() == context_df['y'].to_numpy()).all()
 
-        with pytest.raises(NotImplementedError, match="Context not currently supported"):
-            remote_optimizer.suggest(context=context_df)
+        remote_predictions = remote_optimizer.predict(
+            parameter_values_pandas_frame=parameter_df,
+            context_values_pandas_frame=context_df
+        )
+        assert len(remote_predictions.get_dataframe().index) == len(parameter_df.index)
+
+        remote_suggestion = remote_optimizer.suggest(context=context_space.random())
+        assert remote_suggestion in input_space
+
+        with pytest.raises(grpc.RpcError):
+            # context is required to suggest
+            remote_optimizer.suggest()
 
         # context is missing but required by problem, should give error
         with pytest.raises(grpc.RpcError):
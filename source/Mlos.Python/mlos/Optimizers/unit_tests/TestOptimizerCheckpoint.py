@@ -0,0 +1,114 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import os
+import pickle
+
+import pandas as pd
+
+import mlos.global_values as global_values
+from mlos.Logger import create_logger
+from mlos.OptimizerEvaluationTools.ObjectiveFunctionFactory import ObjectiveFunctionFactory, objective_function_config_store
+from mlos.Optimizers.BayesianOptimizer import BayesianOptimizer, bayesian_optimizer_config_store
+from mlos.Optimizers.OptimizationProblem import OptimizationProblem, Objective
+from mlos.Optimizers.OptimizerCheckpoint import OptimizerCheckpoint
+from mlos.Spaces.HypergridsBinaryEncoderDecoder import HypergridBinaryEncoder
+from mlos.Utils.Checkpoint import CheckpointReader
+
+
+class TestOptimizerCheckpoint:
+    """ Tests saving trained optimizers to checkpoints and restoring them.
+
+    """
+
+    @classmethod
+    def setup_class(cls):
+        global_values.declare_singletons()
+        objective_function_config = objective_function_config_store.get_config_by_name('2d_quadratic_concave_up')
+        cls.objective_function = ObjectiveFunctionFactory.create_objective_function(objective_function_config)
+        cls.optimization_problem = OptimizationProblem(
+            parameter_space=cls.objective_function.parameter_space,
+            objective_space=cls.objective_function.output_space,
+            objectives=[Objective(name='y', minimize=True)]
+        )
+        cls.optimizer = BayesianOptimizer(optimization_problem=cls.optimization_problem, optimizer_config=bayesian_optimizer_config_store.default)
+        parameters_df = cls.optimization_problem.parameter_space.random_dataframe(num_samples=50)
+        cls.optimizer.register(parameters_df, cls.objective_function.evaluate_dataframe(parameters_df))
+        cls.test_parameters_df = cls.optimization_problem.parameter_space.random_dataframe(num_samples=20)
+
+    def assert_restored(self, restored_optimizer, same_model=True):
+        original_parameters_df, original_targets_df, _ = self.optimizer.get_all_observations()
+        restored_parameters_df, restored_targets_df, _ = restored_optimizer.get_all_observations()
+        pd.testing.assert_frame_equal(restored_parameters_df, original_parameters_df)
+        pd.testing.assert_frame_equal(restored_targets_df, original_targets_df)
+        assert restored_optimizer.optimizer_config == self.optimizer.optimizer_config
+        assert HypergridBinaryEncoder.encode(restored_optimizer.optimization_problem.parameter_space) == \
+            HypergridBinaryEncoder.encode(self.optimization_problem.parameter_space)
+
+        if same_model:
+            original_predictions_df = self.optimizer.predict(self.test_parameters_df.copy()).get_dataframe()
+            restored_predictions_df = restored_optimizer.predict(self.test_parameters_df.copy()).get_dataframe()
+            pd.testing.assert_frame_equal(restored_predictions_df, original_predictions_df)
+
+        assert restored_optimizer.suggest() in self.optimization_problem.parameter_space
+
+    def test_round_trip(self):
+        self.assert_restored(OptimizerCheckpoint.loads(OptimizerCheckpoint.dumps(self.optimizer)))
+
+    def test_state_covers_all_attributes(self):
+        """ Attributes that are neither in the state nor recreated on restore would be silently lost.
+
+        """
+        checkpointed_attribute_names = set(OptimizerCheckpoint._state_attribute_names)  # pylint: disable=protected-access
+        checkpointed_attribute_names |= set(OptimizerCheckpoint._observation_attribute_names_by_entry_name.values())  # pylint: disable=protected-access
+        assert set(self.optimizer.__dict__.keys()) == checkpointed_attribute_names | {'logger'}
+
+    def test_transient_state_is_not_restored(self):
+        self.optimizer.predict(self.test_parameters_df.copy())
+        logger = create_logger("RestoredOptimizer")
+        restored_optimizer = OptimizerCheckpoint.loads(OptimizerCheckpoint.dumps(self.optimizer), logger=logger)
+
+        assert restored_optimizer.logger is logger
+        assert restored_optimizer.surrogate_model.logger is logger
+        for _, regressor in restored_optimizer.surrogate_model._regressors_by_objective_name:  # pylint: disable=protected-access
+            assert len(regressor._prediction_cache) == 0  # pylint: disable=protected-access
+        self.assert_restored(restored_optimizer)
+
+    def test_round_trip_without_state(self):
+        checkpoint = OptimizerCheckpoint.dumps(self.optimizer, include_state=False)
+        assert 'state' not in CheckpointReader(checkpoint)
+        self.assert_restored(OptimizerCheckpoint.loads(checkpoint), same_model=False)
+
+    def test_compression(self):
+        compressed_checkpoint = OptimizerCheckpoint.dumps(self.optimizer, compress=True)
+        assert len(compressed_checkpoint) < len(OptimizerCheckpoint.dumps(self.optimizer))
+        self.assert_restored(OptimizerCheckpoint.loads(compressed_checkpoint))
+
+    def test_checkpoint_files(self, tmp_path):
+        path = os.path.join(tmp_path, 'optimizer.checkpoint')
+        OptimizerCheckpoint.dump(self.optimizer, path)
+        self.assert_restored(OptimizerCheckpoint.load(path))
+        self.assert_restored(OptimizerCheckpoint.load(path, use_mmap=False))
+
+    def test_pickles_are_loaded(self, tmp_path):
+        pickled_optimizer = pickle.dumps(self.optimizer)
+        self.assert_restored(OptimizerCheckpoint.loads(pickled_optimizer))
+
+        path = os.path.join(tmp_path, 'optimizer.pickle')
+        with open(path, 'wb') as pickle_file:
+            pickle_file.write(pickled_optimizer)
+        self.assert_restored(OptimizerCheckpoint.load(path))
+
+    def test_unreadable_state_is_refit(self, monkeypatch):
+        checkpoint = OptimizerCheckpoint.dumps(self.optimizer)
+
+        get_object = CheckpointReader.get_object
+
+        def fail_to_unpickle_state(reader, name, external_objects=None):
+            if name == 'state':
+                raise AttributeError("Can't get attribute 'RenamedClass'.")
+            return get_object(reader, name, external_objects=external_objects)
+
+        monkeypatch.setattr(CheckpointReader, 'get_object', fail_to_unpickle_state)
+        self.assert_restored(OptimizerCheckpoint.loads(checkpoint), same_model=False)
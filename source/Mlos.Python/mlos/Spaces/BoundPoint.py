@@ -0,0 +1,229 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import copyreg
+from functools import lru_cache
+
+from mlos.Spaces.Point import Point
+
+
+class _Missing:
+    """ Marks a dimension that the point does not specify a value for (e.g. it belongs to an inactive subgrid).
+
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __reduce__(self):
+        return "MISSING"
+
+MISSING = _Missing()
+
+
+class BoundPoint(Point):
+    """ A Point whose layout is fixed by the hypergrid it was created for.
+
+    Instead of a dict, values are kept in a flat list with one slot per root dimension and one slot per subgrid. Subgrid
+    slots hold BoundPoints of the subgrid's class. Each class carries a precomputed table mapping every dotted dimension
+    name to its slot and the remainder of the name, so reads and writes never have to split dimension names.
+
+    Classes are generated once per hypergrid schema by bound_point_class() and hypergrids cache them in their point_class
+    property. Values along dimensions that are not part of the schema are kept in an ordinary Point.
+
+    BoundPoints pickle as the schema and the list of values, not as JSON. The generated classes themselves pickle as their
+    schema, so hypergrids that cached their point_class can be pickled too.
+    """
+    __slots__ = ('_values', '_extra')
+
+    # The following are set on each generated class.
+    #
+    _schema = ((), ())
+    _root_names = ()
+    _subgrid_classes = ()
+    _slots_by_name = {}
+
+    def __init__(self, **kwargs):  # pylint: disable=super-init-not-called
+        object.__setattr__(self, '_values', [MISSING] * len(self._root_names))
+        object.__setattr__(self, '_extra', None)
+        for dimension_name, value in kwargs.items():
+            self[dimension_name] = value
+
+    def copy(self):
+        copy = type(self)()
+        copy._values[:] = [value.copy() if isinstance(value, Point) else value for value in self._values]
+        if self._extra is not None:
+            object.__setattr__(copy, '_extra', self._extra.copy())
+        return copy
+
+    @property
+    def dimension_value_dict(self):
+        """ Returns a dict of the values in the root of this point, with points for subgrids - same as in a Point.
+
+        The dict is a snapshot, but the points for subgrids are the ones held by this point.
+        """
+        dimension_value_dict = {
+            dimension_name: value
+            for dimension_name, value in zip(self._root_names, self._values)
+            if value is not MISSING
+        }
+        if self._extra is not None:
+            dimension_value_dict.update(self._extra.dimension_value_dict)
+        return dimension_value_dict
+
+    def __iter__(self):
+        for dimension_name, value in zip(self._root_names, self._values):
+            if value is MISSING:
+                continue
+            if isinstance(value, Point):
+                for sub_dimension_name, sub_dimension_value in value:
+                    yield dimension_name + "." + sub_dimension_name, sub_dimension_value
+            else:
+                yield dimension_name, value
+        if self._extra is not None:
+            yield from self._extra
+
+    def __getattr__(self, dimension_name):
+        if dimension_name in BoundPoint.__slots__:
+            # Only possible before __init__ or __setstate__ ran.
+            #
+            raise AttributeError(dimension_name)
+        return Point.__getattr__(self, dimension_name)
+
+    def __setattr__(self, dimension_name, value):
+        self[dimension_name] = value
+
+    def __getitem__(self, dimension_name):
+        slot_and_remainder = self._slots_by_name.get(dimension_name, None)
+        if slot_and_remainder is not None:
+            slot, remainder = slot_and_remainder
+            value = self._values[slot]
+            if value is not MISSING:
+                if remainder is None:
+                    return value
+                return value[remainder]
+        elif self._extra is not None:
+            return self._extra[dimension_name]
+        raise KeyError(f"This Point does not have a value along dimension: {dimension_name}")
+
+    def __setitem__(self, dimension_name, value):
+        slot_and_remainder = self._slots_by_name.get(dimension_name, None)
+        if slot_and_remainder is None:
+            if self._extra is None:
+                object.__setattr__(self, '_extra', Point())
+            self._extra[dimension_name] = value
+            return
+
+        slot, remainder = slot_and_remainder
+        subgrid_class = self._subgrid_classes[slot]
+        if subgrid_class is None:
+            self._values[slot] = value
+        elif remainder is None:
+            if not isinstance(value, subgrid_class):
+                value = subgrid_class(**{sub_dimension_name: sub_dimension_value for sub_dimension_name, sub_dimension_value in value})
+            self._values[slot] = value
+        else:
+            point_in_subgrid = self._values[slot]
+            if point_in_subgrid is MISSING:
+                point_in_subgrid = subgrid_class()
+                self._values[slot] = point_in_subgrid
+            point_in_subgrid[remainder] = value
+
+    def __contains__(self, dimension_name):
+        slot_and_remainder = self._slots_by_name.get(dimension_name, None)
+        if slot_and_remainder is None:
+            return self._extra is not None and dimension_name in self._extra
+        slot, remainder = slot_and_remainder
+        value = self._values[slot]
+        if value is MISSING:
+            return False
+        return remainder is None or remainder in value
+
+    def __reduce__(self):
+        return _restore_bound_point, (self._schema, self._values, self._extra)
+
+    def __getstate__(self):
+        return self._values, self._extra
+
+    def __setstate__(self, state):
+        values, extra = state
+        object.__setattr__(self, '_values', values)
+        object.__setattr__(self, '_extra', extra)
+
+
+class _BoundPointClass(type):
+    """ Metaclass of the classes generated by bound_point_class().
+
+    They can't be found by name, so they are pickled as their schema instead (see copyreg.pickle below).
+    """
+
+
+def _reduce_bound_point_class(point_class):
+    return bound_point_class, (point_class._schema,)  # pylint: disable=protected-access
+
+
+copyreg.pickle(_BoundPointClass, _reduce_bound_point_class)
+
+
+def _restore_bound_point(schema, values, extra):
+    point = bound_point_class(schema).__new__(bound_point_class(schema))
+    point.__setstate__((list(values), extra))
+    return point
+
+
+def hypergrid_schema(hypergrid):
+    """ Returns a hashable description of the layout of points in the hypergrid: its root dimension names and the schemas of its subgrids.
+
+    """
+    return (
+        tuple(dimension.name for dimension in hypergrid.root_dimensions),
+        tuple((subgrid_name, hypergrid_schema(subgrid)) for subgrid_name, subgrid in hypergrid.subgrids_by_name.items())
+    )
+
+
+@lru_cache(maxsize=None)
+def bound_point_class(schema):
+    """ Generates a BoundPoint subclass for the schema returned by hypergrid_schema().
+
+    Hypergrids with identical schemas share the class.
+
+    :param schema:
+    :return:
+    """
+    dimension_names, subgrid_schemas = schema
+    root_names = dimension_names + tuple(subgrid_name for subgrid_name, _ in subgrid_schemas)
+    subgrid_classes = (None,) * len(dimension_names) + tuple(bound_point_class(subgrid_schema) for _, subgrid_schema in subgrid_schemas)
+
+    slots_by_name = {}
+    for slot, (root_name, subgrid_class) in enumerate(zip(root_names, subgrid_classes)):
+        slots_by_name[root_name] = (slot, None)
+        if subgrid_class is not None:
+            for sub_dimension_name in subgrid_class._slots_by_name:  # pylint: disable=protected-access
+                slots_by_name[f"{root_name}.{sub_dimension_name}"] = (slot, sub_dimension_name)
+
+    class_dict = {
+        '__slots__': (),
+        '_schema': schema,
+        '_root_names': root_names,
+        '_subgrid_classes': subgrid_classes,
+        '_slots_by_name': slots_by_name
+    }
+
+    # Root dimensions get properties so that attribute reads don't have to go through __getattr__.
+    #
+    for slot, dimension_name in enumerate(dimension_names):
+        if dimension_name.isidentifier() and not hasattr(BoundPoint, dimension_name):
+            class_dict[dimension_name] = property(_make_slot_getter(slot, dimension_name))
+
+    return _BoundPointClass("BoundPoint", (BoundPoint,), class_dict)
+
+
+def _make_slot_getter(slot, dimension_name):
+    def get_slot_value(self):
+        value = self._values[slot]  # pylint: disable=protected-access
+        if value is MISSING:
+            raise AttributeError(f"This Point does not have a {dimension_name} attribute. Point: {self}")
+        return value
+    return get_slot_value
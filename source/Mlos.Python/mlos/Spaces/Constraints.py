@@ -0,0 +1,315 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import ast
+from enum import Enum
+from types import SimpleNamespace
+from typing import Callable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mlos.Spaces.Dimensions.ContinuousDimension import ContinuousDimension
+from mlos.Spaces.Dimensions.DiscreteDimension import DiscreteDimension
+
+
+class ConstraintRepairStrategy(Enum):
+    """ What to do with samples that violate the constraints of a hypergrid.
+
+    RESAMPLE drops them and draws new samples until there are enough valid ones.
+    PROJECT moves each of them towards a randomly chosen valid sample, along the numeric dimensions referenced by the
+    constraints, and stops at the point closest to the original sample that satisfies all constraints. Samples that
+    can't be repaired that way are resampled.
+    """
+    RESAMPLE = "resample"
+    PROJECT = "project"
+
+
+class Constraint:
+    """ A predicate over the dimensions of a hypergrid, written as a Python expression.
+
+    The expression is evaluated over whole columns at once, so it must only use vectorizable operations: & | ~ instead of
+    and, or, not and np.minimum instead of min. Dimensions in subgrids are referenced by their dotted names, e.g.:
+
+        Constraint(name='fits_in_memory', expression='buffer_size * num_buffers <= 2 ** 30')
+        Constraint(name='smaller_emergency_buffer', expression='emergency_buffer_config.log2_buffer_size < log2_buffer_size')
+
+    Numpy is available as np. A constraint only applies to samples with values along all dimensions it references, so
+    constraints on dimensions in inactive subgrids are always satisfied.
+
+    Parameters
+    ----------
+    name : str
+        Identifier.
+
+    expression : str
+        A Python expression over the dimensions of the hypergrid.
+    """
+
+    _functions = {
+        'np': np,
+        'abs': np.abs,
+        'minimum': np.minimum,
+        'maximum': np.maximum,
+        'exp': np.exp,
+        'log': np.log,
+        'log2': np.log2,
+        'sqrt': np.sqrt
+    }
+
+    def __init__(self, name, expression):
+        self.name = name
+        self.expression = expression
+        syntax_tree = ast.parse(expression, mode='eval')
+        self.dimension_names = tuple(sorted(
+            dimension_name
+            for dimension_name in _referenced_names(syntax_tree)
+            if dimension_name.split('.')[0] not in self._functions
+        ))
+        self._code = compile(syntax_tree, filename=f"<constraint {name}>", mode='eval')
+
+    def __repr__(self):
+        return f"{self.name}: {self.expression}"
+
+    def is_satisfied_by_point(self, point) -> bool:
+        values = {}
+        for dimension_name in self.dimension_names:
+            value = point.get(dimension_name, None)
+            if value is None or pd.isnull(value):
+                # Points built from rows of hierarchical dataframes carry NaNs along the dimensions of inactive subgrids.
+                #
+                return True
+            values[dimension_name] = value
+        return bool(self._evaluate(values))
+
+    def is_satisfied_by_rows(self, dataframe: pd.DataFrame, prefix="") -> np.ndarray:
+        """ Returns a boolean array telling which rows of the dataframe satisfy the constraint.
+
+        :param dataframe:
+        :param prefix: prepended to the dimension names to get the column names, when the constraint belongs to a subgrid.
+        :return:
+        """
+        num_rows = len(dataframe.index)
+        not_applicable = np.zeros(num_rows, dtype=bool)
+        values = {}
+        for dimension_name in self.dimension_names:
+            column_name = prefix + dimension_name
+            if column_name not in dataframe.columns:
+                return np.ones(num_rows, dtype=bool)
+            column = dataframe[column_name]
+            null_mask = column.isnull().to_numpy()
+            if null_mask.any():
+                not_applicable |= null_mask
+                if null_mask.all():
+                    return np.ones(num_rows, dtype=bool)
+
+                # Fill the gaps with a valid value, so that evaluating the expression doesn't trip over types. The results
+                # for these rows are discarded anyway.
+                #
+                column = column.where(~null_mask, column[~null_mask].iloc[0])
+            values[dimension_name] = column.to_numpy()
+
+        with np.errstate(all='ignore'):
+            satisfied = self._evaluate(values)
+        satisfied = np.broadcast_to(np.asarray(satisfied, dtype=bool), (num_rows,))
+        return satisfied | not_applicable
+
+    def _evaluate(self, values):
+        # The expression only gets to see the functions above and the values, in a single namespace without any builtins.
+        #
+        namespace = {'__builtins__': {}}
+        namespace.update(self._functions)
+        namespace.update(_to_namespace(values))
+        return eval(self._code, namespace)  # pylint: disable=eval-used
+
+
+def _referenced_names(syntax_tree):
+    """ Returns the set of all names and dotted names used in the expression.
+
+    """
+    names = set()
+
+    class NameCollector(ast.NodeVisitor):
+
+        def visit_Attribute(self, node):  # pylint: disable=invalid-name
+            parts = []
+            current = node
+            while isinstance(current, ast.Attribute):
+                parts.append(current.attr)
+                current = current.value
+            if isinstance(current, ast.Name):
+                parts.append(current.id)
+                names.add('.'.join(reversed(parts)))
+            else:
+                self.generic_visit(node)
+
+        def visit_Name(self, node):  # pylint: disable=invalid-name
+            names.add(node.id)
+
+    NameCollector().visit(syntax_tree)
+    return names
+
+
+def _to_namespace(values):
+    """ Turns {'a': 1, 'subgrid.b': 2} into {'a': 1, 'subgrid': SimpleNamespace(b=2)}, so that dotted names resolve.
+
+    """
+    tree = {}
+    for dimension_name, value in values.items():
+        *subgrid_names, name = dimension_name.split('.')
+        node = tree
+        for subgrid_name in subgrid_names:
+            node = node.setdefault(subgrid_name, {})
+        node[name] = value
+
+    def convert(node):
+        if isinstance(node, dict):
+            return SimpleNamespace(**{name: convert(child) for name, child in node.items()})
+        return node
+
+    return {name: convert(child) for name, child in tree.items()}
+
+
+def constraints_mask(prefixed_constraints: List[Tuple[str, Constraint]], dataframe: pd.DataFrame) -> np.ndarray:
+    mask = np.ones(len(dataframe.index), dtype=bool)
+    for prefix, constraint in prefixed_constraints:
+        mask &= constraint.is_satisfied_by_rows(dataframe, prefix=prefix)
+    return mask
+
+
+def enforce_constraints(
+        hypergrid,
+        samples_df: pd.DataFrame,
+        draw_samples: Callable[[int], pd.DataFrame],
+        num_samples: int,
+        rng: np.random.Generator,
+        max_attempts=100
+) -> pd.DataFrame:
+    """ Returns num_samples rows that satisfy all constraints of the hypergrid and its subgrids.
+
+    Rows of samples_df that violate the constraints are repaired or replaced according to the hypergrid's
+    constraint_repair_strategy. Replacements come from draw_samples(), which must return unconstrained samples from the
+    hypergrid. Valid rows keep their relative order.
+
+    :raises ValueError: if not enough valid samples were found within max_attempts rounds of sampling.
+    """
+    prefixed_constraints = list(hypergrid.enumerate_constraints())
+    repair_strategy = hypergrid.constraint_repair_strategy
+    movable_columns = _get_movable_columns(hypergrid, prefixed_constraints)
+
+    valid_dfs = []
+    num_valid_samples = 0
+    num_drawn_samples = 0
+    anchors_df = None
+
+    for _ in range(max_attempts):
+        num_drawn_samples += len(samples_df.index)
+        satisfied = constraints_mask(prefixed_constraints, samples_df)
+        if repair_strategy == ConstraintRepairStrategy.PROJECT and not satisfied.all():
+            if satisfied.any():
+                anchors_df = samples_df[satisfied]
+            if anchors_df is not None:
+                samples_df, satisfied = _project_onto_constraints(
+                    samples_df=samples_df,
+                    satisfied=satisfied,
+                    anchors_df=anchors_df,
+                    movable_columns=movable_columns,
+                    prefixed_constraints=prefixed_constraints,
+                    rng=rng
+                )
+
+        valid_df = samples_df[satisfied]
+        valid_dfs.append(valid_df)
+        num_valid_samples += len(valid_df.index)
+        if num_valid_samples >= num_samples:
+            break
+
+        # Draw enough samples to make up for the missing ones, given the acceptance rate so far.
+        #
+        num_missing_samples = num_samples - num_valid_samples
+        acceptance_rate = max(num_valid_samples / num_drawn_samples, 0.01) if num_drawn_samples > 0 else 1
+        samples_df = draw_samples(int(np.ceil(num_missing_samples / acceptance_rate)))
+    else:
+        raise ValueError(
+            f"Failed to produce {num_samples} samples satisfying the constraints of hypergrid {hypergrid.name} "
+            f"after {max_attempts} attempts. Found {num_valid_samples} samples out of {num_drawn_samples}."
+        )
+
+    valid_samples_df = pd.concat(valid_dfs, ignore_index=True, sort=False) if len(valid_dfs) > 1 else valid_dfs[0].reset_index(drop=True)
+    return valid_samples_df.iloc[:num_samples]
+
+
+def _get_movable_columns(hypergrid, prefixed_constraints):
+    """ Returns (column name, is discrete) for all continuous and discrete dimensions referenced by any constraint.
+
+    Pivot dimensions are excluded, since changing them would change which subgrids are active.
+    """
+    referenced_column_names = {prefix + dimension_name for prefix, constraint in prefixed_constraints for dimension_name in constraint.dimension_names}
+    movable_columns = []
+
+    def collect(grid, prefix):
+        for dimension in grid.root_dimensions:
+            column_name = prefix + dimension.name
+            if column_name not in referenced_column_names or dimension.name in grid.joined_subgrids_by_pivot_dimension:
+                continue
+            if isinstance(dimension, (ContinuousDimension, DiscreteDimension)):
+                movable_columns.append((column_name, isinstance(dimension, DiscreteDimension)))
+        for subgrid_name, subgrid in grid.subgrids_by_name.items():
+            collect(subgrid, f"{prefix}{subgrid_name}.")
+
+    collect(hypergrid, "")
+    return movable_columns
+
+
+def _project_onto_constraints(samples_df, satisfied, anchors_df, movable_columns, prefixed_constraints, rng, num_bisection_steps=20):
+    """ Moves each row that violates the constraints along a straight line towards a randomly chosen valid anchor row, and
+    keeps the point furthest from the anchor that satisfies all constraints.
+
+    Discrete values are rounded towards the anchor, so they stay within bounds. The search is a vectorized bisection on the
+    fraction of the way from the anchor to the original row.
+    """
+    column_names = [column_name for column_name, _ in movable_columns if column_name in samples_df.columns and column_name in anchors_df.columns]
+    if not column_names:
+        return samples_df, satisfied
+    is_discrete = np.array([discrete for column_name, discrete in movable_columns if column_name in column_names])
+
+    violating_df = samples_df[~satisfied].copy()
+    original_values = violating_df[column_names].to_numpy(dtype=float)
+    anchor_values = anchors_df[column_names].to_numpy(dtype=float)[rng.integers(0, len(anchors_df.index), size=len(violating_df.index))]
+
+    # We can only move along the dimensions that have values in both rows.
+    #
+    anchor_values = np.where(np.isnan(original_values) | np.isnan(anchor_values), original_values, anchor_values)
+    original_dtypes = samples_df.dtypes[column_names]
+
+    def move_towards_anchors(fractions):
+        offsets = fractions[:, np.newaxis] * (original_values - anchor_values)
+        offsets[:, is_discrete] = np.trunc(offsets[:, is_discrete])
+        moved_values = anchor_values + offsets
+        for column_index, column_name in enumerate(column_names):
+            column_values = moved_values[:, column_index]
+            if np.issubdtype(original_dtypes[column_name], np.integer):
+                column_values = column_values.astype(original_dtypes[column_name])
+            violating_df[column_name] = column_values
+        return constraints_mask(prefixed_constraints, violating_df)
+
+    # The lower fractions only ever move to points that satisfy the constraints, so after the bisection, every row that can
+    # be repaired at all sits at a valid point.
+    #
+    lower_fractions = np.zeros(len(violating_df.index))
+    upper_fractions = np.ones(len(violating_df.index))
+    for _ in range(num_bisection_steps):
+        middle_fractions = (lower_fractions + upper_fractions) / 2
+        middle_satisfied = move_towards_anchors(middle_fractions)
+        lower_fractions = np.where(middle_satisfied, middle_fractions, lower_fractions)
+        upper_fractions = np.where(middle_satisfied, upper_fractions, middle_fractions)
+    repairable = move_towards_anchors(lower_fractions)
+
+    repaired_df = violating_df[repairable]
+    samples_df = samples_df.copy()
+    for column_name in column_names:
+        samples_df.loc[repaired_df.index, column_name] = repaired_df[column_name]
+    satisfied = satisfied.copy()
+    satisfied[samples_df.index.get_indexer(repaired_df.index)] = True
+    return samples_df, satisfied
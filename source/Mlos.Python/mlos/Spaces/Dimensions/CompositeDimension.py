@@ -7,7 +7,7 @@ from numbers import Number
 import numpy as np
 
 from .Dimension import Dimension
-from .IntervalTree import IntervalTree
+from .SortedChunkArray import SortedChunkArray
 
 
 class CompositeDimension(Dimension):
@@ -15,16 +15,16 @@ class CompositeDimension(Dimension):
 
     A union or difference operation on two ContinuousDimensions (or two DiscreteDimensions) can lead to
     a result comprised by discontinuous sets. In order to support further efficient operations on the
-    result, we maintain such a union in an interval tree data structure.
+    result, we maintain such a union in a sorted array of chunks, with numpy arrays of their bounds.
     """
 
-    def __init__(self, name, chunks_type, chunks=None):
-        super(CompositeDimension, self).__init__(name=name)
+    def __init__(self, name, chunks_type, chunks=None, random_state=None):
+        super(CompositeDimension, self).__init__(name=name, random_state=random_state)
         self.chunks_type = chunks_type
-        self._interval_tree = IntervalTree(name=self.name, chunks_type=self.chunks_type)
+        self._chunks = SortedChunkArray(name=self.name, chunks_type=self.chunks_type)
         if chunks is not None:
             for chunk in chunks:
-                self._interval_tree.add(chunk)
+                self._chunks.add(chunk)
 
     def __str__(self):
         return self.to_string(include_name=True)
@@ -41,9 +41,10 @@ class CompositeDimension(Dimension):
     def copy(self):
         copy = CompositeDimension(
             name=self.name,
-            chunks_type=self.chunks_type
+            chunks_type=self.chunks_type,
+            random_state=self.random_state
         )
-        copy._interval_tree = self._interval_tree.copy()  # pylint: disable=protected-access
+        copy._chunks = self._chunks.copy()  # pylint: disable=protected-access
         return copy
 
     def __contains__(self, item):
@@ -83,33 +84,31 @@ class CompositeDimension(Dimension):
         :return:
         """
         # TODO: fix the rounding problems
-        total_length = sum((chunk.max - chunk.min) for chunk in self.enumerate_chunks())
-        partial_linspaces = []
-        for chunk in self.enumerate_chunks():
-            chunk_length = chunk.max - chunk.min
-            chunk_size_proportion = (chunk_length * 1.0 / total_length)
-            num_elements = round(chunk_size_proportion * num)
-            partial_linspaces.append(chunk.linspace(num=num_elements))
-        return np.concatenate(partial_linspaces)
+        return self._chunks.linspace(num=num)
 
     def contains_number(self, number):
-        # TODO: improve perf
-        return any(number in node.payload for node in self._interval_tree.enumerate())
+        return self._chunks.contains_number(number)
+
+    def contains_numbers(self, numbers) -> np.ndarray:
+        """ Returns a boolean mask of the numbers (e.g. a dataframe column) that belong to this dimension.
+
+        """
+        return self._chunks.contains_numbers(numbers)
 
     def enumerate_chunks(self):
-        return (node.payload for node in self._interval_tree.enumerate())
+        return self._chunks.enumerate()
 
     def pop_overlapping_chunks(self, chunk):
-        return self._interval_tree.pop_overlapping_chunks(chunk)
+        return self._chunks.pop_overlapping_chunks(chunk)
 
     def pop_adjacent_chunks(self, chunk):
-        return self._interval_tree.pop_adjacent_chunks(chunk)
+        return self._chunks.pop_adjacent_chunks(chunk)
 
     def push(self, chunk, skip_checks=False):
         if not skip_checks:
-            overlapping_chunks = self._interval_tree.pop_overlapping_chunks(chunk)
+            overlapping_chunks = self._chunks.pop_overlapping_chunks(chunk)
             assert not overlapping_chunks
-        self._interval_tree.push(chunk)
+        self._chunks.push(chunk)
 
     def difference(self, other):
         raise NotImplementedError("Did you remember to import DimensionCalulator?")
@@ -130,7 +129,7 @@ class CompositeDimension(Dimension):
         raise NotImplementedError("Did you remember to import DimensionCalulator?")
 
     def random(self):
-        raise NotImplementedError("TODO")
+        return self._chunks.random(random_state=self._random_state)
 
 
 def get_next_chunk(chunk_enumerator):
@@ -0,0 +1,232 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import bisect
+import math
+
+import numpy as np
+
+from .ContinuousDimension import ContinuousDimension
+from .DiscreteDimension import DiscreteDimension
+
+
+class SortedChunkArray:
+    """ Keeps the chunks of a CompositeDimension sorted by their min, together with numpy arrays of their bounds.
+
+    Just like the IntervalTree, it maintains the invariant that no two chunks overlap. Since the chunks are sorted and disjoint,
+    both their mins and maxes are sorted, so:
+        1) finding the chunks that might contain a number, or overlap with (or be adjacent to) another chunk is a binary search,
+        2) membership of a whole column of numbers can be tested with a single np.searchsorted() call.
+
+    The bounds arrays are rebuilt lazily, on the first membership test after the chunks were modified.
+    """
+
+    def __init__(self, name, chunks_type):
+        self.name = name
+        self.chunks_type = chunks_type
+        self._chunks = []
+        self._mins = []
+        self._bounds = None
+
+    def copy(self):
+        copy = SortedChunkArray(name=self.name, chunks_type=self.chunks_type)
+        copy._chunks = [chunk.copy() for chunk in self._chunks]  # pylint: disable=protected-access
+        copy._mins = list(self._mins)  # pylint: disable=protected-access
+        return copy
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def enumerate(self):
+        # Copying the list allows the callers to pop chunks as they go.
+        #
+        return iter(list(self._chunks))
+
+    def add(self, chunk):
+        assert isinstance(chunk, self.chunks_type)
+        overlapping_chunks = self.pop_overlapping_chunks(chunk)
+        result = chunk
+        for overlapping_chunk in overlapping_chunks:
+            result = result.union(overlapping_chunk)
+        self.push(result)
+
+    def push(self, chunk):
+        """ Push the chunk into the array. Use with caution.
+
+        Users of this method have to be certain that the chunk does not overlap nor is contiguous with any other chunks.
+        Otherwise, some of the invariants might be violated.
+        """
+        position = bisect.bisect_right(self._mins, chunk.min)
+        self._chunks.insert(position, chunk)
+        self._mins.insert(position, chunk.min)
+        self._bounds = None
+
+    def remove(self, chunk):
+        assert isinstance(chunk, self.chunks_type)
+        overlapping_chunks = self.pop_overlapping_chunks(chunk)
+
+        for overlapping_chunk in overlapping_chunks:
+            if overlapping_chunk in chunk:
+                # we have popped it successfully already
+                continue
+            # We need to do some math
+            difference = overlapping_chunk.difference(chunk)
+            self.push(difference)
+
+    def pop_overlapping_chunks(self, chunk):
+        """ Finds, removes, and returns a list of chunks overlapping with chunk.
+
+        Only the chunks whose bounds overlap with the chunk's bounds are candidates, and they are contiguous in the array.
+        """
+        return self._pop_chunks_in_range(
+            low=chunk.min,
+            high=chunk.max,
+            predicate=lambda candidate: candidate.intersects(chunk)
+        )
+
+    def pop_adjacent_chunks(self, chunk):
+        """ Finds, removes and returns a list of chunks adjacent to chunk, sorted by their min.
+
+        For example: if our array contains [0, 1], (2, 4) and we call pop_adjacent_chunks((1, 2]) then this function
+        should return both chunks.
+        """
+        stride = chunk.stride if isinstance(chunk, DiscreteDimension) else 0
+        return self._pop_chunks_in_range(
+            low=chunk.min - stride,
+            high=chunk.max + stride,
+            predicate=lambda candidate: candidate.is_contiguous_with(chunk)
+        )
+
+    def _pop_chunks_in_range(self, low, high, predicate):
+        # The first chunk whose max is not below low is either the chunk containing low, or the first one after it. Since
+        # maxes are sorted just like the mins, we can look for it in the mins, starting one chunk earlier.
+        #
+        first = max(bisect.bisect_left(self._mins, low) - 1, 0)
+        last = bisect.bisect_right(self._mins, high)
+        popped_chunks = []
+        remaining_chunks = []
+        for candidate in self._chunks[first:last]:
+            if predicate(candidate):
+                popped_chunks.append(candidate)
+            else:
+                remaining_chunks.append(candidate)
+        if popped_chunks:
+            self._chunks[first:last] = remaining_chunks
+            self._mins[first:last] = [candidate.min for candidate in remaining_chunks]
+            self._bounds = None
+        return popped_chunks
+
+    @property
+    def bounds(self):
+        """ Returns a tuple of numpy arrays: mins, maxes, include_mins, include_maxes.
+
+        """
+        if self._bounds is None:
+            mins = np.array([chunk.min for chunk in self._chunks], dtype=np.float64)
+            maxes = np.array([chunk.max for chunk in self._chunks], dtype=np.float64)
+            include_mins = np.array([getattr(chunk, 'include_min', True) for chunk in self._chunks], dtype=bool)
+            include_maxes = np.array([getattr(chunk, 'include_max', True) for chunk in self._chunks], dtype=bool)
+            self._bounds = mins, maxes, include_mins, include_maxes
+        return self._bounds
+
+    def contains_number(self, number):
+        # Only the last chunk starting at or before the number, and (if they share the min) the one before it can contain it.
+        #
+        position = bisect.bisect_right(self._mins, number)
+        return any(number in chunk for chunk in self._chunks[max(position - 2, 0):position])
+
+    def contains_numbers(self, numbers) -> np.ndarray:
+        """ Returns a boolean mask of the numbers that belong to any chunk.
+
+        """
+        numbers = np.asarray(numbers, dtype=np.float64)
+        if not self._chunks:
+            return np.zeros(numbers.shape, dtype=bool)
+
+        mins, maxes, include_mins, include_maxes = self.bounds
+        positions = np.searchsorted(mins, numbers, side='right') - 1
+        contained_mask = np.zeros(numbers.shape, dtype=bool)
+        with np.errstate(invalid='ignore'):
+            for candidate_positions in (positions, positions - 1):
+                valid_positions_mask = candidate_positions >= 0
+                candidate_positions = np.maximum(candidate_positions, 0)
+                candidate_mins = mins[candidate_positions]
+                candidate_maxes = maxes[candidate_positions]
+                above_min_mask = (numbers > candidate_mins) | ((numbers == candidate_mins) & include_mins[candidate_positions])
+                below_max_mask = (numbers < candidate_maxes) | ((numbers == candidate_maxes) & include_maxes[candidate_positions])
+                contained_mask |= valid_positions_mask & above_min_mask & below_max_mask
+            if self.chunks_type is DiscreteDimension:
+                contained_mask &= numbers == np.floor(numbers)
+        return contained_mask
+
+    def _chunk_lengths(self) -> np.ndarray:
+        mins, maxes, _, _ = self.bounds
+        if self.chunks_type is DiscreteDimension:
+            return maxes - mins + 1
+        return maxes - mins
+
+    def random(self, random_state):
+        """ Returns a number drawn uniformly from the union of all chunks, so each chunk is picked with probability proportional to its length.
+
+        """
+        if not self._chunks:
+            raise ValueError("Cannot generate a random value from an empty dimension.")
+        if self.chunks_type not in (ContinuousDimension, DiscreteDimension):
+            return self._chunks[random_state.randrange(len(self._chunks))].random()
+
+        cumulative_lengths = np.cumsum(self._chunk_lengths())
+        total_length = cumulative_lengths[-1]
+        if math.isinf(total_length):
+            raise ValueError("Cannot generate a random value from an unbounded dimension.")
+
+        if self.chunks_type is DiscreteDimension:
+            offset = random_state.randrange(int(total_length))
+            position = int(np.searchsorted(cumulative_lengths, offset, side='right'))
+            chunk_start = cumulative_lengths[position - 1] if position > 0 else 0
+            return self._chunks[position].min + int(offset - chunk_start)
+
+        if total_length == 0:
+            # All chunks are single points.
+            #
+            return self._chunks[random_state.randrange(len(self._chunks))].min
+
+        while True:
+            offset = random_state.random() * total_length
+            position = int(np.searchsorted(cumulative_lengths, offset, side='right'))
+            chunk_start = cumulative_lengths[position - 1] if position > 0 else 0
+            chunk = self._chunks[position]
+            value = chunk.min + (offset - chunk_start)
+            if value in chunk:
+                return value
+
+    def linspace(self, num):
+        """ Returns num numbers (give or take rounding) spread over the chunks in proportion to their lengths.
+
+        Within each chunk the numbers are evenly spaced from its min to its max. Excluded ends are spaced out as if they
+        were included, and then dropped, so that all returned numbers belong to the chunks.
+        """
+        if not self._chunks:
+            return np.array([])
+
+        mins, maxes, include_mins, include_maxes = self.bounds
+        widths = maxes - mins
+        total_width = widths.sum()
+        if total_width > 0:
+            proportions = widths / total_width
+        else:
+            proportions = np.full(len(widths), 1.0 / len(widths))
+        nums_per_chunk = np.round(proportions * num).astype(np.int64)
+
+        excluded_mins = (~include_mins).astype(np.int64)
+        nums_with_ends_per_chunk = np.where(nums_per_chunk > 0, nums_per_chunk + excluded_mins + (~include_maxes).astype(np.int64), 0)
+
+        chunk_positions = np.repeat(np.arange(len(self._chunks)), nums_per_chunk)
+        first_indices = np.cumsum(nums_per_chunk) - nums_per_chunk
+        indices_in_chunk = np.arange(nums_per_chunk.sum()) - first_indices[chunk_positions] + excluded_mins[chunk_positions]
+        steps = np.divide(widths, nums_with_ends_per_chunk - 1, out=np.zeros(len(widths)), where=nums_with_ends_per_chunk > 1)
+        values = mins[chunk_positions] + indices_in_chunk * steps[chunk_positions]
+
+        if self.chunks_type is DiscreteDimension:
+            return np.rint(values).astype(int)
+        return values
@@ -7,8 +7,10 @@ import random
 import pandas as pd
 from mlos.Spaces.Dimensions.ContinuousDimension import ContinuousDimension
 from mlos.Spaces.Dimensions.CategoricalDimension import CategoricalDimension
+from mlos.Spaces.Dimensions.CompositeDimension import CompositeDimension
 from mlos.Spaces.Dimensions.Dimension import Dimension
 from mlos.Spaces.Dimensions.DiscreteDimension import DiscreteDimension
+from mlos.Spaces.HypergridSampler import SamplingStrategy
 from mlos.Spaces.Point import Point
 from mlos.Tracer import trace
 
@@ -67,6 +69,17 @@ class Hypergrid(ABC):
         ]
         return pd.DataFrame(config_dicts)
 
+    def sample_dataframe(self, num_samples, sampling_strategy: SamplingStrategy = SamplingStrategy.SOBOL):
+        """ Returns a dataframe of num_samples points drawn with the specified sampling strategy.
+
+        Hypergrids that don't support low-discrepancy sampling fall back to random_dataframe().
+
+        :param num_samples:
+        :param sampling_strategy:
+        :return:
+        """
+        return self.random_dataframe(num_samples)
+
     @trace()
     def get_valid_rows_index(self, original_dataframe) -> pd.Index:
         """Returns an index of all rows in the dataframe that belong to this Hypergrid.
@@ -107,6 +120,9 @@ class Hypergrid(ABC):
                 elif isinstance(dimension, CategoricalDimension):
                     valid_rows_index = valid_rows_index.intersection(dataframe[dataframe[dimension.name].isin(dimension.values_set)].index)
 
+                elif isinstance(dimension, CompositeDimension):
+                    valid_rows_index = valid_rows_index.intersection(dataframe[dimension.contains_numbers(dataframe[dimension.name])].index)
+
                 else:
                     raise ValueError(f"Unsupported dimension type: {type(dimension)}")
 
@@ -2,8 +2,10 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 #
+from typing import List
 from pandas import DataFrame
 from mlos.Spaces import CategoricalDimension, DiscreteDimension, Hypergrid, Point, SimpleHypergrid
+from mlos.Spaces.HypergridAdapters.FusedAdapterChain import ColumnPlan
 from mlos.Spaces.HypergridAdapters.HypergridAdapter import HypergridAdapter
 from mlos.Spaces.HypergridAdapters.HierarchicalToFlatHypergridAdapter import HierarchicalToFlatHypergridAdapter
 
@@ -37,6 +39,7 @@ class CategoricalToDiscreteHypergridAdapter(HypergridAdapter):
 
         # Now we need to build the target hypergrid and the mappings between adaptee and target.
         self._build_simple_hypergrid_target()
+        self._target.freeze()
 
     @property
     def adaptee(self) -> Hypergrid:
@@ -46,6 +49,16 @@ class CategoricalToDiscreteHypergridAdapter(HypergridAdapter):
     def target(self) -> Hypergrid:
         return self._target
 
+    def _fuse_column_plans(self, column_plans: List[ColumnPlan]) -> List[ColumnPlan]:
+        for column_plan in column_plans:
+            forward_mapping = self._adaptee_to_target_dimension_mappings.get(column_plan.target_name, None)
+            if forward_mapping is None:
+                continue
+            if column_plan.categories is not None or not column_plan.is_affine_identity:
+                return None
+            column_plan.set_categories(list(forward_mapping.keys()))
+        return column_plans
+
     def _project_point(self, point: Point) -> Point:
         projected_point = Point()
         for dim_name, original_dim_value in point:
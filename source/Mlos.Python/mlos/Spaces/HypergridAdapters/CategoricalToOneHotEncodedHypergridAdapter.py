@@ -2,10 +2,9 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 #
-from typing import Dict
+from typing import Dict, List
 import numpy as np
 from pandas import DataFrame
-from sklearn.preprocessing import OneHotEncoder
 from mlos.Spaces import CategoricalDimension, DiscreteDimension, Hypergrid, SimpleHypergrid
 from mlos.Spaces.HypergridAdapters.HypergridAdapter import HypergridAdapter
 from mlos.Spaces.HypergridAdapters.HierarchicalToFlatHypergridAdapter import HierarchicalToFlatHypergridAdapter
@@ -14,37 +13,93 @@ from mlos.Spaces.HypergridAdapters.CategoricalToDiscreteHypergridAdapter import
 
 class CategoricalToOneHotEncodingAdapteeTargetMapping:
     """ Retains the list of target Hypergrid's (one hot encoded) dimensions
-        together with the sklearn OneHotEncoder instance used to transform/inverse transform.
-        The class is instantiated with the sklearn OneHotEncoder instance and target dimension names are added directly.
+        together with everything needed to one hot encode one or more (merged) adaptee columns and to decode them.
+        The target dimension names are added directly.
+
+        Each row of the adaptee columns is mapped to a single integer code in a mixed radix system: every column is a digit
+        whose value is 0 for a missing value, or 1 + the position of the value among the column's levels. The first column
+        is the most significant digit. The one hot encoded category of the row is the code minus first_code, with
+        first_code set to 1 if the all-missing code is excluded.
     """
 
-    def __init__(self, one_hot_encoder: OneHotEncoder):
+    def __init__(self, levels_per_column: List[np.ndarray], exclude_all_missing: bool, drop: str):
         self.target_dims = []
-        self.one_hot_encoder = one_hot_encoder
-        self.num_dummy_dims = 0
+        self.levels_per_column = levels_per_column
+        self.radixes = tuple(len(levels) + 1 for levels in levels_per_column)
+        self.first_code = 1 if exclude_all_missing else 0
+        self.num_categories = int(np.prod(self.radixes)) - self.first_code
+        self.drop_first = (drop == 'first') or (drop == 'if_binary' and self.num_categories == 2)
+        self.num_dummy_dims = self.num_categories - 1 if self.drop_first else self.num_categories
+
+    def encode(self, values: np.ndarray) -> np.ndarray:
+        """ One hot encodes the rows of a (num_rows, num_columns) array of adaptee values.
+
+        """
+        digits = np.zeros(values.shape, dtype=np.int64)
+        for i, levels in enumerate(self.levels_per_column):
+            column = values[:, i]
+            present_mask = ~np.isnan(column)
+            positions = np.minimum(np.searchsorted(levels, column[present_mask]), len(levels) - 1)
+            unknown_mask = levels[positions] != column[present_mask]
+            if unknown_mask.any():
+                raise ValueError(f"Found unknown categories {np.unique(column[present_mask][unknown_mask])} during transform.")
+            digits[present_mask, i] = positions + 1
+
+        categories = np.ravel_multi_index(tuple(digits.T), self.radixes) - self.first_code
+        if (categories < 0).any():
+            raise ValueError("Found rows with all categorical values missing during transform.")
+
+        one_hot_columns = categories - 1 if self.drop_first else categories
+        encoded_rows_mask = one_hot_columns >= 0
+        one_hot_values = np.zeros((len(categories), self.num_dummy_dims), dtype=np.float64)
+        one_hot_values[np.flatnonzero(encoded_rows_mask), one_hot_columns[encoded_rows_mask]] = 1
+        return one_hot_values
+
+    def decode(self, one_hot_values: np.ndarray) -> np.ndarray:
+        """ Returns the (num_rows, num_columns) array of adaptee values for the rows of one hot encoded values.
+
+        Rows with no hot value decode to the dropped category, or to all missing values if no category was dropped.
+        """
+        categories = np.argmax(one_hot_values, axis=1) if self.num_dummy_dims > 0 else np.zeros(len(one_hot_values), dtype=np.int64)
+        no_hot_value_mask = ~(one_hot_values == 1).any(axis=1)
+        if self.drop_first:
+            categories += 1
+            categories[no_hot_value_mask] = 0
+
+        digits = np.unravel_index(categories + self.first_code, self.radixes)
+        values = np.full((len(categories), len(self.levels_per_column)), np.nan)
+        for i, levels in enumerate(self.levels_per_column):
+            present_mask = digits[i] > 0
+            values[present_mask, i] = levels[digits[i][present_mask] - 1]
+        if not self.drop_first:
+            values[no_hot_value_mask] = np.nan
+        return values
 
 
 class CategoricalToOneHotEncodedHypergridAdapter(HypergridAdapter):
-    """ Maps values in categorical dimensions into values in OneHotEncoded dimensions using:
+    """ Maps values in categorical dimensions into values in OneHotEncoded dimensions, with the same semantics as:
         https://scikit-learn.org/stable/modules/generated/sklearn.preprocessing.OneHotEncoder.html,
         which will be referred to as sklearn's OHE.
 
+        The encoding is computed column-wise with numpy: categorical values (and their cross product) are mapped to integer
+        codes, which are scattered into the one hot encoded columns. Decoding is an argmax followed by integer division.
+
         Parameters
         ----------
         merge_all_categorical_dimensions: bool
-            If True, sklearn's OHE will be applied to the cross product of all categorical levels in the adaptee space.
-            If False, sklearn's OHE will be applied individually to each categorical dimension in the adaptee space.
+            If True, the cross product of all categorical levels in the adaptee space will be one hot encoded.
+            If False, each categorical dimension in the adaptee space will be one hot encoded individually.
             Default=False.
         drop: {None, 'first', 'if_binary'}
-            Argument passed to sklearn's OHE with same argument name.
+            Same as sklearn's OHE argument with same argument name.
             Default=None.
 
         The following sklearn OHE arguments are not supported or are restricted:
         categories: Not supported since the levels a categorical can assume are those specified by the adaptee CategoricalDimension categories.
         drop: Not supporting sklearn's OHE drop argument as a array-like of shape (n_features,).
         dtype: This adapter will always use float64 so we're able to accommodate np.NaN values in the projected/unprojected dataframes.
-        sparse: Not exposed in the adapter since the adapter maintains the OHE instances.
-        handle_unknown: This adapter will always set sklearn's OHE instantiation argument handle_unknown='error'.
+        sparse: Not supported since the encoded values are stored in dataframe columns.
+        handle_unknown: This adapter will always raise a ValueError for unknown categories, like handle_unknown='error'.
 
     """
 
@@ -61,16 +116,10 @@ class CategoricalToOneHotEncodedHypergridAdapter(HypergridAdapter):
 
         self._adaptee: Hypergrid = adaptee
         self._merge_all_categorical_dimensions = merge_all_categorical_dimensions
-        self._one_hot_encoder_kwargs = {
-            'drop': drop,
-            'dtype': np.float64,
-            'sparse': False,
-            'handle_unknown': 'error'
-        }
+        self._drop = drop
         self._all_one_hot_encoded_target_dimension_names = []
         self._adaptee_to_target_data_dict: Dict[str, CategoricalToOneHotEncodingAdapteeTargetMapping] = {}
         self._adaptee_expected_dimension_name_ordering = []
-        self._concatenation_delim = '___'
         self._merged_categorical_dimension_column_name = 'ohe_cross_product'
         self.ohe_target_column_suffix = '__ohe'
         self._target: Hypergrid = None
@@ -94,11 +143,12 @@ class CategoricalToOneHotEncodedHypergridAdapter(HypergridAdapter):
             self._adaptee_expected_dimension_name_ordering.append(adaptee_dimension.name)
         self._adaptee_contains_categorical_dimensions = len(self._adaptee_dimension_names_to_transform) > 0
 
-        # since sklearn OneHotEncoder doesn't accept strings, convert any categorical dimensions to discrete
+        # since we encode numeric codes, convert any categorical dimensions to discrete
         if any(isinstance(dimension, CategoricalDimension) for dimension in self._adaptee.dimensions) or self.has_adaptee_been_flattened:
             self._adaptee = CategoricalToDiscreteHypergridAdapter(adaptee=self._adaptee)
 
         self._build_simple_hypergrid_target()
+        self._target.freeze()
 
     @property
     def adaptee(self) -> Hypergrid:
@@ -118,10 +168,6 @@ class CategoricalToOneHotEncodedHypergridAdapter(HypergridAdapter):
     def get_one_hot_encoded_column_names(self):
         return self._all_one_hot_encoded_target_dimension_names
 
-    def _concatenate_dataframe_columns(self, df: DataFrame, columns_to_concatenate) -> DataFrame:
-        df[columns_to_concatenate] = df[columns_to_concatenate].astype('float64')
-        return df[columns_to_concatenate].apply(lambda cat_row: self._concatenation_delim.join(cat_row.map(str)), axis=1)
-
     def _project_dataframe(self, df: DataFrame, in_place=True) -> DataFrame:
         if not in_place:
             df = df.copy(deep=True)
@@ -132,21 +178,11 @@ class CategoricalToOneHotEncodedHypergridAdapter(HypergridAdapter):
             df[missing_col] = df[missing_col].astype('float64')
             columns_to_drop.append(missing_col)
 
-        columns_to_transform = self._adaptee_dimension_names_to_transform
-        if self._merge_all_categorical_dimensions and self._adaptee_contains_categorical_dimensions:
-            df[self._merged_categorical_dimension_column_name] = self._concatenate_dataframe_columns(df, columns_to_transform)
-            columns_to_transform = [self._merged_categorical_dimension_column_name]
-            columns_to_drop.extend(self._adaptee_dimension_names_to_transform)
-
-        for adaptee_column_name in columns_to_transform:
-            my_ohe_dict = self._adaptee_to_target_data_dict[adaptee_column_name]
-            my_ohe = my_ohe_dict.one_hot_encoder
-            if not self._merge_all_categorical_dimensions:
-                df[adaptee_column_name] = df[adaptee_column_name].astype('float64')
-            ohe_x = df[adaptee_column_name].map(str).to_numpy().reshape(-1, 1)
-            my_ohe_target_columns = my_ohe_dict.target_dims
-            df[my_ohe_target_columns] = DataFrame(my_ohe.transform(ohe_x), index=df.index)
-            columns_to_drop.append(adaptee_column_name)
+        for mapping_name, adaptee_column_names in self._get_adaptee_columns_per_mapping():
+            my_ohe_dict = self._adaptee_to_target_data_dict[mapping_name]
+            ohe_x = df[adaptee_column_names].to_numpy(dtype=np.float64)
+            df[my_ohe_dict.target_dims] = DataFrame(my_ohe_dict.encode(ohe_x), index=df.index)
+            columns_to_drop.extend(adaptee_column_names)
 
         if columns_to_drop:
             df.drop(columns=columns_to_drop, inplace=True)
@@ -163,27 +199,13 @@ class CategoricalToOneHotEncodedHypergridAdapter(HypergridAdapter):
                     columns_to_return.append(column_to_transform)
 
         columns_to_drop = []
-        if self._merge_all_categorical_dimensions and self._adaptee_contains_categorical_dimensions:
-            my_ohe_dict = self._adaptee_to_target_data_dict[self._merged_categorical_dimension_column_name]
+        for mapping_name, adaptee_column_names in self._get_adaptee_columns_per_mapping():
+            my_ohe_dict = self._adaptee_to_target_data_dict[mapping_name]
             target_columns_to_invert = my_ohe_dict.target_dims
-            my_ohe = my_ohe_dict.one_hot_encoder
-            df[self._merged_categorical_dimension_column_name] = my_ohe.inverse_transform(df[target_columns_to_invert])
-            df[self._adaptee_dimension_names_to_transform] = df[self._merged_categorical_dimension_column_name]\
-                .str.split(self._concatenation_delim, expand=True)
-            df.loc[:, self._adaptee_dimension_names_to_transform].replace('nan', np.NaN, inplace=True)
-            df[self._adaptee_dimension_names_to_transform] = df[self._adaptee_dimension_names_to_transform].astype('float64')
+            unprojected_values = my_ohe_dict.decode(df[target_columns_to_invert].to_numpy(dtype=np.float64))
+            for i, adaptee_column_name in enumerate(adaptee_column_names):
+                df[adaptee_column_name] = unprojected_values[:, i]
             columns_to_drop.extend(target_columns_to_invert)
-            columns_to_drop.append(self._merged_categorical_dimension_column_name)
-
-        else:
-            for adaptee_column_name in self._adaptee_dimension_names_to_transform:
-                my_ohe_dict = self._adaptee_to_target_data_dict[adaptee_column_name]
-                target_columns_to_invert = my_ohe_dict.target_dims
-                my_ohe = my_ohe_dict.one_hot_encoder
-                df[adaptee_column_name] = my_ohe.inverse_transform(df[target_columns_to_invert])
-                df[adaptee_column_name].replace('nan', np.NaN, inplace=True)
-                df[adaptee_column_name] = df[adaptee_column_name].astype('float64')
-                columns_to_drop.extend(target_columns_to_invert)
 
         columns_to_retain_present_in_df = [column_name for column_name in columns_to_return if column_name in df.columns.values]
         if in_place:
@@ -194,6 +216,16 @@ class CategoricalToOneHotEncodedHypergridAdapter(HypergridAdapter):
 
         return df
 
+    def _get_adaptee_columns_per_mapping(self):
+        """ Returns a list of (mapping name, adaptee column names) pairs, one for each one hot encoding.
+
+        """
+        if not self._adaptee_contains_categorical_dimensions:
+            return []
+        if self._merge_all_categorical_dimensions:
+            return [(self._merged_categorical_dimension_column_name, self._adaptee_dimension_names_to_transform)]
+        return [(adaptee_column_name, [adaptee_column_name]) for adaptee_column_name in self._adaptee_dimension_names_to_transform]
+
     def _build_simple_hypergrid_target(self) -> None:
         """ Builds a SimpleHypergrid target for a SimpleHypergrid adaptee.
 
@@ -207,67 +239,42 @@ class CategoricalToOneHotEncodedHypergridAdapter(HypergridAdapter):
         )
 
         """ Details about construction of the target hypergrid:
-           1) Moving non-categorical dimensions to target, while collecting needed info about adaptee categorical dimensions
-           2) Since sklearn's OHE will handle both project and unproject dataframe transforms, prepare the OHE class.
-              This requires constructing the 'categories' argument for OHE (all categorical dims or 1 cross product dim).
-              The dimension's .linspace() method provides the order list of values but doesn't include possible np.NaN values,
-              hence that list is augmented to include the string 'nan' which pandas.DataFrame.apply(map(str)) will produce from a np.NaN value.
-              All values (output from CategoricalToDiscrete adapter are converted to strings prior to initializing the OHE object.
-              This will allow the code to accommodate any missing values in the dataframes passed to .project_dataframe and .unproject_dataframe.
-           3) If the cross product of all categorical dimensions have been requested, construct the cross product
+           1) Moving non-categorical dimensions to target, while collecting the levels of the adaptee categorical dimensions
+           2) The dimension's .linspace() method provides the ordered list of levels but doesn't include possible np.NaN values,
+              which will be present in dataframes generated from hierarchical hypergrids. A missing value is encoded as an additional
+              level preceding all others.
+           3) If the cross product of all categorical dimensions have been requested, a single mapping encodes all of them. The
+              all-missing combination cannot appear in hierarchical hypergrid derived dataframes, so it is excluded from the categories.
         """
-        categories_list_for_ohe_init = []
+        levels_per_column = []
         for adaptee_dimension in self._adaptee.dimensions:
             if adaptee_dimension.name in self._adaptee_dimension_names_to_transform:
-                """ conversion to str allows accommodation of np.NaN values in dataframes
-                    np.NaN values will not appear in the .linspace() list but will be present in dataframes generated from hierarchical hypergrids.
-                    So 'nan' is included to allow OHE to map np.NaNs in ._project_dataframe() and ._unproject_dataframe().
-                    The value 'nan' is placed first in the list so the 'nan' x ... x 'nan' cross product value is first ([0]).
-                    Since this value should never appear in hierarchical hypergrid derived dataframes, it is popped from
-                    the categories when user specifies merge_all_categorical_dimensions==True.
-                """
-                expanded_categories = ['nan'] + [str(float(x)) for x in adaptee_dimension.linspace()]
-                categories_list_for_ohe_init.append(expanded_categories)
-
-                if not self._merge_all_categorical_dimensions and self._adaptee_contains_categorical_dimensions:
+                levels = np.array(adaptee_dimension.linspace(), dtype=np.float64)
+                levels_per_column.append(levels)
+
+                if not self._merge_all_categorical_dimensions:
                     # do not need to encode the cross product of all categorical dimensions, sufficient info here to add target dimensions
                     self._adaptee_to_target_data_dict[adaptee_dimension.name] = CategoricalToOneHotEncodingAdapteeTargetMapping(
-                        one_hot_encoder=OneHotEncoder(categories=[expanded_categories], **self._one_hot_encoder_kwargs))
-                    temp_df_for_fit = DataFrame({adaptee_dimension.name: expanded_categories})
-                    self._add_one_hot_encoded_dimensions(adaptee_dimension.name, temp_df_for_fit)
+                        levels_per_column=[levels],
+                        exclude_all_missing=False,
+                        drop=self._drop
+                    )
+                    self._add_one_hot_encoded_dimensions(adaptee_dimension.name)
             else:
                 self._target.add_dimension(adaptee_dimension.copy())
 
         if self._merge_all_categorical_dimensions and self._adaptee_contains_categorical_dimensions:
-            # harvested categories for each categorical dimension in single pass across all adaptee dimensions used to compute the cross product encoding here
-            cross_product_categories = self._create_cross_product_categories(categories_list_for_ohe_init)
             self._adaptee_to_target_data_dict[self._merged_categorical_dimension_column_name] = CategoricalToOneHotEncodingAdapteeTargetMapping(
-                one_hot_encoder=OneHotEncoder(categories=[cross_product_categories], **self._one_hot_encoder_kwargs))
-            temp_df_for_fit = DataFrame({self._merged_categorical_dimension_column_name: cross_product_categories})
-            self._add_one_hot_encoded_dimensions(self._merged_categorical_dimension_column_name, temp_df_for_fit)
+                levels_per_column=levels_per_column,
+                exclude_all_missing=self.has_adaptee_been_flattened and len(levels_per_column) > 1,
+                drop=self._drop
+            )
+            self._add_one_hot_encoded_dimensions(self._merged_categorical_dimension_column_name)
 
-    def _add_one_hot_encoded_dimensions(self, adaptee_dimension_name, temp_df_for_fit: DataFrame) -> None:
+    def _add_one_hot_encoded_dimensions(self, adaptee_dimension_name) -> None:
         my_target_data = self._adaptee_to_target_data_dict[adaptee_dimension_name]
-        my_ohe_output = my_target_data.one_hot_encoder.fit_transform(temp_df_for_fit)
-        my_target_data.num_dummy_dims = my_ohe_output.shape[1]
         for i in range(my_target_data.num_dummy_dims):
             target_dim_name = f'{adaptee_dimension_name}{self.ohe_target_column_suffix}{i}'
             my_target_data.target_dims.append(target_dim_name)
             self._target.add_dimension(DiscreteDimension(name=target_dim_name, min=0, max=1))
             self._all_one_hot_encoded_target_dimension_names.append(target_dim_name)
-
-    def _create_cross_product_categories(self, categories_per_dimension) -> []:
-        num_categorical_dims = len(categories_per_dimension)
-        cross_product = np.array(np.meshgrid(*categories_per_dimension)).T.reshape(-1, num_categorical_dims)
-        temp_df = DataFrame(cross_product)
-        temp_df['concatenated_levels'] = self._concatenate_dataframe_columns(temp_df, temp_df.columns.values)
-        concatenated_levels = temp_df['concatenated_levels'].values.tolist()
-
-        # expect first element arises from 'nan' x ... x 'nan' which cannot appear in hierarchical hypergrids,
-        #  so popping this before returning the cross product list
-        if self.has_adaptee_been_flattened and num_categorical_dims > 1:
-            all_nans = self._concatenation_delim.join(['nan'] * num_categorical_dims)
-            should_be_all_nans = concatenated_levels.pop(0)
-            if should_be_all_nans != all_nans:
-                raise ValueError('Failed to find cross product of nan values when constructing OneHotEncoding with merge_all_categorical_dimensions==True')
-        return concatenated_levels
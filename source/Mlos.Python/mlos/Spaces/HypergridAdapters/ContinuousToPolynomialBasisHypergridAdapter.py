@@ -2,19 +2,56 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 #
+from functools import lru_cache
+from itertools import combinations, combinations_with_replacement
 import math
 import numpy as np
 from pandas import DataFrame
-from sklearn.preprocessing import PolynomialFeatures
 from mlos.Spaces import ContinuousDimension, Hypergrid, SimpleHypergrid
 from mlos.Spaces.HypergridAdapters.HypergridAdapter import HypergridAdapter
 from mlos.Spaces.HypergridAdapters.HierarchicalToFlatHypergridAdapter import HierarchicalToFlatHypergridAdapter
 
 
+@lru_cache(maxsize=None)
+def _polynomial_term_plan(num_features: int, degree: int, interaction_only: bool, include_bias: bool):
+    """ Returns the powers table of all polynomial terms, together with a plan to compute each term with a single product.
+
+    Terms are ordered just like sklearn's PolynomialFeatures (with order='C') orders them: by degree, and then lexicographically.
+    Each term of degree d > 0 is the product of its parent term of degree d - 1 and one of the features, so the plan consists of
+    the index of the parent term (-1 for the constant term, which may not be in the table) and of the feature (-1 for the constant term).
+
+    Plans are shared by all adapters with the same arguments, so the returned arrays are read-only.
+    """
+    make_combinations = combinations if interaction_only else combinations_with_replacement
+    terms = [
+        term
+        for term_degree in range(0 if include_bias else 1, degree + 1)
+        for term in make_combinations(range(num_features), term_degree)
+    ]
+    term_indices = {term: i for i, term in enumerate(terms)}
+
+    powers = np.zeros((len(terms), num_features), dtype=np.int64)
+    parent_term_indices = np.full(len(terms), -1, dtype=np.int64)
+    feature_indices = np.full(len(terms), -1, dtype=np.int64)
+    for i, term in enumerate(terms):
+        for feature_index in term:
+            powers[i, feature_index] += 1
+        if term:
+            parent_term_indices[i] = term_indices.get(term[:-1], -1)
+            feature_indices[i] = term[-1]
+
+    for array in (powers, parent_term_indices, feature_indices):
+        array.setflags(write=False)
+    return powers, parent_term_indices, feature_indices
+
+
 class ContinuousToPolynomialBasisHypergridAdapter(HypergridAdapter):
-    """ Adds polynomial basis function features for each continuous dimension in the adaptee hypergrid using
+    """ Adds polynomial basis function features for each continuous dimension in the adaptee hypergrid, with the same terms as
         https://scikit-learn.org/stable/modules/generated/sklearn.preprocessing.PolynomialFeatures.html.
         All non-continuous adaptee dimensions will be present in the target hypergrid.
+
+        Each term is computed by multiplying a single lower degree term by a single feature, following a plan that is
+        computed once for each combination of the number of features and the arguments below.
         Beware: Because HierarchicalHypergrids may have NaN values for some points, these NaNs will be replaced by zeros.
 
         Parameters
@@ -70,22 +107,20 @@ class ContinuousToPolynomialBasisHypergridAdapter(HypergridAdapter):
         # see definition of _get_polynomial_feature_names() for usage
         self._internal_feature_name_terminal_char = '_'
 
-        # Since sklearn PolynomialFeatures does not accept NaNs and these may appear in data frames from hierarchical hypergrids,
+        # Since NaNs would propagate to all terms they are part of and these may appear in data frames from hierarchical hypergrids,
         # the NaNs will be replaced with an imputed (finite) value.  The following sets the value used.
         self._nan_imputed_finite_value = 0
 
-        # instantiate sklearn's polynomial features instance
-        self._polynomial_features = PolynomialFeatures(**self._polynomial_features_kwargs)
-        # because the exact number of additional dimensions that will be added depends on the parameters to sklearn's PF,
-        # *and* the sklearn PF instance above doesn't determine this information until after the .fit() method is called (requiring a dataframe),
-        # *and* the target hypergrid can not be constructed without knowing the resulting number of continuous dimensions,
-        # a trivial dataframe is constructed (all 1s) and .fit_transform() of _polynomial_features instance is called.
-        trivial_continuous_dim_x = np.ones((1, self._num_dimensions_to_transform))
-        trivial_polynomial_features_y = self._polynomial_features.fit_transform(trivial_continuous_dim_x)
-        self._polynomial_features_powers = self._polynomial_features.powers_
-        self._num_polynomial_basis_dimensions_in_target = trivial_polynomial_features_y.shape[1]
+        self._polynomial_features_powers, self._parent_term_indices, self._feature_indices = _polynomial_term_plan(
+            num_features=self._num_dimensions_to_transform,
+            degree=degree,
+            interaction_only=interaction_only,
+            include_bias=include_bias
+        )
+        self._num_polynomial_basis_dimensions_in_target = self._polynomial_features_powers.shape[0]
         self._target_polynomial_feature_map = {}  # keys are target dimension names, values are index in features
         self._build_simple_hypergrid_target()
+        self._target.freeze()
 
     def _build_simple_hypergrid_target(self) -> None:
         self._target = SimpleHypergrid(
@@ -102,35 +137,12 @@ class ContinuousToPolynomialBasisHypergridAdapter(HypergridAdapter):
         if not self._adaptee_contains_dimensions_to_transform:
             return
 
-        # add new dimensions to be created by sklearn PolynomialFeatures
+        # add new dimensions for the polynomial terms
 
         # construct target dim names using adaptee dim names and polynomial feature powers matrix
-        # This logic is worked out explicitly here so we have control over the derived dimension names.
-        # Currently, the code only substitutes adaptee feature names into the default feature_names produced by
-        # sklearn's PolynomialFeatures .get_feature_names() method.
-        poly_feature_dim_names = self._get_polynomial_feature_names()
-        for i, poly_feature_name in enumerate(poly_feature_dim_names):
-            ith_terms_powers = self._polynomial_features_powers[i]
-
-            if not self._polynomial_features_kwargs['include_bias'] and ith_terms_powers.sum() == 0:
-                # the constant term is skipped
-                continue
-            else:
-                # replace adaptee dim names for poly feature name {x0_, x1_, ...} representatives
-                target_dim_name = poly_feature_name
-                for j, adaptee_dim_name in enumerate(self._adaptee_dimension_names_to_transform):
-                    adaptee_dim_power = ith_terms_powers[j]
-                    if adaptee_dim_power == 0:
-                        continue
-                    if adaptee_dim_power == 1:
-                        poly_feature_adaptee_dim_name_standin = f'x{j}{self._internal_feature_name_terminal_char}'
-                        adaptee_dim_replacement_name = adaptee_dim_name
-                    else:
-                        # power > 1 cases
-                        poly_feature_adaptee_dim_name_standin = f'x{j}{self._internal_feature_name_terminal_char}^{adaptee_dim_power}'
-                        adaptee_dim_replacement_name = f'{adaptee_dim_name}^{adaptee_dim_power}'
-
-                    target_dim_name = target_dim_name.replace(poly_feature_adaptee_dim_name_standin, adaptee_dim_replacement_name)
+        # The names follow sklearn's PolynomialFeatures .get_feature_names() format, e.g. ['1', 'x', 'y', 'x^2', 'x y', 'y^2'].
+        target_dim_names = self._get_polynomial_feature_names(self._adaptee_dimension_names_to_transform)
+        for i, target_dim_name in enumerate(target_dim_names):
             # add target dimension
             # min and max are placed at -Inf and +Inf since .random() on the target hypergrid is generated on the original
             # hypergrid and passed through the adapters.
@@ -173,14 +185,43 @@ class ContinuousToPolynomialBasisHypergridAdapter(HypergridAdapter):
     def get_num_polynomial_features(self):
         return self._polynomial_features_powers.shape[0]
 
-    def _get_polynomial_feature_names(self):
-        # The default polynomial feature feature names returned from .get_feature_names() look like: ['1', 'x0', 'x1', 'x0^2', 'x0 x1', 'x1^2']
-        # They are altered below by adding a terminal char so string substitutions don't confuse
-        # a derived feature named 'x1 x12' with another potentially derived feature named 'x10 x124'
-        replaceable_feature_names = []
-        for i in range(len(self._adaptee_dimension_names_to_transform)):
-            replaceable_feature_names.append(f'x{i}{self._internal_feature_name_terminal_char}')
-        return self._polynomial_features.get_feature_names(replaceable_feature_names)
+    def _get_polynomial_feature_names(self, feature_names=None):
+        # If no feature names are given, the names look like: ['1', 'x0_', 'x1_', 'x0_^2', 'x0_ x1_', 'x1_^2']
+        # The terminal char keeps a derived feature named 'x1_ x12_' distinct from another potentially derived feature named 'x10_ x124_'
+        if feature_names is None:
+            feature_names = [f'x{i}{self._internal_feature_name_terminal_char}' for i in range(self._num_dimensions_to_transform)]
+
+        polynomial_feature_names = []
+        for ith_terms_powers in self._polynomial_features_powers:
+            factor_names = [
+                feature_name if power == 1 else f'{feature_name}^{power}'
+                for feature_name, power in zip(feature_names, ith_terms_powers)
+                if power > 0
+            ]
+            polynomial_feature_names.append(' '.join(factor_names) if factor_names else '1')
+        return polynomial_feature_names
+
+    def _compute_polynomial_features(self, x: np.ndarray) -> np.ndarray:
+        """ Computes all polynomial terms for the rows of x, one product per term.
+
+        Products with a parent term or a feature that is zero in every row (e.g. imputed for dimensions of inactive subgrids) are skipped.
+        """
+        num_rows = x.shape[0]
+        # Fortran order keeps each term's column contiguous.
+        #
+        all_poly_features = np.zeros((num_rows, self._num_polynomial_basis_dimensions_in_target), order='F')
+        is_zero_column = np.zeros(self._num_polynomial_basis_dimensions_in_target, dtype=bool)
+        is_zero_feature = ~x.any(axis=0)
+        for i, (parent_term_index, feature_index) in enumerate(zip(self._parent_term_indices, self._feature_indices)):
+            if feature_index < 0:
+                all_poly_features[:, i] = 1
+            elif is_zero_feature[feature_index] or (parent_term_index >= 0 and is_zero_column[parent_term_index]):
+                is_zero_column[i] = True
+            elif parent_term_index < 0:
+                all_poly_features[:, i] = x[:, feature_index]
+            else:
+                np.multiply(all_poly_features[:, parent_term_index], x[:, feature_index], out=all_poly_features[:, i])
+        return all_poly_features
 
     def _project_dataframe(self, df: DataFrame, in_place=True) -> DataFrame:
         if not in_place:
@@ -197,7 +238,7 @@ class ContinuousToPolynomialBasisHypergridAdapter(HypergridAdapter):
             if dim_name in df.columns.values:
                 x_to_transform[:, i] = df[dim_name]
 
-        all_poly_features = self._polynomial_features.transform(x_to_transform)
+        all_poly_features = self._compute_polynomial_features(x_to_transform)
         for target_dim_name in self._target_polynomial_feature_map:
             target_dim_index = self._target_polynomial_feature_map[target_dim_name]
             df[target_dim_name] = all_poly_features[:, target_dim_index]
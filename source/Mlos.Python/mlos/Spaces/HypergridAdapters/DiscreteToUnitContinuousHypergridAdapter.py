@@ -3,9 +3,11 @@
 # Licensed under the MIT License.
 #
 import math
+from typing import List
 import numpy as np
 from pandas import DataFrame
 from mlos.Spaces import CategoricalDimension, ContinuousDimension, DiscreteDimension, Hypergrid, Point, SimpleHypergrid
+from mlos.Spaces.HypergridAdapters.FusedAdapterChain import ColumnPlan
 from mlos.Spaces.HypergridAdapters.HypergridAdapter import HypergridAdapter
 from mlos.Spaces.HypergridAdapters.CategoricalToDiscreteHypergridAdapter import CategoricalToDiscreteHypergridAdapter
 
@@ -18,6 +20,8 @@ class DiscreteToUnitContinuousHypergridAdapter(HypergridAdapter):
     And more importantly, unmaps the continuous values back to discrete ones.
 
     """
+    _rejects_unknown_dimensions_on_project = True
+    _rejects_unknown_dimensions_on_unproject = True
 
     def __init__(self, adaptee: Hypergrid):
         if not HypergridAdapter.is_like_simple_hypergrid(adaptee):
@@ -42,6 +46,7 @@ class DiscreteToUnitContinuousHypergridAdapter(HypergridAdapter):
 
         # Now we need to build the target hypergrid and the mappings between adaptee and target.
         self._build_simple_hypergrid_target()
+        self._target.freeze()
 
 
     @property
@@ -52,6 +57,23 @@ class DiscreteToUnitContinuousHypergridAdapter(HypergridAdapter):
     def target(self) -> Hypergrid:
         return self._target
 
+    def _fuse_column_plans(self, column_plans: List[ColumnPlan]) -> List[ColumnPlan]:
+        for column_plan in column_plans:
+            if not column_plan.is_affine_identity:
+                return None
+            adaptee_dimension = self._adaptee[column_plan.target_name]
+            if isinstance(adaptee_dimension, DiscreteDimension):
+                column_plan.offset = adaptee_dimension.min
+                column_plan.scale = len(adaptee_dimension)
+                column_plan.discrete = True
+            elif isinstance(adaptee_dimension, ContinuousDimension):
+                column_plan.offset = adaptee_dimension.min
+                column_plan.scale = adaptee_dimension.max - adaptee_dimension.min
+                column_plan.constant_zero = adaptee_dimension.min == adaptee_dimension.max
+            else:
+                return None
+        return column_plans
+
     def _project_point(self, point: Point) -> Point:
         projected_point = Point()
         for dim_name, original_dim_value in point:
@@ -93,7 +115,7 @@ class DiscreteToUnitContinuousHypergridAdapter(HypergridAdapter):
                 df[dim_name] = (df[dim_name] - adaptee_dimension.min) / len(adaptee_dimension)
             elif isinstance(adaptee_dimension, ContinuousDimension):
                 if adaptee_dimension.min == adaptee_dimension.max:
-                    df[dim_name] = 0
+                    df[dim_name] = df[dim_name].where(df[dim_name].isnull(), 0)
                 else:
                     df[dim_name] = (df[dim_name] - adaptee_dimension.min) / (adaptee_dimension.max - adaptee_dimension.min)
             else:
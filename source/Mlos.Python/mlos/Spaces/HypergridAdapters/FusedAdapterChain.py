@@ -0,0 +1,191 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import math
+from typing import List
+
+import numpy as np
+from pandas import DataFrame
+
+from mlos.Spaces.Dimensions.Dimension import Dimension
+from mlos.Spaces.Point import Point
+
+
+class ColumnPlan:
+    """ Describes how a single column of the outermost adaptee maps to a single column of the innermost target of a chain of adapters.
+
+    Projection first maps categorical values to their codes (if categories are set) and then applies:
+        projected = (value - offset) / scale
+    or sets the projected value to 0 if constant_zero is set. Null values stay null. Unprojection applies the inverse transform, flooring the value
+    if it was discrete, and finally maps codes back to categories.
+    """
+    __slots__ = ('adaptee_name', 'target_name', 'categories', 'forward_mapping', 'backward_mapping', 'offset', 'scale', 'discrete', 'constant_zero')
+
+    def __init__(self, adaptee_name: str):
+        self.adaptee_name = adaptee_name
+        self.target_name = adaptee_name
+        self.categories = None
+        self.forward_mapping = None
+        self.backward_mapping = None
+        self.offset = 0.0
+        self.scale = 1.0
+        self.discrete = False
+        self.constant_zero = False
+
+    @property
+    def is_affine_identity(self) -> bool:
+        return self.offset == 0 and self.scale == 1 and not self.discrete and not self.constant_zero
+
+    def set_categories(self, categories: list):
+        self.categories = np.empty(len(categories), dtype=object)
+        self.categories[:] = categories
+        self.forward_mapping = {value: code for code, value in enumerate(categories)}
+        self.backward_mapping = dict(enumerate(categories))
+
+    def project_value(self, value):
+        if self.categories is not None:
+            value = self.forward_mapping[value]
+        if self.constant_zero:
+            return 0
+        if self.is_affine_identity:
+            return value
+        return (value - self.offset * 1.0) / self.scale
+
+    def unproject_value(self, value):
+        if not self.is_affine_identity:
+            value = value * self.scale + self.offset
+            if self.discrete:
+                value = math.floor(value)
+        if self.categories is not None:
+            value = self.backward_mapping[value]
+        return value
+
+    def project_column(self, df: DataFrame) -> None:
+        column = df[self.target_name]
+        if self.categories is not None:
+            codes = column.map(self.forward_mapping)
+            unknown_values_mask = codes.isnull() & column.notnull()
+            if unknown_values_mask.any():
+                # Just like the CategoricalToDiscreteHypergridAdapter, let the values we don't know about through.
+                #
+                codes = codes.where(~unknown_values_mask, column)
+            column = codes
+
+        if self.constant_zero:
+            df[self.target_name] = column.where(column.isnull(), 0)
+        elif self.is_affine_identity:
+            if self.categories is not None:
+                df[self.target_name] = column
+        else:
+            df[self.target_name] = (column.to_numpy(dtype=np.float64) - self.offset) / self.scale
+
+    def unproject_column(self, df: DataFrame) -> None:
+        if self.is_affine_identity and self.categories is None:
+            return
+
+        values = df[self.target_name].to_numpy()
+        if not self.is_affine_identity:
+            values = values.astype(np.float64) * self.scale + self.offset
+            if self.discrete:
+                values = np.floor(values)
+
+        if self.categories is None:
+            null_mask = np.isnan(values)
+            if self.discrete and not null_mask.any():
+                # If there are no nulls, we must cast back to int64.
+                #
+                values = values.astype(np.int64)
+            df[self.target_name] = values
+            return
+
+        codes = values.astype(np.float64)
+        with np.errstate(invalid='ignore'):
+            known_codes_mask = (codes >= 0) & (codes < len(self.categories)) & (codes == np.floor(codes))
+        unprojected_values = values.astype(object)
+        unprojected_values[known_codes_mask] = self.categories[codes[known_codes_mask].astype(np.int64)]
+        df[self.target_name] = unprojected_values
+
+
+class FusedAdapterChain:
+    """ Projects and unprojects points and dataframes through a whole chain of adapters in a single pass.
+
+    Adapters that map each column independently (HierarchicalToFlat, CategoricalToDiscrete, DiscreteToUnitContinuous)
+    describe their transform by updating the ColumnPlans of their adaptee. HypergridAdapter.compile() composes these
+    descriptions from the innermost adaptee outwards, so that each column is renamed once and transformed by a single
+    vectorized expression instead of being copied, renamed and validated by every adapter in the chain.
+    """
+
+    def __init__(
+            self,
+            column_plans: List[ColumnPlan],
+            flattens_dimension_names: bool,
+            rejects_unknown_dimensions_on_project: bool,
+            rejects_unknown_dimensions_on_unproject: bool
+    ):
+        self.column_plans = column_plans
+        self.flattens_dimension_names = flattens_dimension_names
+        self.rejects_unknown_dimensions_on_project = rejects_unknown_dimensions_on_project
+        self.rejects_unknown_dimensions_on_unproject = rejects_unknown_dimensions_on_unproject
+
+        self._plans_by_adaptee_name = {column_plan.adaptee_name: column_plan for column_plan in column_plans}
+        self._plans_by_target_name = {column_plan.target_name: column_plan for column_plan in column_plans}
+        self._forward_name_mapping = {
+            column_plan.adaptee_name: column_plan.target_name
+            for column_plan in column_plans
+            if column_plan.adaptee_name != column_plan.target_name
+        }
+        self._backward_name_mapping = {target_name: adaptee_name for adaptee_name, target_name in self._forward_name_mapping.items()}
+
+    def project_point(self, point: Point) -> Point:
+        projected_values = {}
+        for dimension_name, value in point:
+            column_plan = self._plans_by_adaptee_name.get(dimension_name, None)
+            if column_plan is not None:
+                projected_values[column_plan.target_name] = column_plan.project_value(value)
+            elif self.rejects_unknown_dimensions_on_project:
+                raise KeyError(f"{dimension_name} is not a dimension of the adaptee.")
+            elif self.flattens_dimension_names:
+                projected_values[Dimension.flatten_dimension_name(dimension_name)] = value
+            else:
+                projected_values[dimension_name] = value
+        return Point(**projected_values)
+
+    def unproject_point(self, point: Point) -> Point:
+        unprojected_values = {}
+        for dimension_name, value in point:
+            column_plan = self._plans_by_target_name.get(dimension_name, None)
+            if column_plan is not None:
+                unprojected_values[column_plan.adaptee_name] = column_plan.unproject_value(value)
+            elif self.rejects_unknown_dimensions_on_unproject:
+                raise KeyError(f"{dimension_name} is not a dimension of the target.")
+            else:
+                unprojected_values[dimension_name] = value
+        return Point(**unprojected_values)
+
+    def project_dataframe(self, df: DataFrame, in_place: bool) -> DataFrame:
+        """ Projects the columns present in df. Just like the adapters' own _project_dataframe(), missing columns are not added.
+        """
+        if not in_place:
+            df = df.copy(deep=True)
+        if self._forward_name_mapping:
+            df.rename(columns=self._forward_name_mapping, inplace=True, copy=False)
+
+        column_names = set(df.columns.values)
+        for column_plan in self.column_plans:
+            if column_plan.target_name in column_names:
+                column_plan.project_column(df)
+        return df
+
+    def unproject_dataframe(self, df: DataFrame, in_place: bool) -> DataFrame:
+        if not in_place:
+            df = df.copy(deep=True)
+
+        column_names = set(df.columns.values)
+        for column_plan in self.column_plans:
+            if column_plan.target_name in column_names:
+                column_plan.unproject_column(df)
+
+        if self._backward_name_mapping:
+            df.rename(columns=self._backward_name_mapping, inplace=True, copy=False)
+        return df
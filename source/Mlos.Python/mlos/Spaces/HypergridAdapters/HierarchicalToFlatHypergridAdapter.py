@@ -2,9 +2,13 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 #
+import numpy as np
+from typing import List
 from pandas import DataFrame
 
-from mlos.Spaces import Dimension, Hypergrid, Point, SimpleHypergrid
+from mlos.Spaces import CategoricalDimension, CompositeDimension, ContinuousDimension, Dimension, DiscreteDimension, Hypergrid, Point, \
+    SimpleHypergrid
+from mlos.Spaces.HypergridAdapters.FusedAdapterChain import ColumnPlan
 from mlos.Spaces.HypergridAdapters.HypergridAdapter import HypergridAdapter
 
 
@@ -12,6 +16,9 @@ class HierarchicalToFlatHypergridAdapter(HypergridAdapter):
     """ Flattens a hierarchical Hypergrid object to a flat Hypergrid.
 
     """
+    _flattens_dimension_names = True
+    _rejects_unknown_dimensions_on_unproject = True
+
     def __init__(self, adaptee: Hypergrid):
         HypergridAdapter.__init__(self, name=adaptee.name, random_state=adaptee.random_state)
         self._adaptee: Hypergrid = adaptee
@@ -33,7 +40,7 @@ class HierarchicalToFlatHypergridAdapter(HypergridAdapter):
             self._target = SimpleHypergrid(
                 name=self._adaptee.name,
                 dimensions=target_dimensions
-            )
+            ).freeze()
         else:
             raise TypeError(f"Cannot build CompositeToSImpleHypergridAdapter for object of type {type(self._adaptee)}.")
 
@@ -45,6 +52,43 @@ class HierarchicalToFlatHypergridAdapter(HypergridAdapter):
     def target(self) -> Hypergrid:
         return self._target
 
+    def get_valid_rows_mask(self, flat_dataframe: DataFrame) -> np.ndarray:
+        """ Returns a boolean mask of rows of a projected dataframe whose values are either missing or within their dimension's range.
+
+        This is a vectorized, relaxed version of Hypergrid.get_valid_rows_index: it does not check that the active
+        dimensions are consistent with the values of the pivot dimensions. Rows with no values at all are invalid.
+        """
+        valid_rows_mask = np.ones(len(flat_dataframe.index), dtype=bool)
+        any_value_mask = np.zeros(len(flat_dataframe.index), dtype=bool)
+        for dimension in self._target.dimensions:
+            if dimension.name not in flat_dataframe.columns:
+                continue
+            column = flat_dataframe[dimension.name]
+            null_mask = column.isnull().to_numpy()
+            any_value_mask |= ~null_mask
+            if isinstance(dimension, CategoricalDimension):
+                in_range_mask = column.isin(dimension.values_set).to_numpy()
+            elif isinstance(dimension, ContinuousDimension):
+                values = column.to_numpy(dtype=float)
+                with np.errstate(invalid='ignore'):
+                    in_range_mask = (values >= dimension.min) if dimension.include_min else (values > dimension.min)
+                    in_range_mask &= (values <= dimension.max) if dimension.include_max else (values < dimension.max)
+            elif isinstance(dimension, DiscreteDimension):
+                values = column.to_numpy(dtype=float)
+                with np.errstate(invalid='ignore'):
+                    in_range_mask = (values >= dimension.min) & (values <= dimension.max)
+            elif isinstance(dimension, CompositeDimension):
+                in_range_mask = dimension.contains_numbers(column.to_numpy(dtype=float))
+            else:
+                in_range_mask = np.ones(len(flat_dataframe.index), dtype=bool)
+            valid_rows_mask &= null_mask | in_range_mask
+        return valid_rows_mask & any_value_mask
+
+    def _fuse_column_plans(self, column_plans: List[ColumnPlan]) -> List[ColumnPlan]:
+        for column_plan in column_plans:
+            column_plan.target_name = self._forward_name_mapping[column_plan.target_name]
+        return column_plans
+
     def _project_point(self, point: Point) -> Point:
         return point.flat_copy()
 
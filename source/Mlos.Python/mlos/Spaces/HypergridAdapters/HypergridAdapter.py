@@ -3,16 +3,27 @@
 # Licensed under the MIT License.
 #
 from abc import abstractmethod
+from typing import List
 import numpy as np
 from pandas import DataFrame
 from mlos.Spaces import Hypergrid, Point, SimpleHypergrid
+from mlos.Spaces.HypergridAdapters.FusedAdapterChain import ColumnPlan, FusedAdapterChain
 
 
 class HypergridAdapter(Hypergrid):
     """ A base class for all HypergridAdapters
 
+    Adapters that transform each column independently can describe their transform as ColumnPlans (see _fuse_column_plans).
+    If all adapters in a chain can, the chain is compiled into a single FusedAdapterChain and the public projection methods
+    go through it instead of through each adapter in turn.
     """
 
+    # Only consulted by the FusedAdapterChain, to mirror the behavior of the adapter's own point projections.
+    #
+    _flattens_dimension_names = False
+    _rejects_unknown_dimensions_on_project = False
+    _rejects_unknown_dimensions_on_unproject = False
+
     @staticmethod
     def is_like_simple_hypergrid(hypergrid):
         return isinstance(hypergrid, SimpleHypergrid) or (isinstance(hypergrid, HypergridAdapter) and isinstance(hypergrid.target, SimpleHypergrid))
@@ -20,6 +31,8 @@ class HypergridAdapter(Hypergrid):
     @abstractmethod
     def __init__(self, name=None, random_state=None):
         Hypergrid.__init__(self, name=name, random_state=random_state)
+        self._fused_adapter_chain = None
+        self._adapter_chain_compiled = False
 
     @property
     @abstractmethod
@@ -56,6 +69,10 @@ class HypergridAdapter(Hypergrid):
     def dimensions(self):
         return self.target.dimensions
 
+    @property
+    def dimension_names(self):
+        return self.target.dimension_names
+
     def get_dimensions_for_point(self, point, return_join_dimensions=True):
         return self.target.get_dimensions_for_point(point, return_join_dimensions)
 
@@ -69,18 +86,64 @@ class HypergridAdapter(Hypergrid):
     def join(self, subgrid, on_external_dimension):
         raise RuntimeError("Join operation is non-sensical for a HypergridAdapter.")
 
+    def compile(self) -> FusedAdapterChain:
+        """ Returns the FusedAdapterChain equivalent to this adapter and all of its adaptees, or None if they can't be fused.
+
+        The targets of all adapters are frozen, so the result is computed once and cached.
+        """
+        if not self._adapter_chain_compiled:
+            adapters = []
+            adaptee = self
+            while isinstance(adaptee, HypergridAdapter):
+                adapters.append(adaptee)
+                adaptee = adaptee.adaptee
+
+            column_plans = [ColumnPlan(adaptee_name=dimension.name) for dimension in adaptee.dimensions]
+            for adapter in reversed(adapters):
+                column_plans = adapter._fuse_column_plans(column_plans)  # pylint: disable=protected-access
+                if column_plans is None:
+                    break
+
+            if column_plans is not None:
+                self._fused_adapter_chain = FusedAdapterChain(
+                    column_plans=column_plans,
+                    flattens_dimension_names=any(adapter._flattens_dimension_names for adapter in adapters),  # pylint: disable=protected-access
+                    rejects_unknown_dimensions_on_project=any(adapter._rejects_unknown_dimensions_on_project for adapter in adapters),  # pylint: disable=protected-access
+                    rejects_unknown_dimensions_on_unproject=any(adapter._rejects_unknown_dimensions_on_unproject for adapter in adapters)  # pylint: disable=protected-access
+                )
+            self._adapter_chain_compiled = True
+        return self._fused_adapter_chain
+
     def project_point(self, point: Point) -> Point:
+        fused_adapter_chain = self.compile()
+        if fused_adapter_chain is not None:
+            return fused_adapter_chain.project_point(point)
+
         if isinstance(self.adaptee, HypergridAdapter):
             point = self.adaptee.project_point(point)
         return self._project_point(point)
 
     def unproject_point(self, point: Point) -> Point:
+        fused_adapter_chain = self.compile()
+        if fused_adapter_chain is not None:
+            return fused_adapter_chain.unproject_point(point)
+
         point = self._unproject_point(point)
         if isinstance(self.adaptee, HypergridAdapter):
             point = self.adaptee.unproject_point(point)
         return point
 
     def project_dataframe(self, df: DataFrame, in_place: bool = True) -> DataFrame:
+        fused_adapter_chain = self.compile()
+        if fused_adapter_chain is not None:
+            # Just like below, make sure we have all the dimensions of the innermost adaptee before projecting.
+            #
+            column_names = set(df.columns.values)
+            for column_plan in fused_adapter_chain.column_plans:
+                if column_plan.adaptee_name not in column_names:
+                    df[column_plan.adaptee_name] = np.nan
+            return fused_adapter_chain.project_dataframe(df, in_place)
+
         if isinstance(self.adaptee, HypergridAdapter):
             df = self.adaptee.project_dataframe(df, in_place)
             # If the adaptee made a copy, we can do our projection in place (on that copy)
@@ -96,6 +159,10 @@ class HypergridAdapter(Hypergrid):
         return self._project_dataframe(df, in_place)
 
     def unproject_dataframe(self, df: DataFrame, in_place: bool = True) -> DataFrame:
+        fused_adapter_chain = self.compile()
+        if fused_adapter_chain is not None:
+            return fused_adapter_chain.unproject_dataframe(df, in_place)
+
         df = self._unproject_dataframe(df, in_place)
         if isinstance(self.adaptee, HypergridAdapter):
             # If self made a copy, the adaptee can unprojecte in_place (on that copy)
@@ -131,6 +198,16 @@ class HypergridAdapter(Hypergrid):
         unprojected_point = Point.from_dataframe(unprojected_dataframe)
         return unprojected_point
 
+    def _fuse_column_plans(self, column_plans: List[ColumnPlan]) -> List[ColumnPlan]:
+        """ Updates the column plans mapping the outermost adaptee to this adapter's adaptee, so that they map to this adapter's target.
+
+        Adapters whose transforms can't be expressed as ColumnPlans return None, which disables fusing of any chain they are a part of.
+
+        :param column_plans: one ColumnPlan per dimension of the adaptee.
+        :return: one ColumnPlan per dimension of the target, or None.
+        """
+        return None
+
     @abstractmethod
     def _project_dataframe(self, df: DataFrame, in_place: bool) -> DataFrame:
         """ Projects a given dataframe from adaptee to target hypergrid.
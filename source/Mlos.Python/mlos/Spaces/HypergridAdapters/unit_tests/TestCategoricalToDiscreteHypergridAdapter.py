@@ -7,8 +7,9 @@ from numbers import Number
 import pandas as pd
 
 from mlos.Spaces import SimpleHypergrid, CategoricalDimension, ContinuousDimension, DiscreteDimension, OrdinalDimension
+from mlos.Spaces.Dimensions.Dimension import Dimension
 from mlos.Spaces.HypergridAdapters import CategoricalToDiscreteHypergridAdapter, DiscreteToUnitContinuousHypergridAdapter,\
-    HierarchicalToFlatHypergridAdapter
+    HierarchicalToFlatHypergridAdapter, HypergridAdapter
 
 class TestCategoricalToDiscreteHypergridAdapter:
 
@@ -250,9 +251,73 @@ class TestCategoricalToDiscreteHypergridAdapter:
         unprojected_df = adapter.unproject_dataframe(df=projected_df, in_place=False)
         assert original_df.equals(unprojected_df)
 
+    def test_fused_adapter_chain_matches_unfused_adapters(self):
+        """ Makes sure that projecting through the compiled chain of adapters produces the same results as going through each adapter.
 
+        :return:
+        """
+        for hypergrid in [self.simple_hypergrid, self.hierarchical_hypergrid]:
+            fused_adapter = DiscreteToUnitContinuousHypergridAdapter(adaptee=hypergrid)
+            assert fused_adapter.compile() is not None
+
+            unfused_adapter = DiscreteToUnitContinuousHypergridAdapter(adaptee=hypergrid)
+            adapter = unfused_adapter
+            while isinstance(adapter, HypergridAdapter):
+                adapter._adapter_chain_compiled = True  # pylint: disable=protected-access
+                adapter = adapter.adaptee
+            assert unfused_adapter.compile() is None
+
+            original_df = hypergrid.random_dataframe(num_samples=1000)
+            fused_projected_df = fused_adapter.project_dataframe(df=original_df, in_place=False)
+            unfused_projected_df = unfused_adapter.project_dataframe(df=original_df, in_place=False)
+            assert fused_projected_df.equals(unfused_projected_df)
+
+            fused_unprojected_df = fused_adapter.unproject_dataframe(df=fused_projected_df, in_place=False)
+            unfused_unprojected_df = unfused_adapter.unproject_dataframe(df=unfused_projected_df, in_place=False)
+            assert fused_unprojected_df.equals(unfused_unprojected_df)
+            assert original_df.equals(fused_unprojected_df)
+
+            for _ in range(100):
+                original_point = hypergrid.random()
+                projected_point = fused_adapter.project_point(original_point)
+                assert projected_point == unfused_adapter.project_point(original_point)
+                assert fused_adapter.unproject_point(projected_point) == unfused_adapter.unproject_point(projected_point)
 
+    def test_fused_adapter_chain_matches_unfused_adapters_on_partial_dataframes(self):
+        """ Makes sure that the compiled chain only projects the columns present in the dataframe, just like each adapter does.
 
+        :return:
+        """
+        hypergrid_with_constant_dimension = SimpleHypergrid(
+            name='constant_adaptee',
+            dimensions=[
+                CategoricalDimension(name='color', values=['red', 'green', 'blue']),
+                DiscreteDimension(name='one_to_ten', min=1, max=10),
+                ContinuousDimension(name='constant', min=2, max=2)
+            ]
+        )
 
-
-
+        for hypergrid in [self.simple_hypergrid, self.hierarchical_hypergrid, hypergrid_with_constant_dimension]:
+            fused_adapter = DiscreteToUnitContinuousHypergridAdapter(adaptee=hypergrid)
+            fused_adapter_chain = fused_adapter.compile()
+            assert fused_adapter_chain is not None
+
+            unfused_adapter = DiscreteToUnitContinuousHypergridAdapter(adaptee=hypergrid)
+            adapter = unfused_adapter
+            while isinstance(adapter, HypergridAdapter):
+                adapter._adapter_chain_compiled = True  # pylint: disable=protected-access
+                adapter = adapter.adaptee
+
+            original_df = hypergrid.random_dataframe(num_samples=100)
+            for dropped_column_name in original_df.columns.values:
+                partial_df = original_df.drop(columns=[dropped_column_name])
+
+                chain_projected_df = fused_adapter_chain.project_dataframe(df=partial_df, in_place=False)
+                assert len(chain_projected_df.columns) == len(partial_df.columns)
+
+                fused_projected_df = fused_adapter.project_dataframe(df=partial_df, in_place=False)
+                unfused_projected_df = unfused_adapter.project_dataframe(df=partial_df, in_place=False)
+                column_names = sorted(unfused_projected_df.columns.values)
+                assert sorted(fused_projected_df.columns.values) == column_names
+                assert fused_projected_df[column_names].equals(unfused_projected_df[column_names])
+                assert fused_projected_df[Dimension.flatten_dimension_name(dropped_column_name)].isnull().all()
@@ -5,6 +5,7 @@
 import math
 import numpy as np
 import pytest
+from sklearn.preprocessing import PolynomialFeatures
 from mlos.Spaces import SimpleHypergrid, CategoricalDimension, ContinuousDimension, DiscreteDimension, OrdinalDimension
 from mlos.OptimizerEvaluationTools.SyntheticFunctions.ThreeLevelQuadratic import ThreeLevelQuadratic
 from mlos.Spaces.HypergridAdapters import ContinuousToPolynomialBasisHypergridAdapter
@@ -117,6 +118,30 @@ class TestContinuousToPolynomialBasisHypergridAdapter:
         unprojected_in_place_df = adapter.unproject_dataframe(df=projected_in_place_df, in_place=True)
         assert original_df_with_fillna_zeros.equals(unprojected_in_place_df)
 
+    @pytest.mark.parametrize("degree", [2, 3, 5])
+    @pytest.mark.parametrize("include_bias", [True, False])
+    @pytest.mark.parametrize("interaction_only", [True, False])
+    def test_polynomial_features_match_sklearn(self, degree, interaction_only, include_bias):
+        adapter = ContinuousToPolynomialBasisHypergridAdapter(
+            adaptee=self.simple_hypergrid,
+            degree=degree,
+            interaction_only=interaction_only,
+            include_bias=include_bias
+        )
+        polynomial_features = PolynomialFeatures(degree=degree, interaction_only=interaction_only, include_bias=include_bias)
+
+        original_df = self.simple_hypergrid.random_dataframe(num_samples=100)
+        x = original_df[['z_one', 'z_two', 'z_3']].to_numpy()
+        # Zero out one of the features to exercise skipping of the terms that are known to be zero.
+        x[:, 1] = 0
+        original_df['z_two'] = 0.0
+        expected_values = polynomial_features.fit_transform(x)
+        assert (adapter.get_polynomial_feature_powers_table() == polynomial_features.powers_).all()
+
+        projected_df = adapter.project_dataframe(df=original_df, in_place=False)
+        observed_values = projected_df[adapter.get_column_names_for_polynomial_features()].to_numpy()
+        assert np.abs(expected_values - observed_values).max() < 10 ** -9
+
     @pytest.mark.parametrize("degree", [2, 3, 5])
     @pytest.mark.parametrize("interaction_only", [True, False])
     def test_point_projection_parameterized(self, degree, interaction_only):
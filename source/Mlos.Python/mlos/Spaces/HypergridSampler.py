@@ -0,0 +1,375 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+from enum import Enum
+from functools import lru_cache
+import math
+
+import numpy as np
+import pandas as pd
+
+from mlos.Spaces.Constraints import enforce_constraints
+from mlos.Spaces.Dimensions.CategoricalDimension import CategoricalDimension
+from mlos.Spaces.Dimensions.CompositeDimension import CompositeDimension
+from mlos.Spaces.Dimensions.ContinuousDimension import ContinuousDimension
+from mlos.Spaces.Dimensions.DiscreteDimension import DiscreteDimension
+
+
+class SamplingStrategy(Enum):
+    """ Strategies for drawing samples from a hypergrid.
+
+    """
+    UNIFORM_RANDOM = "uniform_random"
+    SOBOL = "sobol"
+    HALTON = "halton"
+    LATIN_HYPERCUBE = "latin_hypercube"
+
+
+class UniformRandomSequence:
+    """ Independent uniform samples from the unit hypercube.
+
+    """
+
+    def __init__(self, num_dimensions, rng: np.random.Generator):
+        self.num_dimensions = num_dimensions
+        self._rng = rng
+
+    def next(self, num_samples) -> np.ndarray:
+        return self._rng.random((num_samples, self.num_dimensions))
+
+
+class SobolSequence:
+    """ A Sobol sequence in the unit hypercube, optionally scrambled with a random linear matrix scramble and a digital shift.
+
+    Consecutive calls to next() continue the same sequence, so the union of all samples drawn so far stays well spread. The
+    first 2^m samples are balanced in every dimension.
+
+    The initial direction numbers for the first 21 dimensions are the ones published by Joe and Kuo (2008). Further dimensions
+    use the next primitive polynomials with initial direction numbers drawn from a fixed seed.
+    """
+
+    num_bits = 30
+
+    def __init__(self, num_dimensions, rng: np.random.Generator, scramble=True):
+        self.num_dimensions = num_dimensions
+        self._index = 0
+        self._direction_numbers = _sobol_direction_numbers(num_dimensions, self.num_bits)
+        self._shift = np.zeros(num_dimensions, dtype=np.int64)
+        if scramble and num_dimensions > 0:
+            self._direction_numbers = _linear_matrix_scramble(self._direction_numbers, self.num_bits, rng)
+            self._shift = rng.integers(0, 1 << self.num_bits, size=num_dimensions, dtype=np.int64)
+
+    def next(self, num_samples) -> np.ndarray:
+        if self._index + num_samples > 1 << self.num_bits:
+            raise ValueError(f"A Sobol sequence can produce at most {1 << self.num_bits} samples.")
+
+        indices = np.arange(self._index, self._index + num_samples, dtype=np.int64)
+        self._index += num_samples
+
+        # Points are produced in Gray code order: each point is the XOR of the direction numbers of the bits set in the Gray
+        # code of its index.
+        #
+        gray_codes = indices ^ (indices >> 1)
+        points = np.zeros((num_samples, self.num_dimensions), dtype=np.int64)
+        max_gray_code = int(gray_codes.max()) if num_samples > 0 else 0
+        for bit in range(max_gray_code.bit_length()):
+            bit_is_set = ((gray_codes >> bit) & 1).astype(bool)
+            points[bit_is_set] ^= self._direction_numbers[:, bit]
+        points ^= self._shift
+        return points / float(1 << self.num_bits)
+
+
+class HaltonSequence:
+    """ A Halton sequence in the unit hypercube, optionally scrambled with random digit permutations.
+
+    Dimension i uses the i-th prime as its base. Consecutive calls to next() continue the same sequence.
+    """
+
+    def __init__(self, num_dimensions, rng: np.random.Generator, scramble=True):
+        self.num_dimensions = num_dimensions
+        self.scramble = scramble
+        self._index = 0
+        self._bases = _first_primes(num_dimensions)
+        self._rng = rng
+
+        # Digit permutations are drawn lazily, as more digits are needed.
+        #
+        self._digit_permutations = [[] for _ in range(num_dimensions)]
+
+    def next(self, num_samples) -> np.ndarray:
+        indices = np.arange(self._index, self._index + num_samples, dtype=np.int64)
+        self._index += num_samples
+
+        points = np.zeros((num_samples, self.num_dimensions))
+        for dimension_index, base in enumerate(self._bases):
+            num_digits = 1
+            while base ** num_digits < self._index:
+                num_digits += 1
+            digit_permutations = self._digit_permutations[dimension_index]
+            while len(digit_permutations) < num_digits:
+                digit_permutations.append(self._rng.permutation(base) if self.scramble else np.arange(base))
+
+            # The digits are accumulated as an integer numerator, so that points fall exactly on the grid of base^num_digits.
+            #
+            numerators = np.zeros(num_samples, dtype=np.int64)
+            remaining_indices = indices.copy()
+            for digit_index, digit_permutation in enumerate(digit_permutations[:num_digits]):
+                numerators += digit_permutation[remaining_indices % base] * base ** (num_digits - 1 - digit_index)
+                remaining_indices //= base
+            points[:, dimension_index] = numerators / float(base ** num_digits)
+        return points
+
+
+class LatinHypercube:
+    """ Latin hypercube samples from the unit hypercube: each dimension is split into as many strata as there are samples and
+    each stratum holds exactly one sample.
+
+    Latin hypercubes can't be extended, so every call to next() produces a new, independent design.
+    """
+
+    def __init__(self, num_dimensions, rng: np.random.Generator):
+        self.num_dimensions = num_dimensions
+        self._rng = rng
+
+    def next(self, num_samples) -> np.ndarray:
+        strata = np.argsort(self._rng.random((num_samples, self.num_dimensions)), axis=0)
+        return (strata + self._rng.random((num_samples, self.num_dimensions))) / max(num_samples, 1)
+
+
+class HypergridSampler:
+    """ Draws samples from a SimpleHypergrid with low-discrepancy sequences.
+
+    Points from the unit hypercube are mapped onto the root dimensions of the hypergrid:
+        * continuous dimensions are scaled to their range,
+        * discrete dimensions are split into equally sized bins, one per value,
+        * ordinal and categorical dimensions are split into equally sized bins, one per value,
+        * composite dimensions are sampled uniformly at random.
+
+    Each subgrid gets its own sequence. It's sampled once for all rows in which the subgrid is active, so the number of samples
+    drawn from a subgrid is proportional to the fraction of the parent's samples that activate it.
+
+    The sampler keeps its sequences between calls to sample_dataframe(), so consecutive calls continue to fill the space
+    rather than start over.
+
+    If the hypergrid has constraints, samples that violate them are repaired or replaced according to the hypergrid's
+    constraint_repair_strategy, with replacements drawn from the same sequences.
+
+    Parameters
+    ----------
+    hypergrid : SimpleHypergrid
+        Hypergrid to sample.
+
+    sampling_strategy : SamplingStrategy
+        Sequence to draw the samples from.
+
+    seed : int
+        Seed for the scrambling of the sequences. If None, it's drawn from the random state of the hypergrid.
+    """
+
+    def __init__(self, hypergrid, sampling_strategy: SamplingStrategy = SamplingStrategy.SOBOL, seed=None):
+        self.hypergrid = hypergrid
+        self.sampling_strategy = SamplingStrategy(sampling_strategy)
+        if seed is None:
+            seed = hypergrid.random_state.getrandbits(64)
+        self._rng = np.random.default_rng(seed)
+
+        # Sequences keyed by the name of the subgrid they sample, relative to the root of the hypergrid.
+        #
+        self._sequences = dict()
+
+    def sample_dataframe(self, num_samples) -> pd.DataFrame:
+        samples_df = self._sample_dataframe_ignoring_constraints(num_samples)
+        if not self.hypergrid.has_constraints():
+            return samples_df
+        return enforce_constraints(
+            hypergrid=self.hypergrid,
+            samples_df=samples_df,
+            draw_samples=self._sample_dataframe_ignoring_constraints,
+            num_samples=num_samples,
+            rng=self._rng
+        )
+
+    def _sample_dataframe_ignoring_constraints(self, num_samples):
+        columns = self._sample_columns(hypergrid=self.hypergrid, num_samples=num_samples, subgrid_path="")
+        return pd.DataFrame(columns, index=pd.RangeIndex(num_samples))
+
+    def _get_sequence(self, subgrid_path, num_dimensions):
+        sequence = self._sequences.get(subgrid_path, None)
+        if sequence is None:
+            if self.sampling_strategy == SamplingStrategy.SOBOL:
+                sequence = SobolSequence(num_dimensions=num_dimensions, rng=self._rng)
+            elif self.sampling_strategy == SamplingStrategy.HALTON:
+                sequence = HaltonSequence(num_dimensions=num_dimensions, rng=self._rng)
+            elif self.sampling_strategy == SamplingStrategy.LATIN_HYPERCUBE:
+                sequence = LatinHypercube(num_dimensions=num_dimensions, rng=self._rng)
+            else:
+                sequence = UniformRandomSequence(num_dimensions=num_dimensions, rng=self._rng)
+            self._sequences[subgrid_path] = sequence
+        return sequence
+
+    def _sample_columns(self, hypergrid, num_samples, subgrid_path):
+        root_dimensions = hypergrid.root_dimensions
+        unit_samples = self._get_sequence(subgrid_path, len(root_dimensions)).next(num_samples)
+
+        columns = dict()
+        for dimension_index, dimension in enumerate(root_dimensions):
+            columns[dimension.name] = pd.Series(_unit_values_to_dimension_values(dimension, unit_samples[:, dimension_index]))
+
+        # Subgrids are visited in a fixed order so that a given seed always produces the same samples.
+        #
+        joined_subgrids = sorted(
+            (
+                (pivot_dimension_name, joined_subgrid)
+                for pivot_dimension_name, joined_subgrids_on_dimension in hypergrid.joined_subgrids_by_pivot_dimension.items()
+                for joined_subgrid in joined_subgrids_on_dimension
+            ),
+            key=lambda pivot_and_subgrid: (pivot_and_subgrid[0], pivot_and_subgrid[1].subgrid.name)
+        )
+        for pivot_dimension_name, joined_subgrid in joined_subgrids:
+            active_positions = np.flatnonzero(_values_in_dimension(columns[pivot_dimension_name], joined_subgrid.join_dimension))
+            if len(active_positions) == 0:
+                continue
+            subgrid = joined_subgrid.subgrid
+            subgrid_columns = self._sample_columns(
+                hypergrid=subgrid,
+                num_samples=len(active_positions),
+                subgrid_path=f"{subgrid_path}{pivot_dimension_name}/{subgrid.name}."
+            )
+            for dimension_name, values in subgrid_columns.items():
+                values.index = active_positions
+                columns[f"{subgrid.name}.{dimension_name}"] = values.reindex(pd.RangeIndex(num_samples))
+        return columns
+
+
+def _unit_values_to_dimension_values(dimension, unit_values):
+    if isinstance(dimension, ContinuousDimension):
+        if math.isinf(dimension.width):
+            raise ValueError("Cannot generate a random value from an unbounded dimension.")
+        values = dimension.min + unit_values * dimension.width
+        if not dimension.include_min:
+            values = np.maximum(values, np.nextafter(dimension.min, math.inf))
+        if not dimension.include_max:
+            values = np.minimum(values, np.nextafter(dimension.max, -math.inf))
+        return values
+
+    if isinstance(dimension, DiscreteDimension):
+        num_values = len(dimension)
+        return dimension.min + np.minimum(np.floor(unit_values * num_values).astype(np.int64), num_values - 1)
+
+    if isinstance(dimension, CategoricalDimension):
+        values = np.empty(len(dimension.values), dtype=object)
+        values[:] = dimension.values
+        indices = np.minimum(np.floor(unit_values * len(values)).astype(np.int64), len(values) - 1)
+        return pd.Series(values[indices]).infer_objects()
+
+    if isinstance(dimension, CompositeDimension):
+        return [dimension.random() for _ in range(len(unit_values))]
+
+    raise ValueError(f"Cannot sample from dimension {dimension.name} of type {type(dimension).__name__}.")
+
+
+def _values_in_dimension(values: pd.Series, dimension) -> np.ndarray:
+    if isinstance(dimension, CategoricalDimension):
+        return values.isin(dimension.values).to_numpy()
+    return np.array([value in dimension for value in values], dtype=bool)
+
+
+@lru_cache(maxsize=None)
+def _first_primes(count):
+    primes = []
+    candidate = 2
+    while len(primes) < count:
+        if all(candidate % prime != 0 for prime in primes if prime * prime <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return tuple(primes)
+
+
+# Initial direction numbers m_1 ... m_s for dimensions 2 to 21, from Joe and Kuo (2008). The primitive polynomials they go with
+# are the first 20 primitive polynomials over GF(2), in the order produced by _primitive_polynomials().
+#
+_JOE_KUO_INITIAL_DIRECTION_NUMBERS = (
+    (1,), (1, 3), (1, 3, 1), (1, 1, 1), (1, 1, 3, 3), (1, 3, 5, 13), (1, 1, 5, 5, 17), (1, 1, 5, 5, 5), (1, 1, 7, 11, 19),
+    (1, 1, 5, 1, 1), (1, 1, 1, 3, 11), (1, 3, 5, 5, 31), (1, 3, 3, 9, 7, 49), (1, 1, 1, 15, 21, 21), (1, 3, 1, 13, 27, 49),
+    (1, 1, 1, 15, 7, 5), (1, 3, 1, 15, 13, 25), (1, 1, 5, 5, 19, 61), (1, 3, 7, 11, 23, 15, 103), (1, 3, 7, 13, 13, 15, 69)
+)
+
+
+def _primitive_polynomials():
+    """ Yields (degree, coefficients) of the primitive polynomials over GF(2) by increasing degree.
+
+    The coefficients of x^(degree-1) ... x^1 are packed into an integer, most significant first.
+    """
+    degree = 1
+    while True:
+        for coefficients in range(1 << (degree - 1)):
+            if _is_primitive(degree, (1 << degree) | (coefficients << 1) | 1):
+                yield degree, coefficients
+        degree += 1
+
+
+def _is_primitive(degree, polynomial):
+    # The polynomial is primitive iff the multiplicative order of x modulo the polynomial is 2^degree - 1.
+    #
+    period = (1 << degree) - 1
+    power_of_x = 1
+    for exponent in range(1, period + 1):
+        power_of_x <<= 1
+        if power_of_x >> degree:
+            power_of_x ^= polynomial
+        if power_of_x == 1:
+            return exponent == period
+    return False
+
+
+@lru_cache(maxsize=None)
+def _sobol_direction_numbers(num_dimensions, num_bits):
+    """ Returns a read-only (num_dimensions, num_bits) array of direction numbers, as num_bits-bit integers.
+
+    """
+    direction_numbers = np.zeros((num_dimensions, num_bits), dtype=np.int64)
+    if num_dimensions == 0:
+        return direction_numbers
+
+    # The first dimension is the van der Corput sequence.
+    #
+    direction_numbers[0] = 1 << np.arange(num_bits - 1, -1, -1, dtype=np.int64)
+
+    rng = np.random.default_rng(0)
+    primitive_polynomials = _primitive_polynomials()
+    for dimension_index in range(1, num_dimensions):
+        degree, coefficients = next(primitive_polynomials)
+        if dimension_index <= len(_JOE_KUO_INITIAL_DIRECTION_NUMBERS):
+            m = list(_JOE_KUO_INITIAL_DIRECTION_NUMBERS[dimension_index - 1])
+        else:
+            m = [2 * int(rng.integers(0, 1 << i)) + 1 for i in range(degree)]
+
+        for i in range(degree, num_bits):
+            new_m = m[i - degree] ^ (m[i - degree] << degree)
+            for k in range(1, degree):
+                if (coefficients >> (degree - 1 - k)) & 1:
+                    new_m ^= m[i - k] << k
+            m.append(new_m)
+
+        for bit in range(num_bits):
+            direction_numbers[dimension_index, bit] = m[bit] << (num_bits - 1 - bit)
+
+    direction_numbers.flags.writeable = False
+    return direction_numbers
+
+
+def _linear_matrix_scramble(direction_numbers, num_bits, rng: np.random.Generator):
+    """ Multiplies the generator matrix of each dimension by a random lower triangular matrix with a unit diagonal, over GF(2).
+
+    """
+    num_dimensions = direction_numbers.shape[0]
+    shifts = np.arange(num_bits - 1, -1, -1, dtype=np.int64)
+
+    # bits[d, j, k] is the k-th most significant bit of the j-th direction number of dimension d.
+    #
+    bits = (direction_numbers[:, :, np.newaxis] >> shifts) & 1
+    lower_triangular = np.tril(rng.integers(0, 2, size=(num_dimensions, num_bits, num_bits), dtype=np.int64), k=-1)
+    lower_triangular += np.eye(num_bits, dtype=np.int64)
+    scrambled_bits = np.einsum('dok,djk->djo', lower_triangular, bits) % 2
+    return (scrambled_bits << shifts).sum(axis=2)
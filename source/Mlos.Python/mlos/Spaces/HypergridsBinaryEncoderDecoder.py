@@ -0,0 +1,458 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import base64
+from collections import OrderedDict
+import hashlib
+import struct
+from threading import Lock
+
+import numpy as np
+
+from mlos.Spaces import Dimension, EmptyDimension, CategoricalDimension, ContinuousDimension, Point, \
+    DiscreteDimension, OrdinalDimension, CompositeDimension, SimpleHypergrid, Constraint, ConstraintRepairStrategy
+
+
+# Every payload starts with the magic bytes followed by the format version.
+#
+MAGIC = b'MLHG'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<4sB')
+
+# Base64 encoding of the header, used to tell binary payloads stored as strings from JSON ones.
+#
+_STRING_PREFIX = base64.b64encode(_HEADER.pack(MAGIC, FORMAT_VERSION))[:6].decode('ascii')
+
+_UINT8 = struct.Struct('<B')
+_UINT32 = struct.Struct('<I')
+_INT64 = struct.Struct('<q')
+_FLOAT64 = struct.Struct('<d')
+
+# Type tags. Each value in a payload is prefixed by one of these.
+#
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_BIG_INT = 4
+_FLOAT = 5
+_STR = 6
+_BYTES = 7
+_LIST = 8
+_TUPLE = 9
+_DICT = 10
+_SET = 11
+_POINT = 12
+_DIMENSION = 13
+_HYPERGRID = 14
+_JOINED_SUBGRID = 15
+
+# Dimension kinds. They follow the type tag of each dimension.
+#
+_EMPTY_DIMENSION = 0
+_CONTINUOUS_DIMENSION = 1
+_DISCRETE_DIMENSION = 2
+_ORDINAL_DIMENSION = 3
+_CATEGORICAL_DIMENSION = 4
+_COMPOSITE_DIMENSION = 5
+
+_type_names_to_types = {
+    dimension_type.__name__: dimension_type
+    for dimension_type
+    in [EmptyDimension, CategoricalDimension, ContinuousDimension, DiscreteDimension, OrdinalDimension, CompositeDimension]
+}
+
+
+class HypergridBinaryEncoder:
+    """ Encodes Hypergrids, Dimensions and Points, as well as lists, tuples, sets and dicts of them, into a compact binary format.
+
+    This is a drop-in alternative to HypergridJsonEncoder for places where the payloads are large or parsed often. The layout
+    is versioned: every payload starts with a magic number and the format version.
+
+    Hypergrids are length-prefixed so that HypergridBinaryDecoder can hash their content and decode each distinct hypergrid only
+    once per process. Subgrids are written in the order of their names so that identical hypergrids always produce identical
+    bytes. Constraints, if any, follow the subgrids, so hypergrids without constraints are encoded the same as before
+    constraints existed.
+    """
+
+    @classmethod
+    def encode(cls, o) -> bytes:
+        buffer = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION))
+        cls._write_value(buffer, o)
+        return bytes(buffer)
+
+    @classmethod
+    def encode_to_string(cls, o) -> str:
+        """ Encodes o as a base64 string, for storing in text columns.
+
+        """
+        return base64.b64encode(cls.encode(o)).decode('ascii')
+
+    @classmethod
+    def content_hash(cls, hypergrid: SimpleHypergrid) -> bytes:
+        """ Returns the digest that HypergridBinaryDecoder uses to cache decoded copies of this hypergrid.
+
+        """
+        buffer = bytearray()
+        cls._write_hypergrid_body(buffer, hypergrid)
+        return _digest(buffer)
+
+    @classmethod
+    def _write_value(cls, buffer, o):
+        # pylint: disable=too-many-branches
+        if o is None:
+            buffer.append(_NONE)
+        elif isinstance(o, (bool, np.bool_)):
+            buffer.append(_TRUE if o else _FALSE)
+        elif isinstance(o, (int, np.integer)):
+            o = int(o)
+            if -2**63 <= o < 2**63:
+                buffer.append(_INT)
+                buffer += _INT64.pack(o)
+            else:
+                buffer.append(_BIG_INT)
+                cls._write_str(buffer, str(o))
+        elif isinstance(o, (float, np.floating)):
+            buffer.append(_FLOAT)
+            buffer += _FLOAT64.pack(o)
+        elif isinstance(o, str):
+            buffer.append(_STR)
+            cls._write_str(buffer, o)
+        elif isinstance(o, (bytes, bytearray)):
+            buffer.append(_BYTES)
+            buffer += _UINT32.pack(len(o))
+            buffer += o
+        elif isinstance(o, Point):
+            buffer.append(_POINT)
+            coordinates = list(o)
+            buffer += _UINT32.pack(len(coordinates))
+            for dimension_name, value in coordinates:
+                cls._write_str(buffer, dimension_name)
+                cls._write_value(buffer, value)
+        elif isinstance(o, Dimension):
+            buffer.append(_DIMENSION)
+            cls._write_dimension(buffer, o)
+        elif isinstance(o, SimpleHypergrid):
+            cls._write_hypergrid(buffer, o)
+        elif isinstance(o, SimpleHypergrid.JoinedSubgrid):
+            buffer.append(_JOINED_SUBGRID)
+            cls._write_hypergrid(buffer, o.subgrid)
+            cls._write_dimension(buffer, o.join_dimension)
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            buffer.append(_LIST if isinstance(o, list) else _TUPLE if isinstance(o, tuple) else _SET)
+            buffer += _UINT32.pack(len(o))
+            for value in o:
+                cls._write_value(buffer, value)
+        elif isinstance(o, dict):
+            buffer.append(_DICT)
+            buffer += _UINT32.pack(len(o))
+            for key, value in o.items():
+                cls._write_value(buffer, key)
+                cls._write_value(buffer, value)
+        else:
+            raise TypeError(f"Object of type {type(o).__name__} is not serializable by {cls.__name__}.")
+
+    @staticmethod
+    def _write_str(buffer, value):
+        encoded = value.encode('utf-8')
+        buffer += _UINT32.pack(len(encoded))
+        buffer += encoded
+
+    @classmethod
+    def _write_dimension(cls, buffer, dimension):
+        # The order of the checks matters: OrdinalDimension derives from CategoricalDimension.
+        #
+        if isinstance(dimension, EmptyDimension):
+            buffer.append(_EMPTY_DIMENSION)
+            cls._write_str(buffer, dimension.name)
+            cls._write_str(buffer, dimension.type.__name__)
+        elif isinstance(dimension, ContinuousDimension):
+            buffer.append(_CONTINUOUS_DIMENSION)
+            cls._write_str(buffer, dimension.name)
+            cls._write_value(buffer, dimension.min)
+            cls._write_value(buffer, dimension.max)
+            buffer.append(int(bool(dimension.include_min)) | int(bool(dimension.include_max)) << 1)
+        elif isinstance(dimension, DiscreteDimension):
+            buffer.append(_DISCRETE_DIMENSION)
+            cls._write_str(buffer, dimension.name)
+            cls._write_value(buffer, dimension.min)
+            cls._write_value(buffer, dimension.max)
+        elif isinstance(dimension, OrdinalDimension):
+            buffer.append(_ORDINAL_DIMENSION)
+            cls._write_str(buffer, dimension.name)
+            buffer.append(int(bool(dimension.ascending)))
+            cls._write_value(buffer, list(dimension.values))
+        elif isinstance(dimension, CategoricalDimension):
+            buffer.append(_CATEGORICAL_DIMENSION)
+            cls._write_str(buffer, dimension.name)
+            cls._write_value(buffer, list(dimension.values))
+        elif isinstance(dimension, CompositeDimension):
+            buffer.append(_COMPOSITE_DIMENSION)
+            cls._write_str(buffer, dimension.name)
+            cls._write_str(buffer, dimension.chunks_type.__name__)
+            chunks = list(dimension.enumerate_chunks())
+            buffer += _UINT32.pack(len(chunks))
+            for chunk in chunks:
+                cls._write_dimension(buffer, chunk)
+        else:
+            raise TypeError(f"Unsupported dimension type: {type(dimension).__name__}")
+
+    @classmethod
+    def _write_hypergrid(cls, buffer, hypergrid):
+        buffer.append(_HYPERGRID)
+        length_offset = len(buffer)
+        buffer += _UINT32.pack(0)
+        cls._write_hypergrid_body(buffer, hypergrid)
+        _UINT32.pack_into(buffer, length_offset, len(buffer) - length_offset - _UINT32.size)
+
+    @classmethod
+    def _write_hypergrid_body(cls, buffer, hypergrid):
+        cls._write_str(buffer, hypergrid.name)
+        root_dimensions = hypergrid.root_dimensions
+        buffer += _UINT32.pack(len(root_dimensions))
+        for dimension in root_dimensions:
+            cls._write_dimension(buffer, dimension)
+
+        joined_subgrids = sorted(
+            (
+                (pivot_dimension_name, joined_subgrid.subgrid.name, joined_subgrid)
+                for pivot_dimension_name, joined_subgrids_on_dimension in hypergrid.joined_subgrids_by_pivot_dimension.items()
+                for joined_subgrid in joined_subgrids_on_dimension
+            ),
+            key=lambda pivot_and_subgrid: pivot_and_subgrid[:2]
+        )
+        buffer += _UINT32.pack(len(joined_subgrids))
+        for _, _, joined_subgrid in joined_subgrids:
+            cls._write_hypergrid(buffer, joined_subgrid.subgrid)
+            cls._write_dimension(buffer, joined_subgrid.join_dimension)
+
+        constraints = hypergrid.constraints
+        if constraints:
+            cls._write_str(buffer, hypergrid.constraint_repair_strategy.value)
+            buffer += _UINT32.pack(len(constraints))
+            for constraint in constraints:
+                cls._write_str(buffer, constraint.name)
+                cls._write_str(buffer, constraint.expression)
+
+
+class HypergridBinaryDecoder:
+    """ Decodes payloads produced by HypergridBinaryEncoder.
+
+    Decoded hypergrids are cached by the hash of their encoded content, so an identical hypergrid is only decoded once per
+    process. Cached hypergrids are frozen, and all callers decoding the same content share the same instance. Callers that
+    need hypergrids of their own, e.g. to join them into other hypergrids, decode with use_cache=False.
+    """
+
+    max_cached_hypergrids = 256
+
+    _hypergrids_by_content_hash = OrderedDict()
+    _cache_lock = Lock()
+
+    @classmethod
+    def decode(cls, data, use_cache=True):
+        data = memoryview(data)
+        if len(data) < _HEADER.size:
+            raise ValueError("Payload is too short to be a binary hypergrid payload.")
+        magic, version = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Payload is not a binary hypergrid payload.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary hypergrid format version: {version}. Supported version: {FORMAT_VERSION}.")
+        value, offset = cls._read_value(data, _HEADER.size, use_cache)
+        if offset != len(data):
+            raise ValueError(f"Found {len(data) - offset} unexpected trailing bytes in binary hypergrid payload.")
+        return value
+
+    @classmethod
+    def decode_from_string(cls, string, use_cache=True):
+        return cls.decode(base64.b64decode(string), use_cache=use_cache)
+
+    @staticmethod
+    def is_binary_string(string):
+        """ Tells strings produced by HypergridBinaryEncoder.encode_to_string() from JSON strings.
+
+        """
+        return string is not None and string.startswith(_STRING_PREFIX)
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._cache_lock:
+            cls._hypergrids_by_content_hash.clear()
+
+    @classmethod
+    def _read_value(cls, data, offset, use_cache=True):
+        # pylint: disable=too-many-return-statements,too-many-branches
+        tag = data[offset]
+        offset += 1
+        if tag == _NONE:
+            return None, offset
+        if tag == _FALSE:
+            return False, offset
+        if tag == _TRUE:
+            return True, offset
+        if tag == _INT:
+            return _INT64.unpack_from(data, offset)[0], offset + _INT64.size
+        if tag == _BIG_INT:
+            value, offset = cls._read_str(data, offset)
+            return int(value), offset
+        if tag == _FLOAT:
+            return _FLOAT64.unpack_from(data, offset)[0], offset + _FLOAT64.size
+        if tag == _STR:
+            return cls._read_str(data, offset)
+        if tag == _BYTES:
+            length = _UINT32.unpack_from(data, offset)[0]
+            offset += _UINT32.size
+            return bytes(data[offset:offset + length]), offset + length
+        if tag in (_LIST, _TUPLE, _SET):
+            count = _UINT32.unpack_from(data, offset)[0]
+            offset += _UINT32.size
+            values = []
+            for _ in range(count):
+                value, offset = cls._read_value(data, offset, use_cache)
+                values.append(value)
+            if tag == _TUPLE:
+                return tuple(values), offset
+            if tag == _SET:
+                return set(values), offset
+            return values, offset
+        if tag == _DICT:
+            count = _UINT32.unpack_from(data, offset)[0]
+            offset += _UINT32.size
+            values = {}
+            for _ in range(count):
+                key, offset = cls._read_value(data, offset, use_cache)
+                values[key], offset = cls._read_value(data, offset, use_cache)
+            return values, offset
+        if tag == _POINT:
+            count = _UINT32.unpack_from(data, offset)[0]
+            offset += _UINT32.size
+            point = Point()
+            for _ in range(count):
+                dimension_name, offset = cls._read_str(data, offset)
+                point[dimension_name], offset = cls._read_value(data, offset)
+            return point, offset
+        if tag == _DIMENSION:
+            return cls._read_dimension(data, offset)
+        if tag == _HYPERGRID:
+            return cls._read_hypergrid(data, offset, use_cache=use_cache)
+        if tag == _JOINED_SUBGRID:
+            subgrid, offset = cls._read_tagged_hypergrid(data, offset)
+            join_dimension, offset = cls._read_dimension(data, offset)
+            return SimpleHypergrid.JoinedSubgrid(subgrid=subgrid, join_dimension=join_dimension), offset
+        raise ValueError(f"Unknown type tag {tag} at offset {offset - 1} of binary hypergrid payload.")
+
+    @staticmethod
+    def _read_str(data, offset):
+        length = _UINT32.unpack_from(data, offset)[0]
+        offset += _UINT32.size
+        return str(data[offset:offset + length], 'utf-8'), offset + length
+
+    @classmethod
+    def _read_dimension(cls, data, offset):
+        kind = data[offset]
+        name, offset = cls._read_str(data, offset + 1)
+        if kind == _EMPTY_DIMENSION:
+            type_name, offset = cls._read_str(data, offset)
+            return EmptyDimension(name=name, type=_type_names_to_types[type_name]), offset
+        if kind == _CONTINUOUS_DIMENSION:
+            min_value, offset = cls._read_value(data, offset)
+            max_value, offset = cls._read_value(data, offset)
+            flags = data[offset]
+            return ContinuousDimension(
+                name=name,
+                min=min_value,
+                max=max_value,
+                include_min=bool(flags & 1),
+                include_max=bool(flags & 2)
+            ), offset + 1
+        if kind == _DISCRETE_DIMENSION:
+            min_value, offset = cls._read_value(data, offset)
+            max_value, offset = cls._read_value(data, offset)
+            return DiscreteDimension(name=name, min=min_value, max=max_value), offset
+        if kind == _ORDINAL_DIMENSION:
+            ascending = bool(data[offset])
+            ordered_values, offset = cls._read_value(data, offset + 1)
+            return OrdinalDimension(name=name, ordered_values=ordered_values, ascending=ascending), offset
+        if kind == _CATEGORICAL_DIMENSION:
+            values, offset = cls._read_value(data, offset)
+            return CategoricalDimension(name=name, values=values), offset
+        if kind == _COMPOSITE_DIMENSION:
+            chunks_type_name, offset = cls._read_str(data, offset)
+            count = _UINT32.unpack_from(data, offset)[0]
+            offset += _UINT32.size
+            chunks = []
+            for _ in range(count):
+                chunk, offset = cls._read_dimension(data, offset)
+                chunks.append(chunk)
+            return CompositeDimension(name=name, chunks_type=_type_names_to_types[chunks_type_name], chunks=chunks), offset
+        raise ValueError(f"Unknown dimension kind {kind} in binary hypergrid payload.")
+
+    @classmethod
+    def _read_tagged_hypergrid(cls, data, offset):
+        if data[offset] != _HYPERGRID:
+            raise ValueError(f"Expected a hypergrid at offset {offset} of binary hypergrid payload.")
+        return cls._read_hypergrid(data, offset + 1, use_cache=False)
+
+    @classmethod
+    def _read_hypergrid(cls, data, offset, use_cache):
+        """ Reads a length-prefixed hypergrid.
+
+        Only hypergrids that are not nested in other hypergrids are cached: joining a subgrid modifies it, so subgrids can't
+        be shared between parents.
+        """
+        length = _UINT32.unpack_from(data, offset)[0]
+        offset += _UINT32.size
+        end = offset + length
+        if not use_cache:
+            return cls._read_hypergrid_body(data, offset, end), end
+
+        content_hash = _digest(data[offset:end])
+        with cls._cache_lock:
+            hypergrid = cls._hypergrids_by_content_hash.get(content_hash, None)
+            if hypergrid is not None:
+                cls._hypergrids_by_content_hash.move_to_end(content_hash)
+                return hypergrid, end
+
+        hypergrid = cls._read_hypergrid_body(data, offset, end).freeze()
+        with cls._cache_lock:
+            hypergrid = cls._hypergrids_by_content_hash.setdefault(content_hash, hypergrid)
+            while len(cls._hypergrids_by_content_hash) > cls.max_cached_hypergrids:
+                cls._hypergrids_by_content_hash.popitem(last=False)
+        return hypergrid, end
+
+    @classmethod
+    def _read_hypergrid_body(cls, data, offset, end):
+        name, offset = cls._read_str(data, offset)
+        count = _UINT32.unpack_from(data, offset)[0]
+        offset += _UINT32.size
+        dimensions = []
+        for _ in range(count):
+            dimension, offset = cls._read_dimension(data, offset)
+            dimensions.append(dimension)
+        hypergrid = SimpleHypergrid(name=name, dimensions=dimensions)
+
+        count = _UINT32.unpack_from(data, offset)[0]
+        offset += _UINT32.size
+        for _ in range(count):
+            subgrid, offset = cls._read_tagged_hypergrid(data, offset)
+            join_dimension, offset = cls._read_dimension(data, offset)
+            hypergrid.add_subgrid_on_external_dimension(other_hypergrid=subgrid, external_dimension=join_dimension)
+
+        if offset < end:
+            constraint_repair_strategy, offset = cls._read_str(data, offset)
+            hypergrid.constraint_repair_strategy = ConstraintRepairStrategy(constraint_repair_strategy)
+            count = _UINT32.unpack_from(data, offset)[0]
+            offset += _UINT32.size
+            for _ in range(count):
+                constraint_name, offset = cls._read_str(data, offset)
+                expression, offset = cls._read_str(data, offset)
+                hypergrid.add_constraint(Constraint(name=constraint_name, expression=expression))
+
+        if offset != end:
+            raise ValueError(f"Hypergrid {name} does not match its encoded length.")
+        return hypergrid
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
@@ -13,6 +13,8 @@ class Point:
     """ Models a point in a Hypergrid.
 
     """
+    __slots__ = ('dimension_value_dict',)
+
     def __init__(self, **kwargs):
         self.dimension_value_dict = dict()
         for dimension_name, value in kwargs.items():
@@ -63,7 +65,7 @@ class Point:
 
     def __setattr__(self, name, value):
         if name == "dimension_value_dict":
-            self.__dict__[name] = value
+            object.__setattr__(self, name, value)
         else:
             dimension_name = name
             subgrid_name, dimension_name_without_subgrid_name = Dimension.split_dimension_name(dimension_name)
@@ -112,11 +114,14 @@ class Point:
         return str(self.to_json(indent=2))
 
     def __getstate__(self):
-        return self.to_json()
+        return self.dimension_value_dict
 
     def __setstate__(self, state):
-        temp_point = self.from_json(state)
-        self.dimension_value_dict = temp_point.dimension_value_dict
+        if isinstance(state, str):
+            # Points used to be pickled as JSON.
+            #
+            state = self.from_json(state).dimension_value_dict
+        self.dimension_value_dict = dict(state)
 
     def to_json(self, indent=None):
         if indent is not None:
@@ -0,0 +1,129 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+from typing import Dict, Iterable, List, Type
+
+import numpy as np
+import pandas as pd
+
+from mlos.Spaces.Point import Point
+
+
+class PointBatch:
+    """ A column-wise view of a batch of points - the bulk counterpart of Point.from_dataframe() and Point.to_dataframe().
+
+    Instead of one dict per point, a PointBatch keeps one numpy array per (flattened) dimension name. Missing values are
+    represented by NaNs, just like in the dataframes produced from hierarchical hypergrids, and they are skipped when
+    individual points are materialized. Creating a PointBatch from a dataframe does not copy the data, and no Point is
+    created until one is asked for.
+
+    Dimensions of subgrids use the dotted names, so subgrid() returns a view of the points in a subgrid by selecting the
+    columns with the subgrid's prefix.
+
+    Points are materialized as instances of point_class, e.g. the BoundPoint class of the hypergrid the points belong to.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], index: pd.Index = None, point_class: Type[Point] = Point):
+        self._columns = columns
+        self._point_class = point_class
+        self._num_points = len(next(iter(columns.values()))) if columns else (len(index) if index is not None else 0)
+        assert all(len(values) == self._num_points for values in columns.values())
+        self._index = index
+
+        # Materializing points needs python scalars and null masks, both are computed once per column when first needed.
+        #
+        self._values_lists = None
+        self._null_masks = None
+
+    @classmethod
+    def from_dataframe(cls, dataframe: pd.DataFrame, point_class: Type[Point] = Point):
+        return cls(
+            columns={column_name: dataframe[column_name].to_numpy() for column_name in dataframe.columns},
+            index=dataframe.index,
+            point_class=point_class
+        )
+
+    @classmethod
+    def from_points(cls, points: Iterable[Point]):
+        """ Creates a PointBatch from an iterable of points, in a single pass and with one list per dimension.
+
+        Points don't need to have the same dimensions: NaNs are used for the values they are missing.
+        """
+        values_lists = {}
+        num_points = 0
+        for point in points:
+            for dimension_name, value in point:
+                values = values_lists.get(dimension_name, None)
+                if values is None:
+                    values = [np.nan] * num_points
+                    values_lists[dimension_name] = values
+                values.extend([np.nan] * (num_points - len(values)))
+                values.append(value)
+            num_points += 1
+
+        columns = {}
+        for dimension_name, values in values_lists.items():
+            values.extend([np.nan] * (num_points - len(values)))
+            columns[dimension_name] = pd.Series(values).to_numpy()
+        return cls(columns=columns, index=pd.RangeIndex(num_points))
+
+    def __len__(self):
+        return self._num_points
+
+    @property
+    def dimension_names(self) -> List[str]:
+        return list(self._columns.keys())
+
+    @property
+    def index(self) -> pd.Index:
+        if self._index is None:
+            self._index = pd.RangeIndex(self._num_points)
+        return self._index
+
+    def column(self, dimension_name: str) -> np.ndarray:
+        return self._columns[dimension_name]
+
+    def subgrid(self, subgrid_name: str):
+        """ Returns a view of the points in the subgrid, with the subgrid's prefix removed from the dimension names.
+
+        """
+        prefix = subgrid_name + "."
+        return PointBatch(
+            columns={
+                dimension_name[len(prefix):]: values
+                for dimension_name, values in self._columns.items()
+                if dimension_name.startswith(prefix)
+            },
+            index=self.index
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(self._columns, index=self.index)
+
+    def __getitem__(self, position: int) -> Point:
+        """ Materializes the point at the position, omitting the dimensions with missing values just like Point.from_dataframe().
+
+        """
+        if position < 0:
+            position += self._num_points
+        if not 0 <= position < self._num_points:
+            raise IndexError(f"Position {position} is out of range for a batch of {self._num_points} points.")
+        self._prepare_for_materialization()
+        return self._point_class(**{
+            dimension_name: values[position]
+            for dimension_name, values in self._values_lists.items()
+            if not self._null_masks[dimension_name][position]
+        })
+
+    def __iter__(self):
+        for position in range(self._num_points):
+            yield self[position]
+
+    def to_points(self) -> List[Point]:
+        return list(self)
+
+    def _prepare_for_materialization(self):
+        if self._values_lists is None:
+            self._null_masks = {dimension_name: pd.isnull(values) for dimension_name, values in self._columns.items()}
+            self._values_lists = {dimension_name: values.tolist() for dimension_name, values in self._columns.items()}
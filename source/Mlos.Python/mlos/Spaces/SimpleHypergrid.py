@@ -2,10 +2,17 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 #
+import numpy as np
+import pandas as pd
+
 from mlos.Exceptions import PointOutOfDomainException
+from mlos.Spaces.BoundPoint import bound_point_class, hypergrid_schema
+from mlos.Spaces.Constraints import Constraint, ConstraintRepairStrategy, constraints_mask, enforce_constraints
 from mlos.Spaces.Dimensions.Dimension import Dimension
 from mlos.Spaces.Hypergrid import Hypergrid
+from mlos.Spaces.HypergridSampler import HypergridSampler, SamplingStrategy
 from mlos.Spaces.Point import Point
+from mlos.Tracer import trace
 
 
 class SimpleHypergrid(Hypergrid):
@@ -13,6 +20,15 @@ class SimpleHypergrid(Hypergrid):
 
     Can be flat or hierarchical, depending if any join operations were performed.
 
+    Once a hypergrid is fully built, it can be frozen. A frozen hypergrid can no longer be modified, but it computes its
+    flattened dimensions, the lookup tables for its dimensions and subgrids, and the list of its joined subgrids only once
+    and shares them with all callers. It also memoizes get_dimensions_for_point() for each combination of active subgrids.
+    Freezing a hypergrid freezes all of its subgrids.
+
+    Constraints restrict the hypergrid to the points that satisfy them. They are evaluated over whole columns, and all
+    sampling methods produce only points that satisfy them, repairing or replacing invalid samples according to the
+    constraint_repair_strategy. Constraints of subgrids apply to the hypergrids they are joined into.
+
     Parameters
     ----------
     name : str
@@ -21,6 +37,9 @@ class SimpleHypergrid(Hypergrid):
     dimensions : list of Dimension
         List of dimension objects. The space is the cartesian product of these.
 
+    constraints : list of Constraint
+        Predicates that all points in the space must satisfy.
+
     """
     class JoinedSubgrid:
         """ Allows a subgrid to be joined on a dimension that's not in that subgrid.
@@ -47,10 +66,18 @@ class SimpleHypergrid(Hypergrid):
                    f"\n{self.subgrid.to_string(indent=indent+2)}" \
                    f"\n{indent_str})"
 
-    def __init__(self, name, dimensions=None, random_state=None):
+    # How many times random() draws a new point before it gives up on satisfying the constraints.
+    #
+    max_constraint_rejections = 1000
+
+    def __init__(self, name, dimensions=None, random_state=None, constraints=None):
         Hypergrid.__init__(self, name=name, random_state=random_state)
         self._dimensions = []
         self.dimensions_dict = dict()
+        self._constraints = []
+        self.constraint_repair_strategy = ConstraintRepairStrategy.PROJECT
+        self._point_class = None
+        self._frozen = False
 
         if dimensions is None:
             dimensions = []
@@ -66,16 +93,124 @@ class SimpleHypergrid(Hypergrid):
         #
         self.subgrids_by_name = dict()
 
+        if constraints is not None:
+            for constraint in constraints:
+                self.add_constraint(constraint)
+
+    @property
+    def point_class(self):
+        """ Returns the BoundPoint class for points in this hypergrid.
+
+        It's generated the first time it's needed and regenerated if dimensions or subgrids are added.
+        """
+        if self._point_class is None:
+            self._point_class = bound_point_class(hypergrid_schema(self))
+        return self._point_class
+
     def is_hierarchical(self):
         return len(self.subgrids_by_name) > 0
 
+    @property
+    def frozen(self):
+        return self._frozen
+
+    def freeze(self):
+        """ Makes the hypergrid immutable and precomputes everything that only depends on its structure.
+
+        The dimensions returned from a frozen hypergrid are shared by all callers, and must not be modified.
+
+        :return: self
+        """
+        if self._frozen:
+            return self
+
+        for subgrid in self.subgrids_by_name.values():
+            subgrid.freeze()
+
+        self._frozen_dimensions = tuple(self.dimensions)
+        self._frozen_dimension_names = tuple(dimension.name for dimension in self._frozen_dimensions)
+
+        # Maps every name accepted by __getitem__ to the dimension or subgrid it returns.
+        #
+        self._dimensions_and_subgrids_by_name = dict(self.dimensions_dict)
+        for subgrid_name, subgrid in self.subgrids_by_name.items():
+            self._dimensions_and_subgrids_by_name[subgrid_name] = subgrid
+            for name, dimension_or_subgrid in subgrid._dimensions_and_subgrids_by_name.items():  # pylint: disable=protected-access
+                self._dimensions_and_subgrids_by_name[f"{subgrid_name}.{name}"] = dimension_or_subgrid
+
+        self._frozen_joined_subgrids = tuple(self._joined_subgrids())
+        self._dimensions_for_point_cache = dict()
+        self._frozen = True
+        return self
+
+    def _assert_not_frozen(self):
+        if self._frozen:
+            raise RuntimeError(f"Hypergrid {self.name} is frozen and cannot be modified.")
+
+    def _joined_subgrids(self):
+        """ Yields (pivot dimension name, joined subgrid) pairs.
+
+        """
+        if self._frozen:
+            return self._frozen_joined_subgrids
+        return (
+            (external_dimension_name, joined_subgrid)
+            for external_dimension_name, guest_subgrids_joined_on_dimension in self.joined_subgrids_by_pivot_dimension.items()
+            for joined_subgrid in guest_subgrids_joined_on_dimension
+        )
+
     def add_dimension(self, dimension):
+        self._assert_not_frozen()
         assert isinstance(dimension, Dimension)
         assert dimension.name not in self.dimensions_dict
 
         dimension.random_state = self.random_state
         self.dimensions_dict[dimension.name] = dimension
         self._dimensions.append(dimension)
+        self._point_class = None
+
+    def add_constraint(self, constraint: Constraint):
+        """ Restricts the hypergrid to points that satisfy the constraint.
+
+        All dimensions referenced by the constraint must already be in the hypergrid or its subgrids.
+
+        :param constraint:
+        :return: self
+        """
+        self._assert_not_frozen()
+        for dimension_name in constraint.dimension_names:
+            if not isinstance(self.get(dimension_name, None), Dimension):
+                raise ValueError(f"Constraint {constraint.name} references {dimension_name}, which is not a dimension in hypergrid {self.name}.")
+        if any(existing_constraint.name == constraint.name for existing_constraint in self._constraints):
+            raise ValueError(f"Hypergrid {self.name} already has a constraint named {constraint.name}.")
+        self._constraints.append(constraint)
+        return self
+
+    @property
+    def constraints(self):
+        return list(self._constraints)
+
+    def has_constraints(self):
+        """ Returns True if this hypergrid or any of its subgrids has constraints.
+
+        """
+        return len(self._constraints) > 0 or any(subgrid.has_constraints() for subgrid in self.subgrids_by_name.values())
+
+    def enumerate_constraints(self, prefix=""):
+        """ Yields (prefix, constraint) for the constraints of this hypergrid and all of its subgrids.
+
+        Prepending the prefix to the dimension names referenced by the constraint gives the names of the columns it applies to.
+        """
+        for constraint in self._constraints:
+            yield prefix, constraint
+        for subgrid_name, subgrid in self.subgrids_by_name.items():
+            yield from subgrid.enumerate_constraints(prefix=f"{prefix}{subgrid_name}.")
+
+    def constraints_mask(self, dataframe: pd.DataFrame) -> np.ndarray:
+        """ Returns a boolean array telling which rows of the dataframe satisfy all constraints of the hypergrid and its subgrids.
+
+        """
+        return constraints_mask(list(self.enumerate_constraints()), dataframe)
 
     @property
     def random_state(self):
@@ -83,6 +218,11 @@ class SimpleHypergrid(Hypergrid):
 
     @random_state.setter
     def random_state(self, value):
+        if value is self._random_state:
+            return
+        # Frozen hypergrids can be shared (e.g. by the HypergridBinaryDecoder's cache), so their random state must not change either.
+        #
+        self._assert_not_frozen()
         self._random_state = value
         for dimension in self._dimensions:
             dimension.random_state = self._random_state
@@ -90,6 +230,13 @@ class SimpleHypergrid(Hypergrid):
             subgrid.random_state = self.random_state
 
     def __getitem__(self, dimension_or_subgrid_name):
+        if self._frozen:
+            try:
+                return self._dimensions_and_subgrids_by_name[dimension_or_subgrid_name]
+            except KeyError:
+                pass
+            raise KeyError(f"{dimension_or_subgrid_name} does not match any dimension names nor any subgrid names.")
+
         subgrid_name, name_without_subgrid_name = Dimension.split_dimension_name(dimension_or_subgrid_name)
         if subgrid_name is None:
             if name_without_subgrid_name in self.dimensions_dict.keys():
@@ -127,9 +274,15 @@ class SimpleHypergrid(Hypergrid):
             for joined_subgrid in joined_subgrids:
                 subgrid_strings.append(joined_subgrid.to_string(indent=indent))
         subgrid_string = "\n".join(subgrid_strings)
-        return root_grid_string + subgrid_string
+
+        constraints_string = ""
+        if self._constraints:
+            constraint_strings = [f"{dimensions_indent_str}{constraint}" for constraint in self._constraints]
+            constraints_string = f"\n{indent_str}Constraints:\n" + "\n".join(constraint_strings)
+        return root_grid_string + subgrid_string + constraints_string
 
     def add_subgrid_on_external_dimension(self, other_hypergrid: Hypergrid, external_dimension: Dimension):
+        self._assert_not_frozen()
         assert external_dimension.name in self.dimensions_dict, f"{self.name} does not contain dimension {external_dimension.name}"
         assert other_hypergrid.name not in self.dimensions_dict.keys(), f"{other_hypergrid.name} collides with a dimension name."
         if not self[external_dimension.name].intersects(external_dimension):
@@ -144,6 +297,7 @@ class SimpleHypergrid(Hypergrid):
         guest_subgrids_joined_on_dimension.add(SimpleHypergrid.JoinedSubgrid(subgrid=other_hypergrid, join_dimension=external_dimension))
         self.joined_subgrids_by_pivot_dimension[external_dimension.name] = guest_subgrids_joined_on_dimension
         self.subgrids_by_name[other_hypergrid.name] = other_hypergrid
+        self._point_class = None
 
     def __contains__(self, item):
         if isinstance(item, Point):
@@ -159,6 +313,7 @@ class SimpleHypergrid(Hypergrid):
         """
         if subgrid is None:
             return self
+        self._assert_not_frozen()
         assert on_external_dimension is not None
 
         if subgrid.name in self.dimensions_dict.keys():
@@ -178,6 +333,7 @@ class SimpleHypergrid(Hypergrid):
                 subgrid=subgrid,
                 on_external_dimension=external_dimension
             )
+            self._point_class = None
         return self
 
     def contains_point(self, point: Point):
@@ -202,15 +358,15 @@ class SimpleHypergrid(Hypergrid):
         if not all(point.get(dimension.name) is not None and point.get(dimension.name) in dimension for dimension in self._dimensions):
             return False
 
-        for external_dimension_name, guest_subgrids_joined_on_dimension in self.joined_subgrids_by_pivot_dimension.items():
-            for guest_subgrid in guest_subgrids_joined_on_dimension:
-                if point[external_dimension_name] in guest_subgrid.join_dimension:
-                    # We need to check if the sub_point belongs to the sub_grid
-                    #
-                    subgrid = guest_subgrid.subgrid
-                    if subgrid.name not in point or point[subgrid.name] not in subgrid:
-                        return False
-        return True
+        for external_dimension_name, guest_subgrid in self._joined_subgrids():
+            if point[external_dimension_name] in guest_subgrid.join_dimension:
+                # We need to check if the sub_point belongs to the sub_grid
+                #
+                subgrid = guest_subgrid.subgrid
+                if subgrid.name not in point or point[subgrid.name] not in subgrid:
+                    return False
+
+        return all(constraint.is_satisfied_by_point(point) for constraint in self._constraints)
 
 
     def contains_space(self, other_space):
@@ -237,23 +393,85 @@ class SimpleHypergrid(Hypergrid):
         return True
 
     def random(self, point=None):
+        if not self._constraints:
+            return self._random_ignoring_constraints(point=point, ignore_subgrid_constraints=False)
+
+        for _ in range(self.max_constraint_rejections):
+            candidate_point = self._random_ignoring_constraints(
+                point=None if point is None else point.copy(),
+                ignore_subgrid_constraints=False
+            )
+            if all(constraint.is_satisfied_by_point(candidate_point) for constraint in self._constraints):
+                return candidate_point
+        raise ValueError(f"Failed to produce a point satisfying the constraints of hypergrid {self.name} after {self.max_constraint_rejections} attempts.")
+
+    def _random_ignoring_constraints(self, point=None, ignore_subgrid_constraints=True):
         if point is None:
-            point = Point()
+            point = self.point_class()
 
         for dimension in self._dimensions:
             if dimension.name not in point:
                 point[dimension.name] = dimension.random()
 
-        for external_dimension_name, guest_subgrids_joined_on_dimension in self.joined_subgrids_by_pivot_dimension.items():
-            for joined_subgrid in guest_subgrids_joined_on_dimension:
-                if point[external_dimension_name] in joined_subgrid.join_dimension:
+        for external_dimension_name, joined_subgrid in self._joined_subgrids():
+            if point[external_dimension_name] in joined_subgrid.join_dimension:
+                if ignore_subgrid_constraints:
+                    sub_point = joined_subgrid.subgrid._random_ignoring_constraints()  # pylint: disable=protected-access
+                else:
                     sub_point = joined_subgrid.subgrid.random()
-                    point[joined_subgrid.subgrid.name] = sub_point
+                point[joined_subgrid.subgrid.name] = sub_point
 
         return point
 
+    @trace()
+    def random_dataframe(self, num_samples):
+        if not self.has_constraints():
+            return Hypergrid.random_dataframe(self, num_samples)
+
+        # Constrained samples are drawn in bulk and then repaired, rather than rejected one at a time.
+        #
+        return enforce_constraints(
+            hypergrid=self,
+            samples_df=self._random_dataframe_ignoring_constraints(num_samples),
+            draw_samples=self._random_dataframe_ignoring_constraints,
+            num_samples=num_samples,
+            rng=np.random.default_rng(self.random_state.getrandbits(64))
+        )
+
+    def _random_dataframe_ignoring_constraints(self, num_samples):
+        return pd.DataFrame([self._random_ignoring_constraints().to_dict() for _ in range(num_samples)])
+
+    @trace()
+    def get_valid_rows_index(self, original_dataframe) -> pd.Index:
+        valid_rows_index = Hypergrid.get_valid_rows_index(self, original_dataframe)
+        if self.is_hierarchical() or not self._constraints:
+            # Rows of hierarchical hypergrids are checked by contains_point(), which already evaluates the constraints.
+            #
+            return valid_rows_index
+        dataframe = original_dataframe.loc[valid_rows_index]
+        return valid_rows_index[self.constraints_mask(dataframe)]
+
+    @trace()
+    def sample_dataframe(self, num_samples, sampling_strategy: SamplingStrategy = SamplingStrategy.SOBOL):
+        """ Returns a dataframe of num_samples points drawn with the specified sampling strategy.
+
+        Low-discrepancy strategies cover the hypergrid much more evenly than random_dataframe() for the same number of samples.
+        Each call draws from freshly scrambled sequences. Use a HypergridSampler to continue the same sequences across calls.
+
+        :param num_samples:
+        :param sampling_strategy:
+        :return:
+        """
+        sampling_strategy = SamplingStrategy(sampling_strategy)
+        if sampling_strategy == SamplingStrategy.UNIFORM_RANDOM:
+            return self.random_dataframe(num_samples)
+        return HypergridSampler(hypergrid=self, sampling_strategy=sampling_strategy).sample_dataframe(num_samples)
+
     @property
     def dimensions(self):
+        if self._frozen:
+            return list(self._frozen_dimensions)
+
         dimensions = []
         for dimension in self._dimensions:
             dimensions.append(dimension)
@@ -264,6 +482,12 @@ class SimpleHypergrid(Hypergrid):
                 dimensions.append(returned_dimension)
         return dimensions
 
+    @property
+    def dimension_names(self):
+        if self._frozen:
+            return list(self._frozen_dimension_names)
+        return [dimension.name for dimension in self.dimensions]
+
     @property
     def root_dimensions(self):
         return self._dimensions
@@ -285,23 +509,43 @@ class SimpleHypergrid(Hypergrid):
         if point not in self:
             raise PointOutOfDomainException(f"Point {point} does not belong to {self}.")
 
+        if not self._frozen:
+            return self._compute_dimensions_for_point(point, return_join_dimensions)
+
+        cache_key = (return_join_dimensions, self._active_subgrids_key(point))
+        dimensions = self._dimensions_for_point_cache.get(cache_key, None)
+        if dimensions is None:
+            dimensions = self._compute_dimensions_for_point(point, return_join_dimensions)
+            self._dimensions_for_point_cache[cache_key] = dimensions
+        return list(dimensions)
+
+    def _active_subgrids_key(self, point):
+        """ Returns a hashable description of which subgrids (recursively) are active for the point.
+
+        """
+        return tuple(
+            joined_subgrid.subgrid._active_subgrids_key(point[joined_subgrid.subgrid.name])  # pylint: disable=protected-access
+            if point[external_dimension_name] in joined_subgrid.join_dimension else None
+            for external_dimension_name, joined_subgrid in self._joined_subgrids()
+        )
+
+    def _compute_dimensions_for_point(self, point, return_join_dimensions):
         dimensions_by_name = {dimension.name: dimension for dimension in self._dimensions}
         ordered_dimension_names = [dimension.name for dimension in self._dimensions]
 
-        for external_dimension_name, guest_subgrids_joined_on_dimension in self.joined_subgrids_by_pivot_dimension.items():
-            for joined_subgrid in guest_subgrids_joined_on_dimension:
-                if point[external_dimension_name] in joined_subgrid.join_dimension:
-                    # We return this narrower join dimension, since point[join_dimension_name] has
-                    # to belong to the join_dimension for all of the subgrid dimensions to make sense.
-                    #
-                    if return_join_dimensions:
-                        dimensions_by_name[external_dimension_name] = joined_subgrid.join_dimension
-                    subgrid = joined_subgrid.subgrid
-                    for dimension in subgrid.get_dimensions_for_point(point[subgrid.name], return_join_dimensions=return_join_dimensions):
-                        dimension = dimension.copy()
-                        dimension.name = f"{subgrid.name}.{dimension.name}"
-                        dimensions_by_name[dimension.name] = dimension
-                        ordered_dimension_names.append(dimension.name)
+        for external_dimension_name, joined_subgrid in self._joined_subgrids():
+            if point[external_dimension_name] in joined_subgrid.join_dimension:
+                # We return this narrower join dimension, since point[join_dimension_name] has
+                # to belong to the join_dimension for all of the subgrid dimensions to make sense.
+                #
+                if return_join_dimensions:
+                    dimensions_by_name[external_dimension_name] = joined_subgrid.join_dimension
+                subgrid = joined_subgrid.subgrid
+                for dimension in subgrid.get_dimensions_for_point(point[subgrid.name], return_join_dimensions=return_join_dimensions):
+                    dimension = dimension.copy()
+                    dimension.name = f"{subgrid.name}.{dimension.name}"
+                    dimensions_by_name[dimension.name] = dimension
+                    ordered_dimension_names.append(dimension.name)
 
         # Returning dimensions in order they were visited (mostly to make sure that root dimension names come first.
         #
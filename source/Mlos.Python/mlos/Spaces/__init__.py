@@ -10,12 +10,18 @@ from .Dimensions.OrdinalDimension import OrdinalDimension
 from .Dimensions.EmptyDimension import EmptyDimension
 from .Dimensions.CompositeDimension import CompositeDimension
 from .Dimensions import DimensionCalculator
+from .Constraints import Constraint, ConstraintRepairStrategy
 from .Hypergrid import Hypergrid
+from .HypergridSampler import HypergridSampler, SamplingStrategy
 from .SimpleHypergrid import SimpleHypergrid
 from .Point import Point
+from .BoundPoint import BoundPoint
+from .PointBatch import PointBatch
 
 __all__ = [
     "Point",
+    "BoundPoint",
+    "PointBatch",
     "Dimension",
     "EmptyDimension",
     "CategoricalDimension",
@@ -24,6 +30,10 @@ __all__ = [
     "DiscreteDimension",
     "OrdinalDimension",
     "CompositeDimension",
+    "Constraint",
+    "ConstraintRepairStrategy",
     "Hypergrid",
+    "HypergridSampler",
+    "SamplingStrategy",
     "SimpleHypergrid",
 ]
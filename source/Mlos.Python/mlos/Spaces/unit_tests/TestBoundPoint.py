@@ -0,0 +1,124 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import pickle
+
+from mlos.Spaces import BoundPoint, CategoricalDimension, DiscreteDimension, Point, SimpleHypergrid
+
+class TestBoundPoint:
+
+    def setup_method(self, method):
+        self.emergency_buffer_settings = SimpleHypergrid(
+            name='emergency_buffer_config',
+            dimensions=[
+                DiscreteDimension(name='log2_emergency_buffer_size', min=0, max=16),
+                CategoricalDimension(name='use_colors', values=[True, False])
+            ]
+        ).join(
+            subgrid=SimpleHypergrid(
+                name='emergency_buffer_color',
+                dimensions=[
+                    CategoricalDimension(name='color', values=['Maroon', 'Crimson', 'Tanager'])
+                ]
+            ),
+            on_external_dimension=CategoricalDimension(name='use_colors', values=[True])
+        )
+
+        self.hierarchical_settings = SimpleHypergrid(
+            name='communication_channel_config',
+            dimensions=[
+                DiscreteDimension(name='num_readers', min=1, max=64),
+                DiscreteDimension(name='log2_buffer_size', min=10, max=24),
+                CategoricalDimension(name='use_emergency_buffer', values=[True, False])
+            ]
+        ).join(
+            subgrid=self.emergency_buffer_settings,
+            on_external_dimension=CategoricalDimension(name='use_emergency_buffer', values=[True])
+        )
+
+    def test_random_points_behave_like_points(self):
+        for _ in range(100):
+            bound_point = self.hierarchical_settings.random()
+            assert isinstance(bound_point, BoundPoint)
+            assert bound_point in self.hierarchical_settings
+
+            point = Point(**bound_point.to_dict())
+            assert point == bound_point
+            assert bound_point == point
+            assert bound_point.to_dict() == point.to_dict()
+            for dimension_name, value in point:
+                assert dimension_name in bound_point
+                assert bound_point[dimension_name] == value
+
+            if bound_point.use_emergency_buffer:
+                assert isinstance(bound_point.emergency_buffer_config, BoundPoint)
+                assert bound_point['emergency_buffer_config.use_colors'] == bound_point.emergency_buffer_config.use_colors
+                assert ('emergency_buffer_config.emergency_buffer_color.color' in bound_point) == bound_point.emergency_buffer_config.use_colors
+            else:
+                assert 'emergency_buffer_config' not in bound_point
+                assert bound_point.get('emergency_buffer_config.use_colors', None) is None
+
+    def test_setting_values(self):
+        bound_point = self.hierarchical_settings.point_class(num_readers=1, log2_buffer_size=10)
+        bound_point.use_emergency_buffer = True
+        bound_point['emergency_buffer_config.log2_emergency_buffer_size'] = 2
+        bound_point.emergency_buffer_config = Point(log2_emergency_buffer_size=3, use_colors=False)
+        assert isinstance(bound_point.emergency_buffer_config, self.emergency_buffer_settings.point_class)
+
+        # Nested points are shared, not copied.
+        #
+        bound_point.emergency_buffer_config.use_colors = True
+        bound_point.emergency_buffer_config.emergency_buffer_color = Point(color='Crimson')
+        assert bound_point['emergency_buffer_config.use_colors']
+        assert bound_point in self.hierarchical_settings
+
+        # Dimensions outside of the hypergrid are allowed too.
+        #
+        bound_point.not_a_dimension = 'foo'
+        assert bound_point.not_a_dimension == 'foo'
+        assert bound_point.to_dict() == {
+            'num_readers': 1,
+            'log2_buffer_size': 10,
+            'use_emergency_buffer': True,
+            'emergency_buffer_config.log2_emergency_buffer_size': 3,
+            'emergency_buffer_config.use_colors': True,
+            'emergency_buffer_config.emergency_buffer_color.color': 'Crimson',
+            'not_a_dimension': 'foo'
+        }
+
+        copied_point = bound_point.copy()
+        copied_point.emergency_buffer_config.log2_emergency_buffer_size = 4
+        assert bound_point.emergency_buffer_config.log2_emergency_buffer_size == 3
+
+    def test_pickling(self):
+        points = [self.hierarchical_settings.random() for _ in range(100)]
+        unpickled_points = pickle.loads(pickle.dumps(points))
+        assert all(type(unpickled_point) is type(point) for unpickled_point, point in zip(unpickled_points, points))
+        assert unpickled_points == points
+
+        point = Point(x=1, y=Point(z='foo'))
+        assert pickle.loads(pickle.dumps(point)) == point
+
+    def test_pickling_hypergrids_with_point_classes(self):
+        point_class = self.hierarchical_settings.point_class
+        assert pickle.loads(pickle.dumps(point_class)) is point_class
+
+        unpickled_settings = pickle.loads(pickle.dumps(self.hierarchical_settings))
+        assert unpickled_settings.point_class is point_class
+        assert unpickled_settings.random() in self.hierarchical_settings
+
+    def test_point_class_is_regenerated_after_join(self):
+        flat_settings = SimpleHypergrid(
+            name='flat',
+            dimensions=[CategoricalDimension(name='use_emergency_buffer', values=[True, False])]
+        )
+        point_class = flat_settings.point_class
+        assert point_class is flat_settings.point_class
+
+        flat_settings.join(subgrid=self.emergency_buffer_settings, on_external_dimension=CategoricalDimension(name='use_emergency_buffer', values=[True]))
+        assert flat_settings.point_class is not point_class
+        point = flat_settings.random(point=None)
+        point.use_emergency_buffer = True
+        point['emergency_buffer_config.use_colors'] = False
+        assert point.emergency_buffer_config.use_colors is False
@@ -4,6 +4,7 @@
 #
 import math
 import random
+import numpy as np
 import pytest
 
 import mlos.Spaces.Dimensions.DimensionCalculator
@@ -189,6 +190,32 @@ class TestCompositeDimension:
         with pytest.raises(TypeError):
             D.intersection(C1)
 
+    def test_vectorized_membership_and_sampling(self):
+        A = ContinuousDimension(name='x', min=0, max=1)
+        B = ContinuousDimension(name='x', min=2, max=3, include_min=False)
+        C = ContinuousDimension(name='x', min=10, max=20, include_max=False)
+        composite = A.union(B).union(C)
+
+        numbers = np.array([-1, 0, 0.5, 1, 1.5, 2, 2.5, 3, 5, 10, 15, 20, 25, np.nan])
+        assert composite.contains_numbers(numbers).tolist() == [number in composite for number in numbers]
+
+        for value in composite.linspace(num=100):
+            assert value in composite
+        assert composite.copy().random_state is composite.random_state
+
+        samples = np.array([composite.random() for _ in range(1000)])
+        assert composite.contains_numbers(samples).all()
+        # The last chunk is 10 times longer than the other two, so it should get the vast majority of samples.
+        #
+        assert (samples >= 10).mean() > 0.75
+
+        D = DiscreteDimension(name='x', min=0, max=10)
+        E = DiscreteDimension(name='x', min=4, max=5)
+        discrete_composite = D - E
+        assert discrete_composite.contains_numbers(np.arange(-1, 12)).tolist() == [number in discrete_composite for number in range(-1, 12)]
+        for _ in range(100):
+            assert discrete_composite.random() in discrete_composite
+
 class TestDiscreteDimension:
 
     def setup_method(self, method):
@@ -4,6 +4,8 @@
 #
 import random
 
+import pytest
+
 from mlos.Spaces import CategoricalDimension, DiscreteDimension, Point, SimpleHypergrid
 
 class TestHierarchicalSpaces:
@@ -172,3 +174,37 @@ class TestHierarchicalSpaces:
                 )
             previous_iteration_first_pass_points = first_pass_points
 
+    def test_frozen_hypergrid(self):
+        expected_dimensions = self.hierarchical_settings.dimensions
+        expected_dimensions_for_points = dict()
+        points = [self.hierarchical_settings.random() for _ in range(100)]
+        for i, point in enumerate(points):
+            expected_dimensions_for_points[i] = self.hierarchical_settings.get_dimensions_for_point(point)
+
+        self.hierarchical_settings.freeze()
+        assert self.hierarchical_settings.frozen
+        assert self.emergency_buffer_color.frozen
+
+        dimensions = self.hierarchical_settings.dimensions
+        assert [dimension.name for dimension in dimensions] == [dimension.name for dimension in expected_dimensions]
+        assert self.hierarchical_settings.dimension_names == [dimension.name for dimension in expected_dimensions]
+        assert all(dimension == expected_dimension for dimension, expected_dimension in zip(dimensions, expected_dimensions))
+        assert self.hierarchical_settings['emergency_buffer_config.emergency_buffer_color.color'] is self.emergency_buffer_color['color']
+        assert self.hierarchical_settings['emergency_buffer_config'] is self.emergency_buffer_settings_with_color
+
+        for i, point in enumerate(points):
+            assert point in self.hierarchical_settings
+            dimensions_for_point = self.hierarchical_settings.get_dimensions_for_point(point)
+            assert [dimension.name for dimension in dimensions_for_point] == [dimension.name for dimension in expected_dimensions_for_points[i]]
+            assert all(dimension == expected_dimension for dimension, expected_dimension in zip(dimensions_for_point, expected_dimensions_for_points[i]))
+            assert self.hierarchical_settings.random() in self.hierarchical_settings
+
+        with pytest.raises(RuntimeError):
+            self.hierarchical_settings.add_dimension(DiscreteDimension(name='num_writers', min=1, max=64))
+
+        with pytest.raises(RuntimeError):
+            self.emergency_buffer_settings_with_color.join(
+                subgrid=SimpleHypergrid(name='emergency_buffer_pattern', dimensions=[CategoricalDimension(name='pattern', values=['stripes'])]),
+                on_external_dimension=CategoricalDimension(name='use_colors', values=[False])
+            )
+
@@ -0,0 +1,154 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import json
+import random
+
+import pytest
+
+from mlos.Optimizers.BayesianOptimizer import bayesian_optimizer_config_store
+from mlos.Spaces import CategoricalDimension, ContinuousDimension, DiscreteDimension, EmptyDimension, OrdinalDimension, \
+    Point, SimpleHypergrid, Constraint, ConstraintRepairStrategy
+from mlos.Spaces.HypergridsBinaryEncoderDecoder import HypergridBinaryDecoder, HypergridBinaryEncoder
+from mlos.Spaces.HypergridsJsonEncoderDecoder import HypergridJsonEncoder
+
+
+class TestHypergridBinaryEncoderDecoder:
+    """ Tests binary encoding and decoding for hypergrids, dimensions and points.
+
+    """
+
+    def setup_method(self, method):
+        HypergridBinaryDecoder.clear_cache()
+        self.hierarchical_hypergrid = SimpleHypergrid(
+            name='communication_channel_parameter_space',
+            dimensions=[
+                DiscreteDimension(name='num_readers', min=1, max=64),
+                OrdinalDimension(name='log2_buffer_size', ordered_values=[16, 14, 12, 10], ascending=False),
+                CategoricalDimension(name='use_emergency_buffer', values=[True, False])
+            ]
+        ).join(
+            subgrid=SimpleHypergrid(
+                name='emergency_buffer_config',
+                dimensions=[
+                    ContinuousDimension(name='emergency_buffer_fraction', min=0, max=0.5, include_max=False),
+                    CategoricalDimension(name='color', values=['Maroon', 'Crimson', 'Tanager'])
+                ]
+            ),
+            on_external_dimension=CategoricalDimension(name='use_emergency_buffer', values=[True])
+        )
+
+    def test_dimensions(self):
+        original_A = ContinuousDimension(name='x', min=0, max=1)
+        original_B = ContinuousDimension(name='x', min=2, max=3, include_min=False)
+        original_C = ContinuousDimension(name='x', min=2.5, max=3.5)
+        composite = original_A.union(original_B) - original_C
+        dimensions = [
+            original_A,
+            composite,
+            EmptyDimension(name="empty", type=ContinuousDimension),
+            DiscreteDimension(name='big', min=2**70, max=2**70 + 10),
+            OrdinalDimension(name='ordinal', ordered_values=['low', 'medium', 'high']),
+            CategoricalDimension(name='categorical', values=[1, 'a', True, 0.5])
+        ]
+        for dimension in dimensions:
+            decoded_dimension = HypergridBinaryDecoder.decode(HypergridBinaryEncoder.encode(dimension))
+            assert type(decoded_dimension) is type(dimension)
+            assert decoded_dimension.name == dimension.name
+            assert decoded_dimension in dimension
+            assert dimension in decoded_dimension
+
+    def test_hypergrids_and_points(self):
+        for hypergrid in [self.hierarchical_hypergrid, bayesian_optimizer_config_store.parameter_space]:
+            decoded_hypergrid = HypergridBinaryDecoder.decode(HypergridBinaryEncoder.encode(hypergrid))
+            # Subgrids joined on the same dimension are kept in a set, so only the encoding is canonical, not to_string().
+            #
+            assert HypergridBinaryEncoder.encode(decoded_hypergrid) == HypergridBinaryEncoder.encode(hypergrid)
+
+            for _ in range(100):
+                point = hypergrid.random()
+                decoded_point = HypergridBinaryDecoder.decode(HypergridBinaryEncoder.encode(point))
+                assert isinstance(decoded_point, Point)
+                assert decoded_point == point
+                assert decoded_point in decoded_hypergrid
+                assert decoded_hypergrid.random() in hypergrid
+
+    def test_containers(self):
+        payload = {
+            'optimizer_id': 7,
+            'model_versions': [1, 2],
+            'space': self.hierarchical_hypergrid,
+            'config': self.hierarchical_hypergrid.random(),
+            'flags': {True, None},
+            'bounds': (0.5, -1.25),
+            'blob': b'\x00\x01'
+        }
+        decoded_payload = HypergridBinaryDecoder.decode(HypergridBinaryEncoder.encode(payload))
+        assert decoded_payload.keys() == payload.keys()
+        assert decoded_payload['model_versions'] == [1, 2]
+        assert decoded_payload['config'] == payload['config']
+        assert decoded_payload['flags'] == {True, None}
+        assert decoded_payload['bounds'] == (0.5, -1.25)
+        assert decoded_payload['blob'] == b'\x00\x01'
+
+        payload_string = HypergridBinaryEncoder.encode_to_string(payload)
+        assert HypergridBinaryDecoder.is_binary_string(payload_string)
+        assert not HypergridBinaryDecoder.is_binary_string(json.dumps(self.hierarchical_hypergrid, cls=HypergridJsonEncoder))
+        assert HypergridBinaryDecoder.decode_from_string(payload_string)['optimizer_id'] == 7
+
+    def test_identical_hypergrids_are_decoded_once(self):
+        encoded = HypergridBinaryEncoder.encode(self.hierarchical_hypergrid)
+        assert len(encoded) < len(json.dumps(self.hierarchical_hypergrid, cls=HypergridJsonEncoder))
+
+        first = HypergridBinaryDecoder.decode(encoded)
+        second = HypergridBinaryDecoder.decode(HypergridBinaryEncoder.encode(first))
+        assert first is second
+        assert first.frozen
+        assert HypergridBinaryEncoder.content_hash(first) == HypergridBinaryEncoder.content_hash(self.hierarchical_hypergrid)
+
+        # Shared hypergrids must not be modified, not even by joining them into other hypergrids.
+        #
+        with pytest.raises(RuntimeError):
+            first.random_state = random.Random(1)
+        with pytest.raises(RuntimeError):
+            SimpleHypergrid(name='root', dimensions=[CategoricalDimension(name='x', values=[True])]).join(
+                subgrid=first,
+                on_external_dimension=CategoricalDimension(name='x', values=[True])
+            )
+
+    def test_constraints(self):
+        unconstrained_encoding = HypergridBinaryEncoder.encode(self.hierarchical_hypergrid)
+        self.hierarchical_hypergrid.add_constraint(
+            Constraint(name='small_emergency_buffer', expression='emergency_buffer_config.emergency_buffer_fraction * num_readers < 4')
+        )
+        self.hierarchical_hypergrid.constraint_repair_strategy = ConstraintRepairStrategy.RESAMPLE
+        encoded = HypergridBinaryEncoder.encode(self.hierarchical_hypergrid)
+        assert len(encoded) > len(unconstrained_encoding)
+
+        decoded_hypergrid = HypergridBinaryDecoder.decode(encoded)
+        assert [(constraint.name, constraint.expression) for constraint in decoded_hypergrid.constraints] == \
+            [(constraint.name, constraint.expression) for constraint in self.hierarchical_hypergrid.constraints]
+        assert decoded_hypergrid.constraint_repair_strategy == ConstraintRepairStrategy.RESAMPLE
+        for _ in range(100):
+            assert decoded_hypergrid.random() in self.hierarchical_hypergrid
+
+    def test_uncached_hypergrids_are_not_shared(self):
+        encoded = HypergridBinaryEncoder.encode({'space': self.hierarchical_hypergrid})
+        first = HypergridBinaryDecoder.decode(encoded, use_cache=False)['space']
+        second = HypergridBinaryDecoder.decode(encoded, use_cache=False)['space']
+        assert first is not second
+        assert not first.frozen
+        first.random_state = random.Random(1)
+        assert HypergridBinaryEncoder.encode(first) == HypergridBinaryEncoder.encode(self.hierarchical_hypergrid)
+
+    def test_invalid_payloads(self):
+        encoded = HypergridBinaryEncoder.encode(self.hierarchical_hypergrid)
+        with pytest.raises(ValueError):
+            HypergridBinaryDecoder.decode(b'JSON' + encoded[4:])
+        with pytest.raises(ValueError):
+            HypergridBinaryDecoder.decode(encoded[:4] + bytes([encoded[4] + 1]) + encoded[5:])
+        with pytest.raises(ValueError):
+            HypergridBinaryDecoder.decode(encoded + b'\x00')
+        with pytest.raises(TypeError):
+            HypergridBinaryEncoder.encode(object())
@@ -0,0 +1,128 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlos.Spaces import CategoricalDimension, Constraint, ConstraintRepairStrategy, ContinuousDimension, DiscreteDimension, \
+    Point, SamplingStrategy, SimpleHypergrid
+
+
+class TestHypergridConstraints:
+
+    def setup_method(self, method):
+        self.flat_hypergrid = SimpleHypergrid(
+            name='flat',
+            dimensions=[
+                ContinuousDimension(name='x', min=0, max=10),
+                ContinuousDimension(name='y', min=0, max=10),
+                DiscreteDimension(name='n', min=1, max=100)
+            ],
+            constraints=[
+                Constraint(name='below_diagonal', expression='y <= x'),
+                Constraint(name='small_product', expression='n * x <= 200')
+            ]
+        )
+
+        self.hierarchical_hypergrid = SimpleHypergrid(
+            name='communication_channel_config',
+            dimensions=[
+                DiscreteDimension(name='log2_buffer_size', min=10, max=20),
+                CategoricalDimension(name='use_emergency_buffer', values=[True, False])
+            ]
+        ).join(
+            subgrid=SimpleHypergrid(
+                name='emergency_buffer_config',
+                dimensions=[
+                    DiscreteDimension(name='log2_buffer_size', min=10, max=20)
+                ]
+            ),
+            on_external_dimension=CategoricalDimension(name='use_emergency_buffer', values=[True])
+        )
+        self.hierarchical_hypergrid.add_constraint(
+            Constraint(name='smaller_emergency_buffer', expression='emergency_buffer_config.log2_buffer_size < log2_buffer_size')
+        )
+
+    def test_expression_parsing(self):
+        constraint = Constraint(name='c', expression='np.sqrt(x) + abs(config.y) <= maximum(x, 1)')
+        assert constraint.dimension_names == ('config.y', 'x')
+        assert constraint.is_satisfied_by_point(Point(x=4, config=Point(y=1)))
+        assert not constraint.is_satisfied_by_point(Point(x=4, config=Point(y=3)))
+
+        # Constraints over missing dimensions don't apply, and neither do constraints over NaNs.
+        #
+        assert constraint.is_satisfied_by_point(Point(x=4))
+        assert constraint.is_satisfied_by_point(Point(x=4, config=Point(y=np.nan)))
+
+    def test_add_constraint_validates_dimension_names(self):
+        with pytest.raises(ValueError):
+            self.flat_hypergrid.add_constraint(Constraint(name='bad', expression='z < 1'))
+
+        with pytest.raises(ValueError):
+            self.flat_hypergrid.add_constraint(Constraint(name='below_diagonal', expression='x < 1'))
+
+    def test_contains_point(self):
+        assert Point(x=5, y=4, n=10) in self.flat_hypergrid
+        assert Point(x=4, y=5, n=10) not in self.flat_hypergrid
+        assert Point(x=5, y=4, n=50) not in self.flat_hypergrid
+
+        assert Point(log2_buffer_size=12, use_emergency_buffer=False) in self.hierarchical_hypergrid
+        assert Point(log2_buffer_size=12, use_emergency_buffer=True, emergency_buffer_config=Point(log2_buffer_size=11)) in self.hierarchical_hypergrid
+        assert Point(log2_buffer_size=12, use_emergency_buffer=True, emergency_buffer_config=Point(log2_buffer_size=12)) not in self.hierarchical_hypergrid
+
+    def test_constraints_mask(self):
+        dataframe = pd.DataFrame({
+            'x': [5, 4, 5, 1],
+            'y': [4, 5, 4, 0],
+            'n': [10, 10, 50, 1]
+        })
+        assert list(self.flat_hypergrid.constraints_mask(dataframe)) == [True, False, False, True]
+
+        dataframe = pd.DataFrame({
+            'log2_buffer_size': [12, 12, 12],
+            'use_emergency_buffer': [False, True, True],
+            'emergency_buffer_config.log2_buffer_size': [np.nan, 11, 12]
+        })
+        assert list(self.hierarchical_hypergrid.constraints_mask(dataframe)) == [True, True, False]
+
+    def test_filter_out_invalid_rows(self):
+        dataframe = pd.DataFrame({
+            'x': [5, 4, 5, 11],
+            'y': [4, 5, 4, 0],
+            'n': [10, 10, 50, 1]
+        })
+        valid_rows_df = self.flat_hypergrid.filter_out_invalid_rows(dataframe)
+        assert list(valid_rows_df.index) == [0]
+
+    @pytest.mark.parametrize("repair_strategy", [strategy for strategy in ConstraintRepairStrategy])
+    def test_random_dataframe_satisfies_constraints(self, repair_strategy):
+        for hypergrid in [self.flat_hypergrid, self.hierarchical_hypergrid]:
+            hypergrid.constraint_repair_strategy = repair_strategy
+            samples_df = hypergrid.random_dataframe(num_samples=1000)
+            assert len(samples_df.index) == 1000
+            assert hypergrid.constraints_mask(samples_df).all()
+            assert len(hypergrid.filter_out_invalid_rows(samples_df).index) == 1000
+
+    @pytest.mark.parametrize("repair_strategy", [strategy for strategy in ConstraintRepairStrategy])
+    @pytest.mark.parametrize("sampling_strategy", [strategy for strategy in SamplingStrategy])
+    def test_sample_dataframe_satisfies_constraints(self, repair_strategy, sampling_strategy):
+        for hypergrid in [self.flat_hypergrid, self.hierarchical_hypergrid]:
+            hypergrid.constraint_repair_strategy = repair_strategy
+            samples_df = hypergrid.sample_dataframe(num_samples=512, sampling_strategy=sampling_strategy)
+            assert len(samples_df.index) == 512
+            assert hypergrid.constraints_mask(samples_df).all()
+            assert len(hypergrid.filter_out_invalid_rows(samples_df).index) == 512
+
+    def test_random_satisfies_constraints(self):
+        for _ in range(100):
+            assert self.flat_hypergrid.random() in self.flat_hypergrid
+            assert self.hierarchical_hypergrid.random() in self.hierarchical_hypergrid
+
+    def test_unsatisfiable_constraints_raise(self):
+        self.flat_hypergrid.add_constraint(Constraint(name='impossible', expression='x > 10'))
+        with pytest.raises(ValueError):
+            self.flat_hypergrid.random()
+        with pytest.raises(ValueError):
+            self.flat_hypergrid.random_dataframe(num_samples=10)
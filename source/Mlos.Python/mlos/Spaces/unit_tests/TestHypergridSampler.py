@@ -0,0 +1,117 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlos.Spaces import CategoricalDimension, ContinuousDimension, DiscreteDimension, HypergridSampler, OrdinalDimension, \
+    Point, SamplingStrategy, SimpleHypergrid
+from mlos.Spaces.HypergridSampler import HaltonSequence, LatinHypercube, SobolSequence
+
+
+class TestHypergridSampler:
+
+    def setup_method(self, method):
+        self.flat_hypergrid = SimpleHypergrid(
+            name='flat',
+            dimensions=[
+                ContinuousDimension(name='x', min=-5, max=5, include_min=False),
+                DiscreteDimension(name='n', min=1, max=8),
+                OrdinalDimension(name='size', ordered_values=['small', 'medium', 'large', 'huge']),
+                CategoricalDimension(name='flag', values=[True, False])
+            ]
+        )
+
+        self.hierarchical_hypergrid = SimpleHypergrid(
+            name='communication_channel_config',
+            dimensions=[
+                DiscreteDimension(name='num_readers', min=1, max=64),
+                CategoricalDimension(name='use_emergency_buffer', values=[True, False])
+            ]
+        ).join(
+            subgrid=SimpleHypergrid(
+                name='emergency_buffer_config',
+                dimensions=[
+                    ContinuousDimension(name='emergency_buffer_fraction', min=0, max=0.5),
+                    CategoricalDimension(name='color', values=['Maroon', 'Crimson', 'Tanager', 'Teal'])
+                ]
+            ),
+            on_external_dimension=CategoricalDimension(name='use_emergency_buffer', values=[True])
+        )
+
+    @staticmethod
+    def assert_one_point_per_elementary_interval(points, num_bins_per_dimension):
+        bins = np.floor(points * num_bins_per_dimension).astype(int)
+        num_bins = np.prod(num_bins_per_dimension)
+        assert len(points) == num_bins
+        assert len({tuple(point_bins) for point_bins in bins}) == num_bins
+
+    @pytest.mark.parametrize('scramble', [False, True])
+    def test_sobol_sequence_is_balanced(self, scramble):
+        sequence = SobolSequence(num_dimensions=25, rng=np.random.default_rng(42), scramble=scramble)
+        points = np.concatenate([sequence.next(5), sequence.next(11), sequence.next(48)])
+        assert points.shape == (64, 25)
+        assert ((points >= 0) & (points < 1)).all()
+
+        for dimension_index in range(25):
+            self.assert_one_point_per_elementary_interval(points[:, [dimension_index]], [64])
+
+        # The first two dimensions form a (0, m, 2)-net.
+        #
+        for num_bins_in_first_dimension in [1, 2, 4, 8, 16, 32, 64]:
+            self.assert_one_point_per_elementary_interval(points[:, :2], [num_bins_in_first_dimension, 64 // num_bins_in_first_dimension])
+
+    def test_halton_sequence(self):
+        points = HaltonSequence(num_dimensions=2, rng=np.random.default_rng(42), scramble=False).next(4)
+        assert np.allclose(points[:, 0], [0, 1 / 2, 1 / 4, 3 / 4])
+        assert np.allclose(points[:, 1], [0, 1 / 3, 2 / 3, 1 / 9])
+
+        sequence = HaltonSequence(num_dimensions=3, rng=np.random.default_rng(42))
+        points = np.concatenate([sequence.next(10), sequence.next(17)])
+        assert ((points >= 0) & (points < 1)).all()
+        self.assert_one_point_per_elementary_interval(points[:, [1]], [27])
+
+    def test_latin_hypercube(self):
+        points = LatinHypercube(num_dimensions=4, rng=np.random.default_rng(42)).next(50)
+        for dimension_index in range(4):
+            self.assert_one_point_per_elementary_interval(points[:, [dimension_index]], [50])
+
+    @pytest.mark.parametrize('sampling_strategy', list(SamplingStrategy))
+    def test_samples_are_in_hypergrid(self, sampling_strategy):
+        for hypergrid in [self.flat_hypergrid, self.hierarchical_hypergrid]:
+            samples_df = hypergrid.sample_dataframe(num_samples=100, sampling_strategy=sampling_strategy)
+            assert len(samples_df.index) == 100
+            assert len(hypergrid.get_valid_rows_index(samples_df)) == 100
+            for i in range(len(samples_df.index)):
+                assert Point.from_dataframe(samples_df.iloc[[i]]) in hypergrid
+
+    def test_sobol_covers_all_values(self):
+        samples_df = self.flat_hypergrid.sample_dataframe(num_samples=8, sampling_strategy=SamplingStrategy.SOBOL)
+        assert sorted(samples_df['n']) == list(range(1, 9))
+        assert samples_df['size'].value_counts().tolist() == [2, 2, 2, 2]
+        assert samples_df['flag'].value_counts().tolist() == [4, 4]
+        assert samples_df['x'].min() > -5
+
+    def test_subgrids_are_sampled_proportionally(self):
+        sampler = HypergridSampler(hypergrid=self.hierarchical_hypergrid, sampling_strategy=SamplingStrategy.SOBOL, seed=42)
+        samples_df = pd.concat([sampler.sample_dataframe(num_samples=32), sampler.sample_dataframe(num_samples=32)], ignore_index=True)
+
+        active_rows = samples_df['use_emergency_buffer'] == True  # pylint: disable=singleton-comparison
+        assert active_rows.sum() == 32
+        assert samples_df.loc[active_rows, 'emergency_buffer_config.color'].notnull().all()
+        assert samples_df.loc[~active_rows, 'emergency_buffer_config.color'].isnull().all()
+
+        # The subgrid's own sequence continues across calls, so all of its samples together are balanced.
+        #
+        self.assert_one_point_per_elementary_interval(
+            samples_df.loc[active_rows, ['emergency_buffer_config.emergency_buffer_fraction']].to_numpy() / 0.5,
+            [32]
+        )
+        assert samples_df.loc[active_rows, 'emergency_buffer_config.color'].value_counts().tolist() == [8, 8, 8, 8]
+
+    def test_seeded_samplers_are_reproducible(self):
+        first_df = HypergridSampler(hypergrid=self.hierarchical_hypergrid, sampling_strategy=SamplingStrategy.HALTON, seed=7).sample_dataframe(20)
+        second_df = HypergridSampler(hypergrid=self.hierarchical_hypergrid, sampling_strategy=SamplingStrategy.HALTON, seed=7).sample_dataframe(20)
+        assert first_df.equals(second_df)
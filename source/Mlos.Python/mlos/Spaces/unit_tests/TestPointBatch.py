@@ -0,0 +1,70 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import numpy as np
+import pandas as pd
+
+from mlos.Spaces import CategoricalDimension, ContinuousDimension, DiscreteDimension, Point, PointBatch, SimpleHypergrid
+
+class TestPointBatch:
+
+    def setup_method(self, method):
+        self.hierarchical_hypergrid = SimpleHypergrid(
+            name='communication_channel_config',
+            dimensions=[
+                DiscreteDimension(name='num_readers', min=1, max=64),
+                CategoricalDimension(name='use_emergency_buffer', values=[True, False])
+            ]
+        ).join(
+            subgrid=SimpleHypergrid(
+                name='emergency_buffer_config',
+                dimensions=[
+                    ContinuousDimension(name='emergency_buffer_fraction', min=0, max=1),
+                    CategoricalDimension(name='color', values=['Maroon', 'Crimson', 'Tanager'])
+                ]
+            ),
+            on_external_dimension=CategoricalDimension(name='use_emergency_buffer', values=[True])
+        )
+
+    def test_round_trip_through_dataframe(self):
+        points = [self.hierarchical_hypergrid.random() for _ in range(100)]
+        point_batch = PointBatch.from_points(points)
+        assert len(point_batch) == len(points)
+
+        dataframe = point_batch.to_dataframe()
+        assert len(dataframe.index) == len(points)
+
+        for point, point_from_batch, point_from_dataframe in zip(points, point_batch, PointBatch.from_dataframe(dataframe)):
+            assert point == point_from_batch
+            assert point == point_from_dataframe
+            assert point_from_dataframe in self.hierarchical_hypergrid
+
+        point_class = self.hierarchical_hypergrid.point_class
+        for point, bound_point in zip(points, PointBatch.from_dataframe(dataframe, point_class=point_class)):
+            assert isinstance(bound_point, point_class)
+            assert point == bound_point
+
+    def test_matches_point_from_dataframe(self):
+        dataframe = self.hierarchical_hypergrid.random_dataframe(num_samples=100)
+        point_batch = PointBatch.from_dataframe(dataframe)
+        for i in range(len(dataframe.index)):
+            expected_point = Point.from_dataframe(dataframe.iloc[[i]])
+            assert point_batch[i] == expected_point
+            assert all(not isinstance(value, np.generic) for _, value in point_batch[i])
+
+    def test_subgrid_view(self):
+        dataframe = pd.DataFrame({
+            'num_readers': [1, 2],
+            'use_emergency_buffer': [True, False],
+            'emergency_buffer_config.emergency_buffer_fraction': [0.5, np.nan],
+            'emergency_buffer_config.color': ['Crimson', np.nan]
+        })
+        point_batch = PointBatch.from_dataframe(dataframe)
+        assert point_batch[1] == Point(num_readers=2, use_emergency_buffer=False)
+
+        subgrid_batch = point_batch.subgrid('emergency_buffer_config')
+        assert sorted(subgrid_batch.dimension_names) == ['color', 'emergency_buffer_fraction']
+        assert subgrid_batch[0] == Point(emergency_buffer_fraction=0.5, color='Crimson')
+        assert subgrid_batch[0] == point_batch[0].emergency_buffer_config
+        assert subgrid_batch[1] == Point()
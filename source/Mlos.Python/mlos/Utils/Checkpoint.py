@@ -0,0 +1,374 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import ast
+import io
+import json
+import mmap
+import os
+import pickle
+import struct
+from typing import Dict
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+# Every checkpoint starts with the magic bytes, the format version and the length of the entry table.
+#
+MAGIC = b'MLOSCKPT'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<8sIQ')
+
+# Entries start at multiples of this many bytes, so that arrays in memory-mapped checkpoints are suitably aligned.
+#
+_ALIGNMENT = 64
+
+# Kinds of entries.
+#
+_BYTES = 'bytes'
+_ARRAY = 'array'
+
+# Arrays smaller than this are pickled along with the object that refers to them. Storing them as entries of their own
+# costs more than it saves.
+#
+_MIN_EXTRACTED_ARRAY_BYTES = 256
+
+# Instances of these types are neither arrays nor external objects, so the pickler doesn't bother looking them up.
+#
+_PLAIN_TYPES = frozenset([type(None), bool, int, float, complex, str, bytes, tuple])
+
+
+def _aligned(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class CheckpointWriter:
+    """ Assembles a checkpoint: a versioned container of named entries, each holding either bytes or a numpy array.
+
+    Layout
+        header      - magic bytes, format version and the length of the entry table
+        entry table - JSON list with the name, kind, position and length of each entry, as well as dtype and shape of arrays
+        entries     - the bytes of each entry, aligned to 64 bytes
+
+    Arrays are stored as their raw bytes in C order. Reading them back involves no parsing, and a memory-mapped checkpoint
+    hands them out without even copying them.
+
+    If compress is set, every entry that shrinks when zlib-compressed is stored compressed, and decompressed when read.
+
+    On top of that:
+        add_dataframe() stores each column of a dataframe as an entry of its own.
+        add_object() pickles an object, but stores each numpy array it refers to as an entry of its own. Large arrays, e.g.
+        the node arrays of fitted sklearn trees or the blocks of dataframes, thus never pass through pickle.
+    """
+
+    def __init__(self, compress: bool = False, compression_level: int = 1):
+        self.compress = compress
+        self.compression_level = compression_level
+        self._entries = []
+        self._entry_names = set()
+
+    def add_bytes(self, name: str, data) -> None:
+        self._add_entry(name=name, kind=_BYTES, data=data)
+
+    def add_array(self, name: str, array: np.ndarray) -> None:
+        array = np.ascontiguousarray(array)
+        if array.dtype.hasobject:
+            raise TypeError(f"Array {name} holds Python objects, only arrays of plain data can be stored.")
+        self._add_entry(
+            name=name,
+            kind=_ARRAY,
+            data=array.reshape(-1).view(np.uint8),
+            descr=repr(np.lib.format.dtype_to_descr(array.dtype)),
+            shape=list(array.shape)
+        )
+
+    def add_dataframe(self, name: str, dataframe: pd.DataFrame) -> None:
+        """ Stores the dataframe column by column.
+
+        Columns of plain data are stored as arrays. Columns of Python objects (e.g. strings) are stored as JSON lists if
+        possible and pickled otherwise. Dataframes whose column labels are not all strings or integers are pickled as a whole.
+        """
+        if not all(isinstance(column_name, (str, int)) and not isinstance(column_name, bool) for column_name in dataframe.columns):
+            self.add_object(name=f"{name}/dataframe", obj=dataframe)
+            self.add_bytes(name=name, data=json.dumps({'pickled': True}).encode('utf-8'))
+            return
+
+        columns = []
+        for column_index, (column_name, column) in enumerate(dataframe.items()):
+            column_entry_name = f"{name}/{column_index}"
+            if isinstance(column.dtype, np.dtype) and not column.dtype.hasobject:
+                self.add_array(name=column_entry_name, array=column.to_numpy())
+                columns.append((column_name, _ARRAY))
+                continue
+            try:
+                json_values = json.dumps(column.tolist())
+            except (TypeError, ValueError):
+                self.add_object(name=column_entry_name, obj=column)
+                columns.append((column_name, 'object'))
+            else:
+                self.add_bytes(name=column_entry_name, data=json_values.encode('utf-8'))
+                columns.append((column_name, 'json'))
+
+        metadata = {'pickled': False, 'columns': columns, 'num_rows': len(dataframe.index)}
+        if isinstance(dataframe.index, pd.RangeIndex):
+            metadata['range_index'] = [dataframe.index.start, dataframe.index.stop, dataframe.index.step]
+        else:
+            self.add_object(name=f"{name}/index", obj=dataframe.index)
+        self.add_bytes(name=name, data=json.dumps(metadata).encode('utf-8'))
+
+    def add_object(self, name: str, obj, external_objects: Dict[str, object] = None) -> None:
+        """ Pickles obj, storing the numpy arrays it refers to as separate entries.
+
+        Objects in external_objects are not stored at all, only references to their keys. CheckpointReader.get_object()
+        must be given objects for the same keys.
+        """
+        stream = io.BytesIO()
+        _ArrayExtractingPickler(stream, writer=self, name=name, external_objects=external_objects).dump(obj)
+        self.add_bytes(name=name, data=stream.getbuffer())
+
+    def to_bytes(self) -> bytes:
+        return b''.join(self._serialize())
+
+    def write(self, path: str) -> None:
+        with open(path, 'wb') as checkpoint_file:
+            for chunk in self._serialize():
+                checkpoint_file.write(chunk)
+
+    def _add_entry(self, name, kind, data, **array_metadata):
+        if name in self._entry_names:
+            raise ValueError(f"Checkpoint already has an entry named {name}.")
+        self._entry_names.add(name)
+
+        data = memoryview(data).cast('B')
+        length = len(data)
+        compressed = False
+        if self.compress and length > 0:
+            compressed_data = zlib.compress(data, self.compression_level)
+            if len(compressed_data) < length:
+                data = memoryview(compressed_data)
+                compressed = True
+
+        entry = dict(name=name, kind=kind, length=length, stored_length=len(data), compressed=compressed)
+        entry.update(array_metadata)
+        self._entries.append((entry, data))
+
+    def _serialize(self):
+        offset = 0
+        table = []
+        for entry, data in self._entries:
+            offset = _aligned(offset)
+            entry['offset'] = offset
+            table.append(entry)
+            offset += len(data)
+
+        table_bytes = json.dumps(table).encode('utf-8')
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(table_bytes))
+        yield header
+        yield table_bytes
+
+        position = len(header) + len(table_bytes)
+        data_start = _aligned(position)
+        for entry, data in self._entries:
+            entry_start = data_start + entry['offset']
+            yield bytes(entry_start - position)
+            yield data
+            position = entry_start + len(data)
+
+
+class CheckpointReader:
+    """ Reads checkpoints assembled by CheckpointWriter.
+
+    The checkpoint can be any bytes-like object. CheckpointReader.open() memory-maps checkpoint files copy-on-write, so
+    arrays stored uncompressed are used in place and pages are only read from disk when they are first touched. Arrays read
+    from immutable buffers are copied, so that all arrays handed out are writable.
+
+    get_object() unpickles, so checkpoints must only be read from trusted sources.
+    """
+
+    def __init__(self, data):
+        self._buffer = memoryview(data).cast('B')
+        if len(self._buffer) < _HEADER.size:
+            raise ValueError("Data is too short to be a checkpoint.")
+        magic, version, table_length = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Data is not a checkpoint.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported checkpoint format version: {version}. Supported version: {FORMAT_VERSION}.")
+        table_end = _HEADER.size + table_length
+        table = json.loads(str(self._buffer[_HEADER.size:table_end], 'utf-8'))
+        self._data_start = _aligned(table_end)
+        self._entries_by_name = {entry['name']: entry for entry in table}
+        self._dtypes_by_descr = {}
+        for entry in table:
+            if self._data_start + entry['offset'] + entry['stored_length'] > len(self._buffer):
+                raise ValueError(f"Checkpoint is truncated: entry {entry['name']} extends past its end.")
+
+    @classmethod
+    def open(cls, path: str, use_mmap: bool = True):
+        with open(path, 'rb') as checkpoint_file:
+            if use_mmap and os.fstat(checkpoint_file.fileno()).st_size > 0:
+                data = mmap.mmap(checkpoint_file.fileno(), 0, access=mmap.ACCESS_COPY)
+            else:
+                data = checkpoint_file.read()
+        return cls(data)
+
+    @staticmethod
+    def is_checkpoint(data) -> bool:
+        """ Tells checkpoints from other payloads, e.g. plain pickles, by their first bytes.
+
+        """
+        return bytes(memoryview(data)[:len(MAGIC)]) == MAGIC
+
+    @property
+    def entry_names(self):
+        return list(self._entries_by_name)
+
+    def __contains__(self, name):
+        return name in self._entries_by_name
+
+    def get_bytes(self, name: str) -> memoryview:
+        entry = self._get_entry(name)
+        start = self._data_start + entry['offset']
+        data = self._buffer[start:start + entry['stored_length']]
+        if entry['compressed']:
+            data = memoryview(bytearray(zlib.decompress(data)))
+            if len(data) != entry['length']:
+                raise ValueError(f"Entry {name} decompressed to {len(data)} bytes, expected {entry['length']}.")
+        return data
+
+    def get_array(self, name: str) -> np.ndarray:
+        entry = self._get_entry(name, kind=_ARRAY)
+        dtype = self._dtypes_by_descr.get(entry['descr'], None)
+        if dtype is None:
+            dtype = np.lib.format.descr_to_dtype(ast.literal_eval(entry['descr']))
+            self._dtypes_by_descr[entry['descr']] = dtype
+        shape = tuple(entry['shape'])
+        if entry['length'] == 0:
+            return np.empty(shape, dtype=dtype)
+        array = np.frombuffer(self.get_bytes(name), dtype=dtype).reshape(shape)
+        if not array.flags.writeable:
+            array = array.copy()
+        return array
+
+    def get_dataframe(self, name: str) -> pd.DataFrame:
+        metadata = json.loads(str(self.get_bytes(name), 'utf-8'))
+        if metadata['pickled']:
+            return self.get_object(f"{name}/dataframe")
+
+        if 'range_index' in metadata:
+            index = pd.RangeIndex(*metadata['range_index'])
+        else:
+            index = self.get_object(f"{name}/index")
+
+        values_by_position = {}
+        for column_index, (_, kind) in enumerate(metadata['columns']):
+            column_entry_name = f"{name}/{column_index}"
+            if kind == _ARRAY:
+                values = self.get_array(column_entry_name)
+            elif kind == 'json':
+                values = np.empty(metadata['num_rows'], dtype=object)
+                values[:] = json.loads(str(self.get_bytes(column_entry_name), 'utf-8'))
+            else:
+                values = self.get_object(column_entry_name).to_numpy()
+            values_by_position[column_index] = values
+
+        dataframe = pd.DataFrame(values_by_position, index=index)
+        dataframe.columns = [column_name for column_name, _ in metadata['columns']]
+        return dataframe
+
+    def get_object(self, name: str, external_objects: Dict[str, object] = None):
+        stream = io.BytesIO(self.get_bytes(name))
+        return _ArrayInjectingUnpickler(stream, reader=self, name=name, external_objects=external_objects).load()
+
+    def _get_entry(self, name, kind=None):
+        entry = self._entries_by_name.get(name, None)
+        if entry is None:
+            raise KeyError(f"Checkpoint has no entry named {name}.")
+        if kind is not None and entry['kind'] != kind:
+            raise ValueError(f"Entry {name} holds {entry['kind']}, not {kind}.")
+        return entry
+
+
+def dumps_object(obj, compress: bool = False) -> bytes:
+    """ Returns a checkpoint holding only obj.
+
+    """
+    writer = CheckpointWriter(compress=compress)
+    writer.add_object(name='object', obj=obj)
+    return writer.to_bytes()
+
+
+def loads_object(data):
+    """ Returns the object in a checkpoint produced by dumps_object().
+
+    """
+    return CheckpointReader(data).get_object('object')
+
+
+class _ArrayExtractingPickler(pickle.Pickler):
+    """ Stores numpy arrays as checkpoint entries and references to them in the pickle.
+
+    """
+
+    def __init__(self, file, writer: CheckpointWriter, name: str, external_objects: Dict[str, object] = None):
+        pickle.Pickler.__init__(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._writer = writer
+        self._name = name
+        self._external_object_keys_by_id = {
+            id(external_object): key
+            for key, external_object in (external_objects or {}).items()
+            if external_object is not None
+        }
+
+        # The arrays are kept alive until pickling is done, so that their ids remain unique.
+        #
+        self._array_indices_by_id = {}
+        self._arrays = []
+
+    def persistent_id(self, obj):  # pylint: disable=method-hidden
+        obj_type = type(obj)
+        if obj_type in _PLAIN_TYPES:
+            return None
+        if obj_type is np.ndarray:
+            if obj.dtype.hasobject or obj.nbytes < _MIN_EXTRACTED_ARRAY_BYTES:
+                return None
+            array_index = self._array_indices_by_id.get(id(obj), None)
+            if array_index is None:
+                array_index = len(self._arrays)
+                self._writer.add_array(name=f"{self._name}/{array_index}", array=obj)
+                self._array_indices_by_id[id(obj)] = array_index
+                self._arrays.append(obj)
+            return _ARRAY, array_index
+
+        key = self._external_object_keys_by_id.get(id(obj), None)
+        if key is not None:
+            return 'external', key
+        return None
+
+
+class _ArrayInjectingUnpickler(pickle.Unpickler):
+    """ Resolves the references left by _ArrayExtractingPickler.
+
+    """
+
+    def __init__(self, file, reader: CheckpointReader, name: str, external_objects: Dict[str, object] = None):
+        pickle.Unpickler.__init__(self, file)
+        self._reader = reader
+        self._name = name
+        self._external_objects = external_objects or {}
+        self._arrays_by_index = {}
+
+    def persistent_load(self, pid):  # pylint: disable=method-hidden
+        kind, key = pid
+        if kind == _ARRAY:
+            array = self._arrays_by_index.get(key, None)
+            if array is None:
+                array = self._reader.get_array(f"{self._name}/{key}")
+                self._arrays_by_index[key] = array
+            return array
+        if kind == 'external' and key in self._external_objects:
+            return self._external_objects[key]
+        raise pickle.UnpicklingError(f"Unresolved reference to {kind} {key} in entry {self._name}.")
@@ -0,0 +1,91 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+from contextlib import contextmanager
+import threading
+
+
+class ReaderWriterLock:
+    """A lock that can be held by any number of readers or by a single writer.
+
+    Writers are preferred: once a writer is waiting, new readers wait until it's done, so a steady stream of readers
+    cannot starve writers.
+
+    The writer lock is reentrant and the thread holding it may also acquire the reader lock. The reader lock is not
+    reentrant: a thread that acquires it twice deadlocks if a writer starts waiting in between.
+
+    try_writer() acquires the writer lock only if nobody, including the calling thread, holds the lock.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._num_active_readers = 0
+        self._num_waiting_writers = 0
+        self._writer_thread_id = None
+        self._writer_depth = 0
+
+    @contextmanager
+    def reader(self):
+        if self._writer_thread_id == threading.get_ident():
+            # The writer may read what it is writing.
+            #
+            yield
+            return
+
+        with self._condition:
+            while self._writer_thread_id is not None or self._num_waiting_writers > 0:
+                self._condition.wait()
+            self._num_active_readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._num_active_readers -= 1
+                if self._num_active_readers == 0:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def writer(self):
+        thread_id = threading.get_ident()
+        with self._condition:
+            if self._writer_thread_id == thread_id:
+                self._writer_depth += 1
+            else:
+                self._num_waiting_writers += 1
+                try:
+                    while self._writer_thread_id is not None or self._num_active_readers > 0:
+                        self._condition.wait()
+                finally:
+                    self._num_waiting_writers -= 1
+                self._writer_thread_id = thread_id
+                self._writer_depth = 1
+        try:
+            yield
+        finally:
+            self._release_writer()
+
+    @contextmanager
+    def try_writer(self):
+        """ Yields True if it acquired the writer lock without waiting, and False otherwise.
+
+        """
+        with self._condition:
+            acquired = self._writer_thread_id is None and self._num_active_readers == 0 and self._num_waiting_writers == 0
+            if acquired:
+                self._writer_thread_id = threading.get_ident()
+                self._writer_depth = 1
+        if not acquired:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self._release_writer()
+
+    def _release_writer(self):
+        with self._condition:
+            self._writer_depth -= 1
+            if self._writer_depth == 0:
+                self._writer_thread_id = None
+                self._condition.notify_all()
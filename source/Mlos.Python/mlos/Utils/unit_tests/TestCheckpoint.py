@@ -0,0 +1,138 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import codecs
+import os
+import pickle
+import struct
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlos.global_values import deserialize_from_bytes_string, serialize_to_bytes_string
+from mlos.Utils.Checkpoint import CheckpointReader, CheckpointWriter, dumps_object, loads_object
+
+
+class TestCheckpoint:
+
+    def test_bytes_and_arrays(self):
+        structured_array = np.zeros(10, dtype=[('left_child', '<i8'), ('threshold', '<f8')])
+        structured_array['left_child'] = np.arange(10)
+        structured_array['threshold'] = np.linspace(0, 1, 10)
+
+        writer = CheckpointWriter()
+        writer.add_bytes('bytes', b'abc')
+        writer.add_array('floats', np.arange(12, dtype=np.float64).reshape(3, 4))
+        writer.add_array('structured', structured_array)
+        writer.add_array('empty', np.empty((0, 3), dtype=np.int32))
+        reader = CheckpointReader(writer.to_bytes())
+
+        assert set(reader.entry_names) == {'bytes', 'floats', 'structured', 'empty'}
+        assert bytes(reader.get_bytes('bytes')) == b'abc'
+        assert np.array_equal(reader.get_array('floats'), np.arange(12, dtype=np.float64).reshape(3, 4))
+        assert np.array_equal(reader.get_array('structured'), structured_array)
+        assert reader.get_array('structured').dtype == structured_array.dtype
+        assert reader.get_array('empty').shape == (0, 3)
+
+        # Arrays are writable even though they were read from immutable bytes.
+        #
+        floats = reader.get_array('floats')
+        floats[0, 0] = -1
+        assert floats[0, 0] == -1
+
+    def test_dataframes(self):
+        dataframe = pd.DataFrame({
+            'x': np.linspace(-1, 1, 1000),
+            'n': np.arange(1000),
+            'flag': np.arange(1000) % 2 == 0,
+            'category': ['a', 'b', None, 'd'] * 250
+        })
+        writer = CheckpointWriter()
+        writer.add_dataframe('dataframe', dataframe)
+        writer.add_dataframe('empty', pd.DataFrame())
+        writer.add_dataframe('shuffled', dataframe.sample(frac=0.5, random_state=1))
+        reader = CheckpointReader(writer.to_bytes())
+
+        pd.testing.assert_frame_equal(reader.get_dataframe('dataframe'), dataframe)
+        assert len(reader.get_dataframe('empty').index) == 0
+        pd.testing.assert_frame_equal(reader.get_dataframe('shuffled'), dataframe.sample(frac=0.5, random_state=1))
+
+    def test_objects_with_arrays_and_external_objects(self):
+        shared = {'name': 'shared'}
+        obj = {
+            'large_array': np.arange(10000, dtype=np.float64),
+            'small_array': np.arange(3),
+            'shared': shared,
+            'nested': [shared, (1, 'two', 3.0)]
+        }
+        writer = CheckpointWriter()
+        writer.add_object('object', obj, external_objects={'shared': shared})
+        reader = CheckpointReader(writer.to_bytes())
+
+        # Large arrays are stored as entries of their own.
+        #
+        assert len(reader.entry_names) > 1
+
+        replacement = {'name': 'replacement'}
+        restored = reader.get_object('object', external_objects={'shared': replacement})
+        assert np.array_equal(restored['large_array'], obj['large_array'])
+        assert np.array_equal(restored['small_array'], obj['small_array'])
+        assert restored['shared'] is replacement
+        assert restored['nested'][0] is replacement
+        assert restored['nested'][1] == (1, 'two', 3.0)
+
+    def test_bytes_strings(self):
+        obj = {'name': 'convergence_state', 'values': np.arange(100, dtype=np.float64)}
+
+        # By default the string holds a plain pickle, which older clients unpickle themselves.
+        #
+        bytes_string = serialize_to_bytes_string(obj)
+        assert not CheckpointReader.is_checkpoint(codecs.decode(bytes_string.encode(), "base64"))
+        assert np.array_equal(pickle.loads(codecs.decode(bytes_string.encode(), "base64"))['values'], obj['values'])
+
+        checkpoint_bytes_string = serialize_to_bytes_string(obj, use_checkpoint_format=True)
+        assert CheckpointReader.is_checkpoint(codecs.decode(checkpoint_bytes_string.encode(), "base64"))
+        for restored_obj in [deserialize_from_bytes_string(bytes_string), deserialize_from_bytes_string(checkpoint_bytes_string)]:
+            assert restored_obj['name'] == obj['name']
+            assert np.array_equal(restored_obj['values'], obj['values'])
+
+    def test_compression(self):
+        array = np.zeros(100000)
+        uncompressed = dumps_object(array)
+        compressed = dumps_object(array, compress=True)
+        assert len(compressed) < len(uncompressed) / 10
+        assert np.array_equal(loads_object(compressed), array)
+        assert np.array_equal(loads_object(uncompressed), array)
+
+    def test_open_memory_maps_the_file(self, tmp_path):
+        path = os.path.join(tmp_path, 'array.checkpoint')
+        writer = CheckpointWriter()
+        writer.add_array('array', np.arange(100000))
+        writer.write(path)
+
+        for use_mmap in (True, False):
+            array = CheckpointReader.open(path, use_mmap=use_mmap).get_array('array')
+            assert np.array_equal(array, np.arange(100000))
+            array[0] = -1
+
+        # Writes to the mapped array don't reach the file.
+        #
+        assert CheckpointReader.open(path).get_array('array')[0] == 0
+
+    def test_invalid_checkpoints_are_rejected(self):
+        data = bytearray(dumps_object([1, 2, 3]))
+        assert CheckpointReader.is_checkpoint(data)
+        assert not CheckpointReader.is_checkpoint(b'\x80\x04not a checkpoint')
+
+        with pytest.raises(ValueError):
+            CheckpointReader(b'\x80\x04not a checkpoint')
+
+        unsupported_version = bytearray(data)
+        struct.pack_into('<I', unsupported_version, 8, 1000)
+        with pytest.raises(ValueError):
+            CheckpointReader(unsupported_version)
+
+        with pytest.raises(ValueError):
+            CheckpointReader(data[:len(data) - 1])
@@ -0,0 +1,107 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from mlos.Utils.ReaderWriterLock import ReaderWriterLock
+
+
+class TestReaderWriterLock:
+
+    def test_readers_share_the_lock(self):
+        lock = ReaderWriterLock()
+        num_readers = 4
+        all_readers_inside = threading.Barrier(num_readers, timeout=10)
+
+        def read():
+            with lock.reader():
+                # Only passes if all readers hold the lock at the same time.
+                #
+                all_readers_inside.wait()
+
+        with ThreadPoolExecutor(max_workers=num_readers) as executor:
+            for future in [executor.submit(read) for _ in range(num_readers)]:
+                future.result()
+
+    def test_writer_excludes_readers_and_writers(self):
+        lock = ReaderWriterLock()
+        num_threads_inside = 0
+        max_num_threads_inside_with_writer = 0
+        counter_lock = threading.Lock()
+
+        def access(is_writer):
+            nonlocal num_threads_inside, max_num_threads_inside_with_writer
+            with lock.writer() if is_writer else lock.reader():
+                with counter_lock:
+                    num_threads_inside += 1
+                time.sleep(0.001)
+                with counter_lock:
+                    if is_writer:
+                        max_num_threads_inside_with_writer = max(max_num_threads_inside_with_writer, num_threads_inside)
+                    num_threads_inside -= 1
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(access, i % 3 == 0) for i in range(60)]:
+                future.result()
+
+        assert max_num_threads_inside_with_writer == 1
+
+    def test_waiting_writer_blocks_new_readers(self):
+        lock = ReaderWriterLock()
+        events = []
+        first_reader_inside = threading.Event()
+        release_first_reader = threading.Event()
+
+        def first_reader():
+            with lock.reader():
+                first_reader_inside.set()
+                release_first_reader.wait(timeout=10)
+                events.append('first_reader')
+
+        def writer():
+            with lock.writer():
+                events.append('writer')
+
+        def second_reader():
+            with lock.reader():
+                events.append('second_reader')
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            first_reader_future = executor.submit(first_reader)
+            first_reader_inside.wait(timeout=10)
+            writer_future = executor.submit(writer)
+            while lock._num_waiting_writers == 0:  # pylint: disable=protected-access
+                time.sleep(0.001)
+            second_reader_future = executor.submit(second_reader)
+            time.sleep(0.01)
+            release_first_reader.set()
+            for future in [first_reader_future, writer_future, second_reader_future]:
+                future.result()
+
+        assert events == ['first_reader', 'writer', 'second_reader']
+
+    def test_try_writer(self):
+        lock = ReaderWriterLock()
+        with lock.try_writer() as acquired:
+            assert acquired
+            with lock.try_writer() as acquired_again:
+                assert not acquired_again
+
+        with lock.reader():
+            with lock.try_writer() as acquired:
+                assert not acquired
+
+        with lock.try_writer() as acquired:
+            assert acquired
+
+    def test_writer_is_reentrant(self):
+        lock = ReaderWriterLock()
+        with lock.writer():
+            with lock.writer():
+                with lock.reader():
+                    pass
+        with lock.reader():
+            pass
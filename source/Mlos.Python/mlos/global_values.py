@@ -5,6 +5,8 @@
 import codecs
 import pickle
 
+from mlos.Utils.Checkpoint import CheckpointReader, dumps_object, loads_object
+
 
 def declare_singletons():
     """ This is a workaround to overcome Python's default 'import' behavior.
@@ -56,8 +58,22 @@ def declare_singletons():
     if 'rpc_handlers' not in globals():
         rpc_handlers = None
 
-def serialize_to_bytes_string(obj):
+def serialize_to_bytes_string(obj, use_checkpoint_format=False):
+    """ Returns a base64 encoded pickle of the object.
+
+    With use_checkpoint_format, the object is stored in a checkpoint instead (see mlos.Utils.Checkpoint), which keeps
+    numpy arrays out of the pickle. Only deserialize_from_bytes_string() can restore those, clients that unpickle the
+    decoded string themselves can't.
+    """
+    if use_checkpoint_format:
+        return codecs.encode(dumps_object(obj), "base64").decode()
     return codecs.encode(pickle.dumps(obj), "base64").decode()
 
 def deserialize_from_bytes_string(bytes_string):
-    return pickle.loads(codecs.decode(bytes_string.encode(), "base64"))
+    """ Restores objects serialized by serialize_to_bytes_string(), as well as base64 encoded pickles.
+
+    """
+    data = codecs.decode(bytes_string.encode(), "base64")
+    if CheckpointReader.is_checkpoint(data):
+        return loads_object(data)
+    return pickle.loads(data)
@@ -7,6 +7,7 @@
 import argparse
 import signal
 
+from mlos.Grpc.AsyncOptimizerServicesServer import AsyncOptimizerServicesServer
 from mlos.Grpc.OptimizerServicesServer import OptimizerServicesServer
 import mlos.global_values as global_values
 
@@ -23,15 +24,47 @@ def parse_command_line_arguments():
                                           help="gRPC port.")
     launch_subcommand_parser.add_argument('--num-threads', type=int, required=False, default=10,
                                           help="Maximum number of threads to service gRPC requests.")
+    launch_subcommand_parser.add_argument('--num-prefetched-suggestions', type=int, required=False, default=0,
+                                          help="Number of suggestions to keep ready for each optimizer. Zero disables prefetching.")
+    launch_subcommand_parser.add_argument('--store-directory', type=str, required=False, default=None,
+                                          help="Directory to persist the optimizers in. By default they are only kept in memory.")
+    launch_subcommand_parser.add_argument('--num-shards', type=int, required=False, default=0,
+                                          help="Number of worker processes to host the optimizers in. Zero hosts them in the server process.")
+    launch_subcommand_parser.add_argument('--memory-budget-mb', type=int, required=False, default=None,
+                                          help="Estimated memory the optimizers may take before idle ones are evicted. By default, none are evicted.")
+    launch_subcommand_parser.add_argument('--eviction-directory', type=str, required=False, default=None,
+                                          help="Directory to write evicted optimizers to. Defaults to a temporary directory.")
+    launch_subcommand_parser.add_argument('--asyncio', action='store_true',
+                                          help="Serve requests on an asyncio event loop and host the optimizers in worker processes.")
+    launch_subcommand_parser.add_argument('--num-workers', type=int, required=False, default=None,
+                                          help="Number of optimizer worker processes when using --asyncio. Defaults to the number of CPUs.")
     arguments = parser.parse_args()
     assert arguments.port > 0, "Port must be a positive integer." # TODO: enforce the upper limit too.
     assert arguments.num_threads > 0, "Number of threads must be a positive integer."
+    assert arguments.num_prefetched_suggestions >= 0, "Number of prefetched suggestions must be a non-negative integer."
+    assert arguments.num_workers is None or arguments.num_workers > 0, "Number of workers must be a positive integer."
+    assert arguments.num_shards >= 0, "Number of shards must be a non-negative integer."
+    assert arguments.store_directory is None or arguments.num_shards == 0, "Sharded optimizers can't be persisted."
+    assert arguments.memory_budget_mb is None or arguments.memory_budget_mb > 0, "Memory budget must be a positive integer."
+    assert arguments.memory_budget_mb is None or (arguments.store_directory is None and arguments.num_shards == 0), \
+        "Memory budget only applies to optimizers kept in memory of the server process."
     return arguments
 
 
 def main():
     args = parse_command_line_arguments()
-    server = OptimizerServicesServer(port=args.port, num_threads=args.num_threads)
+    if args.asyncio:
+        server = AsyncOptimizerServicesServer(port=args.port, num_workers=args.num_workers)
+    else:
+        server = OptimizerServicesServer(
+            port=args.port,
+            num_threads=args.num_threads,
+            num_prefetched_suggestions=args.num_prefetched_suggestions,
+            optimizer_store_directory=args.store_directory,
+            num_shards=args.num_shards,
+            memory_budget_bytes=None if args.memory_budget_mb is None else args.memory_budget_mb * 1024 * 1024,
+            eviction_directory=args.eviction_directory
+        )
 
     def ctrl_c_handler(_, __):
         print("Received CTRL-C: shutting down.")
@@ -0,0 +1,231 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import warnings
+
+import grpc
+import numpy as np
+import pytest
+
+import mlos.global_values as global_values
+from mlos.Exceptions import OptimizerQueueFullException
+from mlos.Grpc.AsyncOptimizerServicesServer import AsyncOptimizerServicesServer
+from mlos.Grpc.BayesianOptimizerProxy import BayesianOptimizerProxy
+from mlos.Grpc.OptimizerMonitor import OptimizerMonitor
+from mlos.Grpc.OptimizerProcessPool import OptimizerWorkQueue
+from mlos.Grpc.OptimizerService_pb2 import Empty
+from mlos.Grpc.OptimizerService_pb2_grpc import OptimizerServiceStub
+from mlos.Logger import create_logger
+from mlos.OptimizerEvaluationTools.ObjectiveFunctionFactory import ObjectiveFunctionFactory, objective_function_config_store
+from mlos.Optimizers.BayesianOptimizer import bayesian_optimizer_config_store
+from mlos.Optimizers.BayesianOptimizerFactory import BayesianOptimizerFactory
+from mlos.Optimizers.OptimizationProblem import OptimizationProblem, Objective
+
+
+class TestAsyncOptimizerServicesServer:
+    """ Tests the E2E Grpc Client-Service workflow against the asyncio server.
+
+    """
+
+    @classmethod
+    def setup_class(cls):
+        warnings.simplefilter("error")
+        global_values.declare_singletons()
+
+    def setup_method(self, method):
+        self.logger = create_logger(self.__class__.__name__)
+
+        # Start up the gRPC service. Try a bunch of times before giving up.
+        #
+        max_num_tries = 100
+        num_tries = 0
+        for port in range(50151, 50151 + max_num_tries):
+            num_tries += 1
+            try:
+                self.server = AsyncOptimizerServicesServer(port=port, num_workers=2, logger=self.logger)
+                self.server.start()
+                self.port = port
+                break
+            except:
+                self.logger.info(f"Failed to create AsyncOptimizerMicroserviceServer on port {port}")
+                if num_tries == max_num_tries:
+                    raise
+
+        self.optimizer_service_channel = grpc.insecure_channel(f'localhost:{self.port}')
+        self.bayesian_optimizer_factory = BayesianOptimizerFactory(grpc_channel=self.optimizer_service_channel, logger=self.logger)
+        self.optimizer_monitor = OptimizerMonitor(grpc_channel=self.optimizer_service_channel, logger=self.logger)
+
+        objective_function_config = objective_function_config_store.get_config_by_name('2d_quadratic_concave_up')
+        self.objective_function = ObjectiveFunctionFactory.create_objective_function(objective_function_config)
+
+        self.optimization_problem = OptimizationProblem(
+            parameter_space=self.objective_function.parameter_space,
+            objective_space=self.objective_function.output_space,
+            objectives=[Objective(name='y', minimize=True)]
+        )
+
+    def teardown_method(self, method):
+        """ We need to tear down the gRPC server and its worker processes here.
+
+        :return:
+        """
+        self.server.stop(grace=None).wait(timeout=10)
+        self.server.wait_for_termination(timeout=10)
+        self.optimizer_service_channel.close()
+
+    def test_echo(self):
+        optimizer_service_stub = OptimizerServiceStub(channel=self.optimizer_service_channel)
+        response = optimizer_service_stub.Echo(Empty())
+        assert isinstance(response, Empty)
+
+    def test_optimizer_with_default_config(self):
+        bayesian_optimizer = self.bayesian_optimizer_factory.create_remote_optimizer(
+            optimization_problem=self.optimization_problem,
+            optimizer_config=bayesian_optimizer_config_store.default
+        )
+        existing_optimizers = {optimizer.id: optimizer for optimizer in self.optimizer_monitor.get_existing_optimizers()}
+        assert bayesian_optimizer.id in existing_optimizers
+        assert existing_optimizers[bayesian_optimizer.id].optimizer_config == bayesian_optimizer.optimizer_config
+        assert not bayesian_optimizer.trained
+
+        num_iterations = 30
+        for _ in range(num_iterations):
+            parameters = bayesian_optimizer.suggest()
+            objectives = self.objective_function.evaluate_point(parameters)
+            bayesian_optimizer.register(parameters.to_dataframe(), objectives.to_dataframe())
+
+        assert bayesian_optimizer.trained
+
+        features_df, objectives_df, _ = bayesian_optimizer.get_all_observations()
+        assert len(features_df.index) == num_iterations
+        assert len(objectives_df.index) == num_iterations
+
+        # The front end knows how many observations there are, so a proxy with smaller messages paginates them.
+        #
+        paginating_optimizer = BayesianOptimizerProxy(
+            grpc_channel=self.optimizer_service_channel,
+            optimization_problem=self.optimization_problem,
+            optimizer_config=bayesian_optimizer.optimizer_config,
+            id=bayesian_optimizer.id,
+            logger=self.logger,
+            max_rows_per_message=16
+        )
+        assert len(list(paginating_optimizer.stream_all_observations())) == 2
+        paginated_features_df, _, _ = paginating_optimizer.get_all_observations()
+        assert len(paginated_features_df.index) == num_iterations
+
+        predictions_df = bayesian_optimizer.predict(features_df).get_dataframe()
+        assert features_df.index.intersection(predictions_df.index).equals(predictions_df.index)
+
+    def test_concurrent_suggestions(self):
+        """ Suggestions for several optimizers are requested concurrently and every optimizer sees its own observations.
+
+        """
+        num_optimizers = 4
+        num_iterations = 10
+        bayesian_optimizers = [
+            self.bayesian_optimizer_factory.create_remote_optimizer(
+                optimization_problem=self.optimization_problem,
+                optimizer_config=bayesian_optimizer_config_store.default
+            )
+            for _ in range(num_optimizers)
+        ]
+
+        def optimize(bayesian_optimizer):
+            for _ in range(num_iterations):
+                parameters = bayesian_optimizer.suggest()
+                objectives = self.objective_function.evaluate_point(parameters)
+                bayesian_optimizer.register(parameters.to_dataframe(), objectives.to_dataframe())
+
+        # Several threads also hammer the same optimizer to make sure its calls get serialized.
+        #
+        with ThreadPoolExecutor(max_workers=2 * num_optimizers) as executor:
+            futures = [executor.submit(optimize, bayesian_optimizer) for bayesian_optimizer in bayesian_optimizers + bayesian_optimizers]
+            for future in futures:
+                future.result()
+
+        for bayesian_optimizer in bayesian_optimizers:
+            features_df, _, _ = bayesian_optimizer.get_all_observations()
+            assert len(features_df.index) == 2 * num_iterations
+            assert not np.isnan(features_df.to_numpy()).any()
+
+    def test_dead_worker_is_replaced(self):
+        """ Kills the worker process hosting an optimizer: calls to it fail with UNAVAILABLE and the worker is replaced.
+
+        """
+        bayesian_optimizer = self.bayesian_optimizer_factory.create_remote_optimizer(
+            optimization_problem=self.optimization_problem,
+            optimizer_config=bayesian_optimizer_config_store.default
+        )
+        bayesian_optimizer.suggest()
+
+        optimizer_process_pool = self.server._optimizer_process_pool  # pylint: disable=protected-access
+        worker_index = optimizer_process_pool.get_optimizer_record(bayesian_optimizer.id).worker_index
+        for process in list(optimizer_process_pool._executors[worker_index]._processes.values()):  # pylint: disable=protected-access
+            process.kill()
+            process.join()
+
+        with pytest.raises(grpc.RpcError) as exception_info:
+            bayesian_optimizer.suggest()
+        assert exception_info.value.code() == grpc.StatusCode.UNAVAILABLE
+        assert bayesian_optimizer.id not in [optimizer.id for optimizer in self.optimizer_monitor.get_existing_optimizers()]
+
+        # New optimizers go to the least loaded workers, so one of them lands on the replacement.
+        #
+        new_optimizers = [
+            self.bayesian_optimizer_factory.create_remote_optimizer(
+                optimization_problem=self.optimization_problem,
+                optimizer_config=bayesian_optimizer_config_store.default
+            )
+            for _ in range(2)
+        ]
+        assert worker_index in [optimizer_process_pool.get_optimizer_record(optimizer.id).worker_index for optimizer in new_optimizers]
+        for optimizer in new_optimizers:
+            parameters = optimizer.suggest()
+            objectives = self.objective_function.evaluate_point(parameters)
+            optimizer.register(parameters.to_dataframe(), objectives.to_dataframe())
+
+    def test_work_queue_rejects_calls_when_full(self):
+        """ Exercises OptimizerWorkQueue directly, on a thread pool, so that we control when calls complete.
+
+        """
+        max_queued_calls = 3
+        release_calls = threading.Event()
+        completed_calls = []
+
+        def blocking_call(call_number):
+            release_calls.wait(timeout=10)
+            completed_calls.append(call_number)
+            return call_number
+
+        async def run():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                work_queue = OptimizerWorkQueue(executor=executor, max_queued_calls=max_queued_calls)
+
+                # The first call is taken off the queue right away, and the following ones wait behind it.
+                #
+                tasks = [asyncio.ensure_future(work_queue.submit(blocking_call, 0))]
+                await asyncio.sleep(0.1)
+                tasks += [asyncio.ensure_future(work_queue.submit(blocking_call, call_number)) for call_number in range(1, max_queued_calls + 1)]
+                await asyncio.sleep(0.1)
+
+                with pytest.raises(OptimizerQueueFullException):
+                    await work_queue.submit(blocking_call, max_queued_calls + 1)
+
+                release_calls.set()
+                results = await asyncio.gather(*tasks)
+                work_queue.close()
+                return results
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+        assert results == list(range(max_queued_calls + 1))
+        assert completed_calls == results
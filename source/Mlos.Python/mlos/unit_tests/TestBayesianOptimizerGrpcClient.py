@@ -12,6 +12,8 @@ import pandas as pd
 
 
 import mlos.global_values as global_values
+from mlos.Grpc.BayesianOptimizerProxy import BayesianOptimizerProxy
+from mlos.Grpc.DataFrameEncoderDecoder import DataFrameFormat
 from mlos.Grpc.OptimizerServicesServer import OptimizerServicesServer
 from mlos.Grpc.OptimizerMonitor import OptimizerMonitor
 from mlos.Grpc.OptimizerService_pb2 import Empty
@@ -158,6 +160,65 @@ class TestBayesianOptimizerGrpcClient:
                 assert 0 <= model_gof_metrics.coefficient_of_determination <= 1
 
 
+    def test_suggest_batch(self):
+        bayesian_optimizer = self.bayesian_optimizer_factory.create_remote_optimizer(
+            optimization_problem=self.optimization_problem,
+            optimizer_config=bayesian_optimizer_config_store.default
+        )
+
+        for random in [True, False]:
+            num_suggestions = 5
+            suggestions = bayesian_optimizer.suggest_batch(num_suggestions=num_suggestions, random=random)
+            assert len(suggestions) == num_suggestions
+            for suggestion in suggestions:
+                assert suggestion in self.optimization_problem.parameter_space
+                objectives = self.objective_function.evaluate_point(suggestion)
+                bayesian_optimizer.register(suggestion.to_dataframe(), objectives.to_dataframe())
+
+        features_df, _, _ = bayesian_optimizer.get_all_observations()
+        assert len(features_df.index) == 10
+
+    @pytest.mark.parametrize("dataframe_format", [dataframe_format for dataframe_format in DataFrameFormat])
+    def test_streaming_observations_and_predictions(self, dataframe_format):
+        remote_optimizer = self.bayesian_optimizer_factory.create_remote_optimizer(
+            optimization_problem=self.optimization_problem,
+            optimizer_config=bayesian_optimizer_config_store.default
+        )
+
+        # A proxy with tiny messages forces every bulk operation to be streamed in many chunks.
+        #
+        bayesian_optimizer = BayesianOptimizerProxy(
+            grpc_channel=self.optimizer_service_channel,
+            optimization_problem=self.optimization_problem,
+            optimizer_config=remote_optimizer.optimizer_config,
+            id=remote_optimizer.id,
+            logger=self.logger,
+            dataframe_format=dataframe_format,
+            max_rows_per_message=16
+        )
+
+        num_observations = 100
+        params_df = self.optimization_problem.parameter_space.random_dataframe(num_samples=num_observations)
+        objectives_df = self.objective_function.evaluate_dataframe(params_df)
+        bayesian_optimizer.register(params_df, objectives_df)
+
+        chunks = list(bayesian_optimizer.stream_all_observations(max_rows_per_chunk=30))
+        assert [len(features_df.index) for features_df, _, _ in chunks] == [30, 30, 30, 10]
+        assert all(context_df is None for _, _, context_df in chunks)
+
+        observed_params_df, observed_objectives_df, _ = bayesian_optimizer.get_all_observations()
+        assert len(observed_params_df.index) == num_observations
+        assert (np.abs(observed_params_df[params_df.columns].to_numpy() - params_df.to_numpy()) < 0.00000001).all()
+        assert (np.abs(observed_objectives_df[objectives_df.columns].to_numpy() - objectives_df.to_numpy()) < 0.00000001).all()
+
+        # Predictions over a frame larger than a message go over the PredictStream.
+        #
+        grid_df = self.optimization_problem.parameter_space.random_dataframe(num_samples=250)
+        streamed_predictions_df = bayesian_optimizer.predict(grid_df).get_dataframe()
+        unary_predictions_df = remote_optimizer.predict(grid_df).get_dataframe()
+        assert streamed_predictions_df.index.equals(unary_predictions_df.index)
+        assert np.allclose(streamed_predictions_df.to_numpy(dtype=float), unary_predictions_df.to_numpy(dtype=float), equal_nan=True)
+
     @pytest.mark.parametrize("i", [i for i in range(10)])
     def test_optimizer_with_random_config(self, i):
         optimizer_config = bayesian_optimizer_config_store.parameter_space.random()
@@ -236,19 +297,8 @@ class TestBayesianOptimizerGrpcClient:
         )
         registered_params_df, registered_objectives_df = self.optimize_objective_function(optimizer=bayesian_optimizer, objective_function=objective_function, num_iterations=20)
 
-        # Apparently the to_json/from_json loses precision so we explicitly lose it here so that we can do the comparison.
-        #
-        registered_features_json = registered_params_df.to_json(orient='index', double_precision=15)
-        registered_objectives_json = registered_objectives_df.to_json(orient='index', double_precision=15)
-
-        # Apparently the jitter is too good and we actually have to use the json strings or they will be optimized away.
+        # Numeric columns travel as packed float64 buffers, so unlike the old to_json/read_json round trip they come back exactly.
         #
-        assert len(registered_features_json) > 0
-        assert len(registered_objectives_json) > 0
-
-        registered_params_df = pd.read_json(registered_features_json, orient='index')
-        registered_objectives_df = pd.read_json(registered_objectives_json, orient='index')
-
         observed_params_df, observed_objectives_df, _ = bayesian_optimizer.get_all_observations()
 
         numeric_params_names = [
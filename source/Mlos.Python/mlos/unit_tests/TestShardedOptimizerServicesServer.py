@@ -0,0 +1,98 @@
+#
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+#
+import warnings
+
+import grpc
+
+import mlos.global_values as global_values
+from mlos.Grpc.OptimizerMonitor import OptimizerMonitor
+from mlos.Grpc.OptimizerServicesServer import OptimizerServicesServer
+from mlos.Logger import create_logger
+from mlos.OptimizerEvaluationTools.ObjectiveFunctionFactory import ObjectiveFunctionFactory, objective_function_config_store
+from mlos.Optimizers.BayesianOptimizer import bayesian_optimizer_config_store
+from mlos.Optimizers.BayesianOptimizerFactory import BayesianOptimizerFactory
+from mlos.Optimizers.OptimizationProblem import OptimizationProblem, Objective
+
+
+class TestShardedOptimizerServicesServer:
+    """ Tests the E2E Grpc Client-Service workflow against a server hosting the optimizers in shards.
+
+    """
+
+    @classmethod
+    def setup_class(cls):
+        warnings.simplefilter("error")
+        global_values.declare_singletons()
+
+    def setup_method(self, method):
+        self.logger = create_logger(self.__class__.__name__)
+
+        # Start up the gRPC service. Try a bunch of times before giving up.
+        #
+        max_num_tries = 100
+        num_tries = 0
+        for port in range(50251, 50251 + max_num_tries):
+            num_tries += 1
+            try:
+                self.server = OptimizerServicesServer(port=port, num_threads=10, logger=self.logger, num_shards=2)
+                self.server.start()
+                self.port = port
+                break
+            except:
+                self.logger.info(f"Failed to create OptimizerMicroserviceServer on port {port}")
+                if num_tries == max_num_tries:
+                    raise
+
+        self.optimizer_service_channel = grpc.insecure_channel(f'localhost:{self.port}')
+        self.bayesian_optimizer_factory = BayesianOptimizerFactory(grpc_channel=self.optimizer_service_channel, logger=self.logger)
+        self.optimizer_monitor = OptimizerMonitor(grpc_channel=self.optimizer_service_channel, logger=self.logger)
+
+        objective_function_config = objective_function_config_store.get_config_by_name('2d_quadratic_concave_up')
+        self.objective_function = ObjectiveFunctionFactory.create_objective_function(objective_function_config)
+
+        self.optimization_problem = OptimizationProblem(
+            parameter_space=self.objective_function.parameter_space,
+            objective_space=self.objective_function.output_space,
+            objectives=[Objective(name='y', minimize=True)]
+        )
+
+    def teardown_method(self, method):
+        """ We need to tear down the gRPC server and its shards here.
+
+        :return:
+        """
+        self.server.stop(grace=None).wait(timeout=10)
+        self.server.wait_for_termination(timeout=10)
+        self.optimizer_service_channel.close()
+
+    def test_optimizers_in_shards(self):
+        bayesian_optimizers = [
+            self.bayesian_optimizer_factory.create_remote_optimizer(
+                optimization_problem=self.optimization_problem,
+                optimizer_config=bayesian_optimizer_config_store.default
+            )
+            for _ in range(4)
+        ]
+        existing_optimizers = {optimizer.id for optimizer in self.optimizer_monitor.get_existing_optimizers()}
+        assert all(bayesian_optimizer.id in existing_optimizers for bayesian_optimizer in bayesian_optimizers)
+
+        # Each tree in the surrogate forest trains on a subsample, so it takes more than a dozen observations to train them all.
+        #
+        num_iterations = 30
+        for _ in range(num_iterations):
+            for bayesian_optimizer in bayesian_optimizers:
+                suggestion = bayesian_optimizer.suggest()
+                assert suggestion in self.optimization_problem.parameter_space
+                bayesian_optimizer.register(
+                    parameter_values_pandas_frame=suggestion.to_dataframe(),
+                    target_values_pandas_frame=self.objective_function.evaluate_point(suggestion).to_dataframe()
+                )
+
+        for bayesian_optimizer in bayesian_optimizers:
+            assert bayesian_optimizer.trained
+            parameters_df, _, _ = bayesian_optimizer.get_all_observations()
+            assert len(parameters_df.index) == num_iterations
+            predictions = bayesian_optimizer.predict(parameter_values_pandas_frame=parameters_df)
+            assert len(predictions.get_dataframe().index) == num_iterations